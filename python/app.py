@@ -1,10 +1,101 @@
-from flask import Flask
+from flask import Flask, request, Response
 from sys import version
+from postgres_api.copy_record_stream import CopyRecordFormatEnum
+from postgres_api.query_result_cache import QueryResultCache
+from postgres_api.query_result_cache_invalidation import QueryResultCacheInvalidationChannel
+from postgres_api.database_implementation import PostgresDatabase, CachingDatabaseInterface, PostgresApiDatabaseCommandResultFactory, BulkInsertRecordsDatabaseCommand, StreamQueryDatabaseCommand, GetRecordsDatabaseCommand
+import json
+import os
 
 app = Flask(__name__)
 
+record_format_per_mimetype = {
+    "text/csv": CopyRecordFormatEnum.Csv,
+    "application/x-ndjson": CopyRecordFormatEnum.JsonLines,
+    "application/jsonlines": CopyRecordFormatEnum.JsonLines
+}
+
+query_result_cache = QueryResultCache()
+
+# each uwsgi process has its own cache, so writes are published to the caches of the other processes
+query_result_cache_invalidation_channel = QueryResultCacheInvalidationChannel(
+    query_result_cache=query_result_cache,
+    user_name=os.environ["POSTGRES_USER"],
+    password=os.environ["POSTGRES_PASSWORD"],
+    host_url=os.environ["POSTGRES_HOST"],
+    port=int(os.environ["POSTGRES_PORT"])
+)
+
+
+def get_database_interface() -> CachingDatabaseInterface:
+    return CachingDatabaseInterface(
+        database_interface=PostgresDatabase(
+            user_name=os.environ["POSTGRES_USER"],
+            password=os.environ["POSTGRES_PASSWORD"],
+            host_url=os.environ["POSTGRES_HOST"],
+            port=int(os.environ["POSTGRES_PORT"])
+        ),
+        query_result_cache=query_result_cache,
+        query_result_cache_invalidation_channel=query_result_cache_invalidation_channel
+    )
+
 @app.route("/")
 def index():
     return "API interface not yet implemented"
 
+@app.route("/v1/query_result_cache_statistics", methods=["GET"])
+def get_query_result_cache_statistics():
+    return Response(json.dumps(query_result_cache.get_statistics()), mimetype="application/json")
+
+@app.route("/v1/get_records/<database_name>/<table_name>", methods=["GET"])
+def get_records(database_name: str, table_name: str):
+    _fetch_rows_total = request.args.get("fetch_rows_total", default=1000, type=int)
+    if _fetch_rows_total < 1:
+        return Response(f"Unexpected fetch rows total {_fetch_rows_total}.", status=400)
+    _database_command_result = StreamQueryDatabaseCommand(
+        database_name=database_name,
+        query=f"SELECT * FROM {GetRecordsDatabaseCommand.get_quoted_identifier(identifier=table_name)}",
+        parameters={},
+        fetch_rows_total=_fetch_rows_total
+    ).execute(
+        database_interface=get_database_interface(),
+        database_command_result_factory=PostgresApiDatabaseCommandResultFactory()
+    )
+    # returning a generator makes the response chunked, so only one batch of rows is held in memory at a time
+    return Response(_database_command_result.get_json_bytes_chunks(), mimetype="application/json")
+
+@app.route("/v1/get_records_page/<database_name>/<table_name>", methods=["GET"])
+def get_records_page(database_name: str, table_name: str):
+    _sort_column_names = request.args.get("sort_column_names", default="")
+    _page_rows_total = request.args.get("page_rows_total", default=100, type=int)
+    if _sort_column_names == "" or _page_rows_total < 1:
+        return Response(f"Expected sort column names and a positive page rows total.", status=400)
+    _database_command_result = GetRecordsDatabaseCommand(
+        database_name=database_name,
+        table_name=table_name,
+        sort_column_names=_sort_column_names.split(","),
+        page_rows_total=_page_rows_total,
+        continuation_token=request.args.get("continuation_token", default=None)
+    ).execute(
+        database_interface=get_database_interface(),
+        database_command_result_factory=PostgresApiDatabaseCommandResultFactory()
+    )
+    return Response(_database_command_result.get_json_bytes(), mimetype="application/json")
+
+@app.route("/v1/bulk_insert_records/<database_name>/<table_name>", methods=["POST"])
+def bulk_insert_records(database_name: str, table_name: str):
+    if request.mimetype not in record_format_per_mimetype:
+        return Response(f"Unsupported content type \"{request.mimetype}\".", status=415)
+    # the records are copied while the request body is read, so the payload is never held in memory
+    _database_command_result = BulkInsertRecordsDatabaseCommand(
+        database_name=database_name,
+        table_name=table_name,
+        record_format=record_format_per_mimetype[request.mimetype],
+        record_stream=request.stream
+    ).execute(
+        database_interface=get_database_interface(),
+        database_command_result_factory=PostgresApiDatabaseCommandResultFactory()
+    )
+    return Response(_database_command_result.get_json_bytes(), mimetype="application/json")
+
 application = app
@@ -0,0 +1,88 @@
+from __future__ import annotations
+from postgres_api.callback import Callback, FunctionCallback
+from postgres_api.callback_dispatch import CallbackDispatchExecutableQueue, DispatchingCallback
+from postgres_api.command import DefaultCommandResult
+from postgres_api.executable import DefaultExecutableElement
+from postgres_api.queue import SingleThreadedExecutableQueue
+from typing import Dict
+import argparse
+import time
+
+
+class CallingBackExecutableQueue(SingleThreadedExecutableQueue):
+
+	def __init__(self, *, execution_result_callback: Callback):
+		super().__init__()
+
+		self.__execution_result_callback = execution_result_callback
+
+	def get_execution_parameters(self) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: DefaultCommandResult):
+		self.__execution_result_callback.execute_json_convertable(
+			json_convertable=execution_result
+		)
+
+
+def _benchmark(*, name: str, execution_result_callback: Callback, elements_total: int, callback_dispatch_executable_queue: CallbackDispatchExecutableQueue = None):
+
+	_executable_queue = CallingBackExecutableQueue(
+		execution_result_callback=execution_result_callback
+	)
+	_executable_element = DefaultExecutableElement(
+		default_output=DefaultCommandResult(
+			default_json_string="{\"version\": 1, \"is_successful\": true}"
+		)
+	)
+
+	_start = time.perf_counter()
+	_executable_queue.append_many_to_end_immediately(
+		executable_elements=[_executable_element] * elements_total
+	)
+	_executable_queue.wait_until_empty()
+	_executed_seconds = time.perf_counter() - _start
+	if callback_dispatch_executable_queue is not None:
+		callback_dispatch_executable_queue.wait_until_delivered()
+	_delivered_seconds = time.perf_counter() - _start
+
+	_executable_queue.dispose()
+
+	print(f"{name:<12} {elements_total:>9} {_executed_seconds:>14.3f} {_delivered_seconds:>15.3f}")
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Measures how long a queue takes to execute its elements when each result is called back to a slow receiver, with the callback on the executing thread and with a callback dispatch queue.")
+	_parser.add_argument("--elements-total", type=int, default=200)
+	_parser.add_argument("--callback-seconds", type=float, default=0.01)
+	_parser.add_argument("--workers-total", type=int, default=8)
+	_arguments = _parser.parse_args()
+
+	_slow_callback = FunctionCallback(
+		function=lambda data: time.sleep(_arguments.callback_seconds)
+	)
+
+	print(f"{'callback':<12} {'elements':>9} {'executed (s)':>14} {'delivered (s)':>15}")
+	_benchmark(
+		name="inline",
+		execution_result_callback=_slow_callback,
+		elements_total=_arguments.elements_total
+	)
+	_callback_dispatch_executable_queue = CallbackDispatchExecutableQueue(
+		callback=_slow_callback,
+		workers_total=_arguments.workers_total
+	)
+	_benchmark(
+		name="dispatched",
+		execution_result_callback=DispatchingCallback(
+			callback_dispatch_executable_queue=_callback_dispatch_executable_queue
+		),
+		elements_total=_arguments.elements_total,
+		callback_dispatch_executable_queue=_callback_dispatch_executable_queue
+	)
+	_callback_dispatch_executable_queue.dispose()
+
+
+if __name__ == "__main__":
+	main()
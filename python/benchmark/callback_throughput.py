@@ -0,0 +1,145 @@
+from __future__ import annotations
+from postgres_api.callback import RemoteApiInterface, RequestsRemoteApiInterface, UrlResponse, Callback, JsonWebTokenCallback, BatchingCallback, CallbackDelivery
+from postgres_api.command import DefaultCommandResult
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import argparse
+import concurrent.futures
+import requests
+import threading
+import time
+
+
+class EmptyJsonHttpRequestHandler(BaseHTTPRequestHandler):
+
+	protocol_version = "HTTP/1.1"
+	# the headers and body are sent separately, which without this waits on delayed acknowledgements over kept alive connections
+	disable_nagle_algorithm = True
+
+	def do_POST(self):
+		self.rfile.read(int(self.headers["Content-Length"]))
+		self.send_response(200)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", "2")
+		self.end_headers()
+		self.wfile.write(b"{}")
+
+	def log_message(self, format, *args):
+		pass
+
+
+class UnpooledRemoteApiInterface(RemoteApiInterface):
+	"""
+	This class posts like the remote api did before sessions, opening a new connection for each post.
+	"""
+
+	def post(self, *, url: str, json_object: object) -> UrlResponse:
+		_response = requests.post(url, json=json_object)
+		return UrlResponse(
+			status_code=_response.status_code,
+			json_object=_response.json()
+		)
+
+
+def _benchmark(*, name: str, remote_api: RemoteApiInterface, url: str, posts_total: int, threads_total: int):
+
+	def _post(index: int):
+		remote_api.post(
+			url=url,
+			json_object={"index": index}
+		)
+
+	_start = time.perf_counter()
+	with concurrent.futures.ThreadPoolExecutor(max_workers=threads_total) as _executor:
+		list(_executor.map(_post, range(posts_total)))
+	_seconds = time.perf_counter() - _start
+
+	print(f"{name:<12} {threads_total:>8} {posts_total:>8} {_seconds:>10.3f} {posts_total / _seconds:>12.0f}")
+
+
+def _benchmark_json_web_token_callback(*, name: str, callback: Callback, results_total: int):
+
+	_json_convertable = DefaultCommandResult(
+		default_json_string="{\"version\": 1, \"is_successful\": true, \"output\": [[1, \"name\"]]}"
+	)
+
+	_start = time.perf_counter()
+	_callback_responses = [callback.execute_json_convertable(
+		json_convertable=_json_convertable
+	) for _ in range(results_total)]
+	for _callback_response in _callback_responses:
+		if isinstance(_callback_response, CallbackDelivery):
+			_callback_response.wait()
+	_seconds = time.perf_counter() - _start
+
+	print(f"{name:<12} {1:>8} {results_total:>8} {_seconds:>10.3f} {results_total / _seconds:>12.0f}")
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Compares callback posts per second to a local HTTP/1.1 server with a new connection per post and with the pooled session, and json web token callbacks per result with and without batching.")
+	_parser.add_argument("--posts-total", type=int, default=2000)
+	_parser.add_argument("--threads-totals", type=int, nargs="+", default=[1, 8])
+	_parser.add_argument("--batch-results-total", type=int, default=100)
+	_parser.add_argument("--secret", type=str, default="benchmark secret of at least thirty-two bytes")
+	_arguments = _parser.parse_args()
+
+	_http_server = ThreadingHTTPServer(("127.0.0.1", 0), EmptyJsonHttpRequestHandler)
+	_http_server_thread = threading.Thread(
+		target=_http_server.serve_forever
+	)
+	_http_server_thread.start()
+	_url = f"http://127.0.0.1:{_http_server.server_port}/callback"
+
+	try:
+		print(f"{'remote api':<12} {'threads':>8} {'posts':>8} {'seconds':>10} {'posts/s':>12}")
+		for _threads_total in _arguments.threads_totals:
+			_benchmark(
+				name="unpooled",
+				remote_api=UnpooledRemoteApiInterface(),
+				url=_url,
+				posts_total=_arguments.posts_total,
+				threads_total=_threads_total
+			)
+			_requests_remote_api = RequestsRemoteApiInterface(
+				maximum_connections_per_host_total=_threads_total
+			)
+			_benchmark(
+				name="pooled",
+				remote_api=_requests_remote_api,
+				url=_url,
+				posts_total=_arguments.posts_total,
+				threads_total=_threads_total
+			)
+			_requests_remote_api.dispose()
+
+		print(f"{'jwt callback':<12} {'threads':>8} {'results':>8} {'seconds':>10} {'results/s':>12}")
+		_requests_remote_api = RequestsRemoteApiInterface()
+		_json_web_token_callback = JsonWebTokenCallback(
+			url=_url,
+			secret=_arguments.secret,
+			remote_api=_requests_remote_api
+		)
+		_benchmark_json_web_token_callback(
+			name="unbatched",
+			callback=_json_web_token_callback,
+			results_total=_arguments.posts_total
+		)
+		_batching_callback = BatchingCallback(
+			callback=_json_web_token_callback,
+			maximum_results_total=_arguments.batch_results_total
+		)
+		_benchmark_json_web_token_callback(
+			name="batched",
+			callback=_batching_callback,
+			results_total=_arguments.posts_total
+		)
+		_batching_callback.dispose()
+		_requests_remote_api.dispose()
+	finally:
+		_http_server.shutdown()
+		_http_server.server_close()
+		_http_server_thread.join()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,177 @@
+from __future__ import annotations
+from postgres_api.connection_pool import PostgresConnectionPool, UnpooledPostgresConnectionSource
+from postgres_api.database_implementation import PostgresConnectionSourceDatabase, PostgresDatabase, PooledPostgresDatabase
+from postgres_api.database_interface import DatabaseInterface
+import threading
+from typing import List, Dict, Callable
+import argparse
+import time
+
+
+class StandInCursor():
+
+	def __init__(self, *, query_seconds: float):
+
+		self.__query_seconds = query_seconds
+
+		self.description = None
+		self.rowcount = -1
+
+	def execute(self, query: str, parameters: Dict[str, object] = None):
+		time.sleep(self.__query_seconds)
+		self.description = [("?column?",)]
+		self.rowcount = 1
+
+	def fetchone(self):
+		return (1,)
+
+	def fetchall(self):
+		return [(1,)]
+
+	def close(self):
+		pass
+
+
+class StandInConnection():
+	"""
+	This class stands in for a psycopg2 connection, sleeping to simulate the connection handshake and each query round trip
+	"""
+
+	def __init__(self, *, connect_seconds: float, query_seconds: float):
+
+		time.sleep(connect_seconds)
+
+		self.__query_seconds = query_seconds
+
+		self.closed = 0
+
+	def cursor(self) -> StandInCursor:
+		return StandInCursor(
+			query_seconds=self.__query_seconds
+		)
+
+	def set_isolation_level(self, isolation_level: int):
+		pass
+
+	def commit(self):
+		pass
+
+	def rollback(self):
+		pass
+
+	def close(self):
+		self.closed = 1
+
+
+def _benchmark(*, name: str, database_interface_factory: Callable[[], DatabaseInterface], database_name: str, threads_total: int, queries_per_thread_total: int):
+
+	_start_event = threading.Event()
+
+	def _thread_method():
+		_database_interface = database_interface_factory()
+		_start_event.wait()
+		for _ in range(queries_per_thread_total):
+			# the same cycle that ExecuteQueryDatabaseCommand runs for each command
+			_database_interface.connect_to_database(
+				database_name=database_name
+			)
+			_database_interface.execute_query(
+				query="SELECT 1",
+				parameters={}
+			)
+			_database_interface.disconnect_from_database()
+
+	_threads = []  # type: List[threading.Thread]
+	for _ in range(threads_total):
+		_thread = threading.Thread(
+			target=_thread_method
+		)
+		_thread.start()
+		_threads.append(_thread)
+
+	_start = time.perf_counter()
+	_start_event.set()
+	for _thread in _threads:
+		_thread.join()
+	_seconds = time.perf_counter() - _start
+
+	_queries_total = threads_total * queries_per_thread_total
+	print(f"{name:<10} {threads_total:>8} {_queries_total:>8} {_seconds:>10.3f} {_queries_total / _seconds:>12.1f}")
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Compares queries per second with and without the connection pool. Uses a stand-in connection unless a host is given.")
+	_parser.add_argument("--host", type=str, default=None)
+	_parser.add_argument("--port", type=int, default=5432)
+	_parser.add_argument("--user", type=str, default="postgres")
+	_parser.add_argument("--password", type=str, default="")
+	_parser.add_argument("--database", type=str, default="postgres")
+	_parser.add_argument("--threads-totals", type=int, nargs="+", default=[1, 4, 16])
+	_parser.add_argument("--queries-per-thread-total", type=int, default=200)
+	_parser.add_argument("--stand-in-connect-seconds", type=float, default=0.01)
+	_parser.add_argument("--stand-in-query-seconds", type=float, default=0.0002)
+	_arguments = _parser.parse_args()
+
+	_connect_function = None
+	if _arguments.host is None:
+
+		def _connect_function(**kwargs) -> StandInConnection:
+			return StandInConnection(
+				connect_seconds=_arguments.stand_in_connect_seconds,
+				query_seconds=_arguments.stand_in_query_seconds
+			)
+
+	print(f"{'database':<10} {'threads':>8} {'queries':>8} {'total (s)':>10} {'queries/s':>12}")
+	for _threads_total in _arguments.threads_totals:
+
+		def _get_unpooled_database() -> DatabaseInterface:
+			if _connect_function is None:
+				return PostgresDatabase(
+					user_name=_arguments.user,
+					password=_arguments.password,
+					host_url=_arguments.host,
+					port=_arguments.port
+				)
+			return PostgresConnectionSourceDatabase(
+				postgres_connection_source=UnpooledPostgresConnectionSource(
+					user_name=_arguments.user,
+					password=_arguments.password,
+					host_url=_arguments.host,
+					port=_arguments.port,
+					connect_function=_connect_function
+				)
+			)
+
+		_benchmark(
+			name="unpooled",
+			database_interface_factory=_get_unpooled_database,
+			database_name=_arguments.database,
+			threads_total=_threads_total,
+			queries_per_thread_total=_arguments.queries_per_thread_total
+		)
+
+		_connection_pool = PostgresConnectionPool(
+			user_name=_arguments.user,
+			password=_arguments.password,
+			host_url=_arguments.host,
+			port=_arguments.port,
+			maximum_connections_total=_threads_total,
+			connect_function=_connect_function
+		)
+
+		_benchmark(
+			name="pooled",
+			database_interface_factory=lambda: PooledPostgresDatabase(
+				connection_pool=_connection_pool
+			),
+			database_name=_arguments.database,
+			threads_total=_threads_total,
+			queries_per_thread_total=_arguments.queries_per_thread_total
+		)
+
+		_connection_pool.dispose()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+from postgres_api.queue import SingleThreadedExecutableQueue
+from postgres_api.executable import DelegatedExecutableElement
+from datetime import datetime, timedelta
+import threading
+from typing import List, Dict
+import argparse
+import random
+
+
+class LatencyRecordingExecutableQueue(SingleThreadedExecutableQueue):
+
+	def __init__(self, *, expected_results_total: int):
+		super().__init__()
+
+		self.__expected_results_total = expected_results_total
+		self.__lateness_seconds = []  # type: List[float]
+		self.__done_event = threading.Event()
+
+	def get_execution_parameters(self) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		self.__lateness_seconds.append(execution_result)
+		if len(self.__lateness_seconds) == self.__expected_results_total:
+			self.__done_event.set()
+
+	def wait_for_results(self, *, timeout_seconds: float) -> List[float]:
+		if not self.__done_event.wait(timeout_seconds):
+			raise Exception(f"Only {len(self.__lateness_seconds)} of {self.__expected_results_total} delayed elements were dispatched.")
+		return self.__lateness_seconds.copy()
+
+
+def _get_percentile(*, sorted_values: List[float], percentile: float) -> float:
+	_index = min(len(sorted_values) - 1, int(round(percentile / 100.0 * (len(sorted_values) - 1))))
+	return sorted_values[_index]
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Measures how far delayed dispatch lands from the requested delay datetime.")
+	_parser.add_argument("--elements-total", type=int, default=500)
+	_parser.add_argument("--maximum-delay-seconds", type=float, default=3.0)
+	_arguments = _parser.parse_args()
+
+	_executable_queue = LatencyRecordingExecutableQueue(
+		expected_results_total=_arguments.elements_total
+	)
+
+	def _get_executable_element(delay_datetime: datetime) -> DelegatedExecutableElement:
+		return DelegatedExecutableElement(
+			delegate_function=lambda *args, **kwargs: (datetime.utcnow() - delay_datetime).total_seconds()
+		)
+
+	for _index in range(_arguments.elements_total):
+		_delay_datetime = datetime.utcnow() + timedelta(seconds=random.uniform(0.01, _arguments.maximum_delay_seconds))
+		_executable_element = _get_executable_element(_delay_datetime)
+		if _index % 2 == 0:
+			_executable_queue.append_to_end_after_datetime(
+				executable_element=_executable_element,
+				delay_datetime=_delay_datetime
+			)
+		else:
+			_executable_queue.insert_at_front_after_datetime(
+				executable_element=_executable_element,
+				delay_datetime=_delay_datetime
+			)
+
+	_lateness_seconds = sorted(_executable_queue.wait_for_results(
+		timeout_seconds=_arguments.maximum_delay_seconds + 30
+	))
+
+	_executable_queue.dispose()
+
+	print(f"elements: {len(_lateness_seconds)}")
+	print(f"early:    {len([_seconds for _seconds in _lateness_seconds if _seconds < 0])}")
+	for _percentile in [50, 90, 99, 100]:
+		_milliseconds = _get_percentile(
+			sorted_values=_lateness_seconds,
+			percentile=_percentile
+		) * 1000
+		print(f"p{_percentile:<3}     {_milliseconds:.3f} ms late")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,130 @@
+from __future__ import annotations
+from postgres_api.queue import DelayedElement, DelayedElementQueue
+from datetime import datetime, timedelta
+import threading
+from typing import List, Tuple
+import argparse
+import random
+import time
+
+
+class LinearDelayedElementQueue():
+	"""
+	The list-backed DelayedElementQueue that scanned for its insertion point, kept for comparison.
+	"""
+
+	def __init__(self):
+
+		self.__queue = []  # type: List[DelayedElement]
+		self.__queue_semaphore = threading.Semaphore()
+
+	def add(self, *, delayed_element: DelayedElement):
+
+		self.__queue_semaphore.acquire()
+
+		if len(self.__queue) == 0:
+			self.__queue.append(delayed_element)
+		else:
+			_is_inserted = False
+			for _delayed_element_index, _delayed_element in enumerate(self.__queue):
+				if _delayed_element.get_delay_datetime() > delayed_element.get_delay_datetime():
+					self.__queue.insert(_delayed_element_index, delayed_element)
+					_is_inserted = True
+					break
+			if not _is_inserted:
+				self.__queue.append(delayed_element)
+
+		self.__queue_semaphore.release()
+
+	def try_get(self) -> Tuple[bool, DelayedElement]:
+
+		_delayed_element = None
+
+		self.__queue_semaphore.acquire()
+
+		_now = datetime.utcnow()
+		if len(self.__queue) != 0:
+			if _now >= self.__queue[0].get_delay_datetime():
+				_delayed_element = self.__queue.pop(0)
+
+		self.__queue_semaphore.release()
+
+		return _delayed_element is not None, _delayed_element
+
+
+def _get_delayed_elements(*, elements_total: int, is_random_order: bool) -> List[DelayedElement]:
+
+	# every element is already due so that draining measures the queue rather than the clock
+	_start_datetime = datetime.utcnow() - timedelta(days=1)
+	_microseconds = list(range(elements_total))
+	if is_random_order:
+		random.shuffle(_microseconds)
+	return [
+		DelayedElement(
+			element=_index,
+			delay_datetime=_start_datetime + timedelta(microseconds=_microsecond)
+		) for _index, _microsecond in enumerate(_microseconds)
+	]
+
+
+def _benchmark(*, delayed_element_queue, delayed_elements: List[DelayedElement], is_bulk: bool) -> Tuple[float, float]:
+
+	_add_start = time.perf_counter()
+	if is_bulk:
+		delayed_element_queue.add_many(
+			delayed_elements=delayed_elements
+		)
+	else:
+		for _delayed_element in delayed_elements:
+			delayed_element_queue.add(
+				delayed_element=_delayed_element
+			)
+	_add_seconds = time.perf_counter() - _add_start
+
+	_drain_start = time.perf_counter()
+	_is_successful = True
+	_drained_total = 0
+	while _is_successful:
+		_is_successful, _ = delayed_element_queue.try_get()
+		if _is_successful:
+			_drained_total += 1
+	_drain_seconds = time.perf_counter() - _drain_start
+
+	if _drained_total != len(delayed_elements):
+		raise Exception(f"Expected to drain {len(delayed_elements)} elements but drained {_drained_total}.")
+
+	return _add_seconds, _drain_seconds
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Compares the linear and heap-backed DelayedElementQueue implementations.")
+	_parser.add_argument("--elements-totals", type=int, nargs="+", default=[10000, 100000, 1000000])
+	_parser.add_argument("--linear-elements-total-maximum", type=int, default=10000, help="The linear queue is quadratic, so larger runs are skipped.")
+	_arguments = _parser.parse_args()
+
+	print(f"{'queue':<10} {'order':<10} {'elements':>10} {'add (s)':>10} {'drain (s)':>10} {'adds/s':>12}")
+	for _elements_total in _arguments.elements_totals:
+		for _is_random_order in [False, True]:
+			_order = "random" if _is_random_order else "ascending"
+			_delayed_elements = _get_delayed_elements(
+				elements_total=_elements_total,
+				is_random_order=_is_random_order
+			)
+			_runs = [
+				("heap", DelayedElementQueue(), False),
+				("heap bulk", DelayedElementQueue(), True)
+			]
+			if _elements_total <= _arguments.linear_elements_total_maximum:
+				_runs.insert(0, ("linear", LinearDelayedElementQueue(), False))
+			for _name, _delayed_element_queue, _is_bulk in _runs:
+				_add_seconds, _drain_seconds = _benchmark(
+					delayed_element_queue=_delayed_element_queue,
+					delayed_elements=_delayed_elements,
+					is_bulk=_is_bulk
+				)
+				print(f"{_name:<10} {_order:<10} {_elements_total:>10} {_add_seconds:>10.3f} {_drain_seconds:>10.3f} {_elements_total / _add_seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+	main()
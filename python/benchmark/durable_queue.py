@@ -0,0 +1,110 @@
+from __future__ import annotations
+from postgres_api.durable_queue import DurableSingleThreadedExecutableQueue, DurableQueueSyncEnum
+from postgres_api.executable import DefaultExecutableElement, ExecutableElement
+from postgres_api.queue import SingleThreadedExecutableQueue, ExecutableQueueInterface
+from typing import Dict, List
+import argparse
+import tempfile
+import time
+
+
+class NullSingleThreadedExecutableQueue(SingleThreadedExecutableQueue):
+
+	def get_execution_parameters(self) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		pass
+
+
+class NullDurableSingleThreadedExecutableQueue(DurableSingleThreadedExecutableQueue):
+
+	def get_execution_parameters(self) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		pass
+
+
+def _benchmark(*, name: str, executable_queue: ExecutableQueueInterface, executable_elements: List[ExecutableElement], batch_elements_total: int):
+
+	_start = time.perf_counter()
+	for _index in range(0, len(executable_elements), batch_elements_total):
+		executable_queue.append_many_to_end_immediately(
+			executable_elements=executable_elements[_index:_index + batch_elements_total]
+		)
+	_enqueued_seconds = time.perf_counter() - _start
+	executable_queue.wait_until_empty()
+	_executed_seconds = time.perf_counter() - _start
+
+	print(f"{name:<14} {batch_elements_total:>6} {len(executable_elements) / _enqueued_seconds:>16.0f} {len(executable_elements) / _executed_seconds:>16.0f}")
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Compares elements per second enqueued to and executed by an in-memory queue and a durable queue syncing its segment log per batch and per interval, and how long a durable queue takes to replay a backlog.")
+	_parser.add_argument("--elements-total", type=int, default=20000)
+	_parser.add_argument("--batch-elements-totals", type=int, nargs="+", default=[1, 100])
+	_parser.add_argument("--sync-interval-seconds", type=float, default=0.1)
+	_parser.add_argument("--window-elements-total", type=int, default=10000)
+	_parser.add_argument("--directory-path", type=str, default=None, help="The directory of the segment logs, which defaults to a temporary directory.")
+	_arguments = _parser.parse_args()
+
+	_executable_elements = [
+		DefaultExecutableElement(
+			default_output={"index": _index, "query": "SELECT * FROM test_table WHERE id = %s"}
+		) for _index in range(_arguments.elements_total)
+	]
+
+	print(f"{'queue':<14} {'batch':>6} {'enqueued/s':>16} {'executed/s':>16}")
+	for _batch_elements_total in _arguments.batch_elements_totals:
+		_executable_queue = NullSingleThreadedExecutableQueue()
+		_benchmark(
+			name="in-memory",
+			executable_queue=_executable_queue,
+			executable_elements=_executable_elements,
+			batch_elements_total=_batch_elements_total
+		)
+		_executable_queue.dispose()
+		for _name, _sync in [("sync/batch", DurableQueueSyncEnum.PerBatch), ("sync/interval", DurableQueueSyncEnum.PerInterval)]:
+			with tempfile.TemporaryDirectory(dir=_arguments.directory_path) as _directory_path:
+				_executable_queue = NullDurableSingleThreadedExecutableQueue(
+					directory_path=_directory_path,
+					window_elements_total=_arguments.window_elements_total,
+					sync=_sync,
+					sync_interval_seconds=_arguments.sync_interval_seconds
+				)
+				_benchmark(
+					name=_name,
+					executable_queue=_executable_queue,
+					executable_elements=_executable_elements,
+					batch_elements_total=_batch_elements_total
+				)
+				_executable_queue.dispose()
+
+	with tempfile.TemporaryDirectory(dir=_arguments.directory_path) as _directory_path:
+		# the backlog is left pending by delaying it past the end of the benchmark
+		_executable_queue = NullDurableSingleThreadedExecutableQueue(
+			directory_path=_directory_path,
+			window_elements_total=_arguments.window_elements_total,
+			sync=DurableQueueSyncEnum.PerInterval
+		)
+		for _executable_element in _executable_elements:
+			_executable_queue.append_to_end_after_elapsed_seconds(
+				executable_element=_executable_element,
+				seconds_total=3600
+			)
+		_executable_queue.dispose()
+
+		_start = time.perf_counter()
+		_executable_queue = NullDurableSingleThreadedExecutableQueue(
+			directory_path=_directory_path,
+			window_elements_total=_arguments.window_elements_total
+		)
+		_replayed_seconds = time.perf_counter() - _start
+		_executable_queue.dispose()
+		print(f"replayed {len(_executable_elements)} delayed elements in {_replayed_seconds:.3f} s")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+from postgres_api.queue import SingleThreadedExecutableQueue
+from postgres_api.executable import DefaultExecutableElement, ExecutableElement
+from typing import List, Dict
+import argparse
+import time
+
+
+class CountingExecutableQueue(SingleThreadedExecutableQueue):
+
+	def __init__(self):
+		super().__init__()
+
+		self.__execution_results_total = 0
+
+	def get_execution_parameters(self) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		self.__execution_results_total += 1
+
+	def get_execution_results_total(self) -> int:
+		return self.__execution_results_total
+
+
+def _benchmark(*, method_name: str, executable_elements: List[ExecutableElement], batch_size: int):
+
+	_executable_queue = CountingExecutableQueue()
+
+	_method = getattr(_executable_queue, method_name)
+
+	_start = time.perf_counter()
+	if batch_size == 1:
+		for _executable_element in executable_elements:
+			_method(
+				executable_element=_executable_element
+			)
+	else:
+		for _batch_index in range(0, len(executable_elements), batch_size):
+			_method(
+				executable_elements=executable_elements[_batch_index:_batch_index + batch_size]
+			)
+	_enqueue_seconds = time.perf_counter() - _start
+	_executable_queue.wait_until_empty()
+	_total_seconds = time.perf_counter() - _start
+
+	_executable_queue.dispose()
+
+	if _executable_queue.get_execution_results_total() != len(executable_elements):
+		raise Exception(f"Expected {len(executable_elements)} execution results but found {_executable_queue.get_execution_results_total()}.")
+
+	print(f"{method_name:<36} {batch_size:>6} {len(executable_elements):>9} {_enqueue_seconds:>12.3f} {_total_seconds:>10.3f} {len(executable_elements) / _total_seconds:>12.0f}")
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Measures enqueue and drain throughput of the SingleThreadedExecutableQueue.")
+	_parser.add_argument("--elements-total", type=int, default=100000)
+	_parser.add_argument("--batch-size", type=int, default=1000)
+	_arguments = _parser.parse_args()
+
+	_executable_elements = [
+		DefaultExecutableElement(
+			default_output=_index
+		) for _index in range(_arguments.elements_total)
+	]
+
+	print(f"{'method':<36} {'batch':>6} {'elements':>9} {'enqueue (s)':>12} {'total (s)':>10} {'elements/s':>12}")
+	_benchmark(
+		method_name="append_to_end_immediately",
+		executable_elements=_executable_elements,
+		batch_size=1
+	)
+	_benchmark(
+		method_name="append_many_to_end_immediately",
+		executable_elements=_executable_elements,
+		batch_size=_arguments.batch_size
+	)
+	_benchmark(
+		method_name="insert_at_front_immediately",
+		executable_elements=_executable_elements,
+		batch_size=1
+	)
+	_benchmark(
+		method_name="insert_many_at_front_immediately",
+		executable_elements=_executable_elements,
+		batch_size=_arguments.batch_size
+	)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+from postgres_api.executable import DelegatedExecutableElement
+from postgres_api.fair_queue import FairThreadPoolExecutableQueue
+from postgres_api.queue import ThreadPoolExecutableQueue, ExecutableQueueInterface
+from typing import Dict, List, Callable
+import argparse
+import threading
+import time
+
+
+class NullThreadPoolExecutableQueue(ThreadPoolExecutableQueue):
+
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		pass
+
+
+class NullFairThreadPoolExecutableQueue(FairThreadPoolExecutableQueue):
+
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		pass
+
+
+def _get_percentile(*, sorted_values: List[float], percentile: float) -> float:
+	return sorted_values[min(len(sorted_values) - 1, int(percentile * len(sorted_values)))]
+
+
+def _benchmark(*, name: str, executable_queue: ExecutableQueueInterface, enqueue_keyword_arguments_function: Callable[[str], Dict[str, object]], arguments: argparse.Namespace):
+
+	_queue_wait_seconds = []  # type: List[float]
+	_lock = threading.Lock()
+
+	def _get_executable_element(*, is_measured: bool) -> DelegatedExecutableElement:
+
+		_enqueued_time = time.perf_counter()
+
+		def _execute():
+			if is_measured:
+				with _lock:
+					_queue_wait_seconds.append(time.perf_counter() - _enqueued_time)
+			time.sleep(arguments.element_seconds)
+
+		return DelegatedExecutableElement(
+			delegate_function=_execute
+		)
+
+	executable_queue.append_many_to_end_immediately(
+		executable_elements=[_get_executable_element(is_measured=False) for _ in range(arguments.noisy_elements_total)],
+		**enqueue_keyword_arguments_function("noisy")
+	)
+	for _element_index in range(arguments.small_elements_total):
+		executable_queue.append_to_end_immediately(
+			executable_element=_get_executable_element(is_measured=True),
+			**enqueue_keyword_arguments_function(f"small {_element_index % arguments.small_tenants_total}")
+		)
+		time.sleep(arguments.small_interval_seconds)
+	while True:
+		with _lock:
+			if len(_queue_wait_seconds) == arguments.small_elements_total:
+				break
+		time.sleep(0.001)
+	executable_queue.dispose()
+
+	_queue_wait_seconds.sort()
+	print(f"{name:<22} {_get_percentile(sorted_values=_queue_wait_seconds, percentile=0.50) * 1000:>12.2f} {_get_percentile(sorted_values=_queue_wait_seconds, percentile=0.99) * 1000:>12.2f} {_queue_wait_seconds[-1] * 1000:>12.2f}")
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Measures the queue wait of small tenants enqueuing now and then behind a noisy tenant that enqueued a large backlog, for a first in first out thread pool and for a fair thread pool sharing by tenant or with a higher lane.")
+	_parser.add_argument("--workers-total", type=int, default=4)
+	_parser.add_argument("--element-seconds", type=float, default=0.0005)
+	_parser.add_argument("--noisy-elements-total", type=int, default=20000)
+	_parser.add_argument("--small-tenants-total", type=int, default=10)
+	_parser.add_argument("--small-elements-total", type=int, default=200)
+	_parser.add_argument("--small-interval-seconds", type=float, default=0.005)
+	_arguments = _parser.parse_args()
+
+	print(f"{'queue':<22} {'p50 wait ms':>12} {'p99 wait ms':>12} {'max wait ms':>12}")
+	_benchmark(
+		name="fifo thread pool",
+		executable_queue=NullThreadPoolExecutableQueue(
+			workers_total=_arguments.workers_total
+		),
+		enqueue_keyword_arguments_function=lambda tenant_key: {},
+		arguments=_arguments
+	)
+	_benchmark(
+		name="fair by tenant",
+		executable_queue=NullFairThreadPoolExecutableQueue(
+			workers_total=_arguments.workers_total
+		),
+		enqueue_keyword_arguments_function=lambda tenant_key: {"tenant_key": tenant_key},
+		arguments=_arguments
+	)
+	_benchmark(
+		name="fair, noisy capped",
+		executable_queue=NullFairThreadPoolExecutableQueue(
+			workers_total=_arguments.workers_total,
+			maximum_executing_total_per_tenant_key={
+				"noisy": max(1, _arguments.workers_total // 2)
+			}
+		),
+		enqueue_keyword_arguments_function=lambda tenant_key: {"tenant_key": tenant_key},
+		arguments=_arguments
+	)
+	_benchmark(
+		name="fair, noisy bulk lane",
+		executable_queue=NullFairThreadPoolExecutableQueue(
+			workers_total=_arguments.workers_total
+		),
+		enqueue_keyword_arguments_function=lambda tenant_key: {"tenant_key": tenant_key, "lane_name": "bulk" if tenant_key == "noisy" else "default"},
+		arguments=_arguments
+	)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+from postgres_api.connection_pool import PostgresConnectionPool
+from postgres_api.executable import ExecutableElement
+from postgres_api.job_table_queue import JobTableExecutableQueue
+from typing import Dict
+import argparse
+import multiprocessing
+from psycopg2 import sql
+import time
+
+
+class SleepingExecutableElement(ExecutableElement):
+
+	__slots__ = ("__seconds",)
+
+	def __init__(self, *, seconds: float):
+
+		self.__seconds = seconds
+
+	def execute(self) -> object:
+		if self.__seconds > 0:
+			time.sleep(self.__seconds)
+		return None
+
+
+class CountingJobTableExecutableQueue(JobTableExecutableQueue):
+
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		pass
+
+
+def _get_postgres_connection_pool(*, arguments: argparse.Namespace, maximum_connections_total: int) -> PostgresConnectionPool:
+	return PostgresConnectionPool(
+		user_name=arguments.user,
+		password=arguments.password,
+		host_url=arguments.host,
+		port=arguments.port,
+		maximum_connections_total=maximum_connections_total
+	)
+
+
+def _get_queue(*, arguments: argparse.Namespace, postgres_connection_pool: PostgresConnectionPool, workers_total: int, claimed_jobs_total: int) -> CountingJobTableExecutableQueue:
+	return CountingJobTableExecutableQueue(
+		postgres_connection_source=postgres_connection_pool,
+		database_name=arguments.database,
+		table_name=arguments.table,
+		workers_total=workers_total,
+		claimed_jobs_total=claimed_jobs_total,
+		poll_interval_seconds=0.05
+	)
+
+
+def _process_method(arguments: argparse.Namespace, claimed_jobs_total: int, start_event: multiprocessing.Event, claimed_jobs_totals_queue: multiprocessing.Queue):
+
+	_postgres_connection_pool = _get_postgres_connection_pool(
+		arguments=arguments,
+		maximum_connections_total=arguments.workers_total + 2
+	)
+	start_event.wait()
+	_executable_queue = _get_queue(
+		arguments=arguments,
+		postgres_connection_pool=_postgres_connection_pool,
+		workers_total=arguments.workers_total,
+		claimed_jobs_total=claimed_jobs_total
+	)
+	_executable_queue.wait_until_empty()
+	_executable_queue.dispose()
+	_postgres_connection_pool.dispose()
+	claimed_jobs_totals_queue.put(sum(_executable_queue.get_claimed_jobs_total_per_worker_index()))
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Measures jobs per second executed from a Postgres job table by several processes, each running a job table queue with its own workers, for each number of processes and jobs claimed at a time.")
+	_parser.add_argument("--host", type=str, default="localhost")
+	_parser.add_argument("--port", type=int, default=5432)
+	_parser.add_argument("--user", type=str, default="postgres")
+	_parser.add_argument("--password", type=str, default="")
+	_parser.add_argument("--database", type=str, default="postgres")
+	_parser.add_argument("--table", type=str, default="benchmark_job")
+	_parser.add_argument("--jobs-total", type=int, default=5000)
+	_parser.add_argument("--job-seconds", type=float, default=0.0)
+	_parser.add_argument("--processes-totals", type=int, nargs="+", default=[1, 2, 4])
+	_parser.add_argument("--workers-total", type=int, default=4)
+	_parser.add_argument("--claimed-jobs-totals", type=int, nargs="+", default=[1, 10])
+	_arguments = _parser.parse_args()
+
+	_postgres_connection_pool = _get_postgres_connection_pool(
+		arguments=_arguments,
+		maximum_connections_total=2
+	)
+	_producing_queue = _get_queue(
+		arguments=_arguments,
+		postgres_connection_pool=_postgres_connection_pool,
+		workers_total=0,
+		claimed_jobs_total=1
+	)
+
+	print(f"{'processes':>9} {'workers':>8} {'claimed':>8} {'enqueued/s':>12} {'executed/s':>12} {'per process':>24}")
+	for _claimed_jobs_total in _arguments.claimed_jobs_totals:
+		for _processes_total in _arguments.processes_totals:
+			_start = time.perf_counter()
+			_producing_queue.append_many_to_end_immediately(
+				executable_elements=[SleepingExecutableElement(seconds=_arguments.job_seconds) for _ in range(_arguments.jobs_total)]
+			)
+			_enqueued_seconds = time.perf_counter() - _start
+
+			_start_event = multiprocessing.Event()
+			_claimed_jobs_totals_queue = multiprocessing.Queue()
+			_processes = [multiprocessing.Process(
+				target=_process_method,
+				args=(_arguments, _claimed_jobs_total, _start_event, _claimed_jobs_totals_queue)
+			) for _ in range(_processes_total)]
+			for _process in _processes:
+				_process.start()
+			_start = time.perf_counter()
+			_start_event.set()
+			_claimed_jobs_totals = sorted(_claimed_jobs_totals_queue.get() for _ in _processes)
+			_executed_seconds = time.perf_counter() - _start
+			for _process in _processes:
+				_process.join()
+
+			print(f"{_processes_total:>9} {_arguments.workers_total:>8} {_claimed_jobs_total:>8} {_arguments.jobs_total / _enqueued_seconds:>12.0f} {_arguments.jobs_total / _executed_seconds:>12.0f} {str(_claimed_jobs_totals):>24}")
+
+	_producing_queue.dispose()
+
+	_postgres_connection = _postgres_connection_pool.acquire(
+		database_name=_arguments.database
+	)
+	_cursor = _postgres_connection.get_connection().cursor()
+	_cursor.execute(sql.SQL("DROP TABLE {table}; DROP SEQUENCE {front_sequence}").format(
+		table=sql.Identifier(_arguments.table),
+		front_sequence=sql.Identifier(f"{_arguments.table}_front_sequence")
+	))
+	_cursor.close()
+	_postgres_connection.get_connection().commit()
+	_postgres_connection_pool.release(
+		postgres_connection=_postgres_connection,
+		is_broken=False
+	)
+	_postgres_connection_pool.dispose()
+
+
+if __name__ == "__main__":
+	main()
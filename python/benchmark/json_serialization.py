@@ -0,0 +1,149 @@
+from __future__ import annotations
+from postgres_api.callback import JsonWebTokenCallback
+from postgres_api.database_implementation import PostgresApiDatabaseCommandResultFactory, ExecuteQueryDatabaseCommandResult
+from postgres_api.database_interface import DatabaseCommandResult
+from postgres_api.json_serializer import JsonSerializerInterface, StandardJsonSerializer, OrjsonJsonSerializer
+from typing import Dict, Callable
+import argparse
+import io
+import json
+import jwt
+import timeit
+
+
+def _get_execute_query_result(*, rows_total: int) -> ExecuteQueryDatabaseCommandResult:
+
+	_database_command_result_factory = PostgresApiDatabaseCommandResultFactory()
+	return ExecuteQueryDatabaseCommandResult(
+		child_database_command_results=[
+			_database_command_result_factory.get_success_connecting_to_database_result(
+				database_name="benchmark"
+			),
+			_database_command_result_factory.get_success_querying_database_result(
+				query="SELECT id, name, score, is_active FROM benchmark WHERE id > %(id)s",
+				parameters={"id": 0},
+				output=[(_index, f"name {_index}", _index * 0.5, _index % 2 == 0) for _index in range(rows_total)]
+			),
+			_database_command_result_factory.get_success_disconnecting_from_database_result(
+				database_name="benchmark"
+			)
+		],
+		is_successful=True
+	)
+
+
+def _get_legacy_json_string(*, database_command_result: DatabaseCommandResult) -> str:
+	# the serialization before json serializers, where each composite result parsed the json string of each child result
+	return json.dumps({
+		"version": 1,
+		"is_successful": True,
+		"child_results": [json.loads(json.dumps(_child_command_result.get_json_object())) for _child_command_result in database_command_result.get_child_command_results()]
+	})
+
+
+def _print_benchmark(*, name: str, rows_total: int, function: Callable[[], object], repeats_total: int):
+	_seconds = min(timeit.repeat(function, number=repeats_total, repeat=5)) / repeats_total
+	print(f"{name:<36} {rows_total:>8} {_seconds * 1000000:>14.1f}")
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Compares serializing database command results and encoding them as json web tokens with each json serializer, with and without the cached encoding.")
+	_parser.add_argument("--rows-totals", type=int, nargs="+", default=[1, 100, 10000])
+	_parser.add_argument("--secret", type=str, default="benchmark secret of at least thirty-two bytes")
+	_arguments = _parser.parse_args()
+
+	_json_serializers = {
+		"standard": StandardJsonSerializer()
+	}  # type: Dict[str, JsonSerializerInterface]
+	try:
+		_json_serializers["orjson"] = OrjsonJsonSerializer()
+	except Exception as ex:
+		print(f"Skipping orjson: {ex}")
+
+	print(f"{'benchmark':<36} {'rows':>8} {'per call (us)':>14}")
+	for _rows_total in _arguments.rows_totals:
+		_repeats_total = max(1, 20000 // (_rows_total + 10))
+
+		_print_benchmark(
+			name="legacy json string",
+			rows_total=_rows_total,
+			function=lambda: _get_legacy_json_string(
+				database_command_result=_get_execute_query_result(
+					rows_total=_rows_total
+				)
+			),
+			repeats_total=_repeats_total
+		)
+		_print_benchmark(
+			name="legacy json web token",
+			rows_total=_rows_total,
+			function=lambda: jwt.encode(json.loads(_get_legacy_json_string(
+				database_command_result=_get_execute_query_result(
+					rows_total=_rows_total
+				)
+			)), _arguments.secret, algorithm="HS256"),
+			repeats_total=_repeats_total
+		)
+
+		for _json_serializer_name, _json_serializer in _json_serializers.items():
+			JsonSerializerInterface.set_default(
+				json_serializer=_json_serializer
+			)
+			_print_benchmark(
+				name=f"{_json_serializer_name} json string",
+				rows_total=_rows_total,
+				function=lambda: _get_execute_query_result(
+					rows_total=_rows_total
+				).get_json_string(),
+				repeats_total=_repeats_total
+			)
+			_cached_database_command_result = _get_execute_query_result(
+				rows_total=_rows_total
+			)
+			_print_benchmark(
+				name=f"{_json_serializer_name} cached json bytes",
+				rows_total=_rows_total,
+				function=_cached_database_command_result.get_json_bytes,
+				repeats_total=_repeats_total
+			)
+			_buffer = io.BytesIO()
+
+			def _write_json_to_buffer():
+				_buffer.seek(0)
+				_buffer.truncate()
+				_get_execute_query_result(
+					rows_total=_rows_total
+				).write_json_to(
+					buffer=_buffer
+				)
+
+			_print_benchmark(
+				name=f"{_json_serializer_name} json string encoded",
+				rows_total=_rows_total,
+				function=lambda: _get_execute_query_result(
+					rows_total=_rows_total
+				).get_json_string().encode("utf-8"),
+				repeats_total=_repeats_total
+			)
+			_print_benchmark(
+				name=f"{_json_serializer_name} write json to buffer",
+				rows_total=_rows_total,
+				function=_write_json_to_buffer,
+				repeats_total=_repeats_total
+			)
+			_print_benchmark(
+				name=f"{_json_serializer_name} json web token",
+				rows_total=_rows_total,
+				function=lambda: JsonWebTokenCallback.get_encoded_json_web_token(
+					data=_get_execute_query_result(
+						rows_total=_rows_total
+					),
+					secret=_arguments.secret
+				),
+				repeats_total=_repeats_total
+			)
+
+
+if __name__ == "__main__":
+	main()
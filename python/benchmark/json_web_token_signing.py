@@ -0,0 +1,89 @@
+from __future__ import annotations
+from postgres_api.json_web_token_signer import JsonWebTokenSigner
+from typing import Callable
+import argparse
+import json
+import jwt
+import jwt.algorithms
+import jwt.api_jws
+import timeit
+
+
+def _print_benchmark(*, name: str, payload_bytes_total: int, function: Callable[[], object], signatures_total: int):
+	_seconds = min(timeit.repeat(function, number=signatures_total, repeat=5)) / signatures_total
+	print(f"{name:<36} {payload_bytes_total:>10} {1 / _seconds:>16.0f}")
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Compares json web token signatures per second of PyJWT encoding each claim set or payload with the key, and of a signer with its key prepared once.")
+	_parser.add_argument("--rows-totals", type=int, nargs="+", default=[1, 100])
+	_parser.add_argument("--signatures-total", type=int, default=2000)
+	_parser.add_argument("--secret", type=str, default="benchmark secret of at least thirty-two bytes")
+	_arguments = _parser.parse_args()
+
+	_private_key = None
+	if jwt.algorithms.has_crypto:
+		from cryptography.hazmat.primitives.asymmetric import ec
+		from cryptography.hazmat.primitives import serialization
+		# a pem is what a callback is usually configured with, so it is what pyjwt loads for each token
+		_private_key = ec.generate_private_key(ec.SECP256R1()).private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+	else:
+		print("Skipping ES256 because the cryptography package is not installed.")
+
+	_json_web_token_signer = JsonWebTokenSigner(
+		key=_arguments.secret
+	)
+
+	print(f"{'benchmark':<36} {'payload':>10} {'signatures/s':>16}")
+	for _rows_total in _arguments.rows_totals:
+		_json_object = {
+			"version": 1,
+			"is_successful": True,
+			"output": [[_index, f"name {_index}"] for _index in range(_rows_total)]
+		}
+		_payload = json.dumps(_json_object).encode("utf-8")
+
+		_print_benchmark(
+			name="pyjwt HS256 claims",
+			payload_bytes_total=len(_payload),
+			function=lambda: jwt.encode(_json_object, _arguments.secret, algorithm="HS256"),
+			signatures_total=_arguments.signatures_total
+		)
+		_print_benchmark(
+			name="pyjwt HS256 payload bytes",
+			payload_bytes_total=len(_payload),
+			function=lambda: jwt.api_jws.encode(_payload, _arguments.secret, algorithm="HS256"),
+			signatures_total=_arguments.signatures_total
+		)
+		_print_benchmark(
+			name="signer HS256 payload bytes",
+			payload_bytes_total=len(_payload),
+			function=lambda: _json_web_token_signer.sign(
+				payload=_payload
+			),
+			signatures_total=_arguments.signatures_total
+		)
+		if _private_key is not None:
+			_asymmetric_json_web_token_signer = JsonWebTokenSigner(
+				key=_private_key,
+				algorithm="ES256"
+			)
+			_print_benchmark(
+				name="pyjwt ES256 payload bytes",
+				payload_bytes_total=len(_payload),
+				function=lambda: jwt.api_jws.encode(_payload, _private_key, algorithm="ES256"),
+				signatures_total=_arguments.signatures_total
+			)
+			_print_benchmark(
+				name="signer ES256 payload bytes",
+				payload_bytes_total=len(_payload),
+				function=lambda: _asymmetric_json_web_token_signer.sign(
+					payload=_payload
+				),
+				signatures_total=_arguments.signatures_total
+			)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+from postgres_api.database_implementation import PostgresDatabase, PostgresApiDatabaseCommandResultFactory, GetRecordsDatabaseCommand
+from postgres_api.database_interface import DatabaseInterface
+from typing import List, Callable
+import argparse
+import statistics
+import time
+
+
+def _get_median_milliseconds(*, function: Callable[[], None], repeats_total: int) -> float:
+
+	_milliseconds = []  # type: List[float]
+	for _ in range(repeats_total):
+		_start = time.perf_counter()
+		function()
+		_milliseconds.append((time.perf_counter() - _start) * 1000)
+	return statistics.median(_milliseconds)
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Compares the latency of deep pages using keyset pagination through GetRecordsDatabaseCommand and using OFFSET.")
+	_parser.add_argument("--host", type=str, default="localhost")
+	_parser.add_argument("--port", type=int, default=5432)
+	_parser.add_argument("--user", type=str, default="postgres")
+	_parser.add_argument("--password", type=str, default="")
+	_parser.add_argument("--database", type=str, default="postgres")
+	_parser.add_argument("--rows-total", type=int, default=1000000)
+	_parser.add_argument("--page-rows-total", type=int, default=100)
+	_parser.add_argument("--page-depths", type=int, nargs="+", default=[0, 100, 1000, 5000, 9000])
+	_parser.add_argument("--repeats-total", type=int, default=20)
+	_arguments = _parser.parse_args()
+
+	_database_interface = PostgresDatabase(
+		user_name=_arguments.user,
+		password=_arguments.password,
+		host_url=_arguments.host,
+		port=_arguments.port
+	)  # type: DatabaseInterface
+	_database_command_result_factory = PostgresApiDatabaseCommandResultFactory()
+
+	_database_interface.connect_to_database(
+		database_name=_arguments.database
+	)
+	_database_interface.execute_query(
+		query="DROP TABLE IF EXISTS benchmark_keyset_pagination; CREATE TABLE benchmark_keyset_pagination (id integer PRIMARY KEY, name text NOT NULL); INSERT INTO benchmark_keyset_pagination SELECT g, md5(g::text) FROM generate_series(1, %(rows_total)s) g; ANALYZE benchmark_keyset_pagination",
+		parameters={
+			"rows_total": _arguments.rows_total
+		}
+	)
+	_database_interface.disconnect_from_database()
+
+	print(f"{'page':>8} {'keyset (ms)':>12} {'offset (ms)':>12}")
+	try:
+		for _page_depth in _arguments.page_depths:
+
+			_continuation_token = None
+			if _page_depth != 0:
+				_continuation_token = GetRecordsDatabaseCommand.get_continuation_token(
+					table_name="benchmark_keyset_pagination",
+					sort_column_names=["id"],
+					last_sort_key=[_page_depth * _arguments.page_rows_total]
+				)
+
+			def _get_keyset_page():
+				_result = GetRecordsDatabaseCommand(
+					database_name=_arguments.database,
+					table_name="benchmark_keyset_pagination",
+					sort_column_names=["id"],
+					page_rows_total=_arguments.page_rows_total,
+					continuation_token=_continuation_token
+				).execute(
+					database_interface=_database_interface,
+					database_command_result_factory=_database_command_result_factory
+				)
+				_is_successful, _records, _ = _result.try_get_records_page()
+				if not _is_successful or len(_records) != _arguments.page_rows_total:
+					raise Exception(f"Unexpected result: {_result.get_json_string()}")
+
+			def _get_offset_page():
+				_database_interface.connect_to_database(
+					database_name=_arguments.database
+				)
+				_database_interface.execute_query(
+					query="SELECT * FROM benchmark_keyset_pagination ORDER BY id LIMIT %(limit)s OFFSET %(offset)s",
+					parameters={
+						"limit": _arguments.page_rows_total,
+						"offset": _page_depth * _arguments.page_rows_total
+					}
+				)
+				_database_interface.disconnect_from_database()
+
+			_keyset_milliseconds = _get_median_milliseconds(
+				function=_get_keyset_page,
+				repeats_total=_arguments.repeats_total
+			)
+			_offset_milliseconds = _get_median_milliseconds(
+				function=_get_offset_page,
+				repeats_total=_arguments.repeats_total
+			)
+			print(f"{_page_depth:>8} {_keyset_milliseconds:>12.3f} {_offset_milliseconds:>12.3f}")
+	finally:
+		_database_interface.connect_to_database(
+			database_name=_arguments.database
+		)
+		_database_interface.execute_query(
+			query="DROP TABLE benchmark_keyset_pagination",
+			parameters={}
+		)
+		_database_interface.disconnect_from_database()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+from postgres_api.database_implementation import ExecuteQueryDatabaseCommand, ExecuteQueryDatabaseCommandResult, PostgresApiDatabaseCommandResultFactory
+from postgres_api.callback import UrlResponse
+from postgres_api.queue import DelayedElement
+from datetime import datetime
+from typing import Callable
+import argparse
+import gc
+import tracemalloc
+
+
+def _get_bytes_per_object(*, function: Callable[[int], object], objects_total: int) -> float:
+
+	gc.collect()
+	tracemalloc.start()
+	try:
+		_start_bytes_total = tracemalloc.get_traced_memory()[0]
+		_objects = [function(_index) for _index in range(objects_total)]
+		_bytes_total = tracemalloc.get_traced_memory()[0] - _start_bytes_total
+	finally:
+		tracemalloc.stop()
+	# the list holding the objects is not part of their size
+	_bytes_total -= _objects.__sizeof__()
+	del _objects
+	return _bytes_total / objects_total
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Measures the traced bytes per queued command, delayed element and result. The query, parameters, output and datetime are shared between the objects, so only the objects themselves are measured.")
+	_parser.add_argument("--objects-total", type=int, default=100000)
+	_arguments = _parser.parse_args()
+
+	_query = "SELECT id, name FROM users WHERE id = %(id)s"
+	_parameters = {"id": 1}
+	_output = [(1, "name")]
+	_delay_datetime = datetime.utcnow()
+	_database_command_result_factory = PostgresApiDatabaseCommandResultFactory()
+
+	def _get_execute_query_database_command(index: int) -> ExecuteQueryDatabaseCommand:
+		return ExecuteQueryDatabaseCommand(
+			database_name="benchmark",
+			query=_query,
+			parameters=_parameters
+		)
+
+	def _get_delayed_element(index: int) -> DelayedElement:
+		return DelayedElement(
+			element=None,
+			delay_datetime=_delay_datetime
+		)
+
+	def _get_querying_result(index: int) -> object:
+		return _database_command_result_factory.get_success_querying_database_result(
+			query=_query,
+			parameters=_parameters,
+			output=_output
+		)
+
+	def _get_execute_query_database_command_result(index: int) -> ExecuteQueryDatabaseCommandResult:
+		return ExecuteQueryDatabaseCommandResult(
+			child_database_command_results=[
+				_database_command_result_factory.get_success_connecting_to_database_result(
+					database_name="benchmark"
+				),
+				_database_command_result_factory.get_success_querying_database_result(
+					query=_query,
+					parameters=_parameters,
+					output=_output
+				),
+				_database_command_result_factory.get_success_disconnecting_from_database_result(
+					database_name="benchmark"
+				)
+			],
+			is_successful=True
+		)
+
+	def _get_url_response(index: int) -> UrlResponse:
+		return UrlResponse(
+			status_code=200,
+			json_object=_output
+		)
+
+	print(f"{'object':<48} {'bytes per object':>18}")
+	for _name, _function in [
+		("ExecuteQueryDatabaseCommand", _get_execute_query_database_command),
+		("DelayedElement", _get_delayed_element),
+		("SuccessQueryingDatabaseDatabaseCommandResult", _get_querying_result),
+		("ExecuteQueryDatabaseCommandResult with children", _get_execute_query_database_command_result),
+		("UrlResponse", _get_url_response)
+	]:
+		_bytes_per_object = _get_bytes_per_object(
+			function=_function,
+			objects_total=_arguments.objects_total
+		)
+		print(f"{_name:<48} {_bytes_per_object:>18.1f}")
+
+
+if __name__ == "__main__":
+	main()
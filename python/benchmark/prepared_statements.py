@@ -0,0 +1,89 @@
+from __future__ import annotations
+from postgres_api.database_implementation import PostgresDatabase
+import argparse
+import time
+
+
+def _benchmark(*, name: str, maximum_prepared_statements_total: int, arguments: argparse.Namespace):
+
+	_postgres_database = PostgresDatabase(
+		user_name=arguments.user,
+		password=arguments.password,
+		host_url=arguments.host,
+		port=arguments.port,
+		maximum_prepared_statements_total=maximum_prepared_statements_total
+	)
+	_postgres_database.connect_to_database(
+		database_name=arguments.database
+	)
+	try:
+		_start = time.perf_counter()
+		for _query_index in range(arguments.queries_total):
+			_postgres_database.execute_query(
+				query="SELECT c.name, o.id, SUM(i.quantity) FROM benchmark_prepared_customer c JOIN benchmark_prepared_order o ON o.customer_id = c.id JOIN benchmark_prepared_item i ON i.order_id = o.id WHERE c.id = %(customer_id)s GROUP BY c.name, o.id ORDER BY o.id",
+				parameters={
+					"customer_id": _query_index % arguments.customers_total + 1
+				}
+			)
+		_elapsed_seconds = time.perf_counter() - _start
+	finally:
+		_postgres_database.disconnect_from_database()
+
+	print(f"{name:<16} {_elapsed_seconds:>10.3f} {_postgres_database.get_prepared_statement_cache_hits_total():>10} {_postgres_database.get_prepared_statement_cache_misses_total():>10}")
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Compares running the same three-table join with server-side prepared statements cached per connection and without them.")
+	_parser.add_argument("--host", type=str, default="localhost")
+	_parser.add_argument("--port", type=int, default=5432)
+	_parser.add_argument("--user", type=str, default="postgres")
+	_parser.add_argument("--password", type=str, default="")
+	_parser.add_argument("--database", type=str, default="postgres")
+	_parser.add_argument("--customers-total", type=int, default=100)
+	_parser.add_argument("--queries-total", type=int, default=2000)
+	_arguments = _parser.parse_args()
+
+	_postgres_database = PostgresDatabase(
+		user_name=_arguments.user,
+		password=_arguments.password,
+		host_url=_arguments.host,
+		port=_arguments.port,
+		maximum_prepared_statements_total=0
+	)
+	_postgres_database.connect_to_database(
+		database_name=_arguments.database
+	)
+	_postgres_database.execute_query(
+		query="DROP TABLE IF EXISTS benchmark_prepared_item, benchmark_prepared_order, benchmark_prepared_customer; CREATE TABLE benchmark_prepared_customer (id integer PRIMARY KEY, name text NOT NULL); CREATE TABLE benchmark_prepared_order (id integer PRIMARY KEY, customer_id integer NOT NULL REFERENCES benchmark_prepared_customer (id)); CREATE INDEX ON benchmark_prepared_order (customer_id); CREATE TABLE benchmark_prepared_item (order_id integer NOT NULL REFERENCES benchmark_prepared_order (id), quantity integer NOT NULL); CREATE INDEX ON benchmark_prepared_item (order_id); INSERT INTO benchmark_prepared_customer SELECT g, md5(g::text) FROM generate_series(1, %(customers_total)s) g; INSERT INTO benchmark_prepared_order SELECT g, g %% %(customers_total)s + 1 FROM generate_series(1, %(customers_total)s * 10) g; INSERT INTO benchmark_prepared_item SELECT g %% (%(customers_total)s * 10) + 1, g %% 7 FROM generate_series(1, %(customers_total)s * 50) g; ANALYZE",
+		parameters={
+			"customers_total": _arguments.customers_total
+		}
+	)
+	_postgres_database.disconnect_from_database()
+
+	print(f"{'queries':<16} {'seconds':>10} {'hits':>10} {'misses':>10}")
+	try:
+		_benchmark(
+			name="prepared",
+			maximum_prepared_statements_total=128,
+			arguments=_arguments
+		)
+		_benchmark(
+			name="unprepared",
+			maximum_prepared_statements_total=0,
+			arguments=_arguments
+		)
+	finally:
+		_postgres_database.connect_to_database(
+			database_name=_arguments.database
+		)
+		_postgres_database.execute_query(
+			query="DROP TABLE benchmark_prepared_item, benchmark_prepared_order, benchmark_prepared_customer",
+			parameters={}
+		)
+		_postgres_database.disconnect_from_database()
+
+
+if __name__ == "__main__":
+	main()
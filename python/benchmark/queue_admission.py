@@ -0,0 +1,122 @@
+from __future__ import annotations
+from postgres_api.executable import ExecutableElement
+from postgres_api.queue import ThreadPoolExecutableQueue
+from postgres_api.queue_admission import ExecutableQueueAdmissionController, ExecutableQueueOverflowPolicyEnum, ExecutableQueueRejection
+from typing import Dict, List
+import argparse
+import sys
+import threading
+import time
+
+
+class PayloadExecutableElement(ExecutableElement):
+
+	__slots__ = ("__payload", "__enqueued_time", "__latency_seconds", "__lock")
+
+	def __init__(self, *, payload: bytes, latency_seconds: List[float], lock: threading.Lock):
+
+		self.__payload = payload
+		self.__enqueued_time = time.perf_counter()
+		self.__latency_seconds = latency_seconds
+		self.__lock = lock
+
+	def get_estimated_bytes_total(self) -> int:
+		return sys.getsizeof(self) + sys.getsizeof(self.__payload)
+
+	def execute(self, *args, **kwargs) -> object:
+		time.sleep(0.001)
+		with self.__lock:
+			self.__latency_seconds.append(time.perf_counter() - self.__enqueued_time)
+		return None
+
+
+class NullThreadPoolExecutableQueue(ThreadPoolExecutableQueue):
+
+	def __init__(self, **kwargs):
+
+		self.rejected_total = 0
+
+		super().__init__(**kwargs)
+
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		pass
+
+	def process_rejected_executable_element(self, *, executable_element: ExecutableElement, executable_queue_rejection: ExecutableQueueRejection):
+		self.rejected_total += 1
+
+
+def _get_percentile(*, sorted_values: List[float], percentile: float) -> float:
+	return sorted_values[min(len(sorted_values) - 1, int(percentile * len(sorted_values)))]
+
+
+def _benchmark(*, name: str, admission_controller: ExecutableQueueAdmissionController, arguments: argparse.Namespace):
+
+	_executable_queue = NullThreadPoolExecutableQueue(
+		workers_total=arguments.workers_total,
+		admission_controller=admission_controller
+	)
+	_latency_seconds = []  # type: List[float]
+	_lock = threading.Lock()
+	_maximum_pending_bytes_total = 0
+
+	# the spike enqueues batches faster than the workers execute them, each element of about 1 ms
+	_start_time = time.perf_counter()
+	for _batch_index in range(arguments.batches_total):
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[PayloadExecutableElement(
+				payload=bytes(arguments.payload_bytes_total),
+				latency_seconds=_latency_seconds,
+				lock=_lock
+			) for _ in range(arguments.batch_elements_total)]
+		)
+		_maximum_pending_bytes_total = max(_maximum_pending_bytes_total, _executable_queue.get_admission_statistics()["pending_bytes_total"])
+		time.sleep(arguments.batch_interval_seconds)
+	_executable_queue.wait_until_empty()
+	_elapsed_seconds = time.perf_counter() - _start_time
+	_executable_queue.dispose()
+
+	_latency_seconds.sort()
+	print(f"{name:<22} {len(_latency_seconds):>10} {_executable_queue.rejected_total:>10} {_get_percentile(sorted_values=_latency_seconds, percentile=0.50) * 1000:>12.2f} {_get_percentile(sorted_values=_latency_seconds, percentile=0.99) * 1000:>12.2f} {_maximum_pending_bytes_total / 1024 / 1024:>12.2f} {_elapsed_seconds:>10.2f}")
+
+
+def main():
+
+	_parser = argparse.ArgumentParser(description="Measures the latency of executed elements, the rejected elements and the peak pending bytes while a spike enqueues faster than a thread pool executes, without limits and with each admission control policy.")
+	_parser.add_argument("--workers-total", type=int, default=4)
+	_parser.add_argument("--batches-total", type=int, default=100)
+	_parser.add_argument("--batch-elements-total", type=int, default=100)
+	_parser.add_argument("--batch-interval-seconds", type=float, default=0.01)
+	_parser.add_argument("--payload-bytes-total", type=int, default=4096)
+	_parser.add_argument("--maximum-elements-total", type=int, default=200)
+	_parser.add_argument("--maximum-estimated-wait-seconds", type=float, default=0.05)
+	_arguments = _parser.parse_args()
+
+	print(f"{'queue':<22} {'executed':>10} {'rejected':>10} {'p50 ms':>12} {'p99 ms':>12} {'peak MiB':>12} {'seconds':>10}")
+	_benchmark(
+		name="unbounded",
+		admission_controller=ExecutableQueueAdmissionController(),
+		arguments=_arguments
+	)
+	for _name, _overflow_policy in [("block", ExecutableQueueOverflowPolicyEnum.Block), ("reject", ExecutableQueueOverflowPolicyEnum.Reject), ("drop oldest", ExecutableQueueOverflowPolicyEnum.DropOldest)]:
+		_benchmark(
+			name=_name,
+			admission_controller=ExecutableQueueAdmissionController(
+				maximum_elements_total=_arguments.maximum_elements_total,
+				overflow_policy=_overflow_policy
+			),
+			arguments=_arguments
+		)
+	_benchmark(
+		name="queue delay shedding",
+		admission_controller=ExecutableQueueAdmissionController(
+			maximum_estimated_wait_seconds=_arguments.maximum_estimated_wait_seconds
+		),
+		arguments=_arguments
+	)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,196 @@
+from __future__ import annotations
+from postgres_api.executable import ExecutableElement, AsyncExecutableElement
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+import asyncio
+import traceback
+from collections import deque
+from typing import List, Dict, Callable, Deque, Set, Union
+
+
+class AsyncExecutableQueue(ABC):
+	"""
+	This class executes elements on worker tasks of the event loop that created it. Elements may be enqueued from any thread. Synchronous executable elements are executed inline on the event loop, so they must not block.
+	"""
+
+	def __init__(self, *, workers_total: int):
+
+		if workers_total < 1:
+			raise Exception(f"Cannot create async executable queue with {workers_total} workers.")
+
+		self.__event_loop = asyncio.get_running_loop()
+		self.__queue = deque()  # type: Deque[Union[ExecutableElement, AsyncExecutableElement]]
+		self.__executable_elements_total = 0
+		self.__queue_not_empty_event = asyncio.Event()
+		self.__queue_empty_event = asyncio.Event()
+		self.__queue_empty_event.set()
+		self.__delayed_timer_handles = set()  # type: Set[asyncio.TimerHandle]
+		self.__is_active = True
+		self.__worker_tasks = [
+			self.__event_loop.create_task(self.__work(
+				worker_index=_worker_index
+			)) for _worker_index in range(workers_total)
+		]  # type: List[asyncio.Task]
+
+	async def __work(self, *, worker_index: int):
+
+		while self.__is_active:
+			if len(self.__queue) == 0:
+				self.__queue_not_empty_event.clear()
+				await self.__queue_not_empty_event.wait()
+			else:
+				_executable_element = self.__queue.popleft()
+				try:
+					_execution_parameters = self.get_execution_parameters(
+						worker_index=worker_index
+					)
+					if isinstance(_executable_element, AsyncExecutableElement):
+						_execution_result = await _executable_element.execute(**_execution_parameters)
+					else:
+						_execution_result = _executable_element.execute(**_execution_parameters)
+					await self.process_execution_result(
+						execution_result=_execution_result
+					)
+				except Exception as ex:
+					self.process_execution_exception(
+						executable_element=_executable_element,
+						exception=ex
+					)
+				finally:
+					self.__executable_elements_total -= 1
+					if self.__executable_elements_total == 0:
+						self.__queue_empty_event.set()
+
+	def __call_in_event_loop(self, *, function: Callable[[], None]):
+		try:
+			_is_event_loop_thread = asyncio.get_running_loop() is self.__event_loop
+		except RuntimeError:
+			_is_event_loop_thread = False
+		if _is_event_loop_thread:
+			function()
+		else:
+			self.__event_loop.call_soon_threadsafe(function)
+
+	def __enqueue(self, *, executable_elements: List[Union[ExecutableElement, AsyncExecutableElement]], is_front: bool):
+
+		if self.__is_active and len(executable_elements) != 0:
+			if is_front:
+				self.__queue.extendleft(reversed(executable_elements))
+			else:
+				self.__queue.extend(executable_elements)
+			self.__executable_elements_total += len(executable_elements)
+			self.__queue_empty_event.clear()
+			self.__queue_not_empty_event.set()
+
+	def __enqueue_after_datetime(self, *, executable_element: Union[ExecutableElement, AsyncExecutableElement], delay_datetime: datetime, is_front: bool):
+
+		def _schedule():
+			if self.__is_active:
+				_delay_seconds = max(0.0, (delay_datetime - datetime.utcnow()).total_seconds())
+				_timer_handle = None  # type: asyncio.TimerHandle
+
+				def _due():
+					self.__delayed_timer_handles.discard(_timer_handle)
+					self.__enqueue(
+						executable_elements=[executable_element],
+						is_front=is_front
+					)
+
+				_timer_handle = self.__event_loop.call_at(self.__event_loop.time() + _delay_seconds, _due)
+				self.__delayed_timer_handles.add(_timer_handle)
+
+		self.__call_in_event_loop(
+			function=_schedule
+		)
+
+	def insert_at_front_immediately(self, *, executable_element: Union[ExecutableElement, AsyncExecutableElement]):
+		self.insert_many_at_front_immediately(
+			executable_elements=[executable_element]
+		)
+
+	def insert_many_at_front_immediately(self, *, executable_elements: List[Union[ExecutableElement, AsyncExecutableElement]]):
+		_executable_elements = list(executable_elements)
+		self.__call_in_event_loop(
+			function=lambda: self.__enqueue(
+				executable_elements=_executable_elements,
+				is_front=True
+			)
+		)
+
+	def append_to_end_immediately(self, *, executable_element: Union[ExecutableElement, AsyncExecutableElement]):
+		self.append_many_to_end_immediately(
+			executable_elements=[executable_element]
+		)
+
+	def append_many_to_end_immediately(self, *, executable_elements: List[Union[ExecutableElement, AsyncExecutableElement]]):
+		_executable_elements = list(executable_elements)
+		self.__call_in_event_loop(
+			function=lambda: self.__enqueue(
+				executable_elements=_executable_elements,
+				is_front=False
+			)
+		)
+
+	def insert_at_front_after_datetime(self, *, executable_element: Union[ExecutableElement, AsyncExecutableElement], delay_datetime: datetime):
+		self.__enqueue_after_datetime(
+			executable_element=executable_element,
+			delay_datetime=delay_datetime,
+			is_front=True
+		)
+
+	def append_to_end_after_datetime(self, *, executable_element: Union[ExecutableElement, AsyncExecutableElement], delay_datetime: datetime):
+		self.__enqueue_after_datetime(
+			executable_element=executable_element,
+			delay_datetime=delay_datetime,
+			is_front=False
+		)
+
+	def insert_at_front_after_elapsed_seconds(self, *, executable_element: Union[ExecutableElement, AsyncExecutableElement], seconds_total: int):
+		self.__enqueue_after_datetime(
+			executable_element=executable_element,
+			delay_datetime=datetime.utcnow() + timedelta(0, seconds_total),
+			is_front=True
+		)
+
+	def append_to_end_after_elapsed_seconds(self, *, executable_element: Union[ExecutableElement, AsyncExecutableElement], seconds_total: int):
+		self.__enqueue_after_datetime(
+			executable_element=executable_element,
+			delay_datetime=datetime.utcnow() + timedelta(0, seconds_total),
+			is_front=False
+		)
+
+	async def wait_until_empty(self):
+		while self.__is_active and self.__executable_elements_total != 0:
+			await self.__queue_empty_event.wait()
+
+	async def dispose(self):
+
+		if self.__is_active:
+			self.__is_active = False
+
+			for _timer_handle in self.__delayed_timer_handles:
+				_timer_handle.cancel()
+			self.__delayed_timer_handles.clear()
+
+			self.__queue_not_empty_event.set()
+			self.__queue_empty_event.set()
+
+			await asyncio.gather(*self.__worker_tasks, return_exceptions=True)
+
+	def process_execution_exception(self, *, executable_element: Union[ExecutableElement, AsyncExecutableElement], exception: Exception):
+		"""
+		Processes an exception raised while executing an element or processing its result, after which the worker carries on with the next element. The exception is printed like that of a thread.
+		:param executable_element: The element that was executed.
+		:param exception: The exception raised.
+		:return: None
+		"""
+
+		traceback.print_exception(type(exception), exception, exception.__traceback__)
+
+	@abstractmethod
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		raise NotImplementedError()
+
+	@abstractmethod
+	async def process_execution_result(self, *, execution_result: object):
+		raise NotImplementedError()
@@ -1,11 +1,28 @@
 from __future__ import annotations
 from postgres_api.json_convertable import JsonConvertable
-from postgres_api.executable import ExecutableElement
-import jwt
+from postgres_api.json_serializer import JsonSerializerInterface
+from postgres_api.json_web_token_signer import JsonWebTokenSigner
+from postgres_api.executable import ExecutableElement, AsyncExecutableElement
 from abc import ABC, abstractmethod
+from collections import deque
+from enum import Enum, auto
+import asyncio
+import concurrent.futures
+import functools
 import json
 import requests
-from typing import Callable
+import requests.adapters
+import threading
+import time
+from typing import Callable, Awaitable, List, Deque, Tuple
+try:
+	import aiohttp
+except ImportError:
+	aiohttp = None
+try:
+	import httpx
+except ImportError:
+	httpx = None
 
 
 class RemoteApiInterface(ABC):
@@ -16,15 +33,68 @@ class RemoteApiInterface(ABC):
 
 
 class RequestsRemoteApiInterface(RemoteApiInterface):
+	"""
+	This class posts over a shared requests session, which keeps up to the maximum connections per host alive so that each post does not open a new TCP and TLS connection. It is safe to share between threads.
+	"""
+
+	def __init__(self, *, hosts_total: int = 10, maximum_connections_per_host_total: int = 10, connect_timeout_seconds: float = 5.0, read_timeout_seconds: float = 30.0):
+
+		self.__timeout = (connect_timeout_seconds, read_timeout_seconds)
+
+		self.__session = requests.Session()
+		_http_adapter = requests.adapters.HTTPAdapter(
+			pool_connections=hosts_total,
+			pool_maxsize=maximum_connections_per_host_total
+		)
+		self.__session.mount("http://", _http_adapter)
+		self.__session.mount("https://", _http_adapter)
 
 	def post(self, *, url: str, json_object: object) -> UrlResponse:
-		_request = requests.post(self._url, json=json_object)
+		# the body is read fully before returning so that the connection goes back to the pool
+		with self.__session.post(url, json=json_object, timeout=self.__timeout) as _response:
+			_url_callback_response = UrlResponse(
+				status_code=_response.status_code,
+				json_object=_response.json()
+			)
+		return _url_callback_response
+
+	def dispose(self):
+		self.__session.close()
+
+
+class HttpxRemoteApiInterface(RemoteApiInterface):
+	"""
+	This class posts over a shared httpx client, which can multiplex the posts to each host over one HTTP/2 connection. It requires the optional httpx package, and the h2 package for HTTP/2.
+	"""
+
+	def __init__(self, *, is_http2: bool = True, maximum_connections_total: int = 100, maximum_keep_alive_connections_total: int = 20, connect_timeout_seconds: float = 5.0, read_timeout_seconds: float = 30.0):
+
+		if httpx is None:
+			raise Exception(f"Cannot create {HttpxRemoteApiInterface.__name__} because the httpx package is not installed.")
+
+		try:
+			self.__client = httpx.Client(
+				http2=is_http2,
+				limits=httpx.Limits(
+					max_connections=maximum_connections_total,
+					max_keepalive_connections=maximum_keep_alive_connections_total
+				),
+				timeout=httpx.Timeout(read_timeout_seconds, connect=connect_timeout_seconds)
+			)
+		except ImportError as ex:
+			raise Exception(f"Cannot create {HttpxRemoteApiInterface.__name__} with HTTP/2 because the h2 package is not installed.") from ex
+
+	def post(self, *, url: str, json_object: object) -> UrlResponse:
+		_response = self.__client.post(url, json=json_object)
 		_url_callback_response = UrlResponse(
-			status_code=_request.status_code,
-			json_object=_request.json()
+			status_code=_response.status_code,
+			json_object=_response.json()
 		)
 		return _url_callback_response
 
+	def dispose(self):
+		self.__client.close()
+
 
 class Callback(ExecutableElement, ABC):
 
@@ -32,26 +102,56 @@ class Callback(ExecutableElement, ABC):
 	def execute(self, *, data: object) -> JsonConvertable:
 		raise NotImplementedError()
 
+	def execute_json_convertable(self, *, json_convertable: JsonConvertable) -> JsonConvertable:
+		"""
+		Executes with a json convertable such as a database command result. By default the callback receives the json string, but callbacks that can use the encoded bytes receive the json convertable itself so that the bytes are not decoded only to be encoded again.
+		:param json_convertable: The json convertable to call back with.
+		:return: The callback response.
+		"""
+
+		return self.execute(
+			data=json_convertable.get_json_string()
+		)
+
 
 class UrlResponse(JsonConvertable):
+	"""
+	This class keeps the json object of a url response body, while its json is the status code along with the body, which is encoded once and kept.
+	"""
+
+	__slots__ = ("__status_code", "__json_object", "__json_bytes")
 
 	def __init__(self, *, status_code: int, json_object):
 		super().__init__()
 
 		self.__status_code = status_code
 		self.__json_object = json_object
+		self.__json_bytes = None  # type: bytes
 
 	def get_status_code(self) -> int:
 		return self.__status_code
 
-	def get_json_object(self) -> object:
+	def is_successful(self) -> bool:
+		return 200 <= self.__status_code < 300
+
+	def get_body_json_object(self) -> object:
 		return self.__json_object
 
-	def get_json_string(self) -> str:
-		return json.dumps({
+	def get_json_object(self) -> object:
+		return {
 			"status_code": self.__status_code,
 			"json_object": self.__json_object
-		})
+		}
+
+	def get_json_bytes(self) -> bytes:
+		if self.__json_bytes is None:
+			self.__json_bytes = JsonSerializerInterface.get_default().dumps(
+				json_object=self.get_json_object()
+			)
+		return self.__json_bytes
+
+	def get_json_string(self) -> str:
+		return self.get_json_bytes().decode("utf-8")
 
 
 class FunctionCallback(Callback):
@@ -83,27 +183,455 @@ class UrlCallback(Callback):
 
 
 class JsonWebTokenCallback(UrlCallback):
+	"""
+	This class posts each result as a json web token, signed by the given signer or else by an HS256 signer of the secret.
+	"""
 
-	def __init__(self, *, url: str, secret: str, remote_api: RemoteApiInterface):
+	def __init__(self, *, url: str, secret: str = None, remote_api: RemoteApiInterface, json_web_token_signer: JsonWebTokenSigner = None):
 		super().__init__(
 			url=url,
 			remote_api=remote_api
 		)
 
-		self.__secret = secret
+		self.__json_web_token_signer = JsonWebTokenCallback.get_json_web_token_signer(
+			secret=secret,
+			json_web_token_signer=json_web_token_signer
+		)
 
-	def execute(self, *, data: object) -> JsonConvertable:
-		_json = None
+	@staticmethod
+	def get_json_web_token_signer(*, secret: str, json_web_token_signer: JsonWebTokenSigner) -> JsonWebTokenSigner:
+		if json_web_token_signer is not None:
+			return json_web_token_signer
+		if secret is None:
+			raise Exception(f"Cannot create json web token callback without either a secret or a signer.")
+		return JsonWebTokenSigner(
+			key=secret
+		)
+
+	@staticmethod
+	def get_json_web_token_payload(*, data: object) -> bytes:
+		# already serialized data is signed as is rather than being parsed only to be serialized again
 		if isinstance(data, JsonConvertable):
-			_json = json.loads(data.get_json_string())
+			_payload = data.get_json_bytes()
 		elif isinstance(data, str):
-			_json = json.loads(data)
+			_payload = data.encode("utf-8")
+		elif isinstance(data, bytes):
+			_payload = data
 		else:
-			_json = data
-		_encoded_jwt = jwt.encode(_json, self.__secret, algorithm="HS256")
+			_payload = JsonSerializerInterface.get_default().dumps(
+				json_object=data
+			)
+		if not _payload.lstrip().startswith(b"{"):
+			raise Exception(f"Cannot encode json web token because its payload is not a json object.")
+		return _payload
+
+	@staticmethod
+	def get_encoded_json_web_token(*, data: object, secret: str) -> str:
+		return JsonWebTokenSigner.get_cached(
+			key=secret
+		).sign(
+			payload=JsonWebTokenCallback.get_json_web_token_payload(
+				data=data
+			)
+		)
+
+	def execute_json_convertable(self, *, json_convertable: JsonConvertable) -> JsonConvertable:
+		return self.execute(
+			data=json_convertable
+		)
+
+	def execute(self, *, data: object) -> JsonConvertable:
+		_encoded_jwt = self.__json_web_token_signer.sign(
+			payload=JsonWebTokenCallback.get_json_web_token_payload(
+				data=data
+			)
+		)
 		_url_response = self._call_url(
 			json_object=json.dumps({
 				"token": _encoded_jwt
 			})
 		)
 		return _url_response
+
+
+class CallbackDeliveryStatusEnum(Enum):
+
+	Pending = auto(),
+	Delivered = auto(),
+	Failed = auto()
+
+
+class CallbackDispatchBackpressureEnum(Enum):
+
+	Block = auto(),
+	Drop = auto()
+
+
+class CallbackDelivery(JsonConvertable):
+	"""
+	This class is the status of one result handed to a batching or dispatching callback, which is only known once the result has been called back.
+	"""
+
+	__slots__ = ("__delivered_event", "__status", "__batch_index", "__results_total", "__attempts_total", "__response", "__error_message")
+
+	def __init__(self):
+
+		self.__delivered_event = threading.Event()
+		self.__status = CallbackDeliveryStatusEnum.Pending
+		self.__batch_index = None  # type: int
+		self.__results_total = None  # type: int
+		self.__attempts_total = None  # type: int
+		self.__response = None  # type: JsonConvertable
+		self.__error_message = None  # type: str
+
+	def set_delivered(self, *, batch_index: int, results_total: int, response: JsonConvertable, error_message: str, attempts_total: int = 1):
+		self.__batch_index = batch_index
+		self.__results_total = results_total
+		self.__attempts_total = attempts_total
+		self.__response = response
+		self.__error_message = error_message
+		self.__status = CallbackDeliveryStatusEnum.Delivered if error_message is None else CallbackDeliveryStatusEnum.Failed
+		self.__delivered_event.set()
+
+	def wait(self, *, timeout_seconds: float = None) -> bool:
+		return self.__delivered_event.wait(timeout_seconds)
+
+	def get_status(self) -> CallbackDeliveryStatusEnum:
+		return self.__status
+
+	def get_batch_index(self) -> int:
+		return self.__batch_index
+
+	def get_attempts_total(self) -> int:
+		return self.__attempts_total
+
+	def get_response(self) -> JsonConvertable:
+		return self.__response
+
+	def get_error_message(self) -> str:
+		return self.__error_message
+
+	def get_json_object(self) -> object:
+		return {
+			"status": self.__status.name,
+			"batch_index": self.__batch_index,
+			"results_total": self.__results_total,
+			"attempts_total": self.__attempts_total,
+			"response": None if self.__response is None else self.__response.get_json_object(),
+			"error_message": self.__error_message
+		}
+
+	def get_json_string(self) -> str:
+		return JsonSerializerInterface.get_default().dumps(
+			json_object=self.get_json_object()
+		).decode("utf-8")
+
+
+class CallbackBatch(JsonConvertable):
+	"""
+	This class joins the already serialized results of a batch into one json object, since a json web token payload cannot be an array.
+	"""
+
+	__slots__ = ("__json_bytes",)
+
+	def __init__(self, *, results_json_bytes: List[bytes]):
+
+		self.__json_bytes = b"{\"version\": 1, \"results\": [" + b", ".join(results_json_bytes) + b"]}"
+
+	def get_json_bytes(self) -> bytes:
+		return self.__json_bytes
+
+	def get_json_string(self) -> str:
+		return self.__json_bytes.decode("utf-8")
+
+
+class BatchingCallback(Callback):
+	"""
+	This class buffers results and calls back the wrapped callback with each batch, once the maximum results or bytes are buffered or the oldest buffered result has waited the maximum delay. Executing returns a CallbackDelivery for the result instead of waiting on the wrapped callback. At most the maximum buffered results are kept while a batch is being called back, after which executing either blocks until the buffer has room or drops the result.
+	"""
+
+	def __init__(self, *, callback: Callback, maximum_results_total: int = 100, maximum_bytes_total: int = 1024 * 1024, maximum_delay_seconds: float = 0.05, maximum_buffered_results_total: int = 10000, backpressure: CallbackDispatchBackpressureEnum = CallbackDispatchBackpressureEnum.Block):
+
+		if maximum_buffered_results_total < 1:
+			raise Exception(f"Cannot create {BatchingCallback.__name__} with a maximum of {maximum_buffered_results_total} buffered results.")
+
+		self.__callback = callback
+		self.__maximum_results_total = maximum_results_total
+		self.__maximum_bytes_total = maximum_bytes_total
+		self.__maximum_delay_seconds = maximum_delay_seconds
+		self.__maximum_buffered_results_total = maximum_buffered_results_total
+		self.__backpressure = backpressure
+
+		self.__buffered_results = deque()  # type: Deque[Tuple[float, bytes, CallbackDelivery]]
+		self.__buffered_bytes_total = 0
+		self.__batches_total = 0
+		self.__dropped_total = 0
+		self.__condition = threading.Condition()
+		self.__thread = None
+		self.__is_thread_active = True
+
+		self.__start_thread()
+
+	def __is_batch_full(self) -> bool:
+		return len(self.__buffered_results) >= self.__maximum_results_total or self.__buffered_bytes_total >= self.__maximum_bytes_total
+
+	def __start_thread(self):
+
+		def _thread_method():
+
+			while True:
+				self.__condition.acquire()
+				while self.__is_thread_active and len(self.__buffered_results) == 0:
+					self.__condition.wait()
+				while self.__is_thread_active and not self.__is_batch_full():
+					_seconds_until_due = self.__buffered_results[0][0] + self.__maximum_delay_seconds - time.monotonic()
+					if _seconds_until_due <= 0:
+						break
+					self.__condition.wait(_seconds_until_due)
+				if not self.__is_thread_active and len(self.__buffered_results) == 0:
+					self.__condition.release()
+					break
+				_results_json_bytes = []  # type: List[bytes]
+				_callback_deliveries = []  # type: List[CallbackDelivery]
+				_batch_bytes_total = 0
+				# a result larger than the maximum bytes is still sent, as a batch of its own
+				while len(self.__buffered_results) != 0 and len(_results_json_bytes) < self.__maximum_results_total and (len(_results_json_bytes) == 0 or _batch_bytes_total + len(self.__buffered_results[0][1]) <= self.__maximum_bytes_total):
+					_, _result_json_bytes, _callback_delivery = self.__buffered_results.popleft()
+					_batch_bytes_total += len(_result_json_bytes)
+					_results_json_bytes.append(_result_json_bytes)
+					_callback_deliveries.append(_callback_delivery)
+				self.__buffered_bytes_total -= _batch_bytes_total
+				_batch_index = self.__batches_total
+				self.__batches_total += 1
+				# results blocked on a full buffer can be buffered while this batch is called back
+				self.__condition.notify_all()
+				self.__condition.release()
+
+				self.__call_back(
+					batch_index=_batch_index,
+					results_json_bytes=_results_json_bytes,
+					callback_deliveries=_callback_deliveries
+				)
+
+		self.__thread = threading.Thread(
+			target=_thread_method
+		)
+		self.__thread.daemon = True
+		self.__thread.start()
+
+	def __call_back(self, *, batch_index: int, results_json_bytes: List[bytes], callback_deliveries: List[CallbackDelivery]):
+
+		_response = None  # type: JsonConvertable
+		_error_message = None  # type: str
+		try:
+			_response = self.__callback.execute_json_convertable(
+				json_convertable=CallbackBatch(
+					results_json_bytes=results_json_bytes
+				)
+			)
+			if isinstance(_response, UrlResponse) and not _response.is_successful():
+				_error_message = f"Unexpected status code {_response.get_status_code()}."
+		except Exception as ex:
+			_error_message = str(ex)
+		for _callback_delivery in callback_deliveries:
+			_callback_delivery.set_delivered(
+				batch_index=batch_index,
+				results_total=len(results_json_bytes),
+				response=_response,
+				error_message=_error_message
+			)
+
+	def execute_json_convertable(self, *, json_convertable: JsonConvertable) -> CallbackDelivery:
+		return self.execute(
+			data=json_convertable
+		)
+
+	def execute(self, *, data: object) -> CallbackDelivery:
+
+		if isinstance(data, JsonConvertable):
+			_result_json_bytes = data.get_json_bytes()
+		elif isinstance(data, str):
+			_result_json_bytes = data.encode("utf-8")
+		elif isinstance(data, bytes):
+			_result_json_bytes = data
+		else:
+			_result_json_bytes = JsonSerializerInterface.get_default().dumps(
+				json_object=data
+			)
+
+		_callback_delivery = CallbackDelivery()
+
+		self.__condition.acquire()
+		try:
+			if self.__backpressure == CallbackDispatchBackpressureEnum.Block:
+				while self.__is_thread_active and len(self.__buffered_results) >= self.__maximum_buffered_results_total:
+					self.__condition.wait()
+			if not self.__is_thread_active:
+				raise Exception(f"Cannot execute {BatchingCallback.__name__} after it has been disposed.")
+			if len(self.__buffered_results) >= self.__maximum_buffered_results_total:
+				self.__dropped_total += 1
+				_callback_delivery.set_delivered(
+					batch_index=None,
+					results_total=1,
+					response=None,
+					error_message=f"Cannot buffer callback because {self.__maximum_buffered_results_total} results are already buffered.",
+					attempts_total=0
+				)
+				return _callback_delivery
+			self.__buffered_results.append((time.monotonic(), _result_json_bytes, _callback_delivery))
+			self.__buffered_bytes_total += len(_result_json_bytes)
+			# the thread waits for the first result and then for the batch to fill or become due, and it shares the condition with blocked results
+			if len(self.__buffered_results) == 1 or self.__is_batch_full():
+				self.__condition.notify_all()
+		finally:
+			self.__condition.release()
+
+		return _callback_delivery
+
+	def get_batches_total(self) -> int:
+		return self.__batches_total
+
+	def get_dropped_total(self) -> int:
+		return self.__dropped_total
+
+	def dispose(self):
+		"""
+		Calls back with the buffered results and stops the thread.
+		:return: None
+		"""
+
+		self.__condition.acquire()
+
+		_is_thread_active = self.__is_thread_active
+		self.__is_thread_active = False
+		self.__condition.notify_all()
+
+		self.__condition.release()
+
+		if _is_thread_active and self.__thread is not threading.current_thread():
+			self.__thread.join()
+
+
+class AsyncRemoteApiInterface(ABC):
+
+	@abstractmethod
+	async def post(self, *, url: str, json_object: object) -> UrlResponse:
+		raise NotImplementedError()
+
+
+class ExecutorAsyncRemoteApiInterface(AsyncRemoteApiInterface):
+	"""
+	This class runs a synchronous remote api on an executor so that it can be awaited
+	"""
+
+	def __init__(self, *, remote_api: RemoteApiInterface, executor: concurrent.futures.Executor = None):
+
+		self.__remote_api = remote_api
+		self.__executor = executor
+
+	async def post(self, *, url: str, json_object: object) -> UrlResponse:
+		return await asyncio.get_running_loop().run_in_executor(self.__executor, functools.partial(
+			self.__remote_api.post,
+			url=url,
+			json_object=json_object
+		))
+
+
+class AiohttpAsyncRemoteApiInterface(AsyncRemoteApiInterface):
+	"""
+	This class posts over a shared aiohttp session so that in-flight requests do not each hold a thread. It requires the optional aiohttp package.
+	"""
+
+	def __init__(self):
+
+		if aiohttp is None:
+			raise Exception(f"Cannot create {AiohttpAsyncRemoteApiInterface.__name__} because the aiohttp package is not installed.")
+
+		self.__client_session = None  # type: aiohttp.ClientSession
+
+	async def post(self, *, url: str, json_object: object) -> UrlResponse:
+		if self.__client_session is None:
+			self.__client_session = aiohttp.ClientSession()
+		async with self.__client_session.post(url, json=json_object) as _response:
+			_url_callback_response = UrlResponse(
+				status_code=_response.status,
+				json_object=await _response.json(content_type=None)
+			)
+		return _url_callback_response
+
+	async def dispose(self):
+		if self.__client_session is not None:
+			await self.__client_session.close()
+			self.__client_session = None
+
+
+class AsyncCallback(AsyncExecutableElement, ABC):
+
+	@abstractmethod
+	async def execute(self, *, data: object) -> JsonConvertable:
+		raise NotImplementedError()
+
+	async def execute_json_convertable(self, *, json_convertable: JsonConvertable) -> JsonConvertable:
+		return await self.execute(
+			data=json_convertable.get_json_string()
+		)
+
+
+class AsyncFunctionCallback(AsyncCallback):
+
+	def __init__(self, *, function: Callable[[object], Awaitable[JsonConvertable]]):
+
+		self.__function = function
+
+	async def execute(self, *, data: object) -> JsonConvertable:
+		return await self.__function(data)
+
+
+class AsyncUrlCallback(AsyncCallback):
+
+	def __init__(self, *, url: str, async_remote_api: AsyncRemoteApiInterface):
+
+		self._url = url
+		self._async_remote_api = async_remote_api
+
+	@abstractmethod
+	async def execute(self, *, data: object):
+		raise NotImplementedError()
+
+	async def _call_url(self, *, json_object) -> UrlResponse:
+		return await self._async_remote_api.post(
+			url=self._url,
+			json_object=json_object
+		)
+
+
+class AsyncJsonWebTokenCallback(AsyncUrlCallback):
+
+	def __init__(self, *, url: str, secret: str = None, async_remote_api: AsyncRemoteApiInterface, json_web_token_signer: JsonWebTokenSigner = None):
+		super().__init__(
+			url=url,
+			async_remote_api=async_remote_api
+		)
+
+		self.__json_web_token_signer = JsonWebTokenCallback.get_json_web_token_signer(
+			secret=secret,
+			json_web_token_signer=json_web_token_signer
+		)
+
+	async def execute_json_convertable(self, *, json_convertable: JsonConvertable) -> JsonConvertable:
+		return await self.execute(
+			data=json_convertable
+		)
+
+	async def execute(self, *, data: object) -> JsonConvertable:
+		_encoded_jwt = self.__json_web_token_signer.sign(
+			payload=JsonWebTokenCallback.get_json_web_token_payload(
+				data=data
+			)
+		)
+		_url_response = await self._call_url(
+			json_object=json.dumps({
+				"token": _encoded_jwt
+			})
+		)
+		return _url_response
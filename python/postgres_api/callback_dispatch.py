@@ -0,0 +1,238 @@
+from __future__ import annotations
+from postgres_api.callback import Callback, CallbackDelivery, CallbackDispatchBackpressureEnum, UrlResponse
+from postgres_api.command import DefaultCommandResult
+from postgres_api.executable import ExecutableElement
+from postgres_api.json_convertable import JsonConvertable
+from postgres_api.queue import ThreadPoolExecutableQueue
+from typing import Dict, Set
+import random
+import threading
+
+
+class CallbackDispatchAttempt(ExecutableElement):
+
+	__slots__ = ("__callback", "__json_convertable", "__callback_delivery", "__attempt_index", "__response", "__error_message")
+
+	def __init__(self, *, callback: Callback, json_convertable: JsonConvertable, callback_delivery: CallbackDelivery, attempt_index: int):
+
+		self.__callback = callback
+		self.__json_convertable = json_convertable
+		self.__callback_delivery = callback_delivery
+		self.__attempt_index = attempt_index
+		self.__response = None  # type: JsonConvertable
+		self.__error_message = None  # type: str
+
+	def get_callback_delivery(self) -> CallbackDelivery:
+		return self.__callback_delivery
+
+	def get_attempt_index(self) -> int:
+		return self.__attempt_index
+
+	def get_response(self) -> JsonConvertable:
+		return self.__response
+
+	def get_error_message(self) -> str:
+		return self.__error_message
+
+	def get_next_attempt(self) -> CallbackDispatchAttempt:
+		return CallbackDispatchAttempt(
+			callback=self.__callback,
+			json_convertable=self.__json_convertable,
+			callback_delivery=self.__callback_delivery,
+			attempt_index=self.__attempt_index + 1
+		)
+
+	def execute(self) -> CallbackDispatchAttempt:
+		try:
+			self.__response = self.__callback.execute_json_convertable(
+				json_convertable=self.__json_convertable
+			)
+			if isinstance(self.__response, UrlResponse) and not self.__response.is_successful():
+				self.__error_message = f"Unexpected status code {self.__response.get_status_code()}."
+		except Exception as ex:
+			self.__error_message = str(ex)
+		return self
+
+
+class CallbackDispatchExecutableQueue(ThreadPoolExecutableQueue):
+	"""
+	This class calls back on its own worker threads, so that a slow receiver holds up these workers instead of the workers executing database commands. A failed attempt is retried after an exponential backoff with jitter by appending it to the end of this queue after the delay. At most the maximum pending results are accepted, counting those waiting on a retry, after which dispatching either blocks until a result is delivered or drops the result. Results still pending when the queue is disposed are marked as failed.
+	"""
+
+	def __init__(self, *, callback: Callback, workers_total: int = 4, maximum_pending_total: int = 10000, backpressure: CallbackDispatchBackpressureEnum = CallbackDispatchBackpressureEnum.Block, attempts_total: int = 5, initial_retry_seconds: float = 0.5, maximum_retry_seconds: float = 30.0):
+
+		if attempts_total < 1:
+			raise Exception(f"Cannot create callback dispatch queue with {attempts_total} attempts.")
+
+		self.__callback = callback
+		self.__maximum_pending_total = maximum_pending_total
+		self.__backpressure = backpressure
+		self.__attempts_total = attempts_total
+		self.__initial_retry_seconds = initial_retry_seconds
+		self.__maximum_retry_seconds = maximum_retry_seconds
+
+		self.__pending_total = 0
+		self.__pending_callback_deliveries = set()  # type: Set[CallbackDelivery]
+		self.__retries_total = 0
+		self.__dropped_total = 0
+		self.__is_disposed = False
+		self.__pending_condition = threading.Condition()
+
+		super().__init__(
+			workers_total=workers_total
+		)
+
+	def get_retry_seconds(self, *, attempt_index: int) -> float:
+		_retry_seconds = min(self.__maximum_retry_seconds, self.__initial_retry_seconds * 2 ** attempt_index)
+		# the jitter spreads out the retries of results that failed together
+		return _retry_seconds * random.uniform(0.5, 1.0)
+
+	def dispatch(self, *, json_convertable: JsonConvertable) -> CallbackDelivery:
+
+		_callback_delivery = CallbackDelivery()
+
+		self.__pending_condition.acquire()
+		try:
+			if self.__backpressure == CallbackDispatchBackpressureEnum.Block:
+				while not self.__is_disposed and self.__pending_total >= self.__maximum_pending_total:
+					self.__pending_condition.wait()
+			if self.__is_disposed:
+				_callback_delivery.set_delivered(
+					batch_index=None,
+					results_total=1,
+					response=None,
+					error_message=f"Cannot dispatch callback because the callback dispatch queue is disposed.",
+					attempts_total=0
+				)
+				return _callback_delivery
+			if self.__pending_total >= self.__maximum_pending_total:
+				self.__dropped_total += 1
+				_callback_delivery.set_delivered(
+					batch_index=None,
+					results_total=1,
+					response=None,
+					error_message=f"Cannot dispatch callback because {self.__maximum_pending_total} results are already pending.",
+					attempts_total=0
+				)
+				return _callback_delivery
+			self.__pending_total += 1
+			self.__pending_callback_deliveries.add(_callback_delivery)
+		finally:
+			self.__pending_condition.release()
+
+		self.append_to_end_immediately(
+			executable_element=CallbackDispatchAttempt(
+				callback=self.__callback,
+				json_convertable=json_convertable,
+				callback_delivery=_callback_delivery,
+				attempt_index=0
+			)
+		)
+
+		return _callback_delivery
+
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: CallbackDispatchAttempt):
+
+		if execution_result.get_error_message() is not None and execution_result.get_attempt_index() + 1 < self.__attempts_total:
+			self.__pending_condition.acquire()
+			self.__retries_total += 1
+			self.__pending_condition.release()
+			self.append_to_end_after_elapsed_seconds(
+				executable_element=execution_result.get_next_attempt(),
+				seconds_total=self.get_retry_seconds(
+					attempt_index=execution_result.get_attempt_index()
+				)
+			)
+		else:
+			self.__pending_condition.acquire()
+			# a result that dispose already marked as failed is not delivered again
+			if execution_result.get_callback_delivery() in self.__pending_callback_deliveries:
+				execution_result.get_callback_delivery().set_delivered(
+					batch_index=None,
+					results_total=1,
+					response=execution_result.get_response(),
+					error_message=execution_result.get_error_message(),
+					attempts_total=execution_result.get_attempt_index() + 1
+				)
+				self.__pending_callback_deliveries.remove(execution_result.get_callback_delivery())
+				self.__pending_total -= 1
+				self.__pending_condition.notify_all()
+			self.__pending_condition.release()
+
+	def wait_until_delivered(self):
+		"""
+		Blocks the current thread until every dispatched result has been delivered or has failed its last attempt, unlike wait_until_empty which does not wait on results that are waiting on a retry.
+		:return: None
+		"""
+
+		self.__pending_condition.acquire()
+
+		while self.__pending_total != 0:
+			self.__pending_condition.wait()
+
+		self.__pending_condition.release()
+
+	def dispose(self):
+
+		# blocked dispatchers stop waiting and later dispatches fail at once
+		self.__pending_condition.acquire()
+		self.__is_disposed = True
+		self.__pending_condition.notify_all()
+		self.__pending_condition.release()
+
+		super().dispose()
+
+		# the results still queued or waiting on a retry are dropped by the queue, so they are marked as failed
+		self.__pending_condition.acquire()
+		for _callback_delivery in self.__pending_callback_deliveries:
+			_callback_delivery.set_delivered(
+				batch_index=None,
+				results_total=1,
+				response=None,
+				error_message=f"Cannot deliver callback because the callback dispatch queue was disposed.",
+				attempts_total=None
+			)
+		self.__pending_callback_deliveries.clear()
+		self.__pending_total = 0
+		self.__pending_condition.notify_all()
+		self.__pending_condition.release()
+
+	def get_pending_total(self) -> int:
+		return self.__pending_total
+
+	def get_retries_total(self) -> int:
+		return self.__retries_total
+
+	def get_dropped_total(self) -> int:
+		return self.__dropped_total
+
+
+class DispatchingCallback(Callback):
+	"""
+	This class hands each result to a callback dispatch queue and returns its CallbackDelivery without waiting, so it can be the execution result callback of the database command queues.
+	"""
+
+	def __init__(self, *, callback_dispatch_executable_queue: CallbackDispatchExecutableQueue):
+
+		self.__callback_dispatch_executable_queue = callback_dispatch_executable_queue
+
+	def execute_json_convertable(self, *, json_convertable: JsonConvertable) -> CallbackDelivery:
+		return self.__callback_dispatch_executable_queue.dispatch(
+			json_convertable=json_convertable
+		)
+
+	def execute(self, *, data: object) -> CallbackDelivery:
+		if isinstance(data, JsonConvertable):
+			_json_convertable = data
+		elif isinstance(data, str):
+			_json_convertable = DefaultCommandResult(
+				default_json_string=data
+			)
+		else:
+			raise Exception(f"Cannot dispatch callback with data of type {type(data).__name__}.")
+		return self.__callback_dispatch_executable_queue.dispatch(
+			json_convertable=_json_convertable
+		)
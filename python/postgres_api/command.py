@@ -1,7 +1,7 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from postgres_api.executable import ExecutableElement
-from postgres_api.json_convertable import JsonConvertable
+from postgres_api.json_convertable import JsonConvertable, CachedJsonConvertable
 from typing import List
 
 
@@ -16,12 +16,19 @@ class CommandResultFactoryInterface(ABC):
 
 class CommandResult(JsonConvertable, ABC):
 
+	__slots__ = ()
+
 	@abstractmethod
 	def get_json_string(self) -> str:
 		raise NotImplementedError()
 
 
-class CompositeCommandResult(CommandResult, ABC):
+class CompositeCommandResult(CachedJsonConvertable, CommandResult, ABC):
+	"""
+	This class caches its json like its child results, which also lets it share the slot layout of cached json convertables.
+	"""
+
+	__slots__ = ("__child_command_results",)
 
 	def __init__(self, *, child_command_results: List[CommandResult]):
 
@@ -31,12 +38,14 @@ class CompositeCommandResult(CommandResult, ABC):
 		return self.__child_command_results.copy()
 
 	@abstractmethod
-	def get_json_string(self) -> str:
-		raise NotImplementedError
+	def get_json_object(self) -> object:
+		raise NotImplementedError()
 
 
 class DefaultCommandResult(CommandResult):
 
+	__slots__ = ("__default_json_string",)
+
 	def __init__(self, *, default_json_string: str):
 
 		self.__default_json_string = default_json_string
@@ -47,6 +56,8 @@ class DefaultCommandResult(CommandResult):
 
 class Command(ExecutableElement):
 
+	__slots__ = ()
+
 	@abstractmethod
 	def execute(self, *args, **kwargs) -> CommandResult:
 		raise NotImplementedError()
@@ -54,6 +65,8 @@ class Command(ExecutableElement):
 
 class CompositeCommand(Command, ABC):
 
+	__slots__ = ("_child_commands",)
+
 	def __init__(self, *, child_commands: List[Command]):
 
 		self._child_commands = child_commands
@@ -0,0 +1,618 @@
+from __future__ import annotations
+from postgres_api.prepared_statement_cache import PreparedStatementCache
+from abc import ABC, abstractmethod
+import psycopg2
+from psycopg2.extensions import POLL_OK, POLL_READ, POLL_WRITE
+import asyncio
+import threading
+from collections import deque
+from typing import List, Dict, Callable, Deque
+import time
+
+
+class ConnectionPoolAcquireTimeoutException(Exception):
+
+	def __init__(self, *, database_name: str, timeout_seconds: float):
+		super().__init__(f"Failed to acquire connection to database \"{database_name}\" within {timeout_seconds} seconds.")
+
+		self.__database_name = database_name
+		self.__timeout_seconds = timeout_seconds
+
+	def get_database_name(self) -> str:
+		return self.__database_name
+
+	def get_timeout_seconds(self) -> float:
+		return self.__timeout_seconds
+
+
+class PostgresConnection():
+
+	def __init__(self, *, connection: object, database_name: str):
+
+		self.__connection = connection
+		self.__database_name = database_name
+		self.__created_time = time.monotonic()
+		self.__last_used_time = self.__created_time
+		self.__prepared_statement_cache = None  # type: PreparedStatementCache
+
+	def get_connection(self) -> object:
+		return self.__connection
+
+	def get_prepared_statement_cache(self) -> PreparedStatementCache:
+		return self.__prepared_statement_cache
+
+	def set_prepared_statement_cache(self, *, prepared_statement_cache: PreparedStatementCache):
+		self.__prepared_statement_cache = prepared_statement_cache
+
+	def get_database_name(self) -> str:
+		return self.__database_name
+
+	def get_lifetime_seconds(self) -> float:
+		return time.monotonic() - self.__created_time
+
+	def get_idle_seconds(self) -> float:
+		return time.monotonic() - self.__last_used_time
+
+	def set_used(self):
+		self.__last_used_time = time.monotonic()
+
+	def is_closed(self) -> bool:
+		return self.__connection.closed != 0
+
+	def is_healthy(self) -> bool:
+		if self.is_closed():
+			return False
+		try:
+			_cursor = self.__connection.cursor()
+			_cursor.execute("SELECT 1")
+			_cursor.fetchone()
+			_cursor.close()
+			self.__connection.rollback()
+			return True
+		except Exception:
+			return False
+
+	def close(self):
+		try:
+			self.__connection.close()
+		except Exception:
+			pass
+
+
+class PostgresConnectionSourceInterface(ABC):
+
+	@abstractmethod
+	def acquire(self, *, database_name: str) -> PostgresConnection:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def release(self, *, postgres_connection: PostgresConnection, is_broken: bool):
+		raise NotImplementedError()
+
+
+class UnpooledPostgresConnectionSource(PostgresConnectionSourceInterface):
+	"""
+	This class opens a new connection for every acquire and closes it on release
+	"""
+
+	def __init__(self, *, user_name: str, password: str, host_url: str, port: int, connect_function: Callable[..., object] = None):
+
+		self.__user_name = user_name
+		self.__password = password
+		self.__host_url = host_url
+		self.__port = port
+		self.__connect_function = psycopg2.connect if connect_function is None else connect_function
+
+	def acquire(self, *, database_name: str) -> PostgresConnection:
+		_connection = self.__connect_function(
+			user=self.__user_name,
+			password=self.__password,
+			host=self.__host_url,
+			port=self.__port,
+			database=database_name
+		)
+		return PostgresConnection(
+			connection=_connection,
+			database_name=database_name
+		)
+
+	def release(self, *, postgres_connection: PostgresConnection, is_broken: bool):
+		postgres_connection.close()
+
+
+class PostgresDatabaseConnectionPool():
+	"""
+	This class keeps between the minimum and maximum number of connections open to a single database
+	"""
+
+	def __init__(self, *, database_name: str, connect_function: Callable[[], object], minimum_connections_total: int, maximum_connections_total: int, maximum_idle_seconds: float, maximum_lifetime_seconds: float, health_check_after_idle_seconds: float):
+
+		if maximum_connections_total < 1 or minimum_connections_total > maximum_connections_total:
+			raise Exception(f"Cannot create connection pool with a minimum of {minimum_connections_total} and a maximum of {maximum_connections_total} connections.")
+
+		self.__database_name = database_name
+		self.__connect_function = connect_function
+		self.__minimum_connections_total = minimum_connections_total
+		self.__maximum_connections_total = maximum_connections_total
+		self.__maximum_idle_seconds = maximum_idle_seconds
+		self.__maximum_lifetime_seconds = maximum_lifetime_seconds
+		self.__health_check_after_idle_seconds = health_check_after_idle_seconds
+
+		# the most recently released connection is reused first so that surplus connections go idle and are evicted
+		self.__idle_postgres_connections = deque()  # type: Deque[PostgresConnection]
+		# includes idle connections, acquired connections and connections that are being opened
+		self.__connections_total = 0
+		self.__condition = threading.Condition()
+		self.__is_disposed = False
+
+	def __open(self) -> PostgresConnection:
+		_postgres_connection = PostgresConnection(
+			connection=self.__connect_function(),
+			database_name=self.__database_name
+		)
+		return _postgres_connection
+
+	def __discard(self, *, postgres_connection: PostgresConnection):
+
+		if postgres_connection is not None:
+			postgres_connection.close()
+
+		self.__condition.acquire()
+
+		self.__connections_total -= 1
+		self.__condition.notify()
+
+		self.__condition.release()
+
+	def __is_reusable(self, *, postgres_connection: PostgresConnection) -> bool:
+		if postgres_connection.is_closed():
+			return False
+		if postgres_connection.get_lifetime_seconds() >= self.__maximum_lifetime_seconds:
+			return False
+		if postgres_connection.get_idle_seconds() >= self.__health_check_after_idle_seconds:
+			return postgres_connection.is_healthy()
+		return True
+
+	def acquire(self, *, timeout_seconds: float) -> PostgresConnection:
+
+		_deadline = time.monotonic() + timeout_seconds
+
+		while True:
+
+			_postgres_connection = None  # type: PostgresConnection
+			_is_opening = False
+
+			self.__condition.acquire()
+			try:
+				while _postgres_connection is None and not _is_opening:
+					if self.__is_disposed:
+						raise Exception(f"Cannot acquire connection to database \"{self.__database_name}\" because the connection pool is disposed.")
+					if len(self.__idle_postgres_connections) != 0:
+						_postgres_connection = self.__idle_postgres_connections.pop()
+					elif self.__connections_total < self.__maximum_connections_total:
+						self.__connections_total += 1
+						_is_opening = True
+					else:
+						_remaining_seconds = _deadline - time.monotonic()
+						if _remaining_seconds <= 0:
+							raise ConnectionPoolAcquireTimeoutException(
+								database_name=self.__database_name,
+								timeout_seconds=timeout_seconds
+							)
+						self.__condition.wait(_remaining_seconds)
+			finally:
+				self.__condition.release()
+
+			if _is_opening:
+				try:
+					_postgres_connection = self.__open()
+				except Exception:
+					self.__discard(
+						postgres_connection=None
+					)
+					raise
+				return _postgres_connection
+
+			# the health check runs outside of the lock since it is a round trip to the database
+			if self.__is_reusable(postgres_connection=_postgres_connection):
+				return _postgres_connection
+
+			self.__discard(
+				postgres_connection=_postgres_connection
+			)
+
+	def release(self, *, postgres_connection: PostgresConnection, is_broken: bool):
+
+		if is_broken or postgres_connection.is_closed() or postgres_connection.get_lifetime_seconds() >= self.__maximum_lifetime_seconds:
+			self.__discard(
+				postgres_connection=postgres_connection
+			)
+		else:
+			postgres_connection.set_used()
+
+			self.__condition.acquire()
+
+			_is_disposed = self.__is_disposed
+			if not _is_disposed:
+				self.__idle_postgres_connections.append(postgres_connection)
+				self.__condition.notify()
+
+			self.__condition.release()
+
+			if _is_disposed:
+				self.__discard(
+					postgres_connection=postgres_connection
+				)
+
+	def evict(self):
+		"""
+		Closes idle connections that have expired and opens connections until the minimum is reached.
+		:return: None
+		"""
+
+		_evicted_postgres_connections = []  # type: List[PostgresConnection]
+
+		self.__condition.acquire()
+
+		_retained_postgres_connections = deque()  # type: Deque[PostgresConnection]
+		for _postgres_connection in self.__idle_postgres_connections:
+			if _postgres_connection.get_lifetime_seconds() >= self.__maximum_lifetime_seconds or _postgres_connection.is_closed():
+				_evicted_postgres_connections.append(_postgres_connection)
+			elif _postgres_connection.get_idle_seconds() >= self.__maximum_idle_seconds and self.__connections_total - len(_evicted_postgres_connections) > self.__minimum_connections_total:
+				_evicted_postgres_connections.append(_postgres_connection)
+			else:
+				_retained_postgres_connections.append(_postgres_connection)
+		self.__idle_postgres_connections = _retained_postgres_connections
+		self.__connections_total -= len(_evicted_postgres_connections)
+
+		_opening_connections_total = 0
+		if not self.__is_disposed:
+			_opening_connections_total = max(0, self.__minimum_connections_total - self.__connections_total)
+			self.__connections_total += _opening_connections_total
+
+		self.__condition.release()
+
+		for _postgres_connection in _evicted_postgres_connections:
+			_postgres_connection.close()
+
+		for _ in range(_opening_connections_total):
+			try:
+				_postgres_connection = self.__open()
+			except Exception:
+				self.__discard(
+					postgres_connection=None
+				)
+			else:
+				self.release(
+					postgres_connection=_postgres_connection,
+					is_broken=False
+				)
+
+	def get_connections_total(self) -> int:
+		return self.__connections_total
+
+	def get_idle_connections_total(self) -> int:
+		return len(self.__idle_postgres_connections)
+
+	def dispose(self):
+
+		self.__condition.acquire()
+
+		self.__is_disposed = True
+		_idle_postgres_connections = list(self.__idle_postgres_connections)
+		self.__idle_postgres_connections.clear()
+		self.__connections_total -= len(_idle_postgres_connections)
+		self.__condition.notify_all()
+
+		self.__condition.release()
+
+		for _postgres_connection in _idle_postgres_connections:
+			_postgres_connection.close()
+
+
+class PostgresConnectionPool(PostgresConnectionSourceInterface):
+	"""
+	This class keeps a bounded connection pool per database and periodically evicts idle and expired connections
+	"""
+
+	def __init__(self, *, user_name: str, password: str, host_url: str, port: int, minimum_connections_total: int = 0, maximum_connections_total: int = 10, maximum_idle_seconds: float = 300.0, maximum_lifetime_seconds: float = 3600.0, acquire_timeout_seconds: float = 30.0, health_check_after_idle_seconds: float = 30.0, eviction_interval_seconds: float = 10.0, connect_function: Callable[..., object] = None):
+
+		self.__user_name = user_name
+		self.__password = password
+		self.__host_url = host_url
+		self.__port = port
+		self.__minimum_connections_total = minimum_connections_total
+		self.__maximum_connections_total = maximum_connections_total
+		self.__maximum_idle_seconds = maximum_idle_seconds
+		self.__maximum_lifetime_seconds = maximum_lifetime_seconds
+		self.__acquire_timeout_seconds = acquire_timeout_seconds
+		self.__health_check_after_idle_seconds = health_check_after_idle_seconds
+		self.__eviction_interval_seconds = eviction_interval_seconds
+		self.__connect_function = psycopg2.connect if connect_function is None else connect_function
+
+		self.__database_connection_pools = {}  # type: Dict[str, PostgresDatabaseConnectionPool]
+		self.__condition = threading.Condition()
+		self.__eviction_thread = None
+		self.__is_thread_active = True
+
+		self.__start_eviction_thread()
+
+	def __start_eviction_thread(self):
+
+		def _thread_method():
+
+			while True:
+				self.__condition.acquire()
+				if self.__is_thread_active:
+					self.__condition.wait(self.__eviction_interval_seconds)
+				_is_thread_active = self.__is_thread_active
+				_database_connection_pools = list(self.__database_connection_pools.values())
+				self.__condition.release()
+				if not _is_thread_active:
+					break
+				for _database_connection_pool in _database_connection_pools:
+					_database_connection_pool.evict()
+
+		self.__eviction_thread = threading.Thread(
+			target=_thread_method
+		)
+		self.__eviction_thread.daemon = True
+		self.__eviction_thread.start()
+
+	def __get_database_connection_pool(self, *, database_name: str) -> PostgresDatabaseConnectionPool:
+
+		self.__condition.acquire()
+
+		if not self.__is_thread_active:
+			self.__condition.release()
+			raise Exception(f"Cannot acquire connection to database \"{database_name}\" because the connection pool is disposed.")
+
+		_database_connection_pool = self.__database_connection_pools.get(database_name, None)
+		if _database_connection_pool is None:
+
+			def _connect_function() -> object:
+				return self.__connect_function(
+					user=self.__user_name,
+					password=self.__password,
+					host=self.__host_url,
+					port=self.__port,
+					database=database_name
+				)
+
+			_database_connection_pool = PostgresDatabaseConnectionPool(
+				database_name=database_name,
+				connect_function=_connect_function,
+				minimum_connections_total=self.__minimum_connections_total,
+				maximum_connections_total=self.__maximum_connections_total,
+				maximum_idle_seconds=self.__maximum_idle_seconds,
+				maximum_lifetime_seconds=self.__maximum_lifetime_seconds,
+				health_check_after_idle_seconds=self.__health_check_after_idle_seconds
+			)
+			self.__database_connection_pools[database_name] = _database_connection_pool
+
+		self.__condition.release()
+
+		return _database_connection_pool
+
+	def acquire(self, *, database_name: str) -> PostgresConnection:
+		_database_connection_pool = self.__get_database_connection_pool(
+			database_name=database_name
+		)
+		return _database_connection_pool.acquire(
+			timeout_seconds=self.__acquire_timeout_seconds
+		)
+
+	def release(self, *, postgres_connection: PostgresConnection, is_broken: bool):
+		_database_connection_pool = self.__database_connection_pools[postgres_connection.get_database_name()]
+		_database_connection_pool.release(
+			postgres_connection=postgres_connection,
+			is_broken=is_broken
+		)
+
+	def get_database_connection_pool(self, *, database_name: str) -> PostgresDatabaseConnectionPool:
+		return self.__get_database_connection_pool(
+			database_name=database_name
+		)
+
+	def dispose(self):
+
+		self.__condition.acquire()
+
+		_is_thread_active = self.__is_thread_active
+		self.__is_thread_active = False
+		_database_connection_pools = list(self.__database_connection_pools.values())
+		self.__condition.notify_all()
+
+		self.__condition.release()
+
+		if _is_thread_active:
+			self.__eviction_thread.join()
+
+		for _database_connection_pool in _database_connection_pools:
+			_database_connection_pool.dispose()
+
+
+class AsyncPostgresConnectionPool():
+	"""
+	This class keeps a bounded pool of asynchronous connections per database for the tasks of one event loop, so that an asynchronous database interface does not open a connection for every command. A task waiting for a connection holds no thread, and idle connections past their idle or lifetime limit are closed as connections are acquired.
+	"""
+
+	def __init__(self, *, user_name: str, password: str, host_url: str, port: int, maximum_connections_total: int = 10, maximum_idle_seconds: float = 300.0, maximum_lifetime_seconds: float = 3600.0, acquire_timeout_seconds: float = 30.0, connect_function: Callable[..., object] = None):
+
+		if maximum_connections_total < 1:
+			raise Exception(f"Cannot create connection pool with a maximum of {maximum_connections_total} connections.")
+
+		self.__user_name = user_name
+		self.__password = password
+		self.__host_url = host_url
+		self.__port = port
+		self.__maximum_connections_total = maximum_connections_total
+		self.__maximum_idle_seconds = maximum_idle_seconds
+		self.__maximum_lifetime_seconds = maximum_lifetime_seconds
+		self.__acquire_timeout_seconds = acquire_timeout_seconds
+		self.__connect_function = psycopg2.connect if connect_function is None else connect_function
+
+		# the most recently released connection is reused first, so the oldest idle connections are at the left
+		self.__idle_postgres_connections_per_database_name = {}  # type: Dict[str, Deque[PostgresConnection]]
+		# includes idle connections, acquired connections and connections that are being opened
+		self.__connections_total_per_database_name = {}  # type: Dict[str, int]
+		self.__condition = asyncio.Condition()
+		self.__is_disposed = False
+
+	@staticmethod
+	async def __wait_for_file_descriptor(*, file_descriptor: int, is_writing: bool):
+
+		_event_loop = asyncio.get_running_loop()
+		_future = _event_loop.create_future()
+
+		def _set_ready():
+			if not _future.done():
+				_future.set_result(None)
+
+		if is_writing:
+			_event_loop.add_writer(file_descriptor, _set_ready)
+		else:
+			_event_loop.add_reader(file_descriptor, _set_ready)
+		try:
+			await _future
+		finally:
+			if is_writing:
+				_event_loop.remove_writer(file_descriptor)
+			else:
+				_event_loop.remove_reader(file_descriptor)
+
+	@staticmethod
+	async def wait_for_connection(*, connection: object):
+		"""
+		Polls an asynchronous connection until its pending operation is done, waiting on its socket in the event loop in between.
+		:param connection: The asynchronous psycopg2 connection.
+		:return: None
+		"""
+
+		while True:
+			_state = connection.poll()
+			if _state == POLL_OK:
+				break
+			elif _state == POLL_READ:
+				await AsyncPostgresConnectionPool.__wait_for_file_descriptor(
+					file_descriptor=connection.fileno(),
+					is_writing=False
+				)
+			elif _state == POLL_WRITE:
+				await AsyncPostgresConnectionPool.__wait_for_file_descriptor(
+					file_descriptor=connection.fileno(),
+					is_writing=True
+				)
+			else:
+				raise Exception(f"Unexpected connection poll state \"{_state}\".")
+
+	async def __open(self, *, database_name: str) -> PostgresConnection:
+
+		_connection = self.__connect_function(
+			user=self.__user_name,
+			password=self.__password,
+			host=self.__host_url,
+			port=self.__port,
+			database=database_name,
+			async_=True
+		)
+		try:
+			await AsyncPostgresConnectionPool.wait_for_connection(
+				connection=_connection
+			)
+		except BaseException:
+			_connection.close()
+			raise
+		return PostgresConnection(
+			connection=_connection,
+			database_name=database_name
+		)
+
+	def __is_reusable(self, *, postgres_connection: PostgresConnection) -> bool:
+		return not postgres_connection.is_closed() and postgres_connection.get_lifetime_seconds() < self.__maximum_lifetime_seconds and postgres_connection.get_idle_seconds() < self.__maximum_idle_seconds
+
+	def __close(self, *, postgres_connection: PostgresConnection):
+
+		# expects the condition to be held
+		postgres_connection.close()
+		self.__connections_total_per_database_name[postgres_connection.get_database_name()] -= 1
+		self.__condition.notify_all()
+
+	async def acquire(self, *, database_name: str) -> PostgresConnection:
+
+		_deadline = time.monotonic() + self.__acquire_timeout_seconds
+		_postgres_connection = None  # type: PostgresConnection
+
+		async with self.__condition:
+			_idle_postgres_connections = self.__idle_postgres_connections_per_database_name.setdefault(database_name, deque())
+			while len(_idle_postgres_connections) != 0 and not self.__is_reusable(postgres_connection=_idle_postgres_connections[0]):
+				self.__close(
+					postgres_connection=_idle_postgres_connections.popleft()
+				)
+			while _postgres_connection is None:
+				if self.__is_disposed:
+					raise Exception(f"Cannot acquire connection to database \"{database_name}\" because the connection pool is disposed.")
+				if len(_idle_postgres_connections) != 0:
+					_postgres_connection = _idle_postgres_connections.pop()
+					if not self.__is_reusable(postgres_connection=_postgres_connection):
+						self.__close(
+							postgres_connection=_postgres_connection
+						)
+						_postgres_connection = None
+				elif self.__connections_total_per_database_name.get(database_name, 0) < self.__maximum_connections_total:
+					self.__connections_total_per_database_name[database_name] = self.__connections_total_per_database_name.get(database_name, 0) + 1
+					break
+				else:
+					_remaining_seconds = _deadline - time.monotonic()
+					if _remaining_seconds <= 0:
+						raise ConnectionPoolAcquireTimeoutException(
+							database_name=database_name,
+							timeout_seconds=self.__acquire_timeout_seconds
+						)
+					try:
+						await asyncio.wait_for(self.__condition.wait(), _remaining_seconds)
+					except asyncio.TimeoutError:
+						pass
+
+		if _postgres_connection is None:
+			# the connection is opened outside of the condition so that other tasks can release and acquire meanwhile
+			try:
+				_postgres_connection = await self.__open(
+					database_name=database_name
+				)
+			except BaseException:
+				async with self.__condition:
+					self.__connections_total_per_database_name[database_name] -= 1
+					self.__condition.notify_all()
+				raise
+
+		return _postgres_connection
+
+	async def release(self, *, postgres_connection: PostgresConnection, is_broken: bool):
+
+		async with self.__condition:
+			if is_broken or self.__is_disposed or postgres_connection.is_closed() or postgres_connection.get_lifetime_seconds() >= self.__maximum_lifetime_seconds:
+				self.__close(
+					postgres_connection=postgres_connection
+				)
+			else:
+				postgres_connection.set_used()
+				self.__idle_postgres_connections_per_database_name[postgres_connection.get_database_name()].append(postgres_connection)
+				self.__condition.notify_all()
+
+	def get_connections_total(self, *, database_name: str) -> int:
+		return self.__connections_total_per_database_name.get(database_name, 0)
+
+	def get_idle_connections_total(self, *, database_name: str) -> int:
+		return len(self.__idle_postgres_connections_per_database_name.get(database_name, ()))
+
+	async def dispose(self):
+
+		async with self.__condition:
+			self.__is_disposed = True
+			for _idle_postgres_connections in self.__idle_postgres_connections_per_database_name.values():
+				while len(_idle_postgres_connections) != 0:
+					self.__close(
+						postgres_connection=_idle_postgres_connections.pop()
+					)
+			self.__condition.notify_all()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from enum import Enum, auto
+from typing import List, BinaryIO
+import csv
+import json
+
+
+class CopyRecordFormatEnum(Enum):
+
+	Csv = auto(),
+	JsonLines = auto()
+
+
+class CopyRecordStream(ABC):
+	"""
+	This class is read by COPY ... FROM STDIN, exposing the records of an incoming stream a block at a time so that the whole payload is never held in memory.
+	"""
+
+	@staticmethod
+	def get_copy_record_stream(*, record_format: CopyRecordFormatEnum, record_stream: BinaryIO) -> CopyRecordStream:
+		if record_format == CopyRecordFormatEnum.Csv:
+			return CsvCopyRecordStream(
+				record_stream=record_stream
+			)
+		elif record_format == CopyRecordFormatEnum.JsonLines:
+			return JsonLinesCopyRecordStream(
+				record_stream=record_stream
+			)
+		else:
+			raise Exception(f"Unexpected record format: {record_format}.")
+
+	@abstractmethod
+	def get_column_names(self) -> List[str]:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def get_copy_format(self) -> str:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def read(self, size: int = -1) -> bytes:
+		raise NotImplementedError()
+
+
+class CsvCopyRecordStream(CopyRecordStream):
+	"""
+	This class passes CSV through to COPY unchanged after taking the column names from the header line.
+	"""
+
+	def __init__(self, *, record_stream: BinaryIO):
+
+		self.__record_stream = record_stream
+
+		_header_line = record_stream.readline().decode("utf-8")
+		if _header_line.strip() == "":
+			raise Exception(f"Cannot copy CSV records without a header line.")
+		self.__column_names = next(csv.reader([_header_line]))
+
+	def get_column_names(self) -> List[str]:
+		return self.__column_names.copy()
+
+	def get_copy_format(self) -> str:
+		return "csv"
+
+	def read(self, size: int = -1) -> bytes:
+		return self.__record_stream.read(size)
+
+
+class JsonLinesCopyRecordStream(CopyRecordStream):
+	"""
+	This class converts one JSON object per line into the COPY text format, taking the column names from the properties of the first object. Properties missing from later objects are copied as NULL.
+	"""
+
+	__text_format_translation = str.maketrans({
+		"\\": "\\\\",
+		"\t": "\\t",
+		"\n": "\\n",
+		"\r": "\\r"
+	})
+
+	def __init__(self, *, record_stream: BinaryIO):
+
+		self.__record_stream = record_stream
+
+		self.__buffer = bytearray()
+		self.__line_number = 0
+		self.__is_record_stream_exhausted = False
+
+		_first_record = self.__try_read_record()
+		if _first_record is None:
+			raise Exception(f"Cannot copy JSON lines records without at least one record.")
+		if not isinstance(_first_record, dict):
+			raise Exception(f"Cannot copy JSON lines record that is not an object at line {self.__line_number}.")
+		self.__column_names = list(_first_record.keys())
+		self.__column_name_set = set(self.__column_names)
+		self.__buffer.extend(self.__get_text_format_line(
+			record=_first_record
+		))
+
+	def __try_read_record(self) -> dict:
+
+		while not self.__is_record_stream_exhausted:
+			_line = self.__record_stream.readline()
+			if _line == b"":
+				self.__is_record_stream_exhausted = True
+			else:
+				self.__line_number += 1
+				if _line.strip() != b"":
+					return json.loads(_line)
+		return None
+
+	@staticmethod
+	def __get_text_format_value(*, value: object) -> str:
+		if value is None:
+			return "\\N"
+		elif isinstance(value, bool):
+			return "t" if value else "f"
+		elif isinstance(value, str):
+			return value.translate(JsonLinesCopyRecordStream.__text_format_translation)
+		elif isinstance(value, (dict, list)):
+			return json.dumps(value).translate(JsonLinesCopyRecordStream.__text_format_translation)
+		else:
+			return str(value)
+
+	def __get_text_format_line(self, *, record: dict) -> bytes:
+
+		if len(record) > len(self.__column_names) or not self.__column_name_set.issuperset(record.keys()):
+			_unexpected_property_names = [_property_name for _property_name in record.keys() if _property_name not in self.__column_name_set]
+			raise Exception(f"Cannot copy JSON lines record with unexpected properties {_unexpected_property_names} at line {self.__line_number}.")
+		_values = [JsonLinesCopyRecordStream.__get_text_format_value(
+			value=record.get(_column_name)
+		) for _column_name in self.__column_names]
+		return ("\t".join(_values) + "\n").encode("utf-8")
+
+	def get_column_names(self) -> List[str]:
+		return self.__column_names.copy()
+
+	def get_copy_format(self) -> str:
+		return "text"
+
+	def read(self, size: int = -1) -> bytes:
+
+		while size < 0 or len(self.__buffer) < size:
+			_record = self.__try_read_record()
+			if _record is None:
+				break
+			if not isinstance(_record, dict):
+				raise Exception(f"Cannot copy JSON lines record that is not an object at line {self.__line_number}.")
+			self.__buffer.extend(self.__get_text_format_line(
+				record=_record
+			))
+
+		if size < 0 or size >= len(self.__buffer):
+			_block = bytes(self.__buffer)
+			self.__buffer.clear()
+		else:
+			_block = bytes(self.__buffer[:size])
+			del self.__buffer[:size]
+		return _block
@@ -1,14 +1,29 @@
 from __future__ import annotations
-from postgres_api.database_interface import DatabaseInterface, DatabaseCommandResult
-from postgres_api.queue import SingleThreadedExecutableQueue
-from postgres_api.callback import Callback
-from typing import Dict
+from postgres_api.database_interface import DatabaseInterface, AsyncDatabaseInterface, DatabaseCommandResult
+from postgres_api.database_implementation import PostgresApiDatabaseCommandResultFactory
+from postgres_api.executable import ExecutableElement
+from postgres_api.queue import SingleThreadedExecutableQueue, ThreadPoolExecutableQueue
+from postgres_api.queue_admission import ExecutableQueueAdmissionController, ExecutableQueueRejection
+from postgres_api.async_queue import AsyncExecutableQueue
+from postgres_api.callback import Callback, AsyncCallback
+from typing import Dict, List, Callable
+import concurrent.futures
+
+
+def get_rejected_database_command_result(*, executable_queue_rejection: ExecutableQueueRejection) -> DatabaseCommandResult:
+	return PostgresApiDatabaseCommandResultFactory().get_rejected_result(
+		rejection_reason=executable_queue_rejection.get_rejection_reason().name,
+		estimated_wait_seconds=executable_queue_rejection.get_estimated_wait_seconds(),
+		error_message=executable_queue_rejection.get_error_message()
+	)
 
 
 class DatabaseCommandSingleThreadedExecutableQueue(SingleThreadedExecutableQueue):
 
-	def __init__(self, *, database_interface: DatabaseInterface, execution_result_callback: Callback):
-		super().__init__()
+	def __init__(self, *, database_interface: DatabaseInterface, execution_result_callback: Callback, admission_controller: ExecutableQueueAdmissionController = None):
+		super().__init__(
+			admission_controller=admission_controller
+		)
 
 		self.__database_interface = database_interface
 		self.__execution_result_callback = execution_result_callback
@@ -19,6 +34,89 @@ class DatabaseCommandSingleThreadedExecutableQueue(SingleThreadedExecutableQueue
 		}
 
 	def process_execution_result(self, *, execution_result: DatabaseCommandResult):
-		self.__execution_result_callback.execute(
-			data=execution_result.get_json_string()
+		self.__execution_result_callback.execute_json_convertable(
+			json_convertable=execution_result
+		)
+
+	def process_rejected_executable_element(self, *, executable_element: ExecutableElement, executable_queue_rejection: ExecutableQueueRejection):
+		super().process_rejected_executable_element(
+			executable_element=executable_element,
+			executable_queue_rejection=executable_queue_rejection
+		)
+		self.__execution_result_callback.execute_json_convertable(
+			json_convertable=get_rejected_database_command_result(
+				executable_queue_rejection=executable_queue_rejection
+			)
+		)
+
+
+class DatabaseCommandThreadPoolExecutableQueue(ThreadPoolExecutableQueue):
+
+	def __init__(self, *, database_interface_factory: Callable[[], DatabaseInterface], workers_total: int, execution_result_callback: Callback, admission_controller: ExecutableQueueAdmissionController = None):
+
+		# each worker owns its database interface since a database interface holds its connection state
+		self.__database_interfaces = [database_interface_factory() for _ in range(workers_total)]  # type: List[DatabaseInterface]
+		self.__execution_result_callback = execution_result_callback
+
+		super().__init__(
+			workers_total=workers_total,
+			admission_controller=admission_controller
+		)
+
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		return {
+			"database_interface": self.__database_interfaces[worker_index]
+		}
+
+	def process_execution_result(self, *, execution_result: DatabaseCommandResult):
+		self.__execution_result_callback.execute_json_convertable(
+			json_convertable=execution_result
+		)
+
+	def process_rejected_executable_element(self, *, executable_element: ExecutableElement, executable_queue_rejection: ExecutableQueueRejection):
+		super().process_rejected_executable_element(
+			executable_element=executable_element,
+			executable_queue_rejection=executable_queue_rejection
+		)
+		self.__execution_result_callback.execute_json_convertable(
+			json_convertable=get_rejected_database_command_result(
+				executable_queue_rejection=executable_queue_rejection
+			)
+		)
+
+
+class DatabaseCommandAsyncExecutableQueue(AsyncExecutableQueue):
+	"""
+	This class executes asynchronous elements against one asynchronous database interface per worker. Database commands are enqueued wrapped in a DatabaseCommandAsyncExecutableElement, so the built-in commands run on the event loop and as many may be in flight as there are workers, bounded only by the connection pool of the asynchronous database interfaces. A database command that cannot be executed asynchronously instead holds one of the executor threads of the queue while it runs, so at most that many of them are in flight.
+	"""
+
+	def __init__(self, *, async_database_interface_factory: Callable[[], AsyncDatabaseInterface], workers_total: int, execution_result_callback: AsyncCallback, executor_threads_total: int = 4):
+
+		if executor_threads_total < 1:
+			raise Exception(f"Cannot create async executable queue with {executor_threads_total} executor threads.")
+
+		self.__async_database_interfaces = [async_database_interface_factory() for _ in range(workers_total)]  # type: List[AsyncDatabaseInterface]
+		self.__execution_result_callback = execution_result_callback
+		self.__executor = concurrent.futures.ThreadPoolExecutor(
+			max_workers=executor_threads_total
+		)
+
+		super().__init__(
+			workers_total=workers_total
+		)
+
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		return {
+			"async_database_interface": self.__async_database_interfaces[worker_index],
+			"executor": self.__executor
+		}
+
+	async def dispose(self):
+		await super().dispose()
+		# the workers are done, so no database command is left running on the executor
+		self.__executor.shutdown()
+
+	async def process_execution_result(self, *, execution_result: DatabaseCommandResult):
+		await self.__execution_result_callback.execute_json_convertable(
+			json_convertable=execution_result
 		)
@@ -1,71 +1,98 @@
 from __future__ import annotations
-from postgres_api.database_interface import DatabaseCommand, CompositeDatabaseCommand, DatabaseCommandResult, CompositeDatabaseCommandResult, DatabaseInterface, DatabaseCommandResultFactoryInterface, DatabaseCommandFactoryInterface
+from postgres_api.database_interface import DatabaseCommand, AsyncDatabaseCommand, CompositeDatabaseCommand, DatabaseCommandResult, CompositeDatabaseCommandResult, DatabaseInterface, AsyncDatabaseInterface, DatabaseCommandResultFactoryInterface, DatabaseCommandFactoryInterface
+from postgres_api.executable import AsyncExecutableElement
+from postgres_api.json_convertable import CachedJsonConvertable
+from postgres_api.json_serializer import JsonSerializerInterface
+from postgres_api.connection_pool import PostgresConnection, PostgresConnectionSourceInterface, UnpooledPostgresConnectionSource, PostgresConnectionPool, AsyncPostgresConnectionPool
+from postgres_api.prepared_statement_cache import PreparedStatement, PreparedStatementCache
+from postgres_api.copy_record_stream import CopyRecordFormatEnum, CopyRecordStream
+from postgres_api.query_result_cache import QueryResultCache
+from postgres_api.query_result_cache_invalidation import QueryResultCacheInvalidationChannel
 import psycopg2
+import psycopg2.extras
+from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT, ISOLATION_LEVEL_DEFAULT
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Set, Awaitable, BinaryIO, Iterator, Union, Callable
+import asyncio
+import base64
+import binascii
+import concurrent.futures
+import functools
 import json
+import sys
+import time
 
 
-class SuccessCreatingDatabaseDatabaseCommandResult(DatabaseCommandResult):
+class SuccessCreatingDatabaseDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
+
+	__slots__ = ("__database_name",)
 
 	def __init__(self, *, database_name: str):
 
 		self.__database_name = database_name
 
-	def get_json_string(self) -> str:
-		return json.dumps({
+	def get_json_object(self) -> object:
+		return {
 			"version": 1,
 			"is_successful": True,
 			"database_name": self.__database_name
-		})
+		}
+
 
+class FailureCreatingDatabaseDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
 
-class FailureCreatingDatabaseDatabaseCommandResult(DatabaseCommandResult):
+	__slots__ = ("__database_name", "__error_message")
 
 	def __init__(self, *, database_name: str, error_message: str):
 
 		self.__database_name = database_name
 		self.__error_message = error_message
 
-	def get_json_string(self) -> str:
-		return json.dumps({
+	def get_json_object(self) -> object:
+		return {
 			"version": 1,
 			"is_successful": False,
 			"database_name": self.__database_name
-		})
+		}
 
 
-class SuccessConnectingToDatabaseDatabaseCommandResult(DatabaseCommandResult):
+class SuccessConnectingToDatabaseDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
+
+	__slots__ = ("__database_name",)
 
 	def __init__(self, *, database_name: str):
 
 		self.__database_name = database_name
 
-	def get_json_string(self) -> str:
-		return json.dumps({
+	def get_json_object(self) -> object:
+		return {
 			"version": 1,
 			"is_successful": True,
 			"database_name": self.__database_name
-		})
+		}
+
 
+class FailureConnectingToDatabaseDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
 
-class FailureConnectingToDatabaseDatabaseCommandResult(DatabaseCommandResult):
+	__slots__ = ("__database_name", "__error_message")
 
 	def __init__(self, *, database_name: str, error_message: str):
 
 		self.__database_name = database_name
 		self.__error_message = error_message
 
-	def get_json_string(self) -> str:
-		return json.dumps({
+	def get_json_object(self) -> object:
+		return {
 			"version": 1,
 			"is_successful": False,
 			"database_name": self.__database_name,
 			"error_message": self.__error_message
-		})
+		}
 
 
-class SuccessQueryingDatabaseDatabaseCommandResult(DatabaseCommandResult):
+class SuccessQueryingDatabaseDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
+
+	__slots__ = ("__query", "__parameters", "__output")
 
 	def __init__(self, *, query: str, parameters: Dict[str, object], output: object):
 
@@ -76,17 +103,19 @@ class SuccessQueryingDatabaseDatabaseCommandResult(DatabaseCommandResult):
 	def get_output(self) -> object:
 		return self.__output
 
-	def get_json_string(self) -> str:
-		return json.dumps({
+	def get_json_object(self) -> object:
+		return {
 			"version": 1,
 			"is_successful": True,
 			"query": self.__query,
 			"parameters": self.__parameters,
 			"output": self.__output
-		})
+		}
+
 
+class FailureQueryingDatabaseDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
 
-class FailureQueryingDatabaseDatabaseCommandResult(DatabaseCommandResult):
+	__slots__ = ("__query", "__parameters", "__output", "__error_message")
 
 	def __init__(self, *, query: str, parameters: Dict[str, object], output: object, error_message: str):
 
@@ -98,49 +127,303 @@ class FailureQueryingDatabaseDatabaseCommandResult(DatabaseCommandResult):
 	def get_output(self) -> object:
 		return self.__output
 
-	def get_json_string(self) -> str:
-		return json.dumps({
+	def get_json_object(self) -> object:
+		return {
 			"version": 1,
 			"is_successful": False,
 			"query": self.__query,
 			"parameters": self.__parameters,
 			"output": self.__output,
 			"error_message": self.__error_message
+		}
+
+
+class StreamingQueryingDatabaseDatabaseCommandResult(DatabaseCommandResult):
+	"""
+	This class serializes the rows as they are fetched so that neither the rows nor the json string are ever held in memory together. The result can be streamed only once. If fetching fails after the output has started, the output is closed early and the failure is reported after it.
+	"""
+
+	__slots__ = ("__query", "__parameters", "__row_batches", "__is_streamed")
+
+	def __init__(self, *, query: str, parameters: Dict[str, object], row_batches: Iterator[List[Tuple]]):
+
+		self.__query = query
+		self.__parameters = parameters
+		self.__row_batches = row_batches
+
+		self.__is_streamed = False
+
+	def __get_json_buffers(self) -> Iterator[Union[bytes, memoryview]]:
+
+		if self.__is_streamed:
+			raise Exception(f"Cannot stream querying result more than once.")
+		self.__is_streamed = True
+
+		_json_prefix = json.dumps({
+			"version": 1,
+			"query": self.__query,
+			"parameters": self.__parameters
 		})
+		# the output is left open at the end of the object so that the rows can follow as they are fetched
+		yield (_json_prefix[:-1] + ", \"output\": [").encode("utf-8")
+		_error_message = None  # type: str
+		try:
+			_is_first_row_batch = True
+			for _row_batch in self.__row_batches:
+				if len(_row_batch) != 0:
+					_rows_json_bytes = JsonSerializerInterface.get_default().dumps(
+						json_object=_row_batch
+					)
+					# the brackets of each batch are skipped by a view rather than by copying the serialized rows
+					_rows_json_view = memoryview(_rows_json_bytes)[1:-1]
+					if _is_first_row_batch:
+						_is_first_row_batch = False
+					else:
+						yield b", "
+					yield _rows_json_view
+		except Exception as ex:
+			_error_message = str(ex)
+		finally:
+			if hasattr(self.__row_batches, "close"):
+				self.__row_batches.close()
+		if _error_message is None:
+			yield b"], \"is_successful\": true}"
+		else:
+			yield ("], \"is_successful\": false, \"error_message\": " + json.dumps(_error_message) + "}").encode("utf-8")
+
+	def get_json_bytes_chunks(self) -> Iterator[bytes]:
+		# wsgi servers only accept bytes, so only here are the views of the rows copied
+		for _json_buffer in self.__get_json_buffers():
+			yield bytes(_json_buffer)
+
+	def get_json_chunks(self) -> Iterator[str]:
+		for _json_buffer in self.__get_json_buffers():
+			yield str(_json_buffer, "utf-8")
+
+	def get_json_bytes(self) -> bytes:
+		return b"".join(self.__get_json_buffers())
+
+	def get_json_string(self) -> str:
+		return self.get_json_bytes().decode("utf-8")
+
+	def write_json_to(self, *, buffer: BinaryIO) -> int:
+		_bytes_total = 0
+		for _json_buffer in self.__get_json_buffers():
+			_bytes_total += buffer.write(_json_buffer)
+		return _bytes_total
+
+
+class SuccessGettingRecordsPageDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
+
+	__slots__ = ("__table_name", "__records", "__continuation_token")
+
+	def __init__(self, *, table_name: str, records: List[List[object]], continuation_token: str):
+
+		self.__table_name = table_name
+		self.__records = records
+		self.__continuation_token = continuation_token
+
+	def get_records(self) -> List[List[object]]:
+		return self.__records
+
+	def get_continuation_token(self) -> str:
+		return self.__continuation_token
+
+	def get_json_object(self) -> object:
+		return {
+			"version": 1,
+			"is_successful": True,
+			"table_name": self.__table_name,
+			"records": self.__records,
+			"continuation_token": self.__continuation_token
+		}
+
+
+class FailureGettingRecordsPageDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
+
+	__slots__ = ("__table_name", "__continuation_token", "__error_message")
+
+	def __init__(self, *, table_name: str, continuation_token: str, error_message: str):
+
+		self.__table_name = table_name
+		self.__continuation_token = continuation_token
+		self.__error_message = error_message
+
+	def get_json_object(self) -> object:
+		return {
+			"version": 1,
+			"is_successful": False,
+			"table_name": self.__table_name,
+			"continuation_token": self.__continuation_token,
+			"error_message": self.__error_message
+		}
+
+
+class SuccessBatchQueryingDatabaseDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
+
+	__slots__ = ("__query", "__row_error_messages")
+
+	def __init__(self, *, query: str, row_error_messages: List[str]):
+
+		self.__query = query
+		self.__row_error_messages = row_error_messages
+
+	def get_row_error_messages(self) -> List[str]:
+		return self.__row_error_messages.copy()
+
+	def get_failed_rows_total(self) -> int:
+		return len(self.__row_error_messages) - self.__row_error_messages.count(None)
+
+	def get_json_object(self) -> object:
+		# only the failed rows are listed so that the result stays small for large batches
+		_failed_rows = [{
+			"index": _index,
+			"error_message": _error_message
+		} for _index, _error_message in enumerate(self.__row_error_messages) if _error_message is not None]
+		return {
+			"version": 1,
+			"is_successful": len(_failed_rows) == 0,
+			"query": self.__query,
+			"rows_total": len(self.__row_error_messages),
+			"failed_rows": _failed_rows
+		}
+
+
+class FailureBatchQueryingDatabaseDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
+
+	__slots__ = ("__query", "__rows_total", "__error_message")
+
+	def __init__(self, *, query: str, rows_total: int, error_message: str):
+
+		self.__query = query
+		self.__rows_total = rows_total
+		self.__error_message = error_message
+
+	def get_json_object(self) -> object:
+		return {
+			"version": 1,
+			"is_successful": False,
+			"query": self.__query,
+			"rows_total": self.__rows_total,
+			"error_message": self.__error_message
+		}
+
+
+class SuccessCopyingRecordsDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
+
+	__slots__ = ("__table_name", "__rows_total", "__elapsed_seconds")
+
+	def __init__(self, *, table_name: str, rows_total: int, elapsed_seconds: float):
+
+		self.__table_name = table_name
+		self.__rows_total = rows_total
+		self.__elapsed_seconds = elapsed_seconds
+
+	def get_rows_total(self) -> int:
+		return self.__rows_total
+
+	def get_rows_per_second(self) -> float:
+		if self.__elapsed_seconds <= 0:
+			return 0.0
+		return self.__rows_total / self.__elapsed_seconds
+
+	def get_json_object(self) -> object:
+		return {
+			"version": 1,
+			"is_successful": True,
+			"table_name": self.__table_name,
+			"rows_total": self.__rows_total,
+			"elapsed_seconds": self.__elapsed_seconds,
+			"rows_per_second": self.get_rows_per_second()
+		}
+
+
+class FailureCopyingRecordsDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
+
+	__slots__ = ("__table_name", "__error_message")
+
+	def __init__(self, *, table_name: str, error_message: str):
+
+		self.__table_name = table_name
+		self.__error_message = error_message
+
+	def get_json_object(self) -> object:
+		return {
+			"version": 1,
+			"is_successful": False,
+			"table_name": self.__table_name,
+			"error_message": self.__error_message
+		}
 
 
-class SuccessDisconnectingFromDatabaseDatabaseCommandResult(DatabaseCommandResult):
+class SuccessDisconnectingFromDatabaseDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
+
+	__slots__ = ("__database_name",)
 
 	def __init__(self, *, database_name: str):
 
 		self.__database_name = database_name
 
-	def get_json_string(self) -> str:
-		return json.dumps({
+	def get_json_object(self) -> object:
+		return {
 			"version": 1,
 			"is_successful": True,
 			"database_name": self.__database_name
-		})
+		}
+
 
+class FailureDisconnectingFromDatabaseDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
 
-class FailureDisconnectingFromDatabaseDatabaseCommandResult(DatabaseCommandResult):
+	__slots__ = ("__database_name", "__error_message")
 
 	def __init__(self, *, database_name: str, error_message: str):
 
 		self.__database_name = database_name
 		self.__error_message = error_message
 
-	def get_json_string(self) -> str:
-		return json.dumps({
+	def get_json_object(self) -> object:
+		return {
 			"version": 1,
 			"is_successful": False,
 			"database_name": self.__database_name,
 			"error_message": self.__error_message
-		})
+		}
+
+
+class RejectedDatabaseCommandResult(CachedJsonConvertable, DatabaseCommandResult):
+	"""
+	This class is the result of a database command that a queue did not execute because it was over capacity or its queue wait was too long, so that a client can back off for the retry after seconds before trying again.
+	"""
+
+	__slots__ = ("__rejection_reason", "__estimated_wait_seconds", "__error_message")
+
+	def __init__(self, *, rejection_reason: str, estimated_wait_seconds: float, error_message: str):
+
+		self.__rejection_reason = rejection_reason
+		self.__estimated_wait_seconds = estimated_wait_seconds
+		self.__error_message = error_message
+
+	def get_rejection_reason(self) -> str:
+		return self.__rejection_reason
+
+	def get_retry_after_seconds(self) -> float:
+		return self.__estimated_wait_seconds
+
+	def get_json_object(self) -> object:
+		return {
+			"version": 1,
+			"is_successful": False,
+			"is_rejected": True,
+			"rejection_reason": self.__rejection_reason,
+			"retry_after_seconds": self.__estimated_wait_seconds,
+			"error_message": self.__error_message
+		}
 
 
 class ExecuteQueryDatabaseCommandResult(CompositeDatabaseCommandResult):
 
+	__slots__ = ("__is_successful",)
+
 	def __init__(self, *, child_database_command_results: List[DatabaseCommandResult], is_successful: bool):
 		super().__init__(
 			child_database_command_results=child_database_command_results
@@ -156,8 +439,90 @@ class ExecuteQueryDatabaseCommandResult(CompositeDatabaseCommandResult):
 			_database_command_result = self.get_child_command_results()[1]  # type: SuccessQueryingDatabaseDatabaseCommandResult
 			return True, _database_command_result.get_output()
 
+	def get_json_object(self) -> object:
+		return {
+			"version": 1,
+			"is_successful": self.__is_successful,
+			"child_results": [_child_command_result.get_json_object() for _child_command_result in self.get_child_command_results()]
+		}
+
+
+class ExecuteBatchQueryDatabaseCommandResult(CompositeDatabaseCommandResult):
+
+	__slots__ = ("__is_successful",)
+
+	def __init__(self, *, child_database_command_results: List[DatabaseCommandResult], is_successful: bool):
+		super().__init__(
+			child_database_command_results=child_database_command_results
+		)
+
+		self.__is_successful = is_successful
+
+	def try_get_row_error_messages(self) -> Tuple[bool, List[str]]:
+
+		if not self.__is_successful:
+			return False, None
+		else:
+			_database_command_result = self.get_child_command_results()[1]  # type: SuccessBatchQueryingDatabaseDatabaseCommandResult
+			return True, _database_command_result.get_row_error_messages()
+
+	def get_json_object(self) -> object:
+		return {
+			"version": 1,
+			"is_successful": self.__is_successful,
+			"child_results": [_child_command_result.get_json_object() for _child_command_result in self.get_child_command_results()]
+		}
+
+
+async def _execute_connected_database_command_async(*, async_database_interface: AsyncDatabaseInterface, database_command_result_factory: DatabaseCommandResultFactoryInterface, database_name: str, execute_function: Callable[[], Awaitable[Tuple[bool, DatabaseCommandResult]]]) -> Tuple[bool, List[DatabaseCommandResult]]:
+
+	# connects, awaits the execute function and disconnects with the same child results as the synchronous database commands
+	_results = []  # type: List[DatabaseCommandResult]
+
+	_is_successful = True
+	_is_connected = False
+
+	try:
+		await async_database_interface.connect_to_database(
+			database_name=database_name
+		)
+		_is_connected = True
+		_connecting_to_database_result = database_command_result_factory.get_success_connecting_to_database_result(
+			database_name=database_name
+		)
+	except Exception as ex:
+		_is_successful = False
+		_connecting_to_database_result = database_command_result_factory.get_failure_connecting_to_database_result(
+			database_name=database_name,
+			error_message=str(ex)
+		)
+	_results.append(_connecting_to_database_result)
+
+	try:
+		if _is_successful:
+			_is_successful, _executing_result = await execute_function()
+			_results.append(_executing_result)
+	finally:
+		# the connection is released even if the command failed or was cancelled, since a pooled connection would otherwise never be returned
+		if _is_connected:
+			try:
+				await async_database_interface.disconnect_from_database()
+				_disconnecting_from_database_result = database_command_result_factory.get_success_disconnecting_from_database_result(
+					database_name=database_name
+				)
+			except Exception as ex:
+				_disconnecting_from_database_result = database_command_result_factory.get_failure_disconnecting_from_database_result(
+					database_name=database_name,
+					error_message=str(ex)
+				)
+			_results.append(_disconnecting_from_database_result)
+
+	return _is_successful, _results
+
 
-class CreateDatabaseDatabaseCommand(DatabaseCommand):
+class CreateDatabaseDatabaseCommand(DatabaseCommand, AsyncDatabaseCommand):
+
+	__slots__ = ("__database_name",)
 
 	def __init__(self, *, database_name: str):
 
@@ -180,8 +545,27 @@ class CreateDatabaseDatabaseCommand(DatabaseCommand):
 			)
 		return _result
 
+	async def execute_async(self, *, async_database_interface: AsyncDatabaseInterface, database_command_result_factory: DatabaseCommandResultFactoryInterface) -> DatabaseCommandResult:
+
+		_result = None
+		try:
+			await async_database_interface.create_database(
+				database_name=self.__database_name
+			)
+			_result = database_command_result_factory.get_success_creating_database_result(
+				database_name=self.__database_name
+			)
+		except Exception as ex:
+			_result = database_command_result_factory.get_failure_creating_database_result(
+				database_name=self.__database_name,
+				error_message=str(ex)
+			)
+		return _result
+
 
-class ExecuteQueryDatabaseCommand(DatabaseCommand):
+class ExecuteQueryDatabaseCommand(DatabaseCommand, AsyncDatabaseCommand):
+
+	__slots__ = ("__database_name", "__query", "__parameters")
 
 	def __init__(self, *, database_name: str, query: str, parameters: Dict[str, str]):
 
@@ -189,17 +573,31 @@ class ExecuteQueryDatabaseCommand(DatabaseCommand):
 		self.__query = query
 		self.__parameters = parameters
 
+	@staticmethod
+	def get_parameters_bytes_total(*, parameters: Dict[str, object]) -> int:
+		if parameters is None:
+			return 0
+		# only the parameters themselves are counted, not anything they refer to
+		return sys.getsizeof(parameters) + sum(sys.getsizeof(_key) + sys.getsizeof(_value) for _key, _value in parameters.items())
+
+	def get_estimated_bytes_total(self) -> int:
+		return sys.getsizeof(self) + sys.getsizeof(self.__query) + ExecuteQueryDatabaseCommand.get_parameters_bytes_total(
+			parameters=self.__parameters
+		)
+
 	def execute(self, *, database_interface: DatabaseInterface, database_command_result_factory: DatabaseCommandResultFactoryInterface) -> DatabaseCommandResult:
 
 		_results = []  # type: List[DatabaseCommandResult]
 
 		_is_successful = True
+		_is_connected = False
 
 		if _is_successful:
 			try:
 				database_interface.connect_to_database(
 					database_name=self.__database_name
 				)
+				_is_connected = True
 				_connecting_to_database_result = database_command_result_factory.get_success_connecting_to_database_result(
 					database_name=self.__database_name
 				)
@@ -233,7 +631,8 @@ class ExecuteQueryDatabaseCommand(DatabaseCommand):
 				)
 			_results.append(_querying_database_result)
 
-		if _is_successful:
+		# the connection is released even if the command failed, since a pooled connection would otherwise never be returned
+		if _is_connected:
 			try:
 				database_interface.disconnect_from_database()
 				_disconnecting_from_database_result = database_command_result_factory.get_success_disconnecting_from_database_result(
@@ -246,67 +645,1301 @@ class ExecuteQueryDatabaseCommand(DatabaseCommand):
 				)
 			_results.append(_disconnecting_from_database_result)
 
-		_result = CompositeDatabaseCommandResult(
-			child_database_command_results=_results
+		_result = ExecuteQueryDatabaseCommandResult(
+			child_database_command_results=_results,
+			is_successful=_is_successful
 		)
 
 		return _result
 
+	async def execute_async(self, *, async_database_interface: AsyncDatabaseInterface, database_command_result_factory: DatabaseCommandResultFactoryInterface) -> DatabaseCommandResult:
 
-class PostgresDatabase(DatabaseInterface):
-
-	def __init__(self, *, user_name: str, password: str, host_url: str, port: int):
-		super().__init__()
-
-		self.__user_name = user_name
-		self.__password = password
-		self.__host_url = host_url
-		self.__port = port
-
-		self.__connected_to_database = None  # type: str
-
-		pass
-
-	def create_database(self, *, database_name: str):
+		async def _execute_query() -> Tuple[bool, DatabaseCommandResult]:
+			_output = None
+			try:
+				_output = await async_database_interface.execute_query(
+					query=self.__query,
+					parameters=self.__parameters
+				)
+				return True, database_command_result_factory.get_success_querying_database_result(
+					query=self.__query,
+					parameters=self.__parameters,
+					output=_output
+				)
+			except Exception as ex:
+				return False, database_command_result_factory.get_failure_querying_database_result(
+					query=self.__query,
+					parameters=self.__parameters,
+					output=_output,
+					error_message=str(ex)
+				)
 
-		_connection = psycopg2.connect(
-			user=self.__user_name,
-			password=self.__password,
-			host=self.__host_url,
-			port=self.__port,
-			database="postgres"
+		_is_successful, _results = await _execute_connected_database_command_async(
+			async_database_interface=async_database_interface,
+			database_command_result_factory=database_command_result_factory,
+			database_name=self.__database_name,
+			execute_function=_execute_query
 		)
 
-		raise NotImplementedError()
-
-	def connect_to_database(self, *, database_name: str):
+		return ExecuteQueryDatabaseCommandResult(
+			child_database_command_results=_results,
+			is_successful=_is_successful
+		)
 
-		if self.__connected_to_database is not None:
-			raise Exception(f"Cannot connect to database \"{database_name}\" because already connected to database \"{self.__connected_to_database}\".")
-		self.__connected_to_database = database_name
 
-	def disconnect_from_database(self):
+class ExecuteBatchQueryDatabaseCommand(DatabaseCommand, AsyncDatabaseCommand):
 
-		if self.__connected_to_database is None:
-			raise Exception(f"Unexpected attempt to disconnect from database while not connected to a database.")
-		self.__connected_to_database = None
+	__slots__ = ("__database_name", "__query", "__parameters_list")
 
-	def execute_query(self, *, query: str, parameters: Dict[str, object]) -> object:
+	def __init__(self, *, database_name: str, query: str, parameters_list: List[Dict[str, object]]):
 
-		raise NotImplementedError()
+		self.__database_name = database_name
+		self.__query = query
+		self.__parameters_list = parameters_list
 
+	def get_estimated_bytes_total(self) -> int:
+		return sys.getsizeof(self) + sys.getsizeof(self.__query) + sys.getsizeof(self.__parameters_list) + sum(ExecuteQueryDatabaseCommand.get_parameters_bytes_total(
+			parameters=_parameters
+		) for _parameters in self.__parameters_list)
 
-class PostgresDatabaseCommandFactory(DatabaseCommandFactoryInterface):
+	def execute(self, *, database_interface: DatabaseInterface, database_command_result_factory: DatabaseCommandResultFactoryInterface) -> DatabaseCommandResult:
 
-	def get_execute_query_database_command(self, *, query: str, parameters: Dict[str, object]):
+		_results = []  # type: List[DatabaseCommandResult]
 
-		raise NotImplementedError()
+		_is_successful = True
+		_is_connected = False
 
+		if _is_successful:
+			try:
+				database_interface.connect_to_database(
+					database_name=self.__database_name
+				)
+				_is_connected = True
+				_connecting_to_database_result = database_command_result_factory.get_success_connecting_to_database_result(
+					database_name=self.__database_name
+				)
+			except Exception as ex:
+				_is_successful = False
+				_connecting_to_database_result = database_command_result_factory.get_failure_connecting_to_database_result(
+					database_name=self.__database_name,
+					error_message=str(ex)
+				)
+			_results.append(_connecting_to_database_result)
 
-class PostgresApiDatabaseCommandResultFactory(DatabaseCommandResultFactoryInterface):
+		if _is_successful:
+			try:
+				_row_error_messages = database_interface.execute_batch_query(
+					query=self.__query,
+					parameters_list=self.__parameters_list
+				)
+				_batch_querying_database_result = database_command_result_factory.get_success_batch_querying_database_result(
+					query=self.__query,
+					row_error_messages=_row_error_messages
+				)
+			except Exception as ex:
+				_is_successful = False
+				_batch_querying_database_result = database_command_result_factory.get_failure_batch_querying_database_result(
+					query=self.__query,
+					rows_total=len(self.__parameters_list),
+					error_message=str(ex)
+				)
+			_results.append(_batch_querying_database_result)
 
-	def get_success_creating_database_result(self, *, database_name: str) -> DatabaseCommandResult:
-		return SuccessCreatingDatabaseDatabaseCommandResult(
+		# the connection is released even if the command failed, since a pooled connection would otherwise never be returned
+		if _is_connected:
+			try:
+				database_interface.disconnect_from_database()
+				_disconnecting_from_database_result = database_command_result_factory.get_success_disconnecting_from_database_result(
+					database_name=self.__database_name
+				)
+			except Exception as ex:
+				_disconnecting_from_database_result = database_command_result_factory.get_failure_disconnecting_from_database_result(
+					database_name=self.__database_name,
+					error_message=str(ex)
+				)
+			_results.append(_disconnecting_from_database_result)
+
+		_result = ExecuteBatchQueryDatabaseCommandResult(
+			child_database_command_results=_results,
+			is_successful=_is_successful
+		)
+
+		return _result
+
+	async def execute_async(self, *, async_database_interface: AsyncDatabaseInterface, database_command_result_factory: DatabaseCommandResultFactoryInterface) -> DatabaseCommandResult:
+
+		async def _execute_batch_query() -> Tuple[bool, DatabaseCommandResult]:
+			try:
+				_row_error_messages = await async_database_interface.execute_batch_query(
+					query=self.__query,
+					parameters_list=self.__parameters_list
+				)
+				return True, database_command_result_factory.get_success_batch_querying_database_result(
+					query=self.__query,
+					row_error_messages=_row_error_messages
+				)
+			except Exception as ex:
+				return False, database_command_result_factory.get_failure_batch_querying_database_result(
+					query=self.__query,
+					rows_total=len(self.__parameters_list),
+					error_message=str(ex)
+				)
+
+		_is_successful, _results = await _execute_connected_database_command_async(
+			async_database_interface=async_database_interface,
+			database_command_result_factory=database_command_result_factory,
+			database_name=self.__database_name,
+			execute_function=_execute_batch_query
+		)
+
+		return ExecuteBatchQueryDatabaseCommandResult(
+			child_database_command_results=_results,
+			is_successful=_is_successful
+		)
+
+
+class StreamQueryDatabaseCommand(DatabaseCommand):
+	"""
+	This class returns a result that connects, executes the query on a server-side cursor and disconnects while it is streamed. The database interface must not execute another command until the result has been streamed, so the command is meant to be executed while handling the request that streams the result.
+	"""
+
+	__slots__ = ("__database_name", "__query", "__parameters", "__fetch_rows_total")
+
+	def __init__(self, *, database_name: str, query: str, parameters: Dict[str, object], fetch_rows_total: int = 1000):
+
+		self.__database_name = database_name
+		self.__query = query
+		self.__parameters = parameters
+		self.__fetch_rows_total = fetch_rows_total
+
+	def get_estimated_bytes_total(self) -> int:
+		return sys.getsizeof(self) + sys.getsizeof(self.__query) + ExecuteQueryDatabaseCommand.get_parameters_bytes_total(
+			parameters=self.__parameters
+		)
+
+	def execute(self, *, database_interface: DatabaseInterface, database_command_result_factory: DatabaseCommandResultFactoryInterface) -> DatabaseCommandResult:
+
+		def _get_row_batches() -> Iterator[List[Tuple]]:
+			database_interface.connect_to_database(
+				database_name=self.__database_name
+			)
+			try:
+				yield from database_interface.execute_streaming_query(
+					query=self.__query,
+					parameters=self.__parameters,
+					fetch_rows_total=self.__fetch_rows_total
+				)
+			finally:
+				database_interface.disconnect_from_database()
+
+		_result = database_command_result_factory.get_streaming_querying_database_result(
+			query=self.__query,
+			parameters=self.__parameters,
+			row_batches=_get_row_batches()
+		)
+
+		return _result
+
+
+class GetRecordsDatabaseCommandResult(CompositeDatabaseCommandResult):
+
+	__slots__ = ("__is_successful",)
+
+	def __init__(self, *, child_database_command_results: List[DatabaseCommandResult], is_successful: bool):
+		super().__init__(
+			child_database_command_results=child_database_command_results
+		)
+
+		self.__is_successful = is_successful
+
+	def try_get_records_page(self) -> Tuple[bool, List[List[object]], str]:
+
+		if not self.__is_successful:
+			return False, None, None
+		else:
+			_database_command_result = self.get_child_command_results()[1]  # type: SuccessGettingRecordsPageDatabaseCommandResult
+			return True, _database_command_result.get_records(), _database_command_result.get_continuation_token()
+
+	def get_json_object(self) -> object:
+		return {
+			"version": 1,
+			"is_successful": self.__is_successful,
+			"child_results": [_child_command_result.get_json_object() for _child_command_result in self.get_child_command_results()]
+		}
+
+
+class GetRecordsDatabaseCommand(DatabaseCommand, AsyncDatabaseCommand):
+	"""
+	This class gets one page of records in ascending order of the sort columns. Each page seeks past the last sort key of the previous page, so deep pages cost the same as the first when the sort columns are indexed. The sort columns must identify a record uniquely, such as by ending with the primary key.
+	"""
+
+	__slots__ = ("__database_name", "__table_name", "__sort_column_names", "__page_rows_total", "__continuation_token")
+
+	def __init__(self, *, database_name: str, table_name: str, sort_column_names: List[str], page_rows_total: int, continuation_token: str = None):
+
+		if len(sort_column_names) == 0:
+			raise Exception(f"Cannot get records without at least one sort column.")
+		if page_rows_total < 1:
+			raise Exception(f"Cannot get records with {page_rows_total} rows per page.")
+
+		self.__database_name = database_name
+		self.__table_name = table_name
+		self.__sort_column_names = sort_column_names
+		self.__page_rows_total = page_rows_total
+		self.__continuation_token = continuation_token
+
+	@staticmethod
+	def get_quoted_identifier(*, identifier: str) -> str:
+		return ".".join(["\"" + _name.replace("\"", "\"\"") + "\"" for _name in identifier.split(".")])
+
+	@staticmethod
+	def get_continuation_token(*, table_name: str, sort_column_names: List[str], last_sort_key: List[object]) -> str:
+		_json_string = json.dumps({
+			"version": 1,
+			"table_name": table_name,
+			"sort_column_names": sort_column_names,
+			"last_sort_key": last_sort_key
+		}, default=str)
+		return base64.urlsafe_b64encode(_json_string.encode("utf-8")).decode("ascii")
+
+	@staticmethod
+	def get_last_sort_key(*, continuation_token: str, table_name: str, sort_column_names: List[str]) -> List[object]:
+
+		try:
+			_json = json.loads(base64.urlsafe_b64decode(continuation_token.encode("ascii")))
+		except (binascii.Error, UnicodeError, ValueError):
+			raise Exception(f"Cannot parse continuation token \"{continuation_token}\".")
+		if not isinstance(_json, dict) or _json.get("version") != 1 or not isinstance(_json.get("last_sort_key"), list):
+			raise Exception(f"Cannot parse continuation token \"{continuation_token}\".")
+		if _json.get("table_name") != table_name or _json.get("sort_column_names") != list(sort_column_names):
+			raise Exception(f"Cannot continue getting records from table \"{table_name}\" with a continuation token of a different table or sort order.")
+		return _json["last_sort_key"]
+
+	def __get_query(self, *, is_continued: bool) -> str:
+
+		_sort_columns = ", ".join([GetRecordsDatabaseCommand.get_quoted_identifier(
+			identifier=_sort_column_name
+		) for _sort_column_name in self.__sort_column_names])
+		# the sort key is selected ahead of the record to build the continuation token from the last row
+		_query = f"SELECT {_sort_columns}, * FROM {GetRecordsDatabaseCommand.get_quoted_identifier(identifier=self.__table_name)}"
+		if is_continued:
+			_last_sort_key_parameters = ", ".join([f"%(last_sort_key_{_index})s" for _index in range(len(self.__sort_column_names))])
+			_query += f" WHERE ({_sort_columns}) > ({_last_sort_key_parameters})"
+		_query += f" ORDER BY {_sort_columns} LIMIT %(limit)s"
+		return _query
+
+	def __get_records_page_parameters(self) -> Dict[str, object]:
+
+		# one extra row shows whether another page follows without returning an empty last page
+		_parameters = {
+			"limit": self.__page_rows_total + 1
+		}  # type: Dict[str, object]
+		if self.__continuation_token is not None:
+			_last_sort_key = GetRecordsDatabaseCommand.get_last_sort_key(
+				continuation_token=self.__continuation_token,
+				table_name=self.__table_name,
+				sort_column_names=self.__sort_column_names
+			)
+			if len(_last_sort_key) != len(self.__sort_column_names):
+				raise Exception(f"Cannot parse continuation token \"{self.__continuation_token}\".")
+			for _index, _value in enumerate(_last_sort_key):
+				_parameters[f"last_sort_key_{_index}"] = _value
+		return _parameters
+
+	def __get_records_page(self, *, rows: List[Tuple]) -> Tuple[List[List[object]], str]:
+
+		_sort_columns_total = len(self.__sort_column_names)
+		_records = [list(_row[_sort_columns_total:]) for _row in rows[:self.__page_rows_total]]
+		if len(rows) <= self.__page_rows_total:
+			_continuation_token = None
+		else:
+			_continuation_token = GetRecordsDatabaseCommand.get_continuation_token(
+				table_name=self.__table_name,
+				sort_column_names=self.__sort_column_names,
+				last_sort_key=list(rows[self.__page_rows_total - 1][:_sort_columns_total])
+			)
+		return _records, _continuation_token
+
+	def execute(self, *, database_interface: DatabaseInterface, database_command_result_factory: DatabaseCommandResultFactoryInterface) -> DatabaseCommandResult:
+
+		_results = []  # type: List[DatabaseCommandResult]
+
+		_is_successful = True
+		_is_connected = False
+
+		if _is_successful:
+			try:
+				database_interface.connect_to_database(
+					database_name=self.__database_name
+				)
+				_is_connected = True
+				_connecting_to_database_result = database_command_result_factory.get_success_connecting_to_database_result(
+					database_name=self.__database_name
+				)
+			except Exception as ex:
+				_is_successful = False
+				_connecting_to_database_result = database_command_result_factory.get_failure_connecting_to_database_result(
+					database_name=self.__database_name,
+					error_message=str(ex)
+				)
+			_results.append(_connecting_to_database_result)
+
+		if _is_successful:
+			try:
+				_records, _continuation_token = self.__get_records_page(
+					rows=database_interface.execute_query(
+						query=self.__get_query(
+							is_continued=self.__continuation_token is not None
+						),
+						parameters=self.__get_records_page_parameters()
+					)
+				)
+				_getting_records_page_result = database_command_result_factory.get_success_getting_records_page_result(
+					table_name=self.__table_name,
+					records=_records,
+					continuation_token=_continuation_token
+				)
+			except Exception as ex:
+				_is_successful = False
+				_getting_records_page_result = database_command_result_factory.get_failure_getting_records_page_result(
+					table_name=self.__table_name,
+					continuation_token=self.__continuation_token,
+					error_message=str(ex)
+				)
+			_results.append(_getting_records_page_result)
+
+		# the connection is released even if the command failed, since a pooled connection would otherwise never be returned
+		if _is_connected:
+			try:
+				database_interface.disconnect_from_database()
+				_disconnecting_from_database_result = database_command_result_factory.get_success_disconnecting_from_database_result(
+					database_name=self.__database_name
+				)
+			except Exception as ex:
+				_disconnecting_from_database_result = database_command_result_factory.get_failure_disconnecting_from_database_result(
+					database_name=self.__database_name,
+					error_message=str(ex)
+				)
+			_results.append(_disconnecting_from_database_result)
+
+		_result = GetRecordsDatabaseCommandResult(
+			child_database_command_results=_results,
+			is_successful=_is_successful
+		)
+
+		return _result
+
+	async def execute_async(self, *, async_database_interface: AsyncDatabaseInterface, database_command_result_factory: DatabaseCommandResultFactoryInterface) -> DatabaseCommandResult:
+
+		async def _get_records_page() -> Tuple[bool, DatabaseCommandResult]:
+			try:
+				_records, _continuation_token = self.__get_records_page(
+					rows=await async_database_interface.execute_query(
+						query=self.__get_query(
+							is_continued=self.__continuation_token is not None
+						),
+						parameters=self.__get_records_page_parameters()
+					)
+				)
+				return True, database_command_result_factory.get_success_getting_records_page_result(
+					table_name=self.__table_name,
+					records=_records,
+					continuation_token=_continuation_token
+				)
+			except Exception as ex:
+				return False, database_command_result_factory.get_failure_getting_records_page_result(
+					table_name=self.__table_name,
+					continuation_token=self.__continuation_token,
+					error_message=str(ex)
+				)
+
+		_is_successful, _results = await _execute_connected_database_command_async(
+			async_database_interface=async_database_interface,
+			database_command_result_factory=database_command_result_factory,
+			database_name=self.__database_name,
+			execute_function=_get_records_page
+		)
+
+		return GetRecordsDatabaseCommandResult(
+			child_database_command_results=_results,
+			is_successful=_is_successful
+		)
+
+
+class BulkInsertRecordsDatabaseCommandResult(CompositeDatabaseCommandResult):
+
+	__slots__ = ("__is_successful",)
+
+	def __init__(self, *, child_database_command_results: List[DatabaseCommandResult], is_successful: bool):
+		super().__init__(
+			child_database_command_results=child_database_command_results
+		)
+
+		self.__is_successful = is_successful
+
+	def try_get_rows_total(self) -> Tuple[bool, int]:
+
+		if not self.__is_successful:
+			return False, None
+		else:
+			_database_command_result = self.get_child_command_results()[1]  # type: SuccessCopyingRecordsDatabaseCommandResult
+			return True, _database_command_result.get_rows_total()
+
+	def get_json_object(self) -> object:
+		return {
+			"version": 1,
+			"is_successful": self.__is_successful,
+			"child_results": [_child_command_result.get_json_object() for _child_command_result in self.get_child_command_results()]
+		}
+
+
+class BulkInsertRecordsDatabaseCommand(DatabaseCommand):
+	"""
+	This class copies CSV or JSON lines records into a table. The record stream is read as the records are copied, so the command must be executed while the stream is still open, such as while handling the request that provides it.
+	"""
+
+	__slots__ = ("__database_name", "__table_name", "__record_format", "__record_stream")
+
+	def __init__(self, *, database_name: str, table_name: str, record_format: CopyRecordFormatEnum, record_stream: BinaryIO):
+
+		self.__database_name = database_name
+		self.__table_name = table_name
+		self.__record_format = record_format
+		self.__record_stream = record_stream
+
+	def execute(self, *, database_interface: DatabaseInterface, database_command_result_factory: DatabaseCommandResultFactoryInterface) -> DatabaseCommandResult:
+
+		_results = []  # type: List[DatabaseCommandResult]
+
+		_is_successful = True
+		_is_connected = False
+
+		if _is_successful:
+			try:
+				database_interface.connect_to_database(
+					database_name=self.__database_name
+				)
+				_is_connected = True
+				_connecting_to_database_result = database_command_result_factory.get_success_connecting_to_database_result(
+					database_name=self.__database_name
+				)
+			except Exception as ex:
+				_is_successful = False
+				_connecting_to_database_result = database_command_result_factory.get_failure_connecting_to_database_result(
+					database_name=self.__database_name,
+					error_message=str(ex)
+				)
+			_results.append(_connecting_to_database_result)
+
+		if _is_successful:
+			try:
+				_start_time = time.perf_counter()
+				_copy_record_stream = CopyRecordStream.get_copy_record_stream(
+					record_format=self.__record_format,
+					record_stream=self.__record_stream
+				)
+				_rows_total = database_interface.copy_records(
+					table_name=self.__table_name,
+					copy_record_stream=_copy_record_stream
+				)
+				_copying_records_result = database_command_result_factory.get_success_copying_records_result(
+					table_name=self.__table_name,
+					rows_total=_rows_total,
+					elapsed_seconds=time.perf_counter() - _start_time
+				)
+			except Exception as ex:
+				_is_successful = False
+				_copying_records_result = database_command_result_factory.get_failure_copying_records_result(
+					table_name=self.__table_name,
+					error_message=str(ex)
+				)
+			_results.append(_copying_records_result)
+
+		# the connection is released even if the command failed, since a pooled connection would otherwise never be returned
+		if _is_connected:
+			try:
+				database_interface.disconnect_from_database()
+				_disconnecting_from_database_result = database_command_result_factory.get_success_disconnecting_from_database_result(
+					database_name=self.__database_name
+				)
+			except Exception as ex:
+				_disconnecting_from_database_result = database_command_result_factory.get_failure_disconnecting_from_database_result(
+					database_name=self.__database_name,
+					error_message=str(ex)
+				)
+			_results.append(_disconnecting_from_database_result)
+
+		_result = BulkInsertRecordsDatabaseCommandResult(
+			child_database_command_results=_results,
+			is_successful=_is_successful
+		)
+
+		return _result
+
+
+class PostgresConnectionSourceDatabase(DatabaseInterface):
+	"""
+	This class runs queries over connections taken from a connection source, holding one connection between connecting and disconnecting. Queries whose parameters each have a type known to the server are run as server-side prepared statements cached per connection; the cache size is fixed by whichever database interface first uses the connection. Batch queries are sent in pages of at most batch_page_rows_total rows, and a failing page is split in halves until its failing rows are found.
+	"""
+
+	def __init__(self, *, postgres_connection_source: PostgresConnectionSourceInterface, maximum_prepared_statements_total: int = 128, unpreparable_retry_seconds: float = 60.0, batch_page_rows_total: int = 1000):
+		super().__init__()
+
+		self.__postgres_connection_source = postgres_connection_source
+		self.__maximum_prepared_statements_total = maximum_prepared_statements_total
+		self.__unpreparable_retry_seconds = unpreparable_retry_seconds
+		self.__batch_page_rows_total = batch_page_rows_total
+
+		self.__connected_to_database = None  # type: str
+		self.__postgres_connection = None  # type: PostgresConnection
+		self.__prepared_statement_cache_hits_total = 0
+		self.__prepared_statement_cache_misses_total = 0
+		self.__prepared_statement_cache_evictions_total = 0
+		self.__cursor_names_total = 0
+
+	def create_database(self, *, database_name: str):
+
+		_postgres_connection = self.__postgres_connection_source.acquire(
+			database_name="postgres"
+		)
+		_is_broken = False
+		try:
+			_connection = _postgres_connection.get_connection()
+			# CREATE DATABASE cannot run inside of a transaction block
+			_connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+			try:
+				_cursor = _connection.cursor()
+				_cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(database_name)))
+				_cursor.close()
+			finally:
+				_connection.set_isolation_level(ISOLATION_LEVEL_DEFAULT)
+		except Exception:
+			_is_broken = _postgres_connection.is_closed()
+			raise
+		finally:
+			self.__postgres_connection_source.release(
+				postgres_connection=_postgres_connection,
+				is_broken=_is_broken
+			)
+
+	def connect_to_database(self, *, database_name: str):
+
+		if self.__connected_to_database is not None:
+			raise Exception(f"Cannot connect to database \"{database_name}\" because already connected to database \"{self.__connected_to_database}\".")
+		self.__postgres_connection = self.__postgres_connection_source.acquire(
+			database_name=database_name
+		)
+		self.__connected_to_database = database_name
+
+	def disconnect_from_database(self):
+
+		if self.__connected_to_database is None:
+			raise Exception(f"Unexpected attempt to disconnect from database while not connected to a database.")
+		_postgres_connection = self.__postgres_connection
+		self.__postgres_connection = None
+		self.__connected_to_database = None
+		self.__postgres_connection_source.release(
+			postgres_connection=_postgres_connection,
+			is_broken=False
+		)
+
+	def __try_get_prepared_statement(self, *, cursor: object, normalized_query: str) -> PreparedStatement:
+
+		_prepared_statement_cache = self.__postgres_connection.get_prepared_statement_cache()
+		if _prepared_statement_cache is None:
+			_prepared_statement_cache = PreparedStatementCache(
+				maximum_prepared_statements_total=self.__maximum_prepared_statements_total,
+				unpreparable_retry_seconds=self.__unpreparable_retry_seconds
+			)
+			self.__postgres_connection.set_prepared_statement_cache(
+				prepared_statement_cache=_prepared_statement_cache
+			)
+
+		_is_cached, _prepared_statement = _prepared_statement_cache.try_get(
+			normalized_query=normalized_query
+		)
+		if _is_cached:
+			if _prepared_statement is not None:
+				self.__prepared_statement_cache_hits_total += 1
+			return _prepared_statement
+
+		_is_preparable, _positional_query, _parameter_names = PreparedStatementCache.try_get_positional_query(
+			normalized_query=normalized_query
+		)
+		if _is_preparable:
+			self.__prepared_statement_cache_misses_total += 1
+			_prepared_statement_name = _prepared_statement_cache.get_next_prepared_statement_name()
+			try:
+				cursor.execute(f"PREPARE {_prepared_statement_name} AS {_positional_query}")
+				_prepared_statement = PreparedStatement(
+					name=_prepared_statement_name,
+					parameter_names=_parameter_names
+				)
+			except psycopg2.Error:
+				# the query is remembered as unpreparable and executed directly until the retry interval of the cache has passed, such as for a table that does not exist yet
+				self.__postgres_connection.get_connection().rollback()
+
+		_evicted_prepared_statements = _prepared_statement_cache.add(
+			normalized_query=normalized_query,
+			prepared_statement=_prepared_statement
+		)
+		for _evicted_prepared_statement in _evicted_prepared_statements:
+			cursor.execute(f"DEALLOCATE {_evicted_prepared_statement.get_name()}")
+			self.__prepared_statement_cache_evictions_total += 1
+
+		return _prepared_statement
+
+	def __try_get_query_prepared_statement(self, *, cursor: object, query: str) -> Tuple[str, PreparedStatement]:
+
+		_normalized_query = None  # type: str
+		_prepared_statement = None  # type: PreparedStatement
+		if self.__maximum_prepared_statements_total > 0:
+			_normalized_query = PreparedStatementCache.normalize_query(
+				query=query
+			)
+			_prepared_statement = self.__try_get_prepared_statement(
+				cursor=cursor,
+				normalized_query=_normalized_query
+			)
+		return _normalized_query, _prepared_statement
+
+	def __forget_prepared_statement(self, *, normalized_query: str, prepared_statement: PreparedStatement):
+
+		# the statement may be invalid now, such as after its table was altered, so it is prepared again next time
+		_connection = self.__postgres_connection.get_connection()
+		self.__postgres_connection.get_prepared_statement_cache().remove(
+			normalized_query=normalized_query
+		)
+		try:
+			_cursor = _connection.cursor()
+			_cursor.execute(f"DEALLOCATE {prepared_statement.get_name()}")
+			_cursor.close()
+			_connection.commit()
+		except psycopg2.Error:
+			_connection.rollback()
+
+	def execute_query(self, *, query: str, parameters: Dict[str, object]) -> object:
+
+		if self.__connected_to_database is None:
+			raise Exception(f"Cannot execute query while not connected to a database.")
+		_connection = self.__postgres_connection.get_connection()
+		_normalized_query = None  # type: str
+		_prepared_statement = None  # type: PreparedStatement
+		try:
+			_cursor = _connection.cursor()
+			_normalized_query, _prepared_statement = self.__try_get_query_prepared_statement(
+				cursor=_cursor,
+				query=query
+			)
+			if _prepared_statement is None:
+				_cursor.execute(query, parameters)
+			else:
+				_cursor.execute(_prepared_statement.get_execute_query(), parameters)
+			if _cursor.description is None:
+				_output = _cursor.rowcount
+			else:
+				_output = _cursor.fetchall()
+			_cursor.close()
+			_connection.commit()
+		except Exception:
+			if not self.__postgres_connection.is_closed():
+				_connection.rollback()
+				if _prepared_statement is not None:
+					self.__forget_prepared_statement(
+						normalized_query=_normalized_query,
+						prepared_statement=_prepared_statement
+					)
+			raise
+		return _output
+
+	def __try_execute_batch_page(self, *, cursor: object, query: str, parameters_list: List[Dict[str, object]]) -> str:
+
+		# the savepoint keeps the earlier pages of the transaction when this page fails
+		cursor.execute("SAVEPOINT postgres_api_batch_page")
+		try:
+			# the page is sent in one round trip
+			psycopg2.extras.execute_batch(cursor, query, parameters_list, page_size=len(parameters_list))
+			_error_message = None
+		except psycopg2.Error as ex:
+			if self.__postgres_connection.is_closed():
+				raise
+			cursor.execute("ROLLBACK TO SAVEPOINT postgres_api_batch_page")
+			_error_message = str(ex)
+		cursor.execute("RELEASE SAVEPOINT postgres_api_batch_page")
+		return _error_message
+
+	def __get_batch_page_row_error_messages(self, *, cursor: object, query: str, parameters_list: List[Dict[str, object]], error_message: str) -> List[str]:
+
+		if error_message is None:
+			return [None] * len(parameters_list)
+		if len(parameters_list) == 1:
+			return [error_message]
+
+		# the failing page is split in halves, so that a few failing rows cost a few round trips each rather than every row costing its own
+		_row_error_messages = []  # type: List[str]
+		_middle_index = len(parameters_list) // 2
+		for _half_parameters_list in [parameters_list[:_middle_index], parameters_list[_middle_index:]]:
+			_row_error_messages.extend(self.__get_batch_page_row_error_messages(
+				cursor=cursor,
+				query=query,
+				parameters_list=_half_parameters_list,
+				error_message=self.__try_execute_batch_page(
+					cursor=cursor,
+					query=query,
+					parameters_list=_half_parameters_list
+				)
+			))
+		return _row_error_messages
+
+	def execute_batch_query(self, *, query: str, parameters_list: List[Dict[str, object]]) -> List[str]:
+
+		if self.__connected_to_database is None:
+			raise Exception(f"Cannot execute batch query while not connected to a database.")
+		if len(parameters_list) == 0:
+			return []
+		_connection = self.__postgres_connection.get_connection()
+		_row_error_messages = []  # type: List[str]
+		try:
+			_cursor = _connection.cursor()
+			_normalized_query, _prepared_statement = self.__try_get_query_prepared_statement(
+				cursor=_cursor,
+				query=query
+			)
+			for _page_index in range(0, len(parameters_list), self.__batch_page_rows_total):
+				_page_parameters_list = parameters_list[_page_index:_page_index + self.__batch_page_rows_total]
+				if _prepared_statement is None:
+					_error_message = self.__try_execute_batch_page(
+						cursor=_cursor,
+						query=query,
+						parameters_list=_page_parameters_list
+					)
+				else:
+					_error_message = self.__try_execute_batch_page(
+						cursor=_cursor,
+						query=_prepared_statement.get_execute_query(),
+						parameters_list=_page_parameters_list
+					)
+					if _error_message is not None:
+						# the statement may be invalid now, such as after its table was altered, so the rest of the batch is executed directly
+						self.__postgres_connection.get_prepared_statement_cache().remove(
+							normalized_query=_normalized_query
+						)
+						_cursor.execute(f"DEALLOCATE {_prepared_statement.get_name()}")
+						_prepared_statement = None
+						_error_message = self.__try_execute_batch_page(
+							cursor=_cursor,
+							query=query,
+							parameters_list=_page_parameters_list
+						)
+				_row_error_messages.extend(self.__get_batch_page_row_error_messages(
+					cursor=_cursor,
+					query=query,
+					parameters_list=_page_parameters_list,
+					error_message=_error_message
+				))
+			_cursor.close()
+			_connection.commit()
+		except Exception:
+			if not self.__postgres_connection.is_closed():
+				_connection.rollback()
+			raise
+		return _row_error_messages
+
+	def execute_streaming_query(self, *, query: str, parameters: Dict[str, object], fetch_rows_total: int) -> Iterator[List[Tuple]]:
+
+		if self.__connected_to_database is None:
+			raise Exception(f"Cannot execute streaming query while not connected to a database.")
+		_connection = self.__postgres_connection.get_connection()
+		self.__cursor_names_total += 1
+		try:
+			# a named cursor is declared on the server, which keeps the rows until they are fetched
+			_cursor = _connection.cursor(name=f"postgres_api_cursor_{self.__cursor_names_total}")
+			_cursor.execute(query, parameters)
+			_rows = _cursor.fetchmany(fetch_rows_total)
+			while len(_rows) != 0:
+				yield _rows
+				_rows = _cursor.fetchmany(fetch_rows_total)
+			_cursor.close()
+			_connection.commit()
+		except BaseException:
+			# includes the iteration being closed early
+			if not self.__postgres_connection.is_closed():
+				_connection.rollback()
+			raise
+
+	def copy_records(self, *, table_name: str, copy_record_stream: CopyRecordStream) -> int:
+
+		if self.__connected_to_database is None:
+			raise Exception(f"Cannot copy records while not connected to a database.")
+		_connection = self.__postgres_connection.get_connection()
+		_copy_query = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT {})").format(
+			sql.Identifier(*table_name.split(".")),
+			sql.SQL(", ").join([sql.Identifier(_column_name) for _column_name in copy_record_stream.get_column_names()]),
+			sql.SQL(copy_record_stream.get_copy_format())
+		)
+		try:
+			_cursor = _connection.cursor()
+			_cursor.copy_expert(_copy_query, copy_record_stream)
+			_rows_total = _cursor.rowcount
+			_cursor.close()
+			_connection.commit()
+		except Exception:
+			if not self.__postgres_connection.is_closed():
+				_connection.rollback()
+			raise
+		return _rows_total
+
+	def get_prepared_statement_cache_hits_total(self) -> int:
+		return self.__prepared_statement_cache_hits_total
+
+	def get_prepared_statement_cache_misses_total(self) -> int:
+		return self.__prepared_statement_cache_misses_total
+
+	def get_prepared_statement_cache_evictions_total(self) -> int:
+		return self.__prepared_statement_cache_evictions_total
+
+
+class PostgresDatabase(PostgresConnectionSourceDatabase):
+
+	def __init__(self, *, user_name: str, password: str, host_url: str, port: int, maximum_prepared_statements_total: int = 128, unpreparable_retry_seconds: float = 60.0, batch_page_rows_total: int = 1000):
+		super().__init__(
+			postgres_connection_source=UnpooledPostgresConnectionSource(
+				user_name=user_name,
+				password=password,
+				host_url=host_url,
+				port=port
+			),
+			maximum_prepared_statements_total=maximum_prepared_statements_total,
+			unpreparable_retry_seconds=unpreparable_retry_seconds,
+			batch_page_rows_total=batch_page_rows_total
+		)
+
+
+class PooledPostgresDatabase(PostgresConnectionSourceDatabase):
+	"""
+	This class checks a connection out of the shared connection pool when connecting and returns it when disconnecting
+	"""
+
+	def __init__(self, *, connection_pool: PostgresConnectionPool, maximum_prepared_statements_total: int = 128, unpreparable_retry_seconds: float = 60.0, batch_page_rows_total: int = 1000):
+		super().__init__(
+			postgres_connection_source=connection_pool,
+			maximum_prepared_statements_total=maximum_prepared_statements_total,
+			unpreparable_retry_seconds=unpreparable_retry_seconds,
+			batch_page_rows_total=batch_page_rows_total
+		)
+
+
+class CachingDatabaseInterface(DatabaseInterface):
+	"""
+	This class serves read queries from a query result cache shared by the database interfaces of a process, invalidating the tables that every other query may change. Given an invalidation channel, the invalidations are also published to the caches of other processes. Changes made without going through an interface sharing the cache or channel are only seen once the cached output expires. Queries calling a function that is neither a known deterministic built-in nor one of the given deterministic function names are never cached and invalidate the whole database, since the function may write or notify; functions called by views are not seen, so views over volatile functions must not be read through this class.
+	"""
+
+	def __init__(self, *, database_interface: DatabaseInterface, query_result_cache: QueryResultCache, query_result_cache_invalidation_channel: QueryResultCacheInvalidationChannel = None, deterministic_function_names: Set[str] = None):
+		super().__init__()
+
+		self.__database_interface = database_interface
+		self.__query_result_cache = query_result_cache
+		self.__query_result_cache_invalidation_channel = query_result_cache_invalidation_channel
+		self.__deterministic_function_names = deterministic_function_names
+
+		self.__connected_to_database = None  # type: str
+
+	def __invalidate_tables(self, *, table_names: Set[str]):
+
+		if table_names is None:
+			self.__query_result_cache.invalidate_database(
+				database_name=self.__connected_to_database
+			)
+		else:
+			self.__query_result_cache.invalidate_tables(
+				database_name=self.__connected_to_database,
+				table_names=table_names
+			)
+		if self.__query_result_cache_invalidation_channel is not None:
+			try:
+				self.__database_interface.execute_query(
+					query=QueryResultCacheInvalidationChannel.get_notification_query(),
+					parameters=self.__query_result_cache_invalidation_channel.get_notification_parameters(
+						database_name=self.__connected_to_database,
+						table_names=table_names
+					)
+				)
+			except Exception:
+				# the write itself has already been committed or rolled back, so failing to publish leaves other processes to rely on expiry
+				pass
+
+	def __invalidate(self, *, query: str):
+
+		_is_known, _table_names = QueryResultCache.try_get_written_table_names(
+			query=query,
+			deterministic_function_names=self.__deterministic_function_names
+		)
+		if not _is_known:
+			self.__invalidate_tables(
+				table_names=None
+			)
+		elif len(_table_names) != 0:
+			self.__invalidate_tables(
+				table_names=_table_names
+			)
+
+	def create_database(self, *, database_name: str):
+		self.__database_interface.create_database(
+			database_name=database_name
+		)
+
+	def connect_to_database(self, *, database_name: str):
+		if self.__query_result_cache_invalidation_channel is not None:
+			# listening starts before the first read so that no invalidation of its output is missed
+			self.__query_result_cache_invalidation_channel.listen_to_database(
+				database_name=database_name
+			)
+		self.__database_interface.connect_to_database(
+			database_name=database_name
+		)
+		self.__connected_to_database = database_name
+
+	def execute_query(self, *, query: str, parameters: Dict[str, object]) -> object:
+
+		_is_cacheable, _table_names = QueryResultCache.try_get_read_table_names(
+			query=query,
+			deterministic_function_names=self.__deterministic_function_names
+		)
+		if not _is_cacheable:
+			try:
+				return self.__database_interface.execute_query(
+					query=query,
+					parameters=parameters
+				)
+			finally:
+				# the query has been committed or rolled back by now, so reads that started before it cannot cache stale output
+				self.__invalidate(
+					query=query
+				)
+
+		_is_cached, _output = self.__query_result_cache.try_get(
+			database_name=self.__connected_to_database,
+			query=query,
+			parameters=parameters
+		)
+		if not _is_cached:
+			_table_versions = self.__query_result_cache.get_table_versions(
+				database_name=self.__connected_to_database,
+				table_names=_table_names
+			)
+			_output = self.__database_interface.execute_query(
+				query=query,
+				parameters=parameters
+			)
+			self.__query_result_cache.add(
+				database_name=self.__connected_to_database,
+				query=query,
+				parameters=parameters,
+				table_names=_table_names,
+				table_versions=_table_versions,
+				output=_output
+			)
+		if isinstance(_output, list):
+			return list(_output)
+		return _output
+
+	def execute_batch_query(self, *, query: str, parameters_list: List[Dict[str, object]]) -> List[str]:
+		try:
+			return self.__database_interface.execute_batch_query(
+				query=query,
+				parameters_list=parameters_list
+			)
+		finally:
+			self.__invalidate(
+				query=query
+			)
+
+	def execute_streaming_query(self, *, query: str, parameters: Dict[str, object], fetch_rows_total: int) -> Iterator[List[Tuple]]:
+		try:
+			yield from self.__database_interface.execute_streaming_query(
+				query=query,
+				parameters=parameters,
+				fetch_rows_total=fetch_rows_total
+			)
+		finally:
+			if not QueryResultCache.try_get_read_table_names(query=query, deterministic_function_names=self.__deterministic_function_names)[0]:
+				self.__invalidate(
+					query=query
+				)
+
+	def copy_records(self, *, table_name: str, copy_record_stream: CopyRecordStream) -> int:
+		try:
+			return self.__database_interface.copy_records(
+				table_name=table_name,
+				copy_record_stream=copy_record_stream
+			)
+		finally:
+			self.__invalidate_tables(
+				# the table name is copied into as an exact identifier rather than folded to lower case
+				table_names={table_name.split(".")[-1]}
+			)
+
+	def disconnect_from_database(self):
+		self.__database_interface.disconnect_from_database()
+		self.__connected_to_database = None
+
+
+class AsyncPostgresDatabase(AsyncDatabaseInterface):
+	"""
+	This class runs queries over psycopg2 asynchronous connections, waiting on the connection socket in the event loop instead of blocking a thread. Connecting acquires a connection from the connection pool and disconnecting releases it, so the connection pool may be shared by the asynchronous database interfaces of every worker of an event loop. Batch queries are sent in pages of at most batch_page_rows_total rows, and a failing page is split in halves until its failing rows are found.
+	"""
+
+	def __init__(self, *, connection_pool: AsyncPostgresConnectionPool, batch_page_rows_total: int = 1000):
+		super().__init__()
+
+		self.__connection_pool = connection_pool
+		self.__batch_page_rows_total = batch_page_rows_total
+
+		self.__connected_to_database = None  # type: str
+		self.__postgres_connection = None  # type: PostgresConnection
+		self.__is_connection_broken = False
+
+	@staticmethod
+	async def __execute(*, connection: object, query: object, parameters: Dict[str, object]) -> object:
+
+		_cursor = connection.cursor()
+		try:
+			_cursor.execute(query, parameters)
+			await AsyncPostgresConnectionPool.wait_for_connection(
+				connection=connection
+			)
+			if _cursor.description is None:
+				_output = _cursor.rowcount
+			else:
+				_output = _cursor.fetchall()
+		finally:
+			_cursor.close()
+		return _output
+
+	async def __execute_on_connection(self, *, query: object, parameters: Dict[str, object]) -> object:
+		try:
+			return await AsyncPostgresDatabase.__execute(
+				connection=self.__postgres_connection.get_connection(),
+				query=query,
+				parameters=parameters
+			)
+		except psycopg2.Error:
+			raise
+		except BaseException:
+			# a query interrupted while waiting for its result, such as by cancelling its task, leaves the connection busy
+			self.__is_connection_broken = True
+			raise
+
+	async def create_database(self, *, database_name: str):
+
+		# asynchronous connections are always in autocommit mode, as CREATE DATABASE requires
+		_postgres_connection = await self.__connection_pool.acquire(
+			database_name="postgres"
+		)
+		_is_broken = False
+		try:
+			await AsyncPostgresDatabase.__execute(
+				connection=_postgres_connection.get_connection(),
+				query=sql.SQL("CREATE DATABASE {}").format(sql.Identifier(database_name)),
+				parameters=None
+			)
+		except psycopg2.Error:
+			raise
+		except BaseException:
+			_is_broken = True
+			raise
+		finally:
+			await self.__connection_pool.release(
+				postgres_connection=_postgres_connection,
+				is_broken=_is_broken
+			)
+
+	async def connect_to_database(self, *, database_name: str):
+
+		if self.__connected_to_database is not None:
+			raise Exception(f"Cannot connect to database \"{database_name}\" because already connected to database \"{self.__connected_to_database}\".")
+		self.__postgres_connection = await self.__connection_pool.acquire(
+			database_name=database_name
+		)
+		self.__connected_to_database = database_name
+		self.__is_connection_broken = False
+
+	async def disconnect_from_database(self):
+
+		if self.__connected_to_database is None:
+			raise Exception(f"Unexpected attempt to disconnect from database while not connected to a database.")
+		_postgres_connection = self.__postgres_connection
+		self.__postgres_connection = None
+		self.__connected_to_database = None
+		await self.__connection_pool.release(
+			postgres_connection=_postgres_connection,
+			is_broken=self.__is_connection_broken
+		)
+
+	async def execute_query(self, *, query: str, parameters: Dict[str, object]) -> object:
+
+		if self.__connected_to_database is None:
+			raise Exception(f"Cannot execute query while not connected to a database.")
+		return await self.__execute_on_connection(
+			query=query,
+			parameters=parameters
+		)
+
+	async def __try_execute_batch_page(self, *, statements: List[bytes]) -> str:
+
+		try:
+			# a multi-statement query runs as one implicit transaction in a single round trip
+			await self.__execute_on_connection(
+				query=b";".join(statements),
+				parameters=None
+			)
+			return None
+		except psycopg2.Error as ex:
+			if self.__postgres_connection.get_connection().closed:
+				raise
+			return str(ex)
+
+	async def __get_batch_page_row_error_messages(self, *, statements: List[bytes], error_message: str) -> List[str]:
+
+		if error_message is None:
+			return [None] * len(statements)
+		if len(statements) == 1:
+			return [error_message]
+
+		# the failing page is split in halves, so that a few failing rows cost a few round trips each rather than every row costing its own
+		_row_error_messages = []  # type: List[str]
+		_middle_index = len(statements) // 2
+		for _half_statements in [statements[:_middle_index], statements[_middle_index:]]:
+			_row_error_messages.extend(await self.__get_batch_page_row_error_messages(
+				statements=_half_statements,
+				error_message=await self.__try_execute_batch_page(
+					statements=_half_statements
+				)
+			))
+		return _row_error_messages
+
+	async def execute_batch_query(self, *, query: str, parameters_list: List[Dict[str, object]]) -> List[str]:
+
+		if self.__connected_to_database is None:
+			raise Exception(f"Cannot execute batch query while not connected to a database.")
+
+		_row_error_messages = []  # type: List[str]
+		for _page_index in range(0, len(parameters_list), self.__batch_page_rows_total):
+			_cursor = self.__postgres_connection.get_connection().cursor()
+			_statements = [_cursor.mogrify(query, _parameters) for _parameters in parameters_list[_page_index:_page_index + self.__batch_page_rows_total]]
+			_cursor.close()
+			_row_error_messages.extend(await self.__get_batch_page_row_error_messages(
+				statements=_statements,
+				error_message=await self.__try_execute_batch_page(
+					statements=_statements
+				)
+			))
+		return _row_error_messages
+
+
+class AsyncDatabaseInterfaceSynchronousAdapter(DatabaseInterface):
+	"""
+	This class lets synchronous database commands running on a worker thread use an asynchronous database interface owned by the event loop
+	"""
+
+	def __init__(self, *, async_database_interface: AsyncDatabaseInterface, event_loop: asyncio.AbstractEventLoop):
+		super().__init__()
+
+		self.__async_database_interface = async_database_interface
+		self.__event_loop = event_loop
+
+	def __run(self, *, coroutine: Awaitable[object]) -> object:
+		return asyncio.run_coroutine_threadsafe(coroutine, self.__event_loop).result()
+
+	def create_database(self, *, database_name: str):
+		self.__run(
+			coroutine=self.__async_database_interface.create_database(
+				database_name=database_name
+			)
+		)
+
+	def connect_to_database(self, *, database_name: str):
+		self.__run(
+			coroutine=self.__async_database_interface.connect_to_database(
+				database_name=database_name
+			)
+		)
+
+	def execute_query(self, *, query: str, parameters: Dict[str, object]) -> object:
+		return self.__run(
+			coroutine=self.__async_database_interface.execute_query(
+				query=query,
+				parameters=parameters
+			)
+		)
+
+	def execute_batch_query(self, *, query: str, parameters_list: List[Dict[str, object]]) -> List[str]:
+		return self.__run(
+			coroutine=self.__async_database_interface.execute_batch_query(
+				query=query,
+				parameters_list=parameters_list
+			)
+		)
+
+	def execute_streaming_query(self, *, query: str, parameters: Dict[str, object], fetch_rows_total: int) -> Iterator[List[Tuple]]:
+		# psycopg2 does not support named cursors on asynchronous connections
+		raise Exception(f"Cannot execute streaming query through an asynchronous database interface.")
+
+	def copy_records(self, *, table_name: str, copy_record_stream: CopyRecordStream) -> int:
+		# psycopg2 does not support COPY on asynchronous connections
+		raise Exception(f"Cannot copy records through an asynchronous database interface.")
+
+	def disconnect_from_database(self):
+		self.__run(
+			coroutine=self.__async_database_interface.disconnect_from_database()
+		)
+
+
+class DatabaseCommandAsyncExecutableElement(AsyncExecutableElement):
+	"""
+	This class executes an AsyncDatabaseCommand on the event loop, so that it holds no thread while waiting on the database. Any other database command runs on the executor, routing its database calls back to the asynchronous database interface, so at most as many of those are in flight as the executor has threads.
+	"""
+
+	__slots__ = ("__database_command", "__database_command_result_factory")
+
+	def __init__(self, *, database_command: DatabaseCommand, database_command_result_factory: DatabaseCommandResultFactoryInterface = None):
+
+		self.__database_command = database_command
+		self.__database_command_result_factory = PostgresApiDatabaseCommandResultFactory() if database_command_result_factory is None else database_command_result_factory
+
+	async def execute(self, *, async_database_interface: AsyncDatabaseInterface, executor: concurrent.futures.Executor = None, **kwargs) -> DatabaseCommandResult:
+
+		if isinstance(self.__database_command, AsyncDatabaseCommand):
+			return await self.__database_command.execute_async(
+				async_database_interface=async_database_interface,
+				database_command_result_factory=self.__database_command_result_factory
+			)
+
+		if executor is None:
+			raise Exception(f"Cannot execute database command {type(self.__database_command).__name__} without an executor since it cannot be executed asynchronously.")
+		_event_loop = asyncio.get_running_loop()
+		_database_interface = AsyncDatabaseInterfaceSynchronousAdapter(
+			async_database_interface=async_database_interface,
+			event_loop=_event_loop
+		)
+		return await _event_loop.run_in_executor(executor, functools.partial(
+			self.__database_command.execute,
+			database_interface=_database_interface,
+			database_command_result_factory=self.__database_command_result_factory
+		))
+
+
+class PostgresDatabaseCommandFactory(DatabaseCommandFactoryInterface):
+
+	def get_execute_query_database_command(self, *, query: str, parameters: Dict[str, object]):
+
+		raise NotImplementedError()
+
+
+class PostgresApiDatabaseCommandResultFactory(DatabaseCommandResultFactoryInterface):
+
+	def get_success_creating_database_result(self, *, database_name: str) -> DatabaseCommandResult:
+		return SuccessCreatingDatabaseDatabaseCommandResult(
 			database_name=database_name
 		)
 
@@ -342,6 +1975,53 @@ class PostgresApiDatabaseCommandResultFactory(DatabaseCommandResultFactoryInterf
 			error_message=error_message
 		)
 
+	def get_streaming_querying_database_result(self, *, query: str, parameters: Dict[str, object], row_batches: Iterator[List[Tuple]]) -> DatabaseCommandResult:
+		return StreamingQueryingDatabaseDatabaseCommandResult(
+			query=query,
+			parameters=parameters,
+			row_batches=row_batches
+		)
+
+	def get_success_getting_records_page_result(self, *, table_name: str, records: List[List[object]], continuation_token: str) -> DatabaseCommandResult:
+		return SuccessGettingRecordsPageDatabaseCommandResult(
+			table_name=table_name,
+			records=records,
+			continuation_token=continuation_token
+		)
+
+	def get_failure_getting_records_page_result(self, *, table_name: str, continuation_token: str, error_message: str) -> DatabaseCommandResult:
+		return FailureGettingRecordsPageDatabaseCommandResult(
+			table_name=table_name,
+			continuation_token=continuation_token,
+			error_message=error_message
+		)
+
+	def get_success_batch_querying_database_result(self, *, query: str, row_error_messages: List[str]) -> DatabaseCommandResult:
+		return SuccessBatchQueryingDatabaseDatabaseCommandResult(
+			query=query,
+			row_error_messages=row_error_messages
+		)
+
+	def get_failure_batch_querying_database_result(self, *, query: str, rows_total: int, error_message: str) -> DatabaseCommandResult:
+		return FailureBatchQueryingDatabaseDatabaseCommandResult(
+			query=query,
+			rows_total=rows_total,
+			error_message=error_message
+		)
+
+	def get_success_copying_records_result(self, *, table_name: str, rows_total: int, elapsed_seconds: float) -> DatabaseCommandResult:
+		return SuccessCopyingRecordsDatabaseCommandResult(
+			table_name=table_name,
+			rows_total=rows_total,
+			elapsed_seconds=elapsed_seconds
+		)
+
+	def get_failure_copying_records_result(self, *, table_name: str, error_message: str) -> DatabaseCommandResult:
+		return FailureCopyingRecordsDatabaseCommandResult(
+			table_name=table_name,
+			error_message=error_message
+		)
+
 	def get_success_disconnecting_from_database_result(self, *, database_name: str) -> DatabaseCommandResult:
 		return SuccessDisconnectingFromDatabaseDatabaseCommandResult(
 			database_name=database_name
@@ -351,4 +2031,11 @@ class PostgresApiDatabaseCommandResultFactory(DatabaseCommandResultFactoryInterf
 		return FailureDisconnectingFromDatabaseDatabaseCommandResult(
 			database_name=database_name,
 			error_message=error_message
-		)
\ No newline at end of file
+		)
+
+	def get_rejected_result(self, *, rejection_reason: str, estimated_wait_seconds: float, error_message: str) -> DatabaseCommandResult:
+		return RejectedDatabaseCommandResult(
+			rejection_reason=rejection_reason,
+			estimated_wait_seconds=estimated_wait_seconds,
+			error_message=error_message
+		)
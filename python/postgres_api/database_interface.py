@@ -1,7 +1,8 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from postgres_api.command import CommandResult, Command, CommandResultFactoryInterface, CommandFactoryInterface, CompositeCommand, CompositeCommandResult
-from typing import Dict, List
+from postgres_api.copy_record_stream import CopyRecordStream
+from typing import Dict, List, Iterator, Tuple
 
 
 class DatabaseCommandResultFactoryInterface(CommandResultFactoryInterface):
@@ -30,6 +31,34 @@ class DatabaseCommandResultFactoryInterface(CommandResultFactoryInterface):
 	def get_failure_querying_database_result(self, *, query: str, parameters: Dict[str, object], output: object, error_message: str) -> DatabaseCommandResult:
 		raise NotImplementedError()
 
+	@abstractmethod
+	def get_streaming_querying_database_result(self, *, query: str, parameters: Dict[str, object], row_batches: Iterator[List[Tuple]]) -> DatabaseCommandResult:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def get_success_getting_records_page_result(self, *, table_name: str, records: List[List[object]], continuation_token: str) -> DatabaseCommandResult:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def get_failure_getting_records_page_result(self, *, table_name: str, continuation_token: str, error_message: str) -> DatabaseCommandResult:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def get_success_batch_querying_database_result(self, *, query: str, row_error_messages: List[str]) -> DatabaseCommandResult:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def get_failure_batch_querying_database_result(self, *, query: str, rows_total: int, error_message: str) -> DatabaseCommandResult:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def get_success_copying_records_result(self, *, table_name: str, rows_total: int, elapsed_seconds: float) -> DatabaseCommandResult:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def get_failure_copying_records_result(self, *, table_name: str, error_message: str) -> DatabaseCommandResult:
+		raise NotImplementedError()
+
 	@abstractmethod
 	def get_success_disconnecting_from_database_result(self, *, database_name: str) -> DatabaseCommandResult:
 		raise NotImplementedError()
@@ -38,9 +67,15 @@ class DatabaseCommandResultFactoryInterface(CommandResultFactoryInterface):
 	def get_failure_disconnecting_from_database_result(self, *, database_name: str, error_message: str) -> DatabaseCommandResult:
 		raise NotImplementedError()
 
+	@abstractmethod
+	def get_rejected_result(self, *, rejection_reason: str, estimated_wait_seconds: float, error_message: str) -> DatabaseCommandResult:
+		raise NotImplementedError()
+
 
 class DatabaseCommandResult(CommandResult):
 
+	__slots__ = ()
+
 	@abstractmethod
 	def get_json_string(self) -> str:
 		raise NotImplementedError()
@@ -48,6 +83,8 @@ class DatabaseCommandResult(CommandResult):
 
 class CompositeDatabaseCommandResult(CompositeCommandResult):
 
+	__slots__ = ()
+
 	def __init__(self, *, child_database_command_results: List[DatabaseCommandResult]):
 		super().__init__(
 			child_command_results=child_database_command_results
@@ -56,12 +93,14 @@ class CompositeDatabaseCommandResult(CompositeCommandResult):
 		pass
 
 	@abstractmethod
-	def get_json_string(self) -> str:
+	def get_json_object(self) -> object:
 		raise NotImplementedError()
 
 
 class DatabaseCommand(Command):
 
+	__slots__ = ()
+
 	@abstractmethod
 	def execute(self, *, database_interface: DatabaseInterface, database_command_result_factory: DatabaseCommandResultFactoryInterface) -> DatabaseCommandResult:
 		raise NotImplementedError()
@@ -69,6 +108,8 @@ class DatabaseCommand(Command):
 
 class CompositeDatabaseCommand(CompositeCommand):
 
+	__slots__ = ()
+
 	def __init__(self, *, child_database_commands: List[DatabaseCommand]):
 		super().__init__(
 			child_commands=child_database_commands
@@ -81,6 +122,18 @@ class CompositeDatabaseCommand(CompositeCommand):
 		raise NotImplementedError()
 
 
+class AsyncDatabaseCommand(ABC):
+	"""
+	This class is implemented alongside DatabaseCommand by the database commands that can also be executed against an asynchronous database interface, so that they hold no thread while waiting on the database.
+	"""
+
+	__slots__ = ()
+
+	@abstractmethod
+	async def execute_async(self, *, async_database_interface: AsyncDatabaseInterface, database_command_result_factory: DatabaseCommandResultFactoryInterface) -> DatabaseCommandResult:
+		raise NotImplementedError()
+
+
 class DatabaseCommandFactoryInterface(CommandFactoryInterface):
 
 	pass
@@ -100,6 +153,60 @@ class DatabaseInterface(ABC):
 	def execute_query(self, *, query: str, parameters: Dict[str, object]) -> object:
 		raise NotImplementedError()
 
+	@abstractmethod
+	def execute_batch_query(self, *, query: str, parameters_list: List[Dict[str, object]]) -> List[str]:
+		"""
+		Executes the query once per set of parameters, committing the rows that succeed.
+		:param query: The query to execute for every set of parameters.
+		:param parameters_list: The parameters of each row.
+		:return: The error message per row or None where the row succeeded.
+		"""
+		raise NotImplementedError()
+
+	@abstractmethod
+	def execute_streaming_query(self, *, query: str, parameters: Dict[str, object], fetch_rows_total: int) -> Iterator[List[Tuple]]:
+		"""
+		Executes the query on a named server-side cursor, fetching the rows in batches as they are iterated.
+		:param query: The query to execute.
+		:param parameters: The parameters of the query.
+		:param fetch_rows_total: The number of rows fetched per batch.
+		:return: The batches of rows, which must be fully iterated or closed before executing another query.
+		"""
+		raise NotImplementedError()
+
+	@abstractmethod
+	def copy_records(self, *, table_name: str, copy_record_stream: CopyRecordStream) -> int:
+		"""
+		Streams the records into the table using COPY ... FROM STDIN as a single transaction.
+		:param table_name: The table, optionally qualified by its schema.
+		:param copy_record_stream: The records to copy.
+		:return: The number of rows copied.
+		"""
+		raise NotImplementedError()
+
 	@abstractmethod
 	def disconnect_from_database(self):
 		raise NotImplementedError()
+
+
+class AsyncDatabaseInterface(ABC):
+
+	@abstractmethod
+	async def create_database(self, *, database_name: str):
+		raise NotImplementedError()
+
+	@abstractmethod
+	async def connect_to_database(self, *, database_name: str):
+		raise NotImplementedError()
+
+	@abstractmethod
+	async def execute_query(self, *, query: str, parameters: Dict[str, object]) -> object:
+		raise NotImplementedError()
+
+	@abstractmethod
+	async def execute_batch_query(self, *, query: str, parameters_list: List[Dict[str, object]]) -> List[str]:
+		raise NotImplementedError()
+
+	@abstractmethod
+	async def disconnect_from_database(self):
+		raise NotImplementedError()
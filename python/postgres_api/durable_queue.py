@@ -0,0 +1,834 @@
+from __future__ import annotations
+from postgres_api.executable import ExecutableElement, FutureExecutableElement
+from postgres_api.queue import ExecutableQueueInterface, DelayedElement, DelayedElementScheduler
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from enum import Enum, IntEnum, auto
+from typing import List, Dict, Tuple, Deque, BinaryIO
+import concurrent.futures
+import mmap
+import os
+import pickle
+import re
+import struct
+import threading
+import time
+import zlib
+
+
+class DurableQueueSyncEnum(Enum):
+
+	PerBatch = auto(),
+	PerInterval = auto()
+
+
+class SegmentLogRecordTypeEnum(IntEnum):
+
+	# the values are written to the segment files, so they must never change
+	Append = 1
+	InsertFront = 2
+	AppendDelayed = 3
+	InsertFrontDelayed = 4
+	Completed = 5
+	# the first record of each segment holds the next sequence index, so that it survives the deletion of the segments holding the highest sequence indexes
+	NextSequenceIndex = 6
+
+
+class ExecutableElementSerializerInterface(ABC):
+
+	@abstractmethod
+	def dumps(self, *, executable_element: ExecutableElement) -> bytes:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def loads(self, *, executable_element_bytes: bytes) -> ExecutableElement:
+		raise NotImplementedError()
+
+
+class PickleExecutableElementSerializer(ExecutableElementSerializerInterface):
+	"""
+	This class serializes executable elements with pickle, so a segment log must only ever be replayed from a trusted directory.
+	"""
+
+	def dumps(self, *, executable_element: ExecutableElement) -> bytes:
+		return pickle.dumps(executable_element, protocol=pickle.HIGHEST_PROTOCOL)
+
+	def loads(self, *, executable_element_bytes: bytes) -> ExecutableElement:
+		return pickle.loads(executable_element_bytes)
+
+
+class SegmentLogRecord():
+
+	__slots__ = ("__record_type", "__sequence_index", "__delay_timestamp", "__segment_index", "__offset")
+
+	def __init__(self, *, record_type: SegmentLogRecordTypeEnum, sequence_index: int, delay_timestamp: float, segment_index: int, offset: int):
+
+		self.__record_type = record_type
+		self.__sequence_index = sequence_index
+		self.__delay_timestamp = delay_timestamp
+		self.__segment_index = segment_index
+		self.__offset = offset
+
+	def get_record_type(self) -> SegmentLogRecordTypeEnum:
+		return self.__record_type
+
+	def get_sequence_index(self) -> int:
+		return self.__sequence_index
+
+	def get_delay_timestamp(self) -> float:
+		return self.__delay_timestamp
+
+	def get_segment_index(self) -> int:
+		return self.__segment_index
+
+	def get_offset(self) -> int:
+		return self.__offset
+
+
+class SegmentLog():
+	"""
+	This class appends records to memory mapped segment files that are preallocated to the segment size. Each record carries the sequence index of an element, and an element is done once a completed record with its sequence index is appended. Since a completed record may be in a later segment than the record it completes, segments are only ever deleted oldest first, once none of their records are live. Sequence indexes are never reused, since a record of a later segment may still complete a sequence index of a deleted segment.
+	"""
+
+	__file_header = b"PASLOG01"
+	__record_header_struct = struct.Struct("<IIBQd")
+	__record_crc_struct = struct.Struct("<BQd")
+	__segment_file_name_pattern = re.compile(r"^segment_(\d{12})\.log$")
+
+	def __init__(self, *, directory_path: str, segment_bytes_total: int = 64 * 1024 * 1024):
+
+		self.__directory_path = directory_path
+		self.__segment_bytes_total = segment_bytes_total
+
+		self.__segment_files = {}  # type: Dict[int, BinaryIO]
+		self.__segment_mmaps = {}  # type: Dict[int, mmap.mmap]
+		self.__live_records_totals = {}  # type: Dict[int, int]
+		self.__records_totals = {}  # type: Dict[int, int]
+		self.__write_segment_index = None  # type: int
+		self.__write_offset = 0
+		self.__unsynced_offset = None  # type: int
+		self.__synced_time = time.monotonic()
+		self.__is_replayed = False
+		self.__next_sequence_index = 0
+
+		os.makedirs(self.__directory_path, exist_ok=True)
+
+	def __get_segment_file_path(self, *, segment_index: int) -> str:
+		return os.path.join(self.__directory_path, f"segment_{segment_index:012d}.log")
+
+	def __open_segment(self, *, segment_index: int, bytes_total: int = None):
+
+		_segment_file_path = self.__get_segment_file_path(
+			segment_index=segment_index
+		)
+		if bytes_total is None:
+			_segment_file = open(_segment_file_path, "r+b")
+		else:
+			_segment_file = open(_segment_file_path, "w+b")
+			# the file is sparse until written, and unwritten bytes read as zeros which marks the end of the records
+			_segment_file.truncate(bytes_total)
+		self.__segment_files[segment_index] = _segment_file
+		self.__segment_mmaps[segment_index] = mmap.mmap(_segment_file.fileno(), 0)
+		self.__live_records_totals.setdefault(segment_index, 0)
+		self.__records_totals.setdefault(segment_index, 0)
+
+	def __close_segment(self, *, segment_index: int):
+		self.__segment_mmaps.pop(segment_index).close()
+		self.__segment_files.pop(segment_index).close()
+
+	def __roll(self, *, record_bytes_total: int):
+
+		if self.__write_segment_index is not None:
+			self.sync()
+			_segment_index = self.__write_segment_index + 1
+		else:
+			_segment_index = max(self.__segment_mmaps.keys(), default=-1) + 1
+
+		self.__open_segment(
+			segment_index=_segment_index,
+			bytes_total=max(self.__segment_bytes_total, len(SegmentLog.__file_header) + SegmentLog.__record_header_struct.size + record_bytes_total)
+		)
+		_segment_mmap = self.__segment_mmaps[_segment_index]
+		_segment_mmap[0:len(SegmentLog.__file_header)] = SegmentLog.__file_header
+		self.__write_segment_index = _segment_index
+		self.__write_offset = len(SegmentLog.__file_header)
+		self.__unsynced_offset = 0
+		self.__write_record(
+			record_type=SegmentLogRecordTypeEnum.NextSequenceIndex,
+			sequence_index=self.__next_sequence_index,
+			delay_timestamp=0.0,
+			payload=b""
+		)
+
+	def __delete_unused_oldest_segments(self):
+
+		while len(self.__segment_mmaps) != 0:
+			_segment_index = min(self.__segment_mmaps.keys())
+			if _segment_index == self.__write_segment_index or self.__live_records_totals[_segment_index] != 0:
+				break
+			self.__close_segment(
+				segment_index=_segment_index
+			)
+			del self.__live_records_totals[_segment_index]
+			del self.__records_totals[_segment_index]
+			os.remove(self.__get_segment_file_path(
+				segment_index=_segment_index
+			))
+
+	def replay(self) -> List[SegmentLogRecord]:
+		"""
+		Reads the records of the existing segments, which are then only read from, and returns the live records with the last location of each sequence index. A segment is read up to its first record that is incomplete or fails its checksum, such as a record torn by a crash.
+		:return: The live records, in no particular order.
+		"""
+
+		if self.__is_replayed:
+			raise Exception(f"Cannot replay segment log more than once.")
+		self.__is_replayed = True
+
+		_segment_indexes = []  # type: List[int]
+		for _file_name in os.listdir(self.__directory_path):
+			_match = SegmentLog.__segment_file_name_pattern.match(_file_name)
+			if _match is not None:
+				_segment_indexes.append(int(_match.group(1)))
+		_segment_indexes.sort()
+
+		_records_per_sequence_index = {}  # type: Dict[int, SegmentLogRecord]
+		_completed_sequence_indexes = set()
+		_record_header_bytes_total = SegmentLog.__record_header_struct.size
+		for _segment_index in _segment_indexes:
+			self.__open_segment(
+				segment_index=_segment_index
+			)
+			_segment_mmap = self.__segment_mmaps[_segment_index]
+			if _segment_mmap[0:len(SegmentLog.__file_header)] != SegmentLog.__file_header:
+				raise Exception(f"Cannot replay segment {_segment_index} because it is not a segment log file.")
+			_segment_view = memoryview(_segment_mmap)
+			try:
+				_offset = len(SegmentLog.__file_header)
+				while _offset + _record_header_bytes_total <= len(_segment_mmap):
+					_payload_bytes_total, _crc, _record_type, _sequence_index, _delay_timestamp = SegmentLog.__record_header_struct.unpack_from(_segment_mmap, _offset)
+					_payload_offset = _offset + _record_header_bytes_total
+					if _record_type == 0 or _payload_offset + _payload_bytes_total > len(_segment_mmap):
+						break
+					if zlib.crc32(_segment_view[_payload_offset:_payload_offset + _payload_bytes_total], zlib.crc32(SegmentLog.__record_crc_struct.pack(_record_type, _sequence_index, _delay_timestamp))) != _crc:
+						break
+					if _record_type == SegmentLogRecordTypeEnum.NextSequenceIndex:
+						self.__next_sequence_index = max(self.__next_sequence_index, _sequence_index)
+						_offset = _payload_offset + _payload_bytes_total
+						continue
+					self.__next_sequence_index = max(self.__next_sequence_index, _sequence_index + 1)
+					self.__records_totals[_segment_index] += 1
+					if _record_type == SegmentLogRecordTypeEnum.Completed:
+						_records_per_sequence_index.pop(_sequence_index, None)
+						_completed_sequence_indexes.add(_sequence_index)
+					elif _sequence_index not in _completed_sequence_indexes:
+						# a compacted record is written again with the same sequence index, so the later copy wins
+						_records_per_sequence_index[_sequence_index] = SegmentLogRecord(
+							record_type=SegmentLogRecordTypeEnum(_record_type),
+							sequence_index=_sequence_index,
+							delay_timestamp=_delay_timestamp,
+							segment_index=_segment_index,
+							offset=_offset
+						)
+					_offset = _payload_offset + _payload_bytes_total
+			finally:
+				_segment_view.release()
+
+		for _record in _records_per_sequence_index.values():
+			self.__live_records_totals[_record.get_segment_index()] += 1
+
+		self.__delete_unused_oldest_segments()
+		# records are never appended to a replayed segment, whose end may be torn
+		self.__roll(
+			record_bytes_total=0
+		)
+
+		return list(_records_per_sequence_index.values())
+
+	def __write_record(self, *, record_type: SegmentLogRecordTypeEnum, sequence_index: int, delay_timestamp: float, payload: bytes) -> int:
+
+		# expects the record to fit in the current segment
+		_record_header_bytes_total = SegmentLog.__record_header_struct.size
+		_record_bytes_total = _record_header_bytes_total + len(payload)
+		_offset = self.__write_offset
+		_segment_mmap = self.__segment_mmaps[self.__write_segment_index]
+		_segment_mmap[_offset + _record_header_bytes_total:_offset + _record_bytes_total] = payload
+		_crc = zlib.crc32(payload, zlib.crc32(SegmentLog.__record_crc_struct.pack(record_type, sequence_index, delay_timestamp)))
+		SegmentLog.__record_header_struct.pack_into(_segment_mmap, _offset, len(payload), _crc, record_type, sequence_index, delay_timestamp)
+		self.__write_offset += _record_bytes_total
+		if self.__unsynced_offset is None:
+			self.__unsynced_offset = _offset
+		return _offset
+
+	def append(self, *, record_type: SegmentLogRecordTypeEnum, sequence_index: int, delay_timestamp: float, payload: bytes) -> Tuple[int, int]:
+		"""
+		Appends the record to the current segment, rolling over to a new segment if it does not fit.
+		:return: The segment index and offset of the record.
+		"""
+
+		if not self.__is_replayed:
+			raise Exception(f"Cannot append to segment log before it is replayed.")
+
+		_record_bytes_total = SegmentLog.__record_header_struct.size + len(payload)
+		if self.__write_offset + _record_bytes_total > len(self.__segment_mmaps[self.__write_segment_index]):
+			self.__roll(
+				record_bytes_total=_record_bytes_total
+			)
+
+		_segment_index = self.__write_segment_index
+		_offset = self.__write_record(
+			record_type=record_type,
+			sequence_index=sequence_index,
+			delay_timestamp=delay_timestamp,
+			payload=payload
+		)
+		self.__next_sequence_index = max(self.__next_sequence_index, sequence_index + 1)
+
+		self.__records_totals[_segment_index] += 1
+		if record_type != SegmentLogRecordTypeEnum.Completed:
+			self.__live_records_totals[_segment_index] += 1
+
+		return _segment_index, _offset
+
+	def complete(self, *, sequence_index: int, segment_index: int):
+		"""
+		Appends a completed record for the record of the sequence index at the segment index, deleting the oldest segments that no longer have live records.
+		"""
+
+		self.append(
+			record_type=SegmentLogRecordTypeEnum.Completed,
+			sequence_index=sequence_index,
+			delay_timestamp=0.0,
+			payload=b""
+		)
+		self.__live_records_totals[segment_index] -= 1
+		self.__delete_unused_oldest_segments()
+
+	def release(self, *, segment_index: int, records_total: int):
+		"""
+		Stops counting records of the segment index as live after they have been appended again, deleting the oldest segments that no longer have live records.
+		"""
+
+		self.__live_records_totals[segment_index] -= records_total
+		self.__delete_unused_oldest_segments()
+
+	def read_payload(self, *, segment_index: int, offset: int) -> bytes:
+		_segment_mmap = self.__segment_mmaps[segment_index]
+		_payload_bytes_total = SegmentLog.__record_header_struct.unpack_from(_segment_mmap, offset)[0]
+		_payload_offset = offset + SegmentLog.__record_header_struct.size
+		return _segment_mmap[_payload_offset:_payload_offset + _payload_bytes_total]
+
+	def get_next_sequence_index(self) -> int:
+		return self.__next_sequence_index
+
+	def get_oldest_sealed_segment_index(self) -> int:
+		_segment_index = min(self.__segment_mmaps.keys())
+		if _segment_index == self.__write_segment_index:
+			return None
+		return _segment_index
+
+	def get_live_records_total(self, *, segment_index: int) -> int:
+		return self.__live_records_totals[segment_index]
+
+	def get_records_total(self, *, segment_index: int) -> int:
+		return self.__records_totals[segment_index]
+
+	def get_segments_total(self) -> int:
+		return len(self.__segment_mmaps)
+
+	def get_seconds_since_sync(self) -> float:
+		return time.monotonic() - self.__synced_time
+
+	def sync(self):
+		"""
+		Flushes the records appended since the last sync to disk. The records already survive the process crashing once appended, since the segments are shared memory maps, so syncing only protects against the operating system crashing or losing power.
+		:return: None
+		"""
+
+		if self.__unsynced_offset is not None:
+			# the flushed range must start on a page boundary
+			_offset = self.__unsynced_offset - self.__unsynced_offset % mmap.PAGESIZE
+			self.__segment_mmaps[self.__write_segment_index].flush(_offset, self.__write_offset - _offset)
+			self.__unsynced_offset = None
+		self.__synced_time = time.monotonic()
+
+	def dispose(self):
+		if self.__write_segment_index is not None:
+			self.sync()
+		for _segment_index in list(self.__segment_mmaps.keys()):
+			self.__close_segment(
+				segment_index=_segment_index
+			)
+
+
+class DurableQueueEntry():
+	"""
+	This class is an element of a durable queue along with the location of its record. The element is only held in memory while the entry is within the window, executing or delayed.
+	"""
+
+	__slots__ = ("record_type", "sequence_index", "delay_timestamp", "segment_index", "offset", "executable_element")
+
+	def __init__(self, *, record_type: SegmentLogRecordTypeEnum, sequence_index: int, delay_timestamp: float, segment_index: int, offset: int, executable_element: ExecutableElement):
+
+		self.record_type = record_type
+		self.sequence_index = sequence_index
+		self.delay_timestamp = delay_timestamp
+		self.segment_index = segment_index
+		self.offset = offset
+		self.executable_element = executable_element
+
+
+class DurableSingleThreadedExecutableQueue(ExecutableQueueInterface):
+	"""
+	This class executes elements on a single thread like SingleThreadedExecutableQueue, but first writes each element to a segment log in the directory, so that the pending and delayed elements of a restarted queue are replayed from it. At most the window of elements is held in memory, while later appended elements are read back from the segment log as the window empties. An element is completed once it has been executed, so an element that was executing when the process stopped is executed again.
+	"""
+
+	def __init__(self, *, directory_path: str, executable_element_serializer: ExecutableElementSerializerInterface = None, window_elements_total: int = 10000, segment_bytes_total: int = 64 * 1024 * 1024, sync: DurableQueueSyncEnum = DurableQueueSyncEnum.PerBatch, sync_interval_seconds: float = 0.1, compaction_interval_seconds: float = 60.0, compaction_live_records_ratio: float = 0.5):
+
+		if window_elements_total < 1:
+			raise Exception(f"Cannot create durable queue with a window of {window_elements_total} elements.")
+
+		self.__executable_element_serializer = PickleExecutableElementSerializer() if executable_element_serializer is None else executable_element_serializer
+		self.__window_elements_total = window_elements_total
+		self.__sync = sync
+		self.__sync_interval_seconds = sync_interval_seconds
+		self.__compaction_interval_seconds = compaction_interval_seconds
+		self.__compaction_live_records_ratio = compaction_live_records_ratio
+
+		self.__segment_log = SegmentLog(
+			directory_path=directory_path,
+			segment_bytes_total=segment_bytes_total
+		)
+		self.__window_entries = deque()  # type: Deque[DurableQueueEntry]
+		# the appended entries past the window keep only the location of their record
+		self.__spilled_entries = deque()  # type: Deque[DurableQueueEntry]
+		self.__spilled_entries_total_per_segment_index = {}  # type: Dict[int, int]
+		self.__delayed_entries = {}  # type: Dict[int, DurableQueueEntry]
+		self.__executing_entry = None  # type: DurableQueueEntry
+		self.__sequence_index = 0
+		self.__compacted_time = time.monotonic()
+		self.__compacted_records_total = 0
+		self.__queue_lock = threading.Lock()
+		self.__queue_not_empty_condition = threading.Condition(self.__queue_lock)
+		self.__queue_empty_condition = threading.Condition(self.__queue_lock)
+		self.__delayed_element_scheduler = None  # type: DelayedElementScheduler
+		self.__processing_thread = None
+		self.__is_threads_active = True
+		self.__is_processing_thread_empty = False
+
+		self.__replay()
+		self.__start_processing_thread()
+
+	def __replay(self):
+
+		_records = self.__segment_log.replay()
+		_records.sort(key=lambda _record: _record.get_sequence_index())
+		# the next sequence index is past every record ever written, including completed ones, since a reused sequence index would be skipped as completed by the next replay
+		self.__sequence_index = self.__segment_log.get_next_sequence_index()
+
+		self.__delayed_element_scheduler = DelayedElementScheduler(
+			due_function=self.__delayed_entry_due
+		)
+
+		_insert_at_front_entries = []  # type: List[DurableQueueEntry]
+		for _record in _records:
+			_entry = DurableQueueEntry(
+				record_type=_record.get_record_type(),
+				sequence_index=_record.get_sequence_index(),
+				delay_timestamp=_record.get_delay_timestamp(),
+				segment_index=_record.get_segment_index(),
+				offset=_record.get_offset(),
+				executable_element=None
+			)
+			if _entry.record_type == SegmentLogRecordTypeEnum.Append:
+				if len(self.__window_entries) < self.__window_elements_total:
+					self.__load_executable_element(
+						entry=_entry
+					)
+					self.__window_entries.append(_entry)
+				else:
+					self.__spill(
+						entry=_entry
+					)
+			else:
+				self.__load_executable_element(
+					entry=_entry
+				)
+				if _entry.record_type == SegmentLogRecordTypeEnum.InsertFront:
+					_insert_at_front_entries.append(_entry)
+				else:
+					self.__delayed_entries[_entry.sequence_index] = _entry
+		# a later insert at the front is executed first
+		self.__window_entries.extendleft(_insert_at_front_entries)
+
+		# the delayed elements are scheduled last since an overdue element is enqueued right away
+		self.__delayed_element_scheduler.add_many(
+			delayed_elements=[
+				DelayedElement(
+					element=_entry,
+					delay_datetime=DurableSingleThreadedExecutableQueue.__get_delay_datetime(
+						delay_timestamp=_entry.delay_timestamp
+					)
+				) for _entry in self.__delayed_entries.values()
+			]
+		)
+
+	@staticmethod
+	def __get_delay_timestamp(*, delay_datetime: datetime) -> float:
+		# delay datetimes are naive utc datetimes, as from datetime.utcnow()
+		return delay_datetime.replace(tzinfo=timezone.utc).timestamp()
+
+	@staticmethod
+	def __get_delay_datetime(*, delay_timestamp: float) -> datetime:
+		return datetime.fromtimestamp(delay_timestamp, timezone.utc).replace(tzinfo=None)
+
+	def __load_executable_element(self, *, entry: DurableQueueEntry):
+		entry.executable_element = self.__executable_element_serializer.loads(
+			executable_element_bytes=self.__segment_log.read_payload(
+				segment_index=entry.segment_index,
+				offset=entry.offset
+			)
+		)
+
+	def __spill(self, *, entry: DurableQueueEntry):
+		entry.executable_element = None
+		self.__spilled_entries.append(entry)
+		self.__spilled_entries_total_per_segment_index[entry.segment_index] = self.__spilled_entries_total_per_segment_index.get(entry.segment_index, 0) + 1
+
+	def __fill_window(self):
+
+		# expects the queue lock to be held
+		while len(self.__spilled_entries) != 0 and len(self.__window_entries) < self.__window_elements_total:
+			_entry = self.__spilled_entries.popleft()
+			self.__spilled_entries_total_per_segment_index[_entry.segment_index] -= 1
+			if self.__spilled_entries_total_per_segment_index[_entry.segment_index] == 0:
+				del self.__spilled_entries_total_per_segment_index[_entry.segment_index]
+			self.__load_executable_element(
+				entry=_entry
+			)
+			self.__window_entries.append(_entry)
+
+	def __write(self, *, record_type: SegmentLogRecordTypeEnum, executable_element: ExecutableElement, delay_timestamp: float) -> DurableQueueEntry:
+
+		# expects the queue lock to be held
+		if isinstance(executable_element, FutureExecutableElement):
+			raise Exception(f"Cannot write a submitted element to a durable queue since its future does not survive a restart.")
+		_segment_index, _offset = self.__segment_log.append(
+			record_type=record_type,
+			sequence_index=self.__sequence_index,
+			delay_timestamp=delay_timestamp,
+			payload=self.__executable_element_serializer.dumps(
+				executable_element=executable_element
+			)
+		)
+		_entry = DurableQueueEntry(
+			record_type=record_type,
+			sequence_index=self.__sequence_index,
+			delay_timestamp=delay_timestamp,
+			segment_index=_segment_index,
+			offset=_offset,
+			executable_element=executable_element
+		)
+		self.__sequence_index += 1
+		return _entry
+
+	def __enqueue(self, *, entry: DurableQueueEntry):
+
+		# expects the queue lock to be held
+		if entry.record_type == SegmentLogRecordTypeEnum.InsertFront:
+			self.__window_entries.appendleft(entry)
+		elif len(self.__spilled_entries) == 0 and len(self.__window_entries) < self.__window_elements_total:
+			self.__window_entries.append(entry)
+		else:
+			self.__spill(
+				entry=entry
+			)
+		if self.__is_processing_thread_empty:
+			self.__queue_not_empty_condition.notify()
+
+	def __end_batch(self):
+
+		# expects the queue lock to be held
+		if self.__sync == DurableQueueSyncEnum.PerBatch or self.__segment_log.get_seconds_since_sync() >= self.__sync_interval_seconds:
+			self.__segment_log.sync()
+
+	def __delayed_entry_due(self, delayed_element: DelayedElement):
+
+		_delayed_entry = delayed_element.get_element()  # type: DurableQueueEntry
+
+		self.__queue_lock.acquire()
+		try:
+			if not self.__is_threads_active:
+				return
+			# the due element is written again before its delayed record is completed, so that it is never lost between them
+			_entry = self.__write(
+				record_type=SegmentLogRecordTypeEnum.InsertFront if _delayed_entry.record_type == SegmentLogRecordTypeEnum.InsertFrontDelayed else SegmentLogRecordTypeEnum.Append,
+				executable_element=_delayed_entry.executable_element,
+				delay_timestamp=0.0
+			)
+			self.__segment_log.complete(
+				sequence_index=_delayed_entry.sequence_index,
+				segment_index=_delayed_entry.segment_index
+			)
+			del self.__delayed_entries[_delayed_entry.sequence_index]
+			self.__enqueue(
+				entry=_entry
+			)
+			self.__end_batch()
+		finally:
+			self.__queue_lock.release()
+
+	def __compact(self):
+		"""
+		Writes the live records of the oldest segment again, if few of its records are live and each live record is held in memory, so that the segment can be deleted instead of a long delayed element keeping every later segment from being deleted.
+		"""
+
+		# expects the queue lock to be held
+		_segment_index = self.__segment_log.get_oldest_sealed_segment_index()
+		if _segment_index is None or _segment_index in self.__spilled_entries_total_per_segment_index:
+			return
+		if self.__segment_log.get_live_records_total(segment_index=_segment_index) > self.__segment_log.get_records_total(segment_index=_segment_index) * self.__compaction_live_records_ratio:
+			return
+
+		_entries = [_entry for _entry in self.__window_entries if _entry.segment_index == _segment_index]
+		_entries.extend(_entry for _entry in self.__delayed_entries.values() if _entry.segment_index == _segment_index)
+		if self.__executing_entry is not None and self.__executing_entry.segment_index == _segment_index:
+			_entries.append(self.__executing_entry)
+
+		for _entry in _entries:
+			_entry.segment_index, _entry.offset = self.__segment_log.append(
+				record_type=_entry.record_type,
+				sequence_index=_entry.sequence_index,
+				delay_timestamp=_entry.delay_timestamp,
+				payload=self.__executable_element_serializer.dumps(
+					executable_element=_entry.executable_element
+				)
+			)
+		# the copies are synced before the segment holding the originals is deleted
+		self.__segment_log.sync()
+		self.__segment_log.release(
+			segment_index=_segment_index,
+			records_total=len(_entries)
+		)
+		self.__compacted_records_total += len(_entries)
+
+	def __start_processing_thread(self):
+
+		def _thread_method():
+
+			while True:
+				self.__queue_lock.acquire()
+				while self.__is_threads_active and len(self.__window_entries) == 0 and len(self.__spilled_entries) == 0:
+					self.__is_processing_thread_empty = True
+					self.__queue_empty_condition.notify_all()
+					self.__queue_not_empty_condition.wait()
+				if not self.__is_threads_active:
+					self.__queue_lock.release()
+					break
+				self.__is_processing_thread_empty = False
+				if len(self.__window_entries) == 0:
+					self.__fill_window()
+				_entry = self.__window_entries.popleft()
+				self.__executing_entry = _entry
+				self.__queue_lock.release()
+
+				try:
+					_execution_parameters = self.get_execution_parameters()
+					_execution_result = _entry.executable_element.execute(**_execution_parameters)
+					self.process_execution_result(
+						execution_result=_execution_result
+					)
+				except Exception as ex:
+					self.process_execution_exception(
+						executable_element=_entry.executable_element,
+						exception=ex
+					)
+
+				self.__queue_lock.acquire()
+				self.__executing_entry = None
+				self.__segment_log.complete(
+					sequence_index=_entry.sequence_index,
+					segment_index=_entry.segment_index
+				)
+				if time.monotonic() - self.__compacted_time >= self.__compaction_interval_seconds:
+					self.__compacted_time = time.monotonic()
+					self.__compact()
+				if self.__sync == DurableQueueSyncEnum.PerInterval and self.__segment_log.get_seconds_since_sync() >= self.__sync_interval_seconds:
+					self.__segment_log.sync()
+				self.__queue_lock.release()
+
+		self.__processing_thread = threading.Thread(
+			target=_thread_method
+		)
+		self.__processing_thread.daemon = True
+		self.__processing_thread.start()
+
+	def __write_and_enqueue(self, *, record_type: SegmentLogRecordTypeEnum, executable_elements: List[ExecutableElement]):
+
+		if len(executable_elements) != 0:
+
+			self.__queue_lock.acquire()
+			try:
+				if not self.__is_threads_active:
+					raise Exception(f"Cannot enqueue to durable queue after it has been disposed.")
+				for _executable_element in executable_elements:
+					self.__enqueue(
+						entry=self.__write(
+							record_type=record_type,
+							executable_element=_executable_element,
+							delay_timestamp=0.0
+						)
+					)
+				self.__end_batch()
+			finally:
+				self.__queue_lock.release()
+
+	def __write_delayed(self, *, record_type: SegmentLogRecordTypeEnum, executable_element: ExecutableElement, delay_datetime: datetime):
+
+		self.__queue_lock.acquire()
+		try:
+			if not self.__is_threads_active:
+				raise Exception(f"Cannot enqueue to durable queue after it has been disposed.")
+			_entry = self.__write(
+				record_type=record_type,
+				executable_element=executable_element,
+				delay_timestamp=DurableSingleThreadedExecutableQueue.__get_delay_timestamp(
+					delay_datetime=delay_datetime
+				)
+			)
+			self.__delayed_entries[_entry.sequence_index] = _entry
+			self.__end_batch()
+		finally:
+			self.__queue_lock.release()
+
+		self.__delayed_element_scheduler.add(
+			delayed_element=DelayedElement(
+				element=_entry,
+				delay_datetime=delay_datetime
+			)
+		)
+
+	def insert_at_front_immediately(self, *, executable_element: ExecutableElement):
+		self.__write_and_enqueue(
+			record_type=SegmentLogRecordTypeEnum.InsertFront,
+			executable_elements=[executable_element]
+		)
+
+	def insert_many_at_front_immediately(self, *, executable_elements: List[ExecutableElement]):
+		# each element is inserted at the front in turn, so the last is inserted first to keep their order
+		self.__write_and_enqueue(
+			record_type=SegmentLogRecordTypeEnum.InsertFront,
+			executable_elements=list(reversed(executable_elements))
+		)
+
+	def append_to_end_immediately(self, *, executable_element: ExecutableElement):
+		self.__write_and_enqueue(
+			record_type=SegmentLogRecordTypeEnum.Append,
+			executable_elements=[executable_element]
+		)
+
+	def append_many_to_end_immediately(self, *, executable_elements: List[ExecutableElement]):
+		self.__write_and_enqueue(
+			record_type=SegmentLogRecordTypeEnum.Append,
+			executable_elements=executable_elements
+		)
+
+	def submit(self, *, executable_element: ExecutableElement) -> concurrent.futures.Future:
+		raise Exception(f"Cannot submit to a durable queue since a future does not survive a restart.")
+
+	def submit_many(self, *, executable_elements: List[ExecutableElement]) -> List[concurrent.futures.Future]:
+		raise Exception(f"Cannot submit to a durable queue since a future does not survive a restart.")
+
+	def insert_at_front_after_datetime(self, *, executable_element: ExecutableElement, delay_datetime: datetime):
+		self.__write_delayed(
+			record_type=SegmentLogRecordTypeEnum.InsertFrontDelayed,
+			executable_element=executable_element,
+			delay_datetime=delay_datetime
+		)
+
+	def append_to_end_after_datetime(self, *, executable_element: ExecutableElement, delay_datetime: datetime):
+		self.__write_delayed(
+			record_type=SegmentLogRecordTypeEnum.AppendDelayed,
+			executable_element=executable_element,
+			delay_datetime=delay_datetime
+		)
+
+	def insert_at_front_after_elapsed_seconds(self, *, executable_element: ExecutableElement, seconds_total: int):
+		self.__write_delayed(
+			record_type=SegmentLogRecordTypeEnum.InsertFrontDelayed,
+			executable_element=executable_element,
+			delay_datetime=datetime.utcnow() + timedelta(0, seconds_total)
+		)
+
+	def append_to_end_after_elapsed_seconds(self, *, executable_element: ExecutableElement, seconds_total: int):
+		self.__write_delayed(
+			record_type=SegmentLogRecordTypeEnum.AppendDelayed,
+			executable_element=executable_element,
+			delay_datetime=datetime.utcnow() + timedelta(0, seconds_total)
+		)
+
+	def wait_until_empty(self):
+
+		self.__queue_lock.acquire()
+
+		while self.__is_threads_active and (not self.__is_processing_thread_empty or len(self.__window_entries) != 0 or len(self.__spilled_entries) != 0):
+			self.__queue_empty_condition.wait()
+
+		self.__queue_lock.release()
+
+	def compact(self):
+		"""
+		Compacts the oldest segment now instead of waiting for the compaction interval.
+		:return: None
+		"""
+
+		self.__queue_lock.acquire()
+		try:
+			self.__compacted_time = time.monotonic()
+			self.__compact()
+		finally:
+			self.__queue_lock.release()
+
+	def get_segments_total(self) -> int:
+		return self.__segment_log.get_segments_total()
+
+	def get_window_elements_total(self) -> int:
+		return len(self.__window_entries)
+
+	def get_spilled_elements_total(self) -> int:
+		return len(self.__spilled_entries)
+
+	def get_compacted_records_total(self) -> int:
+		return self.__compacted_records_total
+
+	def dispose(self):
+		"""
+		Stops the queue without completing the pending elements, so that they are replayed by the next queue of the directory.
+		:return: None
+		"""
+
+		self.__delayed_element_scheduler.dispose()
+
+		self.__queue_lock.acquire()
+
+		_is_threads_active = self.__is_threads_active
+		self.__is_threads_active = False
+		self.__queue_not_empty_condition.notify_all()
+		self.__queue_empty_condition.notify_all()
+
+		self.__queue_lock.release()
+
+		if _is_threads_active and self.__processing_thread is not threading.current_thread():
+			self.__processing_thread.join()
+
+		if _is_threads_active:
+			self.__segment_log.dispose()
+
+	@abstractmethod
+	def get_execution_parameters(self) -> Dict[str, object]:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def process_execution_result(self, *, execution_result: object):
+		raise NotImplementedError()
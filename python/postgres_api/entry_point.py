@@ -13,6 +13,7 @@ class PostgresApiEntryPointTypeEnum(EntryPointTypeEnum):
 
 	CreateDatabase = auto(),
 	InsertRecord = auto(),
+	BulkInsertRecords = auto(),
 	GetRecord = auto(),
 	GetRecords = auto(),
 	UpdateRecord = auto(),
@@ -1,17 +1,30 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Callable
+from typing import Callable, Awaitable
+import concurrent.futures
+import sys
 
 
 class ExecutableElement(ABC):
 
+	__slots__ = ()
+
 	@abstractmethod
 	def execute(self, *args, **kwargs) -> object:
 		raise NotImplementedError()
 
+	def get_estimated_bytes_total(self) -> int:
+		"""
+		Estimates the memory held by the element while it waits in a queue, which a queue bounded by bytes admits against. Elements holding large arguments should add them to the estimate.
+		:return: The estimated bytes.
+		"""
+		return sys.getsizeof(self)
+
 
 class DefaultExecutableElement(ExecutableElement):
 
+	__slots__ = ("__default_output",)
+
 	def __init__(self, *, default_output: object):
 
 		self.__default_output = default_output
@@ -22,9 +35,62 @@ class DefaultExecutableElement(ExecutableElement):
 
 class DelegatedExecutableElement(ExecutableElement):
 
+	__slots__ = ("__delegate_function",)
+
 	def __init__(self, *, delegate_function: Callable[[...], object]):
 
 		self.__delegate_function = delegate_function
 
 	def execute(self, *args, **kwargs) -> object:
-		return self.__delegate_function(*args, **kwargs)
\ No newline at end of file
+		return self.__delegate_function(*args, **kwargs)
+
+
+class AsyncExecutableElement(ABC):
+
+	__slots__ = ()
+
+	@abstractmethod
+	async def execute(self, *args, **kwargs) -> object:
+		raise NotImplementedError()
+
+
+class DelegatedAsyncExecutableElement(AsyncExecutableElement):
+
+	__slots__ = ("__delegate_function",)
+
+	def __init__(self, *, delegate_function: Callable[[...], Awaitable[object]]):
+
+		self.__delegate_function = delegate_function
+
+	async def execute(self, *args, **kwargs) -> object:
+		return await self.__delegate_function(*args, **kwargs)
+
+
+class FutureExecutableElement(ExecutableElement):
+	"""
+	This class resolves a future with the output or the exception of the executable element it wraps. The element is not executed if the future was cancelled first.
+	"""
+
+	__slots__ = ("__executable_element", "__future")
+
+	def __init__(self, *, executable_element: ExecutableElement, future: concurrent.futures.Future):
+
+		self.__executable_element = executable_element
+		self.__future = future
+
+	def get_future(self) -> concurrent.futures.Future:
+		return self.__future
+
+	def get_estimated_bytes_total(self) -> int:
+		return sys.getsizeof(self) + self.__executable_element.get_estimated_bytes_total()
+
+	def execute(self, *args, **kwargs) -> object:
+		if not self.__future.set_running_or_notify_cancel():
+			raise concurrent.futures.CancelledError()
+		try:
+			_output = self.__executable_element.execute(*args, **kwargs)
+		except Exception as ex:
+			self.__future.set_exception(ex)
+			raise
+		self.__future.set_result(_output)
+		return _output
@@ -0,0 +1,435 @@
+from __future__ import annotations
+from postgres_api.executable import ExecutableElement, FutureExecutableElement
+from postgres_api.queue import ExecutableQueueInterface, DelayedElement, DelayedElementScheduler
+from abc import abstractmethod
+from collections import deque
+from datetime import datetime, timedelta
+from typing import List, Dict, Tuple, Deque
+import concurrent.futures
+import threading
+import time
+
+
+class FairQueueTenant():
+
+	__slots__ = ("tenant_key", "entries", "deficit")
+
+	def __init__(self, *, tenant_key: object):
+
+		self.tenant_key = tenant_key
+		# an entry is (enqueued time, cost, executable element)
+		self.entries = deque()  # type: Deque[Tuple[float, float, ExecutableElement]]
+		self.deficit = 0.0
+
+
+class FairQueueLane():
+	"""
+	This class holds the tenants of a priority lane with pending elements, in round robin order, along with the recent queue waits of the elements taken from the lane.
+	"""
+
+	__slots__ = ("lane_name", "active_tenants", "tenant_per_tenant_key", "pending_total", "executed_total", "queue_wait_seconds")
+
+	def __init__(self, *, lane_name: str, queue_wait_samples_total: int):
+
+		self.lane_name = lane_name
+		self.active_tenants = deque()  # type: Deque[FairQueueTenant]
+		self.tenant_per_tenant_key = {}  # type: Dict[object, FairQueueTenant]
+		self.pending_total = 0
+		self.executed_total = 0
+		self.queue_wait_seconds = deque(maxlen=queue_wait_samples_total)  # type: Deque[float]
+
+
+class FairThreadPoolExecutableQueue(ExecutableQueueInterface):
+	"""
+	This class executes elements on a fixed number of worker threads, taking them from named priority lanes in strict priority order. Within a lane, the tenants with pending elements share the workers by deficit round robin, where each turn adds the quantum times the weight of the tenant to its deficit and an element is taken once the deficit covers its cost, so that a tenant enqueuing many elements does not hold up the others. A tenant with as many elements executing as its concurrency cap is skipped until one of them finishes.
+	"""
+
+	def __init__(self, *, workers_total: int, lane_names: List[str] = None, default_lane_name: str = None, quantum: float = 1.0, weight_per_tenant_key: Dict[object, float] = None, default_weight: float = 1.0, maximum_executing_total_per_tenant_key: Dict[object, int] = None, default_maximum_executing_total: int = None, queue_wait_samples_total: int = 10000):
+
+		if workers_total < 1:
+			raise Exception(f"Cannot create thread pool with {workers_total} workers.")
+		if lane_names is None:
+			lane_names = ["interactive", "default", "bulk"]
+		if len(lane_names) == 0 or len(set(lane_names)) != len(lane_names):
+			raise Exception(f"Cannot create fair queue with lanes {lane_names}.")
+		if default_lane_name is None:
+			default_lane_name = "default" if "default" in lane_names else lane_names[0]
+		if default_lane_name not in lane_names:
+			raise Exception(f"Cannot create fair queue with default lane \"{default_lane_name}\" that is not one of {lane_names}.")
+		if quantum <= 0:
+			raise Exception(f"Cannot create fair queue with a quantum of {quantum}.")
+		if default_weight <= 0 or (weight_per_tenant_key is not None and any(_weight <= 0 for _weight in weight_per_tenant_key.values())):
+			raise Exception(f"Cannot create fair queue with a weight that is not positive.")
+
+		self.__workers_total = workers_total
+		self.__default_lane_name = default_lane_name
+		self.__quantum = quantum
+		self.__weight_per_tenant_key = {} if weight_per_tenant_key is None else dict(weight_per_tenant_key)
+		self.__default_weight = default_weight
+		self.__maximum_executing_total_per_tenant_key = {} if maximum_executing_total_per_tenant_key is None else dict(maximum_executing_total_per_tenant_key)
+		self.__default_maximum_executing_total = default_maximum_executing_total
+
+		# the lanes are in priority order, highest first
+		self.__lanes = [FairQueueLane(
+			lane_name=_lane_name,
+			queue_wait_samples_total=queue_wait_samples_total
+		) for _lane_name in lane_names]
+		self.__lane_per_lane_name = {_lane.lane_name: _lane for _lane in self.__lanes}  # type: Dict[str, FairQueueLane]
+		self.__executing_total_per_tenant_key = {}  # type: Dict[object, int]
+		self.__executable_elements_total = 0
+		self.__delayed_element_scheduler = None  # type: DelayedElementScheduler
+		self.__queue_lock = threading.Lock()
+		self.__queue_not_empty_condition = threading.Condition(self.__queue_lock)
+		self.__queue_empty_condition = threading.Condition(self.__queue_lock)
+		self.__worker_threads = []  # type: List[threading.Thread]
+		self.__is_threads_active = True
+
+		self.__start_delayed_element_scheduler()
+		self.__start_worker_threads()
+
+	def __start_delayed_element_scheduler(self):
+
+		def _due_function(delayed_element: DelayedElement):
+			_executable_element, _tenant_key, _lane_name, _cost, _is_front = delayed_element.get_element()  # type: ExecutableElement, object, str, float, bool
+			self.__enqueue_many(
+				executable_elements=[_executable_element],
+				tenant_key=_tenant_key,
+				lane_name=_lane_name,
+				cost=_cost,
+				is_front=_is_front
+			)
+
+		self.__delayed_element_scheduler = DelayedElementScheduler(
+			due_function=_due_function
+		)
+
+	def __is_tenant_capped(self, *, tenant_key: object) -> bool:
+		_maximum_executing_total = self.__maximum_executing_total_per_tenant_key.get(tenant_key, self.__default_maximum_executing_total)
+		return _maximum_executing_total is not None and self.__executing_total_per_tenant_key.get(tenant_key, 0) >= _maximum_executing_total
+
+	def __try_take(self, *, lane: FairQueueLane) -> Tuple[FairQueueTenant, float, ExecutableElement]:
+
+		# expects the queue lock to be held
+		_capped_tenants_total = 0
+		while _capped_tenants_total < len(lane.active_tenants):
+			_tenant = lane.active_tenants[0]
+			if self.__is_tenant_capped(
+				tenant_key=_tenant.tenant_key
+			):
+				# a capped tenant keeps its place in the rotation without gaining deficit
+				lane.active_tenants.rotate(-1)
+				_capped_tenants_total += 1
+				continue
+			_enqueued_time, _cost, _executable_element = _tenant.entries[0]
+			if _tenant.deficit < _cost:
+				_tenant.deficit += self.__quantum * self.__weight_per_tenant_key.get(_tenant.tenant_key, self.__default_weight)
+				lane.active_tenants.rotate(-1)
+				_capped_tenants_total = 0
+				continue
+			_tenant.deficit -= _cost
+			_tenant.entries.popleft()
+			lane.pending_total -= 1
+			if len(_tenant.entries) == 0:
+				# a tenant does not keep deficit while it has nothing pending
+				lane.active_tenants.popleft()
+				del lane.tenant_per_tenant_key[_tenant.tenant_key]
+			return _tenant, _enqueued_time, _executable_element
+		return None, None, None
+
+	def __take(self) -> Tuple[FairQueueLane, FairQueueTenant, float, ExecutableElement]:
+
+		# expects the queue lock to be held
+		for _lane in self.__lanes:
+			if _lane.pending_total != 0:
+				_tenant, _enqueued_time, _executable_element = self.__try_take(
+					lane=_lane
+				)
+				if _tenant is not None:
+					return _lane, _tenant, _enqueued_time, _executable_element
+		return None, None, None, None
+
+	def __start_worker_threads(self):
+
+		def _thread_method(worker_index: int):
+
+			while True:
+				self.__queue_lock.acquire()
+				_lane = None
+				while self.__is_threads_active:
+					_lane, _tenant, _enqueued_time, _executable_element = self.__take()
+					if _lane is not None:
+						break
+					# every pending element is of a capped tenant, or nothing is pending
+					self.__queue_not_empty_condition.wait()
+				if not self.__is_threads_active:
+					self.__queue_lock.release()
+					break
+				_tenant_key = _tenant.tenant_key
+				self.__executing_total_per_tenant_key[_tenant_key] = self.__executing_total_per_tenant_key.get(_tenant_key, 0) + 1
+				_lane.queue_wait_seconds.append(time.monotonic() - _enqueued_time)
+				self.__queue_lock.release()
+
+				try:
+					_execution_parameters = self.get_execution_parameters(
+						worker_index=worker_index
+					)
+					_execution_result = _executable_element.execute(**_execution_parameters)
+					self.process_execution_result(
+						execution_result=_execution_result
+					)
+				except Exception as ex:
+					self.process_execution_exception(
+						executable_element=_executable_element,
+						exception=ex
+					)
+				finally:
+					self.__queue_lock.acquire()
+					_lane.executed_total += 1
+					_executing_total = self.__executing_total_per_tenant_key[_tenant_key] - 1
+					if _executing_total == 0:
+						del self.__executing_total_per_tenant_key[_tenant_key]
+					else:
+						self.__executing_total_per_tenant_key[_tenant_key] = _executing_total
+					# a worker may be waiting on this tenant to drop below its concurrency cap
+					self.__queue_not_empty_condition.notify()
+					self.__executable_elements_total -= 1
+					if self.__executable_elements_total == 0:
+						self.__queue_empty_condition.notify_all()
+					self.__queue_lock.release()
+
+		for _worker_index in range(self.__workers_total):
+			_worker_thread = threading.Thread(
+				target=_thread_method,
+				args=(_worker_index,)
+			)
+			_worker_thread.daemon = True
+			_worker_thread.start()
+			self.__worker_threads.append(_worker_thread)
+
+	def __get_lane(self, *, lane_name: str) -> FairQueueLane:
+		_lane = self.__lane_per_lane_name.get(self.__default_lane_name if lane_name is None else lane_name, None)
+		if _lane is None:
+			raise Exception(f"Cannot enqueue to unknown lane \"{lane_name}\".")
+		return _lane
+
+	def __enqueue_many(self, *, executable_elements: List[ExecutableElement], tenant_key: object, lane_name: str, cost: float, is_front: bool):
+
+		if len(executable_elements) != 0:
+
+			if cost <= 0:
+				raise Exception(f"Cannot enqueue element with a cost of {cost}.")
+
+			_enqueued_time = time.monotonic()
+			self.__queue_lock.acquire()
+			try:
+				_lane = self.__get_lane(
+					lane_name=lane_name
+				)
+				_tenant = _lane.tenant_per_tenant_key.get(tenant_key, None)
+				if _tenant is None:
+					_tenant = FairQueueTenant(
+						tenant_key=tenant_key
+					)
+					_lane.tenant_per_tenant_key[tenant_key] = _tenant
+					_lane.active_tenants.append(_tenant)
+				# inserting at the front only moves the elements ahead of the other elements of the tenant, not ahead of other tenants
+				if is_front:
+					_tenant.entries.extendleft((_enqueued_time, cost, _executable_element) for _executable_element in reversed(executable_elements))
+				else:
+					_tenant.entries.extend((_enqueued_time, cost, _executable_element) for _executable_element in executable_elements)
+				_lane.pending_total += len(executable_elements)
+				self.__executable_elements_total += len(executable_elements)
+				self.__queue_not_empty_condition.notify(len(executable_elements))
+			finally:
+				self.__queue_lock.release()
+
+	def __schedule(self, *, executable_element: ExecutableElement, delay_datetime: datetime, tenant_key: object, lane_name: str, cost: float, is_front: bool):
+
+		# an unknown lane fails when enqueued instead of when due
+		self.__get_lane(
+			lane_name=lane_name
+		)
+		self.__delayed_element_scheduler.add(
+			delayed_element=DelayedElement(
+				element=(executable_element, tenant_key, lane_name, cost, is_front),
+				delay_datetime=delay_datetime
+			)
+		)
+
+	def insert_at_front_immediately(self, *, executable_element: ExecutableElement, tenant_key: object = None, lane_name: str = None, cost: float = 1.0):
+		self.__enqueue_many(
+			executable_elements=[executable_element],
+			tenant_key=tenant_key,
+			lane_name=lane_name,
+			cost=cost,
+			is_front=True
+		)
+
+	def insert_many_at_front_immediately(self, *, executable_elements: List[ExecutableElement], tenant_key: object = None, lane_name: str = None, cost: float = 1.0):
+		self.__enqueue_many(
+			executable_elements=executable_elements,
+			tenant_key=tenant_key,
+			lane_name=lane_name,
+			cost=cost,
+			is_front=True
+		)
+
+	def append_to_end_immediately(self, *, executable_element: ExecutableElement, tenant_key: object = None, lane_name: str = None, cost: float = 1.0):
+		self.__enqueue_many(
+			executable_elements=[executable_element],
+			tenant_key=tenant_key,
+			lane_name=lane_name,
+			cost=cost,
+			is_front=False
+		)
+
+	def append_many_to_end_immediately(self, *, executable_elements: List[ExecutableElement], tenant_key: object = None, lane_name: str = None, cost: float = 1.0):
+		self.__enqueue_many(
+			executable_elements=executable_elements,
+			tenant_key=tenant_key,
+			lane_name=lane_name,
+			cost=cost,
+			is_front=False
+		)
+
+	def submit(self, *, executable_element: ExecutableElement, tenant_key: object = None, lane_name: str = None, cost: float = 1.0) -> concurrent.futures.Future:
+
+		_future_executable_element = FutureExecutableElement(
+			executable_element=executable_element,
+			future=concurrent.futures.Future()
+		)
+		self.append_to_end_immediately(
+			executable_element=_future_executable_element,
+			tenant_key=tenant_key,
+			lane_name=lane_name,
+			cost=cost
+		)
+		return _future_executable_element.get_future()
+
+	def submit_many(self, *, executable_elements: List[ExecutableElement], tenant_key: object = None, lane_name: str = None, cost: float = 1.0) -> List[concurrent.futures.Future]:
+
+		_future_executable_elements = [FutureExecutableElement(
+			executable_element=_executable_element,
+			future=concurrent.futures.Future()
+		) for _executable_element in executable_elements]
+		self.append_many_to_end_immediately(
+			executable_elements=_future_executable_elements,
+			tenant_key=tenant_key,
+			lane_name=lane_name,
+			cost=cost
+		)
+		return [_future_executable_element.get_future() for _future_executable_element in _future_executable_elements]
+
+	def insert_at_front_after_datetime(self, *, executable_element: ExecutableElement, delay_datetime: datetime, tenant_key: object = None, lane_name: str = None, cost: float = 1.0):
+		self.__schedule(
+			executable_element=executable_element,
+			delay_datetime=delay_datetime,
+			tenant_key=tenant_key,
+			lane_name=lane_name,
+			cost=cost,
+			is_front=True
+		)
+
+	def append_to_end_after_datetime(self, *, executable_element: ExecutableElement, delay_datetime: datetime, tenant_key: object = None, lane_name: str = None, cost: float = 1.0):
+		self.__schedule(
+			executable_element=executable_element,
+			delay_datetime=delay_datetime,
+			tenant_key=tenant_key,
+			lane_name=lane_name,
+			cost=cost,
+			is_front=False
+		)
+
+	def insert_at_front_after_elapsed_seconds(self, *, executable_element: ExecutableElement, seconds_total: int, tenant_key: object = None, lane_name: str = None, cost: float = 1.0):
+		self.__schedule(
+			executable_element=executable_element,
+			delay_datetime=datetime.utcnow() + timedelta(0, seconds_total),
+			tenant_key=tenant_key,
+			lane_name=lane_name,
+			cost=cost,
+			is_front=True
+		)
+
+	def append_to_end_after_elapsed_seconds(self, *, executable_element: ExecutableElement, seconds_total: int, tenant_key: object = None, lane_name: str = None, cost: float = 1.0):
+		self.__schedule(
+			executable_element=executable_element,
+			delay_datetime=datetime.utcnow() + timedelta(0, seconds_total),
+			tenant_key=tenant_key,
+			lane_name=lane_name,
+			cost=cost,
+			is_front=False
+		)
+
+	def wait_until_empty(self):
+
+		self.__queue_lock.acquire()
+
+		while self.__is_threads_active and self.__executable_elements_total != 0:
+			self.__queue_empty_condition.wait()
+
+		self.__queue_lock.release()
+
+	@staticmethod
+	def __get_percentile(*, sorted_values: List[float], percentile: float) -> float:
+		if len(sorted_values) == 0:
+			return 0.0
+		return sorted_values[min(len(sorted_values) - 1, int(percentile * len(sorted_values)))]
+
+	def get_statistics(self) -> Dict[str, object]:
+		"""
+		Gets the pending and executed elements of each lane and the percentiles of the queue waits of the recent elements taken from it.
+		:return: The statistics per lane name.
+		"""
+
+		with self.__queue_lock:
+			_statistics_per_lane_name = {}
+			for _lane in self.__lanes:
+				_queue_wait_seconds = sorted(_lane.queue_wait_seconds)
+				_statistics_per_lane_name[_lane.lane_name] = {
+					"pending_total": _lane.pending_total,
+					"executed_total": _lane.executed_total,
+					"tenants_total": len(_lane.active_tenants),
+					"queue_wait_samples_total": len(_queue_wait_seconds),
+					"queue_wait_p50_seconds": FairThreadPoolExecutableQueue.__get_percentile(
+						sorted_values=_queue_wait_seconds,
+						percentile=0.50
+					),
+					"queue_wait_p99_seconds": FairThreadPoolExecutableQueue.__get_percentile(
+						sorted_values=_queue_wait_seconds,
+						percentile=0.99
+					),
+					"queue_wait_maximum_seconds": 0.0 if len(_queue_wait_seconds) == 0 else _queue_wait_seconds[-1]
+				}
+			return _statistics_per_lane_name
+
+	def dispose(self):
+
+		# the scheduler is stopped first since a due element may be waiting on the lock to be enqueued
+		self.__delayed_element_scheduler.dispose()
+
+		self.__queue_lock.acquire()
+
+		_is_threads_active = self.__is_threads_active
+		self.__is_threads_active = False
+		self.__queue_not_empty_condition.notify_all()
+		self.__queue_empty_condition.notify_all()
+
+		self.__queue_lock.release()
+
+		if _is_threads_active:
+			for _worker_thread in self.__worker_threads:
+				if _worker_thread is not threading.current_thread():
+					_worker_thread.join()
+
+	@abstractmethod
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def process_execution_result(self, *, execution_result: object):
+		"""
+		Processes the result of an executed element. This is called from every worker thread, so implementations must be thread-safe.
+		:param execution_result: The output of the executed element.
+		:return: None
+		"""
+		raise NotImplementedError()
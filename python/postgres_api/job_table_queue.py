@@ -0,0 +1,408 @@
+from __future__ import annotations
+from postgres_api.connection_pool import PostgresConnection, PostgresConnectionSourceInterface
+from postgres_api.durable_queue import ExecutableElementSerializerInterface, PickleExecutableElementSerializer
+from postgres_api.executable import ExecutableElement, FutureExecutableElement
+from postgres_api.queue import ExecutableQueueInterface
+from abc import abstractmethod
+from datetime import datetime, timedelta
+from psycopg2 import sql
+from typing import List, Dict, Tuple, Set
+import concurrent.futures
+import os
+import psycopg2
+import socket
+import threading
+import time
+import uuid
+
+
+class JobTableExecutableQueue(ExecutableQueueInterface):
+	"""
+	This class keeps its elements as rows of a Postgres job table, so that elements enqueued by any node are executed by the workers of any node sharing the table. A worker claims a batch of due jobs with FOR UPDATE SKIP LOCKED, leasing them to this queue until the lease expires, and deletes each job once executed. Leases are renewed while the jobs are held, so the jobs of a node that stops renewing, such as one that has died, are claimed again once their leases expire. A job claimed the maximum number of times is no longer claimed and is left in the table for inspection.
+	"""
+
+	def __init__(self, *, postgres_connection_source: PostgresConnectionSourceInterface, database_name: str, table_name: str = "postgres_api_job", executable_element_serializer: ExecutableElementSerializerInterface = None, workers_total: int = 4, claimed_jobs_total: int = 10, lease_seconds: float = 30.0, maximum_attempts_total: int = 5, poll_interval_seconds: float = 0.5):
+
+		if claimed_jobs_total < 1:
+			raise Exception(f"Cannot create job table queue claiming {claimed_jobs_total} jobs at a time.")
+		if lease_seconds <= 0:
+			raise Exception(f"Cannot create job table queue with a lease of {lease_seconds} seconds.")
+
+		self.__postgres_connection_source = postgres_connection_source
+		self.__database_name = database_name
+		self.__table_name = table_name
+		self.__executable_element_serializer = PickleExecutableElementSerializer() if executable_element_serializer is None else executable_element_serializer
+		self.__workers_total = workers_total
+		self.__claimed_jobs_total = claimed_jobs_total
+		self.__lease_seconds = lease_seconds
+		self.__maximum_attempts_total = maximum_attempts_total
+		self.__poll_interval_seconds = poll_interval_seconds
+
+		self.__lease_owner = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex}"
+		self.__leased_job_ids = set()  # type: Set[int]
+		self.__claimed_jobs_total_per_worker_index = [0] * workers_total
+		self.__condition = threading.Condition()
+		self.__worker_threads = []  # type: List[threading.Thread]
+		self.__lease_renewal_thread = None  # type: threading.Thread
+		self.__is_threads_active = True
+
+		self.__front_sequence_name = f"{table_name}_front_sequence"
+		_table_identifier = sql.Identifier(table_name)
+		# a job inserted at the front sorts before every appended job, with the latest first, while an appended job sorts by when it is due
+		self.__insert_query = sql.SQL("INSERT INTO {table} (run_at, sort_key, payload) SELECT _run_at, CASE WHEN _is_front THEN -nextval({front_sequence}) ELSE (extract(epoch FROM _run_at) * 1000000)::bigint END, _payload FROM (SELECT COALESCE(_delay_datetime AT TIME ZONE 'UTC', clock_timestamp()) AS _run_at, _is_front, _payload FROM unnest(%s::timestamp[], %s::boolean[], %s::bytea[]) WITH ORDINALITY AS _job (_delay_datetime, _is_front, _payload, _ordinal) ORDER BY _ordinal) AS _jobs").format(
+			table=_table_identifier,
+			front_sequence=sql.Literal(self.__front_sequence_name)
+		)
+		self.__claim_query = sql.SQL("UPDATE {table} SET lease_owner = %(lease_owner)s, lease_expires_at = clock_timestamp() + %(lease_seconds)s * interval '1 second', attempts_total = attempts_total + 1 WHERE job_id IN (SELECT job_id FROM {table} WHERE run_at <= clock_timestamp() AND (lease_expires_at IS NULL OR lease_expires_at < clock_timestamp()) AND attempts_total < %(maximum_attempts_total)s ORDER BY sort_key, job_id LIMIT %(claimed_jobs_total)s FOR UPDATE SKIP LOCKED) RETURNING job_id, sort_key, payload").format(
+			table=_table_identifier
+		)
+		self.__delete_query = sql.SQL("DELETE FROM {table} WHERE job_id = ANY(%(job_ids)s) AND lease_owner = %(lease_owner)s").format(
+			table=_table_identifier
+		)
+		# a job that was claimed but not executed is released without counting the attempt
+		self.__release_query = sql.SQL("UPDATE {table} SET lease_owner = NULL, lease_expires_at = NULL, attempts_total = attempts_total - 1 WHERE job_id = ANY(%(job_ids)s) AND lease_owner = %(lease_owner)s").format(
+			table=_table_identifier
+		)
+		self.__renew_query = sql.SQL("UPDATE {table} SET lease_expires_at = clock_timestamp() + %(lease_seconds)s * interval '1 second' WHERE job_id = ANY(%(job_ids)s) AND lease_owner = %(lease_owner)s").format(
+			table=_table_identifier
+		)
+		self.__pending_query = sql.SQL("SELECT EXISTS (SELECT 1 FROM {table} WHERE run_at <= clock_timestamp() AND attempts_total < %(maximum_attempts_total)s)").format(
+			table=_table_identifier
+		)
+
+		self.create_table()
+		self.__start_threads()
+
+	def __execute(self, *, query: sql.Composable, parameters: object, is_fetching: bool) -> List[Tuple]:
+
+		_postgres_connection = self.__postgres_connection_source.acquire(
+			database_name=self.__database_name
+		)  # type: PostgresConnection
+		_is_broken = False
+		try:
+			_connection = _postgres_connection.get_connection()
+			try:
+				_cursor = _connection.cursor()
+				_cursor.execute(query, parameters)
+				_rows = _cursor.fetchall() if is_fetching else None
+				_cursor.close()
+				_connection.commit()
+			except psycopg2.Error:
+				_connection.rollback()
+				raise
+			return _rows
+		except Exception:
+			_is_broken = _postgres_connection.is_closed()
+			raise
+		finally:
+			self.__postgres_connection_source.release(
+				postgres_connection=_postgres_connection,
+				is_broken=_is_broken
+			)
+
+	def create_table(self):
+		"""
+		Creates the job table and its sequence and index if they do not exist yet.
+		:return: None
+		"""
+
+		_table_identifier = sql.Identifier(self.__table_name)
+		try:
+			self.__execute(
+				query=sql.SQL("CREATE SEQUENCE IF NOT EXISTS {front_sequence}; CREATE TABLE IF NOT EXISTS {table} (job_id BIGSERIAL PRIMARY KEY, sort_key BIGINT NOT NULL, run_at TIMESTAMPTZ NOT NULL, lease_owner TEXT NULL, lease_expires_at TIMESTAMPTZ NULL, attempts_total INTEGER NOT NULL DEFAULT 0, payload BYTEA NOT NULL); CREATE INDEX IF NOT EXISTS {index} ON {table} (sort_key, job_id)").format(
+					front_sequence=sql.Identifier(self.__front_sequence_name),
+					table=_table_identifier,
+					index=sql.Identifier(f"{self.__table_name}_sort_key_index")
+				),
+				parameters=None,
+				is_fetching=False
+			)
+		except psycopg2.IntegrityError:
+			# another node created the table at the same time
+			pass
+
+	def __insert(self, *, executable_elements: List[ExecutableElement], is_front: bool, delay_datetime: datetime):
+
+		if len(executable_elements) != 0:
+			_payloads = []  # type: List[bytes]
+			for _executable_element in executable_elements:
+				if isinstance(_executable_element, FutureExecutableElement):
+					raise Exception(f"Cannot insert a submitted element into a job table since its future does not cross nodes.")
+				_payloads.append(psycopg2.Binary(self.__executable_element_serializer.dumps(
+					executable_element=_executable_element
+				)))
+			self.__execute(
+				query=self.__insert_query,
+				parameters=([delay_datetime] * len(_payloads), [is_front] * len(_payloads), _payloads),
+				is_fetching=False
+			)
+
+			self.__condition.acquire()
+			self.__condition.notify_all()
+			self.__condition.release()
+
+	def __claim(self, *, worker_index: int) -> List[Tuple[int, ExecutableElement]]:
+
+		_rows = self.__execute(
+			query=self.__claim_query,
+			parameters={
+				"lease_owner": self.__lease_owner,
+				"lease_seconds": self.__lease_seconds,
+				"maximum_attempts_total": self.__maximum_attempts_total,
+				"claimed_jobs_total": self.__claimed_jobs_total
+			},
+			is_fetching=True
+		)
+		# the update returns the claimed rows in no particular order
+		_rows.sort(key=lambda _row: (_row[1], _row[0]))
+
+		self.__condition.acquire()
+		self.__leased_job_ids.update(_row[0] for _row in _rows)
+		self.__claimed_jobs_total_per_worker_index[worker_index] += len(_rows)
+		self.__condition.release()
+
+		return [(_row[0], self.__executable_element_serializer.loads(
+			executable_element_bytes=bytes(_row[2])
+		)) for _row in _rows]
+
+	def __finish(self, *, query: sql.Composable, job_ids: List[int]):
+
+		if len(job_ids) != 0:
+			try:
+				self.__execute(
+					query=query,
+					parameters={
+						"job_ids": job_ids,
+						"lease_owner": self.__lease_owner
+					},
+					is_fetching=False
+				)
+			finally:
+				self.__condition.acquire()
+				self.__leased_job_ids.difference_update(job_ids)
+				self.__condition.release()
+
+	def __start_threads(self):
+
+		def _worker_thread_method(worker_index: int):
+
+			while True:
+				self.__condition.acquire()
+				_is_threads_active = self.__is_threads_active
+				self.__condition.release()
+				if not _is_threads_active:
+					break
+
+				try:
+					_claimed_jobs = self.__claim(
+						worker_index=worker_index
+					)
+				except Exception as ex:
+					self.process_execution_exception(
+						executable_element=None,
+						exception=ex
+					)
+					_claimed_jobs = []
+
+				if len(_claimed_jobs) == 0:
+					# a job enqueued by this node wakes the workers right away, while jobs of other nodes are found by polling
+					self.__condition.acquire()
+					if self.__is_threads_active:
+						self.__condition.wait(self.__poll_interval_seconds)
+					self.__condition.release()
+					continue
+
+				_executed_job_ids = []  # type: List[int]
+				for _job_index, (_job_id, _executable_element) in enumerate(_claimed_jobs):
+					if not self.__is_threads_active:
+						self.__finish(
+							query=self.__release_query,
+							job_ids=[_job_id for _job_id, _ in _claimed_jobs[_job_index:]]
+						)
+						break
+					try:
+						_execution_parameters = self.get_execution_parameters(
+							worker_index=worker_index
+						)
+						_execution_result = _executable_element.execute(**_execution_parameters)
+						self.process_execution_result(
+							execution_result=_execution_result
+						)
+					except Exception as ex:
+						self.process_execution_exception(
+							executable_element=_executable_element,
+							exception=ex
+						)
+					_executed_job_ids.append(_job_id)
+
+				try:
+					self.__finish(
+						query=self.__delete_query,
+						job_ids=_executed_job_ids
+					)
+				except Exception as ex:
+					# the jobs are executed again once their leases expire
+					self.process_execution_exception(
+						executable_element=None,
+						exception=ex
+					)
+
+		def _lease_renewal_thread_method():
+
+			while True:
+				self.__condition.acquire()
+				if self.__is_threads_active:
+					self.__condition.wait(self.__lease_seconds / 3)
+				_is_threads_active = self.__is_threads_active
+				_leased_job_ids = list(self.__leased_job_ids)
+				self.__condition.release()
+				if not _is_threads_active:
+					break
+				if len(_leased_job_ids) != 0:
+					try:
+						self.__execute(
+							query=self.__renew_query,
+							parameters={
+								"job_ids": _leased_job_ids,
+								"lease_seconds": self.__lease_seconds,
+								"lease_owner": self.__lease_owner
+							},
+							is_fetching=False
+						)
+					except Exception as ex:
+						self.process_execution_exception(
+							executable_element=None,
+							exception=ex
+						)
+
+		for _worker_index in range(self.__workers_total):
+			_worker_thread = threading.Thread(
+				target=_worker_thread_method,
+				args=(_worker_index,)
+			)
+			_worker_thread.daemon = True
+			self.__worker_threads.append(_worker_thread)
+			_worker_thread.start()
+
+		if self.__workers_total != 0:
+			self.__lease_renewal_thread = threading.Thread(
+				target=_lease_renewal_thread_method
+			)
+			self.__lease_renewal_thread.daemon = True
+			self.__lease_renewal_thread.start()
+
+	def insert_at_front_immediately(self, *, executable_element: ExecutableElement):
+		self.__insert(
+			executable_elements=[executable_element],
+			is_front=True,
+			delay_datetime=None
+		)
+
+	def insert_many_at_front_immediately(self, *, executable_elements: List[ExecutableElement]):
+		# the latest job inserted at the front is claimed first, so the last element is inserted first to keep their order
+		self.__insert(
+			executable_elements=list(reversed(executable_elements)),
+			is_front=True,
+			delay_datetime=None
+		)
+
+	def append_to_end_immediately(self, *, executable_element: ExecutableElement):
+		self.__insert(
+			executable_elements=[executable_element],
+			is_front=False,
+			delay_datetime=None
+		)
+
+	def append_many_to_end_immediately(self, *, executable_elements: List[ExecutableElement]):
+		self.__insert(
+			executable_elements=executable_elements,
+			is_front=False,
+			delay_datetime=None
+		)
+
+	def submit(self, *, executable_element: ExecutableElement) -> concurrent.futures.Future:
+		raise Exception(f"Cannot submit to a job table queue since a future does not cross nodes.")
+
+	def submit_many(self, *, executable_elements: List[ExecutableElement]) -> List[concurrent.futures.Future]:
+		raise Exception(f"Cannot submit to a job table queue since a future does not cross nodes.")
+
+	def insert_at_front_after_datetime(self, *, executable_element: ExecutableElement, delay_datetime: datetime):
+		self.__insert(
+			executable_elements=[executable_element],
+			is_front=True,
+			delay_datetime=delay_datetime
+		)
+
+	def append_to_end_after_datetime(self, *, executable_element: ExecutableElement, delay_datetime: datetime):
+		self.__insert(
+			executable_elements=[executable_element],
+			is_front=False,
+			delay_datetime=delay_datetime
+		)
+
+	def insert_at_front_after_elapsed_seconds(self, *, executable_element: ExecutableElement, seconds_total: int):
+		self.__insert(
+			executable_elements=[executable_element],
+			is_front=True,
+			delay_datetime=datetime.utcnow() + timedelta(0, seconds_total)
+		)
+
+	def append_to_end_after_elapsed_seconds(self, *, executable_element: ExecutableElement, seconds_total: int):
+		self.__insert(
+			executable_elements=[executable_element],
+			is_front=False,
+			delay_datetime=datetime.utcnow() + timedelta(0, seconds_total)
+		)
+
+	def wait_until_empty(self):
+		"""
+		Blocks the current thread until the job table has no due jobs left to execute, polling the table since the jobs may be executed by any node.
+		:return: None
+		"""
+
+		while self.__is_threads_active:
+			_rows = self.__execute(
+				query=self.__pending_query,
+				parameters={
+					"maximum_attempts_total": self.__maximum_attempts_total
+				},
+				is_fetching=True
+			)
+			if not _rows[0][0]:
+				break
+			time.sleep(min(self.__poll_interval_seconds, 0.05))
+
+	def get_lease_owner(self) -> str:
+		return self.__lease_owner
+
+	def get_claimed_jobs_total_per_worker_index(self) -> List[int]:
+		return list(self.__claimed_jobs_total_per_worker_index)
+
+	def dispose(self):
+		"""
+		Stops the workers after their current job, releasing the jobs they claimed but did not execute so that other nodes can claim them right away.
+		:return: None
+		"""
+
+		self.__condition.acquire()
+
+		_is_threads_active = self.__is_threads_active
+		self.__is_threads_active = False
+		self.__condition.notify_all()
+
+		self.__condition.release()
+
+		if _is_threads_active:
+			for _worker_thread in self.__worker_threads:
+				if _worker_thread is not threading.current_thread():
+					_worker_thread.join()
+			if self.__lease_renewal_thread is not None:
+				self.__lease_renewal_thread.join()
+
+	@abstractmethod
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def process_execution_result(self, *, execution_result: object):
+		raise NotImplementedError()
@@ -1,8 +1,54 @@
 from abc import ABC, abstractmethod
+from postgres_api.json_serializer import JsonSerializerInterface
+from typing import BinaryIO
 
 
 class JsonConvertable(ABC):
 
+	__slots__ = ()
+
 	@abstractmethod
 	def get_json_string(self) -> str:
 		raise NotImplementedError()
+
+	def get_json_bytes(self) -> bytes:
+		return self.get_json_string().encode("utf-8")
+
+	def get_json_object(self) -> object:
+		return JsonSerializerInterface.get_default().loads(
+			json_bytes=self.get_json_bytes()
+		)
+
+	def write_json_to(self, *, buffer: BinaryIO) -> int:
+		"""
+		Writes the utf-8 json bytes to a binary buffer, such as a reused io.BytesIO, a file or a socket file, without first decoding them to a string.
+		:param buffer: The writable binary buffer.
+		:return: The number of bytes written.
+		"""
+
+		return buffer.write(self.get_json_bytes())
+
+
+class CachedJsonConvertable(JsonConvertable, ABC):
+	"""
+	This class serializes its json object once with the default serializer and keeps the encoded bytes, so its json object must not change once converted.
+	"""
+
+	__slots__ = ("__json_bytes",)
+
+	@abstractmethod
+	def get_json_object(self) -> object:
+		raise NotImplementedError()
+
+	def get_json_bytes(self) -> bytes:
+		try:
+			return self.__json_bytes
+		except AttributeError:
+			# the slot stays unset until the first conversion, so that subclasses need not call this constructor
+			self.__json_bytes = JsonSerializerInterface.get_default().dumps(
+				json_object=self.get_json_object()
+			)
+			return self.__json_bytes
+
+	def get_json_string(self) -> str:
+		return self.get_json_bytes().decode("utf-8")
@@ -0,0 +1,62 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Union
+import json
+try:
+	import orjson
+except ImportError:
+	orjson = None
+
+
+class JsonSerializerInterface(ABC):
+
+	__default_json_serializer = None  # type: JsonSerializerInterface
+
+	@staticmethod
+	def get_default() -> JsonSerializerInterface:
+		"""
+		Gets the serializer used by every json convertable, which is the standard serializer unless another one was set, so that the json written does not depend on which optional packages are installed.
+		:return: The default serializer.
+		"""
+
+		if JsonSerializerInterface.__default_json_serializer is None:
+			JsonSerializerInterface.__default_json_serializer = StandardJsonSerializer()
+		return JsonSerializerInterface.__default_json_serializer
+
+	@staticmethod
+	def set_default(*, json_serializer: JsonSerializerInterface):
+		JsonSerializerInterface.__default_json_serializer = json_serializer
+
+	@abstractmethod
+	def dumps(self, *, json_object: object) -> bytes:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def loads(self, *, json_bytes: Union[bytes, str]) -> object:
+		raise NotImplementedError()
+
+
+class StandardJsonSerializer(JsonSerializerInterface):
+
+	def dumps(self, *, json_object: object) -> bytes:
+		return json.dumps(json_object).encode("utf-8")
+
+	def loads(self, *, json_bytes: Union[bytes, str]) -> object:
+		return json.loads(json_bytes)
+
+
+class OrjsonJsonSerializer(JsonSerializerInterface):
+	"""
+	This class serializes with the optional orjson package, which writes utf-8 bytes directly. Unlike the standard serializer it also serializes dates, times and uuids, and writes no whitespace, so it is only used once set as the default.
+	"""
+
+	def __init__(self):
+
+		if orjson is None:
+			raise Exception(f"Cannot create {OrjsonJsonSerializer.__name__} because the orjson package is not installed.")
+
+	def dumps(self, *, json_object: object) -> bytes:
+		return orjson.dumps(json_object, option=orjson.OPT_NON_STR_KEYS)
+
+	def loads(self, *, json_bytes: Union[bytes, str]) -> object:
+		return orjson.loads(json_bytes)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+from typing import Dict, Union
+import functools
+import hmac
+import json
+import jwt.algorithms
+import jwt.utils
+
+
+class JsonWebTokenSigner():
+	"""
+	This class signs json web tokens with a key that is prepared once, so that a secret is not validated and a private key is not loaded again for each token. The header is encoded once as well, and payloads are signed as the already serialized bytes.
+	"""
+
+	def __init__(self, *, key: Union[str, bytes, object], algorithm: str = "HS256", headers: Dict[str, object] = None):
+
+		_algorithms = jwt.algorithms.get_default_algorithms()
+		if algorithm == "none":
+			raise Exception(f"Cannot create json web token signer without a signing algorithm.")
+		if algorithm not in _algorithms:
+			if algorithm in jwt.algorithms.requires_cryptography:
+				raise Exception(f"Cannot create json web token signer with algorithm {algorithm} because the cryptography package is not installed.")
+			raise Exception(f"Cannot create json web token signer with unknown algorithm {algorithm}.")
+
+		self.__algorithm = _algorithms[algorithm]  # type: jwt.algorithms.Algorithm
+		self.__prepared_key = self.__algorithm.prepare_key(key)
+
+		# an hmac keyed once only needs to be copied for each token, instead of padding the key again
+		if isinstance(self.__algorithm, jwt.algorithms.HMACAlgorithm):
+			self.__keyed_hmac = hmac.new(self.__prepared_key, digestmod=self.__algorithm.hash_alg)
+		else:
+			self.__keyed_hmac = None
+
+		_header = {
+			"typ": "JWT",
+			"alg": algorithm
+		}
+		if headers is not None:
+			_header.update(headers)
+		self.__encoded_header_prefix = jwt.utils.base64url_encode(json.dumps(_header, separators=(",", ":"), sort_keys=True).encode("utf-8")) + b"."
+
+	@staticmethod
+	@functools.lru_cache(maxsize=32)
+	def get_cached(*, key: Union[str, bytes, object], algorithm: str = "HS256") -> JsonWebTokenSigner:
+		"""
+		Gets a signer shared by every caller with the same key and algorithm, for callers that only have the key at hand.
+		:param key: The secret or private key, which must be hashable.
+		:param algorithm: The signing algorithm.
+		:return: The shared signer.
+		"""
+
+		return JsonWebTokenSigner(
+			key=key,
+			algorithm=algorithm
+		)
+
+	def sign(self, *, payload: bytes) -> str:
+		"""
+		Signs the json bytes of the payload, which must already be a serialized json object.
+		:param payload: The serialized json object.
+		:return: The encoded json web token.
+		"""
+
+		_signing_input = self.__encoded_header_prefix + jwt.utils.base64url_encode(payload)
+		if self.__keyed_hmac is None:
+			_signature = self.__algorithm.sign(_signing_input, self.__prepared_key)
+		else:
+			_hmac = self.__keyed_hmac.copy()
+			_hmac.update(_signing_input)
+			_signature = _hmac.digest()
+		return (_signing_input + b"." + jwt.utils.base64url_encode(_signature)).decode("ascii")
@@ -0,0 +1,197 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import List, Dict, Tuple
+import re
+import time
+
+
+class PreparedStatement():
+
+	def __init__(self, *, name: str, parameter_names: List[str]):
+
+		self.__name = name
+		self.__parameter_names = parameter_names
+
+		if len(parameter_names) == 0:
+			self.__execute_query = f"EXECUTE {name}"
+		else:
+			_parameters = ", ".join([f"%({_parameter_name})s" for _parameter_name in parameter_names])
+			self.__execute_query = f"EXECUTE {name} ({_parameters})"
+
+	def get_name(self) -> str:
+		return self.__name
+
+	def get_parameter_names(self) -> List[str]:
+		return self.__parameter_names.copy()
+
+	def get_execute_query(self) -> str:
+		return self.__execute_query
+
+
+class PreparedStatementCache():
+	"""
+	This class keeps the server-side prepared statements of a single connection, evicting the least recently used statement once full. Queries that cannot be prepared are remembered as None so they are not attempted again until the retry interval has passed, since a query may only fail to prepare until the table it refers to is created.
+	"""
+
+	__preparable_first_keywords = {"select", "insert", "update", "delete", "values", "with"}
+	__named_parameter_pattern = re.compile(r"%\((\w+)\)s|%%|%")
+	__preceding_operator_pattern = re.compile(r"([-+*/<>=~!@#%^&|`?]+) ?$")
+	__preceding_keyword_pattern = re.compile(r"(?:^|[ (])(?:limit|offset) ?$", re.IGNORECASE)
+	__following_operator_pattern = re.compile(r" ?(::|[-+*/<>=~!@#%^&|`?]+)")
+	__typing_operators = {"=", "<>", "!=", "<", ">", "<=", ">="}
+
+	def __init__(self, *, maximum_prepared_statements_total: int, unpreparable_retry_seconds: float = 60.0):
+
+		self.__maximum_prepared_statements_total = maximum_prepared_statements_total
+		self.__unpreparable_retry_seconds = unpreparable_retry_seconds
+
+		self.__prepared_statement_per_normalized_query = OrderedDict()  # type: OrderedDict[str, PreparedStatement]
+		self.__unpreparable_time_per_normalized_query = {}  # type: Dict[str, float]
+		self.__prepared_statement_names_total = 0
+
+	@staticmethod
+	def normalize_query(*, query: str) -> str:
+		"""
+		Collapses whitespace outside of quoted literals and identifiers so that queries differing only in layout share a prepared statement.
+		:param query: The query text.
+		:return: The normalized query text.
+		"""
+
+		_characters = []  # type: List[str]
+		_quote_character = None  # type: str
+		_is_whitespace_pending = False
+		_previous_character = None  # type: str
+		for _character in query.strip():
+			if _quote_character is not None:
+				_characters.append(_character)
+				if _character == _quote_character:
+					_quote_character = None
+			elif (_previous_character == "-" and _character == "-") or (_previous_character == "/" and _character == "*"):
+				# collapsing the line break that ends a comment would comment out the rest of the query
+				return query.strip()
+			elif _character.isspace():
+				_is_whitespace_pending = True
+			else:
+				if _is_whitespace_pending:
+					_characters.append(" ")
+					_is_whitespace_pending = False
+				_characters.append(_character)
+				if _character == "'" or _character == "\"":
+					_quote_character = _character
+			_previous_character = _character
+		return "".join(_characters)
+
+	@staticmethod
+	def __is_typed_parameter(*, normalized_query: str, start: int, end: int, values_start: int, values_end: int) -> bool:
+
+		# the server infers the type of a positional parameter when preparing, so a parameter whose type comes only from its value, such as one in the select list, would come back as text instead of as the type of its value
+		_following_match = PreparedStatementCache.__following_operator_pattern.match(normalized_query, end)
+		if _following_match is not None and (_following_match.group(1) == "::" or _following_match.group(1) in PreparedStatementCache.__typing_operators):
+			return True
+		_preceding_query = normalized_query[:start]
+		_preceding_match = PreparedStatementCache.__preceding_operator_pattern.search(_preceding_query)
+		if _preceding_match is not None and _preceding_match.group(1) in PreparedStatementCache.__typing_operators:
+			return True
+		if PreparedStatementCache.__preceding_keyword_pattern.search(_preceding_query) is not None:
+			return True
+		# the values of an insert are typed by their target columns
+		return values_start <= start < values_end and _preceding_query.rstrip()[-1:] in ("(", ",")
+
+	@staticmethod
+	def try_get_positional_query(*, normalized_query: str) -> Tuple[bool, str, List[str]]:
+		"""
+		Converts the named psycopg2 parameters of the query into the positional parameters expected by PREPARE. A query is only preparable if each parameter is compared with, cast to or inserted into something of a known type, so that preparing it does not change its output.
+		:param normalized_query: The normalized query text.
+		:return: If the query can be prepared, the query with positional parameters and the parameter name per position.
+		"""
+
+		_first_keyword = normalized_query.split(" ", 1)[0].lower()
+		if _first_keyword not in PreparedStatementCache.__preparable_first_keywords or "$" in normalized_query:
+			return False, None, None
+
+		_lower_normalized_query = normalized_query.lower()
+		_values_start = len(normalized_query)
+		_values_end = len(normalized_query)
+		if _first_keyword == "insert" and " values " in _lower_normalized_query:
+			_values_start = _lower_normalized_query.index(" values ")
+			for _keyword in (" returning ", " on conflict "):
+				if _keyword in _lower_normalized_query[_values_start:]:
+					_values_end = min(_values_end, _lower_normalized_query.index(_keyword, _values_start))
+
+		_parameter_names = []  # type: List[str]
+		_parameter_position_per_name = {}  # type: Dict[str, int]
+		_is_preparable = True
+
+		def _replace(match: re.Match) -> str:
+			nonlocal _is_preparable
+			_parameter_name = match.group(1)
+			if _parameter_name is not None:
+				if not PreparedStatementCache.__is_typed_parameter(
+					normalized_query=normalized_query,
+					start=match.start(),
+					end=match.end(),
+					values_start=_values_start,
+					values_end=_values_end
+				):
+					_is_preparable = False
+				if _parameter_name not in _parameter_position_per_name:
+					_parameter_names.append(_parameter_name)
+					_parameter_position_per_name[_parameter_name] = len(_parameter_names)
+				return f"${_parameter_position_per_name[_parameter_name]}"
+			elif match.group(0) == "%%":
+				return "%"
+			else:
+				# positional or otherwise unsupported parameter placeholders
+				_is_preparable = False
+				return match.group(0)
+
+		_positional_query = PreparedStatementCache.__named_parameter_pattern.sub(_replace, normalized_query)
+		if not _is_preparable:
+			return False, None, None
+		return True, _positional_query, _parameter_names
+
+	def try_get(self, *, normalized_query: str) -> Tuple[bool, PreparedStatement]:
+
+		if normalized_query not in self.__prepared_statement_per_normalized_query:
+			return False, None
+		if normalized_query in self.__unpreparable_time_per_normalized_query and time.monotonic() - self.__unpreparable_time_per_normalized_query[normalized_query] >= self.__unpreparable_retry_seconds:
+			self.remove(
+				normalized_query=normalized_query
+			)
+			return False, None
+		self.__prepared_statement_per_normalized_query.move_to_end(normalized_query)
+		return True, self.__prepared_statement_per_normalized_query[normalized_query]
+
+	def get_next_prepared_statement_name(self) -> str:
+		self.__prepared_statement_names_total += 1
+		return f"postgres_api_statement_{self.__prepared_statement_names_total}"
+
+	def add(self, *, normalized_query: str, prepared_statement: PreparedStatement) -> List[PreparedStatement]:
+		"""
+		Caches the prepared statement for the normalized query.
+		:param normalized_query: The normalized query text.
+		:param prepared_statement: The prepared statement or None if the query cannot be prepared.
+		:return: The evicted prepared statements that still need to be deallocated.
+		"""
+
+		self.__prepared_statement_per_normalized_query[normalized_query] = prepared_statement
+		self.__prepared_statement_per_normalized_query.move_to_end(normalized_query)
+		if prepared_statement is None:
+			self.__unpreparable_time_per_normalized_query[normalized_query] = time.monotonic()
+		else:
+			self.__unpreparable_time_per_normalized_query.pop(normalized_query, None)
+
+		_evicted_prepared_statements = []  # type: List[PreparedStatement]
+		while len(self.__prepared_statement_per_normalized_query) > self.__maximum_prepared_statements_total:
+			_evicted_normalized_query, _evicted_prepared_statement = self.__prepared_statement_per_normalized_query.popitem(last=False)
+			self.__unpreparable_time_per_normalized_query.pop(_evicted_normalized_query, None)
+			if _evicted_prepared_statement is not None:
+				_evicted_prepared_statements.append(_evicted_prepared_statement)
+		return _evicted_prepared_statements
+
+	def remove(self, *, normalized_query: str) -> PreparedStatement:
+		self.__unpreparable_time_per_normalized_query.pop(normalized_query, None)
+		return self.__prepared_statement_per_normalized_query.pop(normalized_query, None)
+
+	def get_length(self) -> int:
+		return len(self.__prepared_statement_per_normalized_query)
@@ -0,0 +1,319 @@
+from __future__ import annotations
+from postgres_api.prepared_statement_cache import PreparedStatementCache
+from collections import OrderedDict
+from typing import Dict, Tuple, Set
+import functools
+import json
+import re
+import sys
+import threading
+import time
+
+
+class QueryResultCacheEntry():
+
+	def __init__(self, *, database_name: str, table_names: Set[str], output: object, bytes_total: int, expiry_time: float):
+
+		self.__database_name = database_name
+		self.__table_names = table_names
+		self.__output = output
+		self.__bytes_total = bytes_total
+		self.__expiry_time = expiry_time
+
+	def get_database_name(self) -> str:
+		return self.__database_name
+
+	def get_table_names(self) -> Set[str]:
+		return self.__table_names
+
+	def get_output(self) -> object:
+		return self.__output
+
+	def get_bytes_total(self) -> int:
+		return self.__bytes_total
+
+	def get_expiry_time(self) -> float:
+		return self.__expiry_time
+
+
+class QueryResultCache():
+	"""
+	This class keeps the output of read queries keyed by database, query and parameters, evicting the least recently used entries once either the entry or the memory limit is reached and expiring entries after their time to live. It is shared by every database interface of a process, so it is thread-safe.
+	"""
+
+	__identifier_pattern = r"(?:\"(?:[^\"]|\"\")+\"|\w+)"
+	__qualified_identifier_pattern = rf"{__identifier_pattern}(?:\s*\.\s*{__identifier_pattern})*"
+	__identifier_token_pattern = re.compile(r"'(?:[^']|'')*'|\"((?:[^\"]|\"\")+)\"|([A-Za-z_]\w*)")
+	__comma_separated_table_pattern = re.compile(rf"(?:^|,)\s*(?:only\s+)?({__qualified_identifier_pattern})", re.IGNORECASE)
+	__write_table_pattern = re.compile(rf"\b(?:insert\s+into|update|delete\s+from|truncate(?:\s+table)?|merge\s+into)\s+(?:only\s+)?({__qualified_identifier_pattern}(?:\s*,\s*{__qualified_identifier_pattern})*)", re.IGNORECASE)
+	# the built-in functions whose output changes on every call but which change no table
+	__volatile_function_names = {"nextval", "setval", "currval", "lastval", "random", "now", "clock_timestamp", "statement_timestamp", "timeofday", "gen_random_uuid", "txid_current", "pg_sleep", "pg_advisory_lock"}
+	__volatile_pattern = re.compile(rf"\b(?:{'|'.join(sorted(__volatile_function_names))}|current_timestamp|current_time|localtime|localtimestamp|current_date|insert|update|delete|for\s+update|for\s+share)\b", re.IGNORECASE)
+	__function_call_pattern = re.compile(r"'(?:[^']|'')*'|(::\s*)?(?:\"((?:[^\"]|\"\")+)\"|([A-Za-z_]\w*))\s*\(")
+	# the keywords and type names that may precede a parenthesis without calling a function
+	__parenthesized_keywords = {"select", "from", "where", "and", "or", "not", "in", "exists", "any", "all", "some", "values", "as", "materialized", "join", "on", "using", "lateral", "over", "filter", "within", "group", "by", "sets", "rollup", "cube", "grouping", "having", "union", "intersect", "except", "with", "case", "when", "then", "else", "is", "between", "like", "ilike", "similar", "array", "row", "cast", "distinct", "numeric", "decimal", "varchar", "char", "character", "varying", "bit", "varbit", "timestamp", "time", "interval", "float"}
+	# the built-in functions without side effects whose output only depends on their arguments, so that settings such as the time zone cannot change it
+	__deterministic_function_names = {"count", "sum", "avg", "min", "max", "bool_and", "bool_or", "every", "array_agg", "string_agg", "json_agg", "jsonb_agg", "json_object_agg", "jsonb_object_agg", "stddev", "stddev_pop", "stddev_samp", "variance", "var_pop", "var_samp", "percentile_cont", "percentile_disc", "mode", "row_number", "rank", "dense_rank", "percent_rank", "cume_dist", "ntile", "lag", "lead", "first_value", "last_value", "nth_value", "coalesce", "nullif", "greatest", "least", "abs", "ceil", "ceiling", "floor", "round", "trunc", "mod", "power", "sqrt", "sign", "length", "char_length", "character_length", "octet_length", "lower", "upper", "initcap", "substring", "substr", "position", "strpos", "overlay", "trim", "btrim", "ltrim", "rtrim", "lpad", "rpad", "left", "right", "replace", "translate", "concat", "concat_ws", "format", "split_part", "starts_with", "md5", "regexp_replace", "regexp_match", "regexp_matches", "array_length", "array_to_string", "string_to_array", "array_position", "cardinality", "unnest", "generate_series", "extract", "date_part", "date_trunc", "make_date", "make_timestamp", "json_build_object", "jsonb_build_object", "json_build_array", "jsonb_build_array", "to_json", "to_jsonb", "row_to_json", "json_array_length", "jsonb_array_length", "json_array_elements", "jsonb_array_elements", "json_extract_path", "jsonb_extract_path", "json_extract_path_text", "jsonb_extract_path_text", "json_typeof", "jsonb_typeof", "jsonb_set", "jsonb_strip_nulls"}
+	__read_first_keywords = {"select", "with", "values"}
+	__write_first_keywords = {"insert", "update", "delete", "truncate", "merge", "with"}
+
+	def __init__(self, *, maximum_entries_total: int = 10000, maximum_bytes_total: int = 64 * 1024 * 1024, time_to_live_seconds: float = 60.0):
+
+		self.__maximum_entries_total = maximum_entries_total
+		self.__maximum_bytes_total = maximum_bytes_total
+		self.__time_to_live_seconds = time_to_live_seconds
+
+		self.__lock = threading.Lock()
+		self.__entry_per_key = OrderedDict()  # type: OrderedDict[Tuple[str, str, str], QueryResultCacheEntry]
+		self.__keys_per_database_table = {}  # type: Dict[Tuple[str, str], Set[Tuple[str, str, str]]]
+		self.__version_per_database_table = {}  # type: Dict[Tuple[str, str], int]
+		self.__bytes_total = 0
+		self.__hits_total = 0
+		self.__misses_total = 0
+		self.__evictions_total = 0
+		self.__expirations_total = 0
+		self.__invalidations_total = 0
+
+	@staticmethod
+	def __get_table_name(*, qualified_identifier: str) -> str:
+		# the schema is dropped so that qualified and unqualified references to a table match, which can only invalidate too much
+		_identifier = re.split(r"\s*\.\s*(?=(?:[^\"]*\"[^\"]*\")*[^\"]*$)", qualified_identifier.strip())[-1]
+		if _identifier.startswith("\""):
+			return _identifier[1:-1].replace("\"\"", "\"")
+		return _identifier.lower()
+
+	@staticmethod
+	def __get_written_table_names(*, query: str) -> Set[str]:
+
+		_table_names = set()  # type: Set[str]
+		for _match in QueryResultCache.__write_table_pattern.finditer(query):
+			for _table_match in QueryResultCache.__comma_separated_table_pattern.finditer(_match.group(1)):
+				_table_names.add(QueryResultCache.__get_table_name(
+					qualified_identifier=_table_match.group(1)
+				))
+		return _table_names
+
+	@staticmethod
+	def __get_called_function_names(*, query: str) -> Set[str]:
+
+		_function_names = set()  # type: Set[str]
+		for _match in QueryResultCache.__function_call_pattern.finditer(query):
+			if _match.group(1) is not None:
+				# a type modifier of a cast, such as ::numeric(10, 2)
+				continue
+			if _match.group(2) is not None:
+				_function_names.add(_match.group(2).replace("\"\"", "\""))
+			elif _match.group(3) is not None:
+				_function_name = _match.group(3).lower()
+				if _function_name not in QueryResultCache.__parenthesized_keywords:
+					_function_names.add(_function_name)
+		# the schema of a qualified function is dropped, as for tables
+		return _function_names - QueryResultCache.__deterministic_function_names
+
+	@staticmethod
+	@functools.lru_cache(maxsize=1024)
+	def __get_query_analysis(*, query: str) -> Tuple[str, bool, frozenset, frozenset, bool, frozenset]:
+		# the analysis only depends on the query text, which the same few queries repeat on every call
+
+		_normalized_query = PreparedStatementCache.normalize_query(
+			query=query
+		)
+		_first_keyword = _normalized_query.split(" ", 1)[0].lower()
+		_is_multiple_statements = ";" in _normalized_query
+
+		_is_read = _first_keyword in QueryResultCache.__read_first_keywords and not _is_multiple_statements
+		_is_cacheable = _is_read and QueryResultCache.__volatile_pattern.search(_normalized_query) is None
+		_function_names = set()  # type: Set[str]
+		if _is_read:
+			# the functions called by a write are not checked, as its column lists cannot be told apart from calls
+			_function_names = QueryResultCache.__get_called_function_names(
+				query=_normalized_query
+			)
+		_read_table_names = set()  # type: Set[str]
+		if _is_cacheable:
+			# every identifier is taken as a possibly read table, which can only invalidate too much, rather than parsing each form of table reference
+			for _match in QueryResultCache.__identifier_token_pattern.finditer(_normalized_query):
+				if _match.group(1) is not None:
+					_read_table_names.add(_match.group(1).replace("\"\"", "\""))
+				elif _match.group(2) is not None:
+					_read_table_names.add(_match.group(2).lower())
+
+		_is_written_known = not _is_multiple_statements and (_first_keyword in QueryResultCache.__read_first_keywords or _first_keyword in QueryResultCache.__write_first_keywords)
+		_written_table_names = set()  # type: Set[str]
+		if _is_written_known:
+			_written_table_names = QueryResultCache.__get_written_table_names(
+				query=_normalized_query
+			)
+			if len(_written_table_names) == 0 and _first_keyword in QueryResultCache.__write_first_keywords and _first_keyword != "with":
+				_is_written_known = False
+
+		return _normalized_query, _is_cacheable, frozenset(_function_names), frozenset(_read_table_names), _is_written_known, frozenset(_written_table_names)
+
+	@staticmethod
+	def try_get_read_table_names(*, query: str, deterministic_function_names: Set[str] = None) -> Tuple[bool, Set[str]]:
+		"""
+		Determines whether the output of the query may be cached, which requires a single statement that reads without side effects and only calls known deterministic functions.
+		:param query: The query text.
+		:param deterministic_function_names: The lower case names of the functions, beyond the built-in ones, known to be without side effects and to only depend on their arguments and the tables they read.
+		:return: If the query may be cached, the names of the tables it may read.
+		"""
+
+		_, _is_cacheable, _function_names, _read_table_names, _, _ = QueryResultCache.__get_query_analysis(query=query)
+		if not _is_cacheable:
+			return False, None
+		if len(_function_names) != 0 and (deterministic_function_names is None or not _function_names.issubset(deterministic_function_names)):
+			# an unknown function may write, notify or return a different output on every call
+			return False, None
+		return True, _read_table_names
+
+	@staticmethod
+	def try_get_written_table_names(*, query: str, deterministic_function_names: Set[str] = None) -> Tuple[bool, Set[str]]:
+		"""
+		Determines which tables the query may change.
+		:param query: The query text.
+		:param deterministic_function_names: The lower case names of the functions, beyond the built-in ones, known to be without side effects.
+		:return: If the changed tables are known, their names; otherwise any table of the database may have changed.
+		"""
+
+		_, _, _function_names, _, _is_written_known, _written_table_names = QueryResultCache.__get_query_analysis(query=query)
+		if not _is_written_known:
+			return False, None
+		if not _function_names.issubset(QueryResultCache.__volatile_function_names.union(deterministic_function_names or set())):
+			# an unknown function may change any table
+			return False, None
+		return True, _written_table_names
+
+	@staticmethod
+	def __get_key(*, database_name: str, query: str, parameters: Dict[str, object]) -> Tuple[str, str, str]:
+		_normalized_query = QueryResultCache.__get_query_analysis(query=query)[0]
+		return database_name, _normalized_query, json.dumps(parameters, sort_keys=True, default=repr)
+
+	@staticmethod
+	def __get_bytes_total(*, output: object) -> int:
+		if isinstance(output, (list, tuple)):
+			return sys.getsizeof(output) + sum([QueryResultCache.__get_bytes_total(output=_element) for _element in output])
+		elif isinstance(output, dict):
+			return sys.getsizeof(output) + sum([QueryResultCache.__get_bytes_total(output=_key) + QueryResultCache.__get_bytes_total(output=_value) for _key, _value in output.items()])
+		else:
+			return sys.getsizeof(output)
+
+	def __remove(self, *, key: Tuple[str, str, str]) -> QueryResultCacheEntry:
+
+		_entry = self.__entry_per_key.pop(key)
+		self.__bytes_total -= _entry.get_bytes_total()
+		for _table_name in _entry.get_table_names():
+			_database_table = (_entry.get_database_name(), _table_name)
+			_keys = self.__keys_per_database_table[_database_table]
+			_keys.discard(key)
+			if len(_keys) == 0:
+				del self.__keys_per_database_table[_database_table]
+		return _entry
+
+	def get_table_versions(self, *, database_name: str, table_names: Set[str]) -> Tuple[int, ...]:
+		"""
+		Gets the versions of the tables, which change whenever the tables are invalidated. Taken before running a query, they show whether its output is already stale when it is added.
+		:param database_name: The database of the tables.
+		:param table_names: The names of the tables.
+		:return: The versions to pass when adding the output.
+		"""
+
+		with self.__lock:
+			return tuple([self.__version_per_database_table.get((database_name, _table_name), 0) for _table_name in [None] + sorted(table_names)])
+
+	def try_get(self, *, database_name: str, query: str, parameters: Dict[str, object]) -> Tuple[bool, object]:
+
+		_key = QueryResultCache.__get_key(
+			database_name=database_name,
+			query=query,
+			parameters=parameters
+		)
+		with self.__lock:
+			_entry = self.__entry_per_key.get(_key)
+			if _entry is not None and _entry.get_expiry_time() <= time.monotonic():
+				self.__remove(
+					key=_key
+				)
+				self.__expirations_total += 1
+				_entry = None
+			if _entry is None:
+				self.__misses_total += 1
+				return False, None
+			self.__entry_per_key.move_to_end(_key)
+			self.__hits_total += 1
+			return True, _entry.get_output()
+
+	def add(self, *, database_name: str, query: str, parameters: Dict[str, object], table_names: Set[str], table_versions: Tuple[int, ...], output: object):
+
+		_key = QueryResultCache.__get_key(
+			database_name=database_name,
+			query=query,
+			parameters=parameters
+		)
+		_bytes_total = QueryResultCache.__get_bytes_total(
+			output=output
+		)
+		if _bytes_total > self.__maximum_bytes_total:
+			return
+		_entry = QueryResultCacheEntry(
+			database_name=database_name,
+			table_names=set(table_names),
+			output=output,
+			bytes_total=_bytes_total,
+			expiry_time=time.monotonic() + self.__time_to_live_seconds
+		)
+		with self.__lock:
+			_current_table_versions = tuple([self.__version_per_database_table.get((database_name, _table_name), 0) for _table_name in [None] + sorted(table_names)])
+			if _current_table_versions != table_versions:
+				# a table was written while the query ran, so the output may already be stale
+				return
+			if _key in self.__entry_per_key:
+				self.__remove(
+					key=_key
+				)
+			self.__entry_per_key[_key] = _entry
+			self.__bytes_total += _bytes_total
+			for _table_name in _entry.get_table_names():
+				self.__keys_per_database_table.setdefault((database_name, _table_name), set()).add(_key)
+			while len(self.__entry_per_key) > self.__maximum_entries_total or self.__bytes_total > self.__maximum_bytes_total:
+				self.__remove(
+					key=next(iter(self.__entry_per_key))
+				)
+				self.__evictions_total += 1
+
+	def invalidate_tables(self, *, database_name: str, table_names: Set[str]):
+
+		with self.__lock:
+			for _table_name in table_names:
+				_database_table = (database_name, _table_name)
+				self.__version_per_database_table[_database_table] = self.__version_per_database_table.get(_database_table, 0) + 1
+				for _key in list(self.__keys_per_database_table.get(_database_table, [])):
+					self.__remove(
+						key=_key
+					)
+					self.__invalidations_total += 1
+
+	def invalidate_database(self, *, database_name: str):
+
+		with self.__lock:
+			_database_table = (database_name, None)
+			self.__version_per_database_table[_database_table] = self.__version_per_database_table.get(_database_table, 0) + 1
+			for _key in [_key for _key in self.__entry_per_key.keys() if _key[0] == database_name]:
+				self.__remove(
+					key=_key
+				)
+				self.__invalidations_total += 1
+
+	def get_statistics(self) -> Dict[str, object]:
+
+		with self.__lock:
+			_lookups_total = self.__hits_total + self.__misses_total
+			return {
+				"entries_total": len(self.__entry_per_key),
+				"bytes_total": self.__bytes_total,
+				"hits_total": self.__hits_total,
+				"misses_total": self.__misses_total,
+				"hit_ratio": 0.0 if _lookups_total == 0 else self.__hits_total / _lookups_total,
+				"evictions_total": self.__evictions_total,
+				"expirations_total": self.__expirations_total,
+				"invalidations_total": self.__invalidations_total
+			}
@@ -0,0 +1,233 @@
+from __future__ import annotations
+from postgres_api.query_result_cache import QueryResultCache
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from typing import List, Dict, Tuple, Set, Callable
+import json
+import os
+import select
+import threading
+import time
+import uuid
+
+
+class QueryResultCacheInvalidationChannel():
+	"""
+	This class shares the invalidations of a query result cache with the caches of other processes through Postgres LISTEN/NOTIFY. A background thread listens on one connection per database, since notifications do not cross databases, and invalidates the cache as notifications arrive. The thread is started by the first database listened to, so an instance created before a process forks listens separately in each process.
+	"""
+
+	__maximum_payload_length = 7999
+
+	def __init__(self, *, query_result_cache: QueryResultCache, user_name: str, password: str, host_url: str, port: int, channel_name: str = "postgres_api_query_result_cache", listen_timeout_seconds: float = 5.0, reconnect_interval_seconds: float = 1.0, connect_function: Callable[..., object] = None):
+
+		self.__query_result_cache = query_result_cache
+		self.__user_name = user_name
+		self.__password = password
+		self.__host_url = host_url
+		self.__port = port
+		self.__channel_name = channel_name
+		self.__listen_timeout_seconds = listen_timeout_seconds
+		self.__reconnect_interval_seconds = reconnect_interval_seconds
+		self.__connect_function = psycopg2.connect if connect_function is None else connect_function
+
+		self.__lock = threading.Lock()
+		self.__process_id = None  # type: int
+		self.__origin = None  # type: str
+		self.__listening_thread = None  # type: threading.Thread
+		self.__wake_file_descriptors = None  # type: Tuple[int, int]
+		self.__is_thread_active = True
+		self.__connection_per_database_name = {}  # type: Dict[str, object]
+		self.__listening_event_per_database_name = {}  # type: Dict[str, threading.Event]
+		self.__inherited_connections = []  # type: List[object]
+		self.__notifications_received_total = 0
+
+	def __start_listening_thread(self):
+
+		self.__process_id = os.getpid()
+		self.__origin = f"{self.__process_id}-{uuid.uuid4().hex}"
+		# closing a connection inherited from the parent process would close it for the parent too
+		self.__inherited_connections.extend(self.__connection_per_database_name.values())
+		self.__connection_per_database_name = {}
+		self.__listening_event_per_database_name = {}
+		self.__wake_file_descriptors = os.pipe()
+
+		def _thread_method():
+
+			_next_connect_time = 0.0
+			while True:
+				with self.__lock:
+					if not self.__is_thread_active:
+						break
+					_pending_database_names = [_database_name for _database_name, _listening_event in self.__listening_event_per_database_name.items() if not _listening_event.is_set()]
+
+				if len(_pending_database_names) != 0 and time.monotonic() >= _next_connect_time:
+					for _database_name in _pending_database_names:
+						try:
+							self.__listen(
+								database_name=_database_name
+							)
+						except psycopg2.Error:
+							_next_connect_time = time.monotonic() + self.__reconnect_interval_seconds
+
+				with self.__lock:
+					_connection_per_database_name = dict(self.__connection_per_database_name)
+				_timeout_seconds = None if len(_pending_database_names) == 0 else self.__reconnect_interval_seconds
+				_readable_objects, _, _ = select.select([self.__wake_file_descriptors[0]] + list(_connection_per_database_name.values()), [], [], _timeout_seconds)
+
+				for _readable_object in _readable_objects:
+					if _readable_object is self.__wake_file_descriptors[0]:
+						os.read(self.__wake_file_descriptors[0], 4096)
+					else:
+						_database_name = [_database_name for _database_name, _connection in _connection_per_database_name.items() if _connection is _readable_object][0]
+						self.__receive(
+							database_name=_database_name,
+							connection=_readable_object
+						)
+
+			with self.__lock:
+				for _connection in self.__connection_per_database_name.values():
+					_connection.close()
+				self.__connection_per_database_name.clear()
+				for _listening_event in self.__listening_event_per_database_name.values():
+					_listening_event.set()
+			os.close(self.__wake_file_descriptors[0])
+			os.close(self.__wake_file_descriptors[1])
+
+		self.__listening_thread = threading.Thread(
+			target=_thread_method
+		)
+		self.__listening_thread.daemon = True
+		self.__listening_thread.start()
+
+	def __listen(self, *, database_name: str):
+
+		_connection = self.__connect_function(
+			user=self.__user_name,
+			password=self.__password,
+			host=self.__host_url,
+			port=self.__port,
+			database=database_name
+		)
+		try:
+			_connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+			_cursor = _connection.cursor()
+			_cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.__channel_name)))
+			_cursor.close()
+		except BaseException:
+			_connection.close()
+			raise
+		with self.__lock:
+			self.__connection_per_database_name[database_name] = _connection
+			self.__listening_event_per_database_name[database_name].set()
+		# output cached before listening, such as while reconnecting, may have missed its invalidation
+		self.__query_result_cache.invalidate_database(
+			database_name=database_name
+		)
+
+	def __receive(self, *, database_name: str, connection: object):
+
+		try:
+			connection.poll()
+		except psycopg2.Error:
+			# notifications may have been missed, so everything cached from the database is dropped now and again once listening
+			connection.close()
+			with self.__lock:
+				del self.__connection_per_database_name[database_name]
+				self.__listening_event_per_database_name[database_name].clear()
+			self.__query_result_cache.invalidate_database(
+				database_name=database_name
+			)
+			return
+		while len(connection.notifies) != 0:
+			_notification = connection.notifies.pop(0)
+			self.process_notification_payload(
+				payload=_notification.payload
+			)
+
+	def listen_to_database(self, *, database_name: str):
+		"""
+		Starts listening for the invalidations published to the database. The first call per database waits until listening so that no invalidation published afterwards is missed.
+		:param database_name: The database to listen to.
+		"""
+
+		with self.__lock:
+			if not self.__is_thread_active:
+				raise Exception(f"Cannot listen to database \"{database_name}\" because the invalidation channel is disposed.")
+			if self.__process_id != os.getpid():
+				self.__start_listening_thread()
+			if database_name in self.__listening_event_per_database_name:
+				# already listening or listening again after losing the connection, which invalidates the database itself
+				return
+			_listening_event = threading.Event()
+			self.__listening_event_per_database_name[database_name] = _listening_event
+			os.write(self.__wake_file_descriptors[1], b"\0")
+		_listening_event.wait(self.__listen_timeout_seconds)
+
+	def get_notification_parameters(self, *, database_name: str, table_names: Set[str]) -> Dict[str, object]:
+		"""
+		Gets the parameters of the notification query that publishes an invalidation.
+		:param database_name: The database the invalidation applies to.
+		:param table_names: The invalidated tables or None for every table of the database.
+		:return: The parameters of the query returned by get_notification_query.
+		"""
+
+		with self.__lock:
+			if self.__process_id != os.getpid():
+				self.__start_listening_thread()
+			_origin = self.__origin
+		_payload = json.dumps({
+			"origin": _origin,
+			"database_name": database_name,
+			"table_names": None if table_names is None else sorted(table_names)
+		})
+		if len(_payload.encode("utf-8")) > QueryResultCacheInvalidationChannel.__maximum_payload_length:
+			# the payload of a notification is limited, so every table is invalidated instead
+			_payload = json.dumps({
+				"origin": _origin,
+				"database_name": database_name,
+				"table_names": None
+			})
+		return {
+			"channel_name": self.__channel_name,
+			"payload": _payload
+		}
+
+	@staticmethod
+	def get_notification_query() -> str:
+		return "SELECT pg_notify(%(channel_name)s, %(payload)s)"
+
+	def process_notification_payload(self, *, payload: str):
+
+		_json = json.loads(payload)
+		with self.__lock:
+			self.__notifications_received_total += 1
+			_origin = self.__origin
+		if _json["origin"] == _origin:
+			# the invalidation was already applied by the process that published it
+			return
+		if _json["table_names"] is None:
+			self.__query_result_cache.invalidate_database(
+				database_name=_json["database_name"]
+			)
+		else:
+			self.__query_result_cache.invalidate_tables(
+				database_name=_json["database_name"],
+				table_names=set(_json["table_names"])
+			)
+
+	def get_notifications_received_total(self) -> int:
+		with self.__lock:
+			return self.__notifications_received_total
+
+	def dispose(self):
+
+		with self.__lock:
+			self.__is_thread_active = False
+			_listening_thread = self.__listening_thread
+			if _listening_thread is not None and self.__process_id == os.getpid():
+				os.write(self.__wake_file_descriptors[1], b"\0")
+			else:
+				_listening_thread = None
+		if _listening_thread is not None:
+			_listening_thread.join()
@@ -1,14 +1,21 @@
 from __future__ import annotations
-from postgres_api.executable import ExecutableElement
+from postgres_api.executable import ExecutableElement, FutureExecutableElement
+from postgres_api.queue_admission import ExecutableQueueAdmissionController, ExecutableQueueRejection, ExecutableQueueRejectedException
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 import threading
-from typing import List, Tuple, Dict, Callable
+import heapq
 import time
+import concurrent.futures
+import traceback
+from collections import deque
+from typing import List, Tuple, Dict, Callable, Deque
 
 
 class DelayedElement():
 
+	__slots__ = ("__element", "__delay_datetime")
+
 	def __init__(self, *, element: object, delay_datetime: datetime):
 
 		self.__element = element
@@ -25,24 +32,34 @@ class DelayedElementQueue():
 
 	def __init__(self):
 
-		self.__queue = []  # type: List[DelayedElement]
+		self.__heap = []  # type: List[Tuple[datetime, int, DelayedElement]]
+		self.__sequence_index = 0
 		self.__queue_semaphore = threading.Semaphore()
 
 	def add(self, *, delayed_element: DelayedElement):
 
 		self.__queue_semaphore.acquire()
 
-		if len(self.__queue) == 0:
-			self.__queue.append(delayed_element)
+		# the sequence index keeps elements sharing a delay datetime in the order they were added
+		heapq.heappush(self.__heap, (delayed_element.get_delay_datetime(), self.__sequence_index, delayed_element))
+		self.__sequence_index += 1
+
+		self.__queue_semaphore.release()
+
+	def add_many(self, *, delayed_elements: List[DelayedElement]):
+
+		self.__queue_semaphore.acquire()
+
+		if len(delayed_elements) > len(self.__heap):
+			# rebuilding the heap is linear while pushing each element would be n log n
+			for _delayed_element in delayed_elements:
+				self.__heap.append((_delayed_element.get_delay_datetime(), self.__sequence_index, _delayed_element))
+				self.__sequence_index += 1
+			heapq.heapify(self.__heap)
 		else:
-			_is_inserted = False
-			for _delayed_element_index, _delayed_element in enumerate(self.__queue):
-				if _delayed_element.get_delay_datetime() > delayed_element.get_delay_datetime():
-					self.__queue.insert(_delayed_element_index, delayed_element)
-					_is_inserted = True
-					break
-			if not _is_inserted:
-				self.__queue.append(delayed_element)
+			for _delayed_element in delayed_elements:
+				heapq.heappush(self.__heap, (_delayed_element.get_delay_datetime(), self.__sequence_index, _delayed_element))
+				self.__sequence_index += 1
 
 		self.__queue_semaphore.release()
 
@@ -53,14 +70,120 @@ class DelayedElementQueue():
 		self.__queue_semaphore.acquire()
 
 		_now = datetime.utcnow()
-		if len(self.__queue) != 0:
-			if _now >= self.__queue[0].get_delay_datetime():
-				_delayed_element = self.__queue.pop()
+		if len(self.__heap) != 0:
+			if _now >= self.__heap[0][0]:
+				_delayed_element = heapq.heappop(self.__heap)[2]
+
+		self.__queue_semaphore.release()
+
+		return _delayed_element is not None, _delayed_element
+
+	def peek_next_due(self) -> Tuple[bool, DelayedElement]:
+
+		_delayed_element = None
+
+		self.__queue_semaphore.acquire()
+
+		if len(self.__heap) != 0:
+			_delayed_element = self.__heap[0][2]
 
 		self.__queue_semaphore.release()
 
 		return _delayed_element is not None, _delayed_element
 
+	def get_length(self) -> int:
+		return len(self.__heap)
+
+
+class DelayedElementScheduler():
+	"""
+	This class hands each delayed element to the due function once its delay datetime has passed, sleeping until the next element is due instead of polling
+	"""
+
+	def __init__(self, *, due_function: Callable[[DelayedElement], None]):
+
+		self.__due_function = due_function
+
+		self.__delayed_element_queue = DelayedElementQueue()
+		self.__condition = threading.Condition()
+		self.__thread = None
+		self.__is_thread_active = True
+
+		self.__start_thread()
+
+	def __start_thread(self):
+
+		def _thread_method():
+
+			while self.__is_thread_active:
+				_due_delayed_elements = []  # type: List[DelayedElement]
+				self.__condition.acquire()
+				_is_successful, _delayed_element = self.__delayed_element_queue.peek_next_due()
+				if not _is_successful:
+					self.__condition.wait()
+				else:
+					_seconds_until_due = (_delayed_element.get_delay_datetime() - datetime.utcnow()).total_seconds()
+					if _seconds_until_due > 0:
+						self.__condition.wait(_seconds_until_due)
+				if self.__is_thread_active:
+					_is_successful = True
+					while _is_successful:
+						_is_successful, _delayed_element = self.__delayed_element_queue.try_get()
+						if _is_successful:
+							_due_delayed_elements.append(_delayed_element)
+				self.__condition.release()
+				for _delayed_element in _due_delayed_elements:
+					self.__due_function(_delayed_element)
+
+		self.__thread = threading.Thread(
+			target=_thread_method
+		)
+		self.__thread.daemon = True
+		self.__thread.start()
+
+	def add(self, *, delayed_element: DelayedElement):
+
+		self.__condition.acquire()
+
+		_is_successful, _next_delayed_element = self.__delayed_element_queue.peek_next_due()
+		self.__delayed_element_queue.add(
+			delayed_element=delayed_element
+		)
+		# the thread only needs to wake if it is now sleeping past the earliest due element
+		if not _is_successful or delayed_element.get_delay_datetime() < _next_delayed_element.get_delay_datetime():
+			self.__condition.notify()
+
+		self.__condition.release()
+
+	def add_many(self, *, delayed_elements: List[DelayedElement]):
+
+		if len(delayed_elements) != 0:
+
+			self.__condition.acquire()
+
+			self.__delayed_element_queue.add_many(
+				delayed_elements=delayed_elements
+			)
+			self.__condition.notify()
+
+			self.__condition.release()
+
+	def get_length(self) -> int:
+		return self.__delayed_element_queue.get_length()
+
+	def dispose(self):
+
+		self.__condition.acquire()
+
+		_is_thread_active = self.__is_thread_active
+		self.__is_thread_active = False
+		self.__condition.notify()
+
+		self.__condition.release()
+
+		if _is_thread_active and self.__thread is not threading.current_thread():
+			self.__thread.join()
+
 
 class ExecutableQueueInterface(ABC):
 
@@ -73,6 +196,15 @@ class ExecutableQueueInterface(ABC):
 		"""
 		raise NotImplementedError()
 
+	@abstractmethod
+	def insert_many_at_front_immediately(self, *, executable_elements: List[ExecutableElement]):
+		"""
+		Inserts these executable elements at the front of the queue, keeping their order so that the first element is executed first.
+		:param executable_elements: The elements to be inserted at the front of the queue.
+		:return: None
+		"""
+		raise NotImplementedError()
+
 	@abstractmethod
 	def append_to_end_immediately(self, *, executable_element: ExecutableElement):
 		"""
@@ -82,6 +214,47 @@ class ExecutableQueueInterface(ABC):
 		"""
 		raise NotImplementedError()
 
+	@abstractmethod
+	def append_many_to_end_immediately(self, *, executable_elements: List[ExecutableElement]):
+		"""
+		Appends these executable elements to the back of the queue in order.
+		:param executable_elements: The executable elements to be executed.
+		:return: None
+		"""
+		raise NotImplementedError()
+
+	def submit(self, *, executable_element: ExecutableElement) -> concurrent.futures.Future:
+		"""
+		Appends this executable element to the back of the queue, returning a future that resolves with its output or exception once it has been executed.
+		:param executable_element: The executable element to be executed.
+		:return: The future of the output of the executable element.
+		"""
+
+		_future_executable_element = FutureExecutableElement(
+			executable_element=executable_element,
+			future=concurrent.futures.Future()
+		)
+		self.append_to_end_immediately(
+			executable_element=_future_executable_element
+		)
+		return _future_executable_element.get_future()
+
+	def submit_many(self, *, executable_elements: List[ExecutableElement]) -> List[concurrent.futures.Future]:
+		"""
+		Appends these executable elements to the back of the queue in order, returning a future for each.
+		:param executable_elements: The executable elements to be executed.
+		:return: The futures of the outputs of the executable elements, in the same order.
+		"""
+
+		_future_executable_elements = [FutureExecutableElement(
+			executable_element=_executable_element,
+			future=concurrent.futures.Future()
+		) for _executable_element in executable_elements]
+		self.append_many_to_end_immediately(
+			executable_elements=_future_executable_elements
+		)
+		return [_future_executable_element.get_future() for _future_executable_element in _future_executable_elements]
+
 	@abstractmethod
 	def insert_at_front_after_datetime(self, *, executable_element: ExecutableElement, delay_datetime: datetime):
 		"""
@@ -130,82 +303,113 @@ class ExecutableQueueInterface(ABC):
 		"""
 		raise NotImplementedError()
 
+	def process_execution_exception(self, *, executable_element: ExecutableElement, exception: Exception):
+		"""
+		Processes an exception raised while executing an element or processing its result, after which the queue carries on with the next element. An exception raised by a submitted element is already set on its future, while any other exception, including one raised while processing the result of a submitted element, is printed like that of a thread.
+		:param executable_element: The element that was executed.
+		:param exception: The exception raised.
+		:return: None
+		"""
+
+		if isinstance(executable_element, FutureExecutableElement):
+			_future = executable_element.get_future()
+			if _future.done() and (_future.cancelled() or _future.exception() is exception):
+				return
+		traceback.print_exception(type(exception), exception, exception.__traceback__)
+
+	def process_rejected_executable_element(self, *, executable_element: ExecutableElement, executable_queue_rejection: ExecutableQueueRejection):
+		"""
+		Processes an element that the admission controller of the queue rejected or dropped instead of executing it. Submitted elements have the rejection set on their futures.
+		:param executable_element: The element that will not be executed.
+		:param executable_queue_rejection: Why the element was rejected.
+		:return: None
+		"""
+
+		if isinstance(executable_element, FutureExecutableElement) and executable_element.get_future().set_running_or_notify_cancel():
+			executable_element.get_future().set_exception(ExecutableQueueRejectedException(
+				executable_queue_rejection=executable_queue_rejection
+			))
+
 
 class SingleThreadedExecutableQueue(ExecutableQueueInterface):
 
-	def __init__(self):
+	def __init__(self, *, admission_controller: ExecutableQueueAdmissionController = None):
 
-		self.__queue = []  # type: List[ExecutableElement]
-		self.__insert_at_front_delayed_element_queue = DelayedElementQueue()
-		self.__append_to_end_delayed_element_queue = DelayedElementQueue()
-		self.__semaphore = threading.Semaphore()
-		self.__delayed_polling_thread = None
+		self.__admission_controller = admission_controller
+		self.__queue = deque()  # type: Deque[ExecutableElement]
+		self.__insert_at_front_delayed_element_scheduler = None  # type: DelayedElementScheduler
+		self.__append_to_end_delayed_element_scheduler = None  # type: DelayedElementScheduler
+		self.__queue_lock = threading.Lock()
+		self.__queue_not_empty_condition = threading.Condition(self.__queue_lock)
+		self.__queue_empty_condition = threading.Condition(self.__queue_lock)
+		self.__queue_not_full_condition = threading.Condition(self.__queue_lock)
 		self.__processing_thread = None
-		self.__wait_until_empty_wait_semaphore = threading.Semaphore(0)
-		self.__wait_until_empty_done_semaphore = threading.Semaphore(0)
-		self.__is_waiting_for_empty = False
 		self.__is_threads_active = True
-		self.__processing_thread_empty_wait_semaphore = threading.Semaphore(0)
-		self.__processing_thread_empty_done_semaphore = threading.Semaphore(0)
 		self.__is_processing_thread_empty = False
 
-		self.__start_delayed_polling_thread()
+		self.__start_delayed_element_schedulers()
 		self.__start_processing_thread()
 
-	def __start_delayed_polling_thread(self):
+	def __start_delayed_element_schedulers(self):
 
-		def _thread_method():
+		def _insert_at_front_due_function(delayed_element: DelayedElement):
+			self.insert_at_front_immediately(
+				executable_element=delayed_element.get_element()
+			)
 
-			while self.__is_threads_active:
-				time.sleep(1)
-				_is_successful = True
-				while _is_successful:
-					_is_successful, _delayed_element = self.__insert_at_front_delayed_element_queue.try_get()
-					if _is_successful:
-						_executable_element = _delayed_element.get_element()  # type: ExecutableElement
-						self.insert_at_front_immediately(
-							executable_element=_executable_element
-						)
-				_is_successful = True
-				while _is_successful:
-					_is_successful, _delayed_element = self.__append_to_end_delayed_element_queue.try_get()  # type: Tuple[bool, ExecutableElement]
-					if _is_successful:
-						_executable_element = _delayed_element.get_element()  # type: ExecutableElement
-						self.append_to_end_immediately(
-							executable_element=_executable_element
-						)
+		def _append_to_end_due_function(delayed_element: DelayedElement):
+			self.append_to_end_immediately(
+				executable_element=delayed_element.get_element()
+			)
 
-		self.__delayed_polling_thread = threading.Thread(
-			target=_thread_method
+		self.__insert_at_front_delayed_element_scheduler = DelayedElementScheduler(
+			due_function=_insert_at_front_due_function
+		)
+		self.__append_to_end_delayed_element_scheduler = DelayedElementScheduler(
+			due_function=_append_to_end_due_function
 		)
-		self.__delayed_polling_thread.daemon = True
-		self.__delayed_polling_thread.start()
 
 	def __start_processing_thread(self):
 
 		def _thread_method():
 
-			while self.__is_threads_active:
-				_executable_element = None  # type: ExecutableElement
-				self.__semaphore.acquire()
-				if len(self.__queue) != 0:
-					_executable_element = self.__queue.pop(0)
-				else:
+			while True:
+				self.__queue_lock.acquire()
+				while self.__is_threads_active and len(self.__queue) == 0:
 					self.__is_processing_thread_empty = True
-					if self.__is_waiting_for_empty:
-						self.__wait_until_empty_wait_semaphore.release()
-						self.__wait_until_empty_done_semaphore.acquire()
-				self.__semaphore.release()
-				if _executable_element is None:
-					self.__processing_thread_empty_wait_semaphore.acquire()
-					self.__is_processing_thread_empty = False
-					self.__processing_thread_empty_done_semaphore.release()
-				else:
+					self.__queue_empty_condition.notify_all()
+					self.__queue_not_empty_condition.wait()
+				if not self.__is_threads_active:
+					self.__queue_lock.release()
+					break
+				self.__is_processing_thread_empty = False
+				_executable_element = self.__queue.popleft()  # type: ExecutableElement
+				if self.__admission_controller is not None:
+					self.__admission_controller.release(
+						executable_element=_executable_element
+					)
+					self.__queue_not_full_condition.notify_all()
+				self.__queue_lock.release()
+
+				_start_time = time.perf_counter()
+				try:
 					_execution_parameters = self.get_execution_parameters()
 					_execution_result = _executable_element.execute(**_execution_parameters)
 					self.process_execution_result(
 						execution_result=_execution_result
 					)
+				except Exception as ex:
+					self.process_execution_exception(
+						executable_element=_executable_element,
+						exception=ex
+					)
+
+				if self.__admission_controller is not None:
+					self.__queue_lock.acquire()
+					self.__admission_controller.record_execution_seconds(
+						execution_seconds=time.perf_counter() - _start_time
+					)
+					self.__queue_lock.release()
 
 		self.__processing_thread = threading.Thread(
 			target=_thread_method
@@ -213,140 +417,491 @@ class SingleThreadedExecutableQueue(ExecutableQueueInterface):
 		self.__processing_thread.daemon = True
 		self.__processing_thread.start()
 
-	def insert_at_front_immediately(self, *, executable_element: ExecutableElement):
+	def __drop_oldest(self) -> ExecutableElement:
+		# expects the queue lock to be held, and the element at the head has waited the longest unless it was inserted at the front
+		if len(self.__queue) == 0:
+			return None
+		return self.__queue.popleft()
 
-		self.__semaphore.acquire()
+	def __enqueue_many(self, *, executable_elements: List[ExecutableElement], is_front: bool):
 
-		self.__queue.insert(0, executable_element)
+		if len(executable_elements) != 0:
 
-		if self.__is_processing_thread_empty:
-			self.__processing_thread_empty_wait_semaphore.release()
-			self.__processing_thread_empty_done_semaphore.acquire()
+			_rejected_elements = []  # type: List[Tuple[ExecutableElement, ExecutableQueueRejection]]
 
-		self.__semaphore.release()
+			self.__queue_lock.acquire()
 
-	def append_to_end_immediately(self, *, executable_element: ExecutableElement):
+			if self.__admission_controller is None:
+				if is_front:
+					self.__queue.extendleft(reversed(executable_elements))
+				else:
+					self.__queue.extend(executable_elements)
+			else:
+				for _executable_element in (reversed(executable_elements) if is_front else executable_elements):
+					_is_admitted, _element_rejected_elements = self.__admission_controller.admit(
+						executable_element=_executable_element,
+						queue_not_full_condition=self.__queue_not_full_condition,
+						is_active_function=lambda: self.__is_threads_active,
+						drop_oldest_function=self.__drop_oldest
+					)
+					_rejected_elements.extend(_element_rejected_elements)
+					if _is_admitted:
+						if is_front:
+							self.__queue.appendleft(_executable_element)
+						else:
+							self.__queue.append(_executable_element)
+						# an admitted element is made available right away since a later element of the batch may block until it is executed
+						if self.__is_processing_thread_empty:
+							self.__queue_not_empty_condition.notify()
 
-		self.__semaphore.acquire()
+			if self.__is_processing_thread_empty:
+				self.__queue_not_empty_condition.notify()
 
-		self.__queue.append(executable_element)
+			self.__queue_lock.release()
 
-		if self.__is_processing_thread_empty:
-			self.__processing_thread_empty_wait_semaphore.release()
-			self.__processing_thread_empty_done_semaphore.acquire()
+			for _executable_element, _executable_queue_rejection in _rejected_elements:
+				self.process_rejected_executable_element(
+					executable_element=_executable_element,
+					executable_queue_rejection=_executable_queue_rejection
+				)
 
-		self.__semaphore.release()
+	def insert_at_front_immediately(self, *, executable_element: ExecutableElement):
+		self.__enqueue_many(
+			executable_elements=[executable_element],
+			is_front=True
+		)
 
-	def insert_at_front_after_datetime(self, *, executable_element: ExecutableElement, delay_datetime: datetime):
+	def insert_many_at_front_immediately(self, *, executable_elements: List[ExecutableElement]):
+		self.__enqueue_many(
+			executable_elements=executable_elements,
+			is_front=True
+		)
 
-		self.__semaphore.acquire()
+	def append_to_end_immediately(self, *, executable_element: ExecutableElement):
+		self.__enqueue_many(
+			executable_elements=[executable_element],
+			is_front=False
+		)
+
+	def append_many_to_end_immediately(self, *, executable_elements: List[ExecutableElement]):
+		self.__enqueue_many(
+			executable_elements=executable_elements,
+			is_front=False
+		)
 
-		self.__insert_at_front_delayed_element_queue.add(
+	def insert_at_front_after_datetime(self, *, executable_element: ExecutableElement, delay_datetime: datetime):
+
+		self.__insert_at_front_delayed_element_scheduler.add(
 			delayed_element=DelayedElement(
 				element=executable_element,
 				delay_datetime=delay_datetime
 			)
 		)
 
-		if self.__is_processing_thread_empty:
-			self.__processing_thread_empty_wait_semaphore.release()
-			self.__processing_thread_empty_done_semaphore.acquire()
-
-		self.__semaphore.release()
-
 	def append_to_end_after_datetime(self, *, executable_element: ExecutableElement, delay_datetime: datetime):
 
-		self.__semaphore.acquire()
-
-		self.__append_to_end_delayed_element_queue.add(
+		self.__append_to_end_delayed_element_scheduler.add(
 			delayed_element=DelayedElement(
 				element=executable_element,
 				delay_datetime=delay_datetime
 			)
 		)
 
-		if self.__is_processing_thread_empty:
-			self.__processing_thread_empty_wait_semaphore.release()
-			self.__processing_thread_empty_done_semaphore.acquire()
-
-		self.__semaphore.release()
-
 	def insert_at_front_after_elapsed_seconds(self, *, executable_element: ExecutableElement, seconds_total: int):
 
-		self.__semaphore.acquire()
-
 		_datetime = datetime.utcnow() + timedelta(0, seconds_total)
-		self.__insert_at_front_delayed_element_queue.add(
+		self.__insert_at_front_delayed_element_scheduler.add(
 			delayed_element=DelayedElement(
 				element=executable_element,
 				delay_datetime=_datetime
 			)
 		)
 
-		if self.__is_processing_thread_empty:
-			self.__processing_thread_empty_wait_semaphore.release()
-			self.__processing_thread_empty_done_semaphore.acquire()
-
-		self.__semaphore.release()
-
 	def append_to_end_after_elapsed_seconds(self, *, executable_element: ExecutableElement, seconds_total: int):
 
-		self.__semaphore.acquire()
-
 		_datetime = datetime.utcnow() + timedelta(0, seconds_total)
-		self.__append_to_end_delayed_element_queue.add(
+		self.__append_to_end_delayed_element_scheduler.add(
 			delayed_element=DelayedElement(
 				element=executable_element,
 				delay_datetime=_datetime
 			)
 		)
 
-		if self.__is_processing_thread_empty:
-			self.__processing_thread_empty_wait_semaphore.release()
-			self.__processing_thread_empty_done_semaphore.acquire()
+	def wait_until_empty(self):
 
-		self.__semaphore.release()
+		self.__queue_lock.acquire()
 
-	def wait_until_empty(self):
+		while self.__is_threads_active and (not self.__is_processing_thread_empty or len(self.__queue) != 0):
+			self.__queue_empty_condition.wait()
+
+		self.__queue_lock.release()
+
+	def dispose(self):
+
+		# the schedulers are stopped first since a due element may be waiting on the lock to be enqueued
+		self.__insert_at_front_delayed_element_scheduler.dispose()
+		self.__append_to_end_delayed_element_scheduler.dispose()
+
+		self.__queue_lock.acquire()
+
+		_is_threads_active = self.__is_threads_active
+		self.__is_threads_active = False
+		self.__queue_not_empty_condition.notify_all()
+		self.__queue_empty_condition.notify_all()
+		self.__queue_not_full_condition.notify_all()
+
+		self.__queue_lock.release()
+
+		if _is_threads_active and self.__processing_thread is not threading.current_thread():
+			self.__processing_thread.join()
+
+	def get_admission_statistics(self) -> Dict[str, object]:
+		if self.__admission_controller is None:
+			return None
+		with self.__queue_lock:
+			return self.__admission_controller.get_statistics()
+
+	@abstractmethod
+	def get_execution_parameters(self) -> Dict[str, object]:
+		raise NotImplementedError()
+
+	@abstractmethod
+	def process_execution_result(self, *, execution_result: object):
+		raise NotImplementedError()
+
+
+class ThreadPoolExecutableQueue(ExecutableQueueInterface):
+	"""
+	This class executes elements on a fixed number of worker threads. Elements sharing an ordering key are executed one at a time in queue order while elements with different ordering keys, or no ordering key, run in parallel.
+	"""
+
+	def __init__(self, *, workers_total: int, admission_controller: ExecutableQueueAdmissionController = None):
 
-		_is_empty = False
+		if workers_total < 1:
+			raise Exception(f"Cannot create thread pool with {workers_total} workers.")
 
-		self.__semaphore.acquire()
+		self.__workers_total = workers_total
+		self.__admission_controller = admission_controller
+		if admission_controller is not None:
+			admission_controller.set_workers_total(
+				workers_total=workers_total
+			)
+
+		# an entry is either (None, executable_element) or (ordering_key, None) for the next element of that ordering key
+		self.__ready_entries = deque()  # type: Deque[Tuple[object, ExecutableElement]]
+		# an ordering key is present while one of its elements is executing or while it has an entry in the ready entries
+		self.__executable_elements_per_ordering_key = {}  # type: Dict[object, Deque[ExecutableElement]]
+		self.__executable_elements_total = 0
+		self.__insert_at_front_delayed_element_scheduler = None  # type: DelayedElementScheduler
+		self.__append_to_end_delayed_element_scheduler = None  # type: DelayedElementScheduler
+		self.__queue_lock = threading.Lock()
+		self.__queue_not_empty_condition = threading.Condition(self.__queue_lock)
+		self.__queue_empty_condition = threading.Condition(self.__queue_lock)
+		self.__queue_not_full_condition = threading.Condition(self.__queue_lock)
+		self.__worker_threads = []  # type: List[threading.Thread]
+		self.__is_threads_active = True
+
+		self.__start_delayed_element_schedulers()
+		self.__start_worker_threads()
 
-		if self.__is_processing_thread_empty:
-			_is_empty = True
+	def __start_delayed_element_schedulers(self):
+
+		def _insert_at_front_due_function(delayed_element: DelayedElement):
+			_ordering_key, _executable_element = delayed_element.get_element()  # type: object, ExecutableElement
+			self.insert_at_front_immediately(
+				executable_element=_executable_element,
+				ordering_key=_ordering_key
+			)
+
+		def _append_to_end_due_function(delayed_element: DelayedElement):
+			_ordering_key, _executable_element = delayed_element.get_element()  # type: object, ExecutableElement
+			self.append_to_end_immediately(
+				executable_element=_executable_element,
+				ordering_key=_ordering_key
+			)
+
+		self.__insert_at_front_delayed_element_scheduler = DelayedElementScheduler(
+			due_function=_insert_at_front_due_function
+		)
+		self.__append_to_end_delayed_element_scheduler = DelayedElementScheduler(
+			due_function=_append_to_end_due_function
+		)
+
+	def __start_worker_threads(self):
+
+		def _thread_method(worker_index: int):
+
+			while True:
+				self.__queue_lock.acquire()
+				while self.__is_threads_active and len(self.__ready_entries) == 0:
+					self.__queue_not_empty_condition.wait()
+				if not self.__is_threads_active:
+					self.__queue_lock.release()
+					break
+				_ordering_key, _executable_element = self.__ready_entries.popleft()
+				if _ordering_key is not None:
+					_executable_element = self.__executable_elements_per_ordering_key[_ordering_key].popleft()
+				if self.__admission_controller is not None:
+					self.__admission_controller.release(
+						executable_element=_executable_element
+					)
+					self.__queue_not_full_condition.notify_all()
+				self.__queue_lock.release()
 
-		if not _is_empty:
-			self.__is_waiting_for_empty = True
+				_start_time = time.perf_counter()
+				try:
+					_execution_parameters = self.get_execution_parameters(
+						worker_index=worker_index
+					)
+					_execution_result = _executable_element.execute(**_execution_parameters)
+					self.process_execution_result(
+						execution_result=_execution_result
+					)
+				except Exception as ex:
+					self.process_execution_exception(
+						executable_element=_executable_element,
+						exception=ex
+					)
+				finally:
+					self.__queue_lock.acquire()
+					if self.__admission_controller is not None:
+						self.__admission_controller.record_execution_seconds(
+							execution_seconds=time.perf_counter() - _start_time
+						)
+					if _ordering_key is not None:
+						if len(self.__executable_elements_per_ordering_key[_ordering_key]) == 0:
+							del self.__executable_elements_per_ordering_key[_ordering_key]
+						else:
+							self.__ready_entries.append((_ordering_key, None))
+							self.__queue_not_empty_condition.notify()
+					self.__executable_elements_total -= 1
+					if self.__executable_elements_total == 0:
+						self.__queue_empty_condition.notify_all()
+					self.__queue_lock.release()
+
+		for _worker_index in range(self.__workers_total):
+			_worker_thread = threading.Thread(
+				target=_thread_method,
+				args=(_worker_index,)
+			)
+			_worker_thread.daemon = True
+			_worker_thread.start()
+			self.__worker_threads.append(_worker_thread)
 
-			self.__semaphore.release()
+	def __enqueue(self, *, executable_element: ExecutableElement, ordering_key: object, is_front: bool):
 
-			self.__wait_until_empty_wait_semaphore.acquire()
-			self.__is_waiting_for_empty = False
-			self.__wait_until_empty_done_semaphore.release()
+		# expects the queue lock to be held
+		if ordering_key is None:
+			_entry = (None, executable_element)
+		else:
+			_executable_elements = self.__executable_elements_per_ordering_key.get(ordering_key, None)
+			if _executable_elements is None:
+				self.__executable_elements_per_ordering_key[ordering_key] = deque([executable_element])
+				_entry = (ordering_key, None)
+			else:
+				# the ordering key is already executing or waiting for a worker, so the element waits its turn within the ordering key
+				if is_front:
+					_executable_elements.appendleft(executable_element)
+				else:
+					_executable_elements.append(executable_element)
+				_entry = None
+		if _entry is not None:
+			if is_front:
+				self.__ready_entries.appendleft(_entry)
+			else:
+				self.__ready_entries.append(_entry)
+		self.__executable_elements_total += 1
+
+	def __drop_oldest(self) -> ExecutableElement:
+
+		# expects the queue lock to be held
+		if len(self.__ready_entries) == 0:
+			return None
+		_ordering_key, _executable_element = self.__ready_entries[0]
+		if _ordering_key is None:
+			self.__ready_entries.popleft()
 		else:
-			self.__semaphore.release()
+			# an ordering key with a ready entry has no element executing, so its next element is dropped in its place
+			_executable_elements = self.__executable_elements_per_ordering_key[_ordering_key]
+			_executable_element = _executable_elements.popleft()
+			if len(_executable_elements) == 0:
+				self.__ready_entries.popleft()
+				del self.__executable_elements_per_ordering_key[_ordering_key]
+		self.__executable_elements_total -= 1
+		if self.__executable_elements_total == 0:
+			self.__queue_empty_condition.notify_all()
+		return _executable_element
+
+	def __enqueue_many(self, *, executable_elements: List[ExecutableElement], ordering_key: object, is_front: bool):
+
+		if len(executable_elements) != 0:
+
+			_rejected_elements = []  # type: List[Tuple[ExecutableElement, ExecutableQueueRejection]]
+
+			self.__queue_lock.acquire()
+
+			for _executable_element in (reversed(executable_elements) if is_front else executable_elements):
+				if self.__admission_controller is None:
+					_is_admitted = True
+				else:
+					_is_admitted, _element_rejected_elements = self.__admission_controller.admit(
+						executable_element=_executable_element,
+						queue_not_full_condition=self.__queue_not_full_condition,
+						is_active_function=lambda: self.__is_threads_active,
+						drop_oldest_function=self.__drop_oldest
+					)
+					_rejected_elements.extend(_element_rejected_elements)
+				if _is_admitted:
+					self.__enqueue(
+						executable_element=_executable_element,
+						ordering_key=ordering_key,
+						is_front=is_front
+					)
+					self.__queue_not_empty_condition.notify()
+
+			self.__queue_lock.release()
+
+			for _executable_element, _executable_queue_rejection in _rejected_elements:
+				self.process_rejected_executable_element(
+					executable_element=_executable_element,
+					executable_queue_rejection=_executable_queue_rejection
+				)
+
+	def insert_at_front_immediately(self, *, executable_element: ExecutableElement, ordering_key: object = None):
+		self.__enqueue_many(
+			executable_elements=[executable_element],
+			ordering_key=ordering_key,
+			is_front=True
+		)
+
+	def insert_many_at_front_immediately(self, *, executable_elements: List[ExecutableElement], ordering_key: object = None):
+		self.__enqueue_many(
+			executable_elements=executable_elements,
+			ordering_key=ordering_key,
+			is_front=True
+		)
+
+	def append_to_end_immediately(self, *, executable_element: ExecutableElement, ordering_key: object = None):
+		self.__enqueue_many(
+			executable_elements=[executable_element],
+			ordering_key=ordering_key,
+			is_front=False
+		)
+
+	def append_many_to_end_immediately(self, *, executable_elements: List[ExecutableElement], ordering_key: object = None):
+		self.__enqueue_many(
+			executable_elements=executable_elements,
+			ordering_key=ordering_key,
+			is_front=False
+		)
+
+	def submit(self, *, executable_element: ExecutableElement, ordering_key: object = None) -> concurrent.futures.Future:
+
+		_future_executable_element = FutureExecutableElement(
+			executable_element=executable_element,
+			future=concurrent.futures.Future()
+		)
+		self.append_to_end_immediately(
+			executable_element=_future_executable_element,
+			ordering_key=ordering_key
+		)
+		return _future_executable_element.get_future()
+
+	def submit_many(self, *, executable_elements: List[ExecutableElement], ordering_key: object = None) -> List[concurrent.futures.Future]:
+
+		_future_executable_elements = [FutureExecutableElement(
+			executable_element=_executable_element,
+			future=concurrent.futures.Future()
+		) for _executable_element in executable_elements]
+		self.append_many_to_end_immediately(
+			executable_elements=_future_executable_elements,
+			ordering_key=ordering_key
+		)
+		return [_future_executable_element.get_future() for _future_executable_element in _future_executable_elements]
+
+	def insert_at_front_after_datetime(self, *, executable_element: ExecutableElement, delay_datetime: datetime, ordering_key: object = None):
+
+		self.__insert_at_front_delayed_element_scheduler.add(
+			delayed_element=DelayedElement(
+				element=(ordering_key, executable_element),
+				delay_datetime=delay_datetime
+			)
+		)
+
+	def append_to_end_after_datetime(self, *, executable_element: ExecutableElement, delay_datetime: datetime, ordering_key: object = None):
+
+		self.__append_to_end_delayed_element_scheduler.add(
+			delayed_element=DelayedElement(
+				element=(ordering_key, executable_element),
+				delay_datetime=delay_datetime
+			)
+		)
+
+	def insert_at_front_after_elapsed_seconds(self, *, executable_element: ExecutableElement, seconds_total: int, ordering_key: object = None):
+
+		_datetime = datetime.utcnow() + timedelta(0, seconds_total)
+		self.__insert_at_front_delayed_element_scheduler.add(
+			delayed_element=DelayedElement(
+				element=(ordering_key, executable_element),
+				delay_datetime=_datetime
+			)
+		)
+
+	def append_to_end_after_elapsed_seconds(self, *, executable_element: ExecutableElement, seconds_total: int, ordering_key: object = None):
+
+		_datetime = datetime.utcnow() + timedelta(0, seconds_total)
+		self.__append_to_end_delayed_element_scheduler.add(
+			delayed_element=DelayedElement(
+				element=(ordering_key, executable_element),
+				delay_datetime=_datetime
+			)
+		)
+
+	def wait_until_empty(self):
+
+		self.__queue_lock.acquire()
+
+		while self.__is_threads_active and self.__executable_elements_total != 0:
+			self.__queue_empty_condition.wait()
+
+		self.__queue_lock.release()
 
 	def dispose(self):
 
-		self.__semaphore.acquire()
+		# the schedulers are stopped first since a due element may be waiting on the lock to be enqueued
+		self.__insert_at_front_delayed_element_scheduler.dispose()
+		self.__append_to_end_delayed_element_scheduler.dispose()
 
-		if self.__is_threads_active:
-			self.__is_threads_active = False
+		self.__queue_lock.acquire()
 
-			if self.__is_processing_thread_empty:
-				self.__processing_thread_empty_wait_semaphore.release()
-				self.__processing_thread_empty_done_semaphore.acquire()
+		_is_threads_active = self.__is_threads_active
+		self.__is_threads_active = False
+		self.__queue_not_empty_condition.notify_all()
+		self.__queue_empty_condition.notify_all()
+		self.__queue_not_full_condition.notify_all()
 
-			self.__delayed_polling_thread.join()
-			self.__processing_thread.join()
+		self.__queue_lock.release()
 
-		self.__semaphore.release()
+		if _is_threads_active:
+			for _worker_thread in self.__worker_threads:
+				if _worker_thread is not threading.current_thread():
+					_worker_thread.join()
+
+	def get_admission_statistics(self) -> Dict[str, object]:
+		if self.__admission_controller is None:
+			return None
+		with self.__queue_lock:
+			return self.__admission_controller.get_statistics()
 
 	@abstractmethod
-	def get_execution_parameters(self) -> Dict[str, object]:
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
 		raise NotImplementedError()
 
 	@abstractmethod
 	def process_execution_result(self, *, execution_result: object):
+		"""
+		Processes the result of an executed element. This is called from every worker thread, so implementations must be thread-safe.
+		:param execution_result: The output of the executed element.
+		:return: None
+		"""
 		raise NotImplementedError()
@@ -0,0 +1,206 @@
+from __future__ import annotations
+from postgres_api.executable import ExecutableElement
+from enum import Enum, auto
+from typing import List, Dict, Tuple, Callable
+import threading
+import time
+
+
+class ExecutableQueueOverflowPolicyEnum(Enum):
+
+	Block = auto(),
+	Reject = auto(),
+	DropOldest = auto()
+
+
+class ExecutableQueueRejectionReasonEnum(Enum):
+
+	Capacity = auto(),
+	QueueDelay = auto(),
+	Dropped = auto()
+
+
+class ExecutableQueueRejection():
+
+	__slots__ = ("__rejection_reason", "__pending_elements_total", "__pending_bytes_total", "__estimated_wait_seconds")
+
+	def __init__(self, *, rejection_reason: ExecutableQueueRejectionReasonEnum, pending_elements_total: int, pending_bytes_total: int, estimated_wait_seconds: float):
+
+		self.__rejection_reason = rejection_reason
+		self.__pending_elements_total = pending_elements_total
+		self.__pending_bytes_total = pending_bytes_total
+		self.__estimated_wait_seconds = estimated_wait_seconds
+
+	def get_rejection_reason(self) -> ExecutableQueueRejectionReasonEnum:
+		return self.__rejection_reason
+
+	def get_pending_elements_total(self) -> int:
+		return self.__pending_elements_total
+
+	def get_pending_bytes_total(self) -> int:
+		return self.__pending_bytes_total
+
+	def get_estimated_wait_seconds(self) -> float:
+		return self.__estimated_wait_seconds
+
+	def get_error_message(self) -> str:
+		if self.__rejection_reason == ExecutableQueueRejectionReasonEnum.QueueDelay:
+			return f"Rejected since the estimated queue wait of {self.__estimated_wait_seconds:.3f} seconds exceeds the limit."
+		if self.__rejection_reason == ExecutableQueueRejectionReasonEnum.Dropped:
+			return f"Dropped as the oldest pending element to make room for a newer element."
+		return f"Rejected since the queue is full with {self.__pending_elements_total} elements of {self.__pending_bytes_total} bytes."
+
+
+class ExecutableQueueRejectedException(Exception):
+
+	def __init__(self, *, executable_queue_rejection: ExecutableQueueRejection):
+		super().__init__(executable_queue_rejection.get_error_message())
+
+		self.__executable_queue_rejection = executable_queue_rejection
+
+	def get_executable_queue_rejection(self) -> ExecutableQueueRejection:
+		return self.__executable_queue_rejection
+
+
+class ExecutableQueueAdmissionController():
+	"""
+	This class limits the pending elements of a queue by count and by estimated bytes, applying the overflow policy to an element that does not fit. It also sheds new elements while the estimated queue wait, from the pending elements and the smoothed execution seconds, exceeds the maximum, regardless of the overflow policy. The queue calls it while holding its queue lock, so it is not thread-safe by itself.
+	"""
+
+	def __init__(self, *, maximum_elements_total: int = None, maximum_bytes_total: int = None, overflow_policy: ExecutableQueueOverflowPolicyEnum = ExecutableQueueOverflowPolicyEnum.Block, block_timeout_seconds: float = None, maximum_estimated_wait_seconds: float = None, execution_seconds_smoothing: float = 0.1, estimated_bytes_function: Callable[[ExecutableElement], int] = None):
+
+		if maximum_elements_total is not None and maximum_elements_total < 1:
+			raise Exception(f"Cannot create admission controller with a maximum of {maximum_elements_total} elements.")
+		if maximum_bytes_total is not None and maximum_bytes_total < 1:
+			raise Exception(f"Cannot create admission controller with a maximum of {maximum_bytes_total} bytes.")
+
+		self.__maximum_elements_total = maximum_elements_total
+		self.__maximum_bytes_total = maximum_bytes_total
+		self.__overflow_policy = overflow_policy
+		self.__block_timeout_seconds = block_timeout_seconds
+		self.__maximum_estimated_wait_seconds = maximum_estimated_wait_seconds
+		self.__execution_seconds_smoothing = execution_seconds_smoothing
+		self.__estimated_bytes_function = (lambda executable_element: executable_element.get_estimated_bytes_total()) if estimated_bytes_function is None else estimated_bytes_function
+
+		self.__workers_total = 1
+		self.__pending_elements_total = 0
+		self.__pending_bytes_total = 0
+		self.__smoothed_execution_seconds = None  # type: float
+		self.__admitted_total = 0
+		self.__rejected_total = 0
+		self.__shed_total = 0
+		self.__dropped_total = 0
+
+	def set_workers_total(self, *, workers_total: int):
+		self.__workers_total = workers_total
+
+	def get_estimated_wait_seconds(self) -> float:
+		if self.__smoothed_execution_seconds is None:
+			return 0.0
+		return self.__pending_elements_total * self.__smoothed_execution_seconds / self.__workers_total
+
+	def __is_fitting(self, *, bytes_total: int) -> bool:
+		if self.__maximum_elements_total is not None and self.__pending_elements_total + 1 > self.__maximum_elements_total:
+			return False
+		# an element larger than the maximum bytes is still admitted into an empty queue, so that it is not refused forever
+		if self.__maximum_bytes_total is not None and self.__pending_elements_total != 0 and self.__pending_bytes_total + bytes_total > self.__maximum_bytes_total:
+			return False
+		return True
+
+	def __get_rejection(self, *, rejection_reason: ExecutableQueueRejectionReasonEnum) -> ExecutableQueueRejection:
+		return ExecutableQueueRejection(
+			rejection_reason=rejection_reason,
+			pending_elements_total=self.__pending_elements_total,
+			pending_bytes_total=self.__pending_bytes_total,
+			estimated_wait_seconds=self.get_estimated_wait_seconds()
+		)
+
+	def admit(self, *, executable_element: ExecutableElement, queue_not_full_condition: threading.Condition, is_active_function: Callable[[], bool], drop_oldest_function: Callable[[], ExecutableElement]) -> Tuple[bool, List[Tuple[ExecutableElement, ExecutableQueueRejection]]]:
+		"""
+		Admits the element as pending if it fits, otherwise applies the overflow policy.
+		:param executable_element: The element to enqueue.
+		:param queue_not_full_condition: The condition of the queue lock that is notified as pending elements are released, which is waited on to block.
+		:param is_active_function: Returns whether the queue is still active, so that blocking stops once it is disposed.
+		:param drop_oldest_function: Removes the oldest pending element from the queue and returns it, or returns None if none is pending.
+		:return: Whether the element was admitted, and the rejected elements along with their rejections, which are the element itself if it was not admitted and any dropped elements.
+		"""
+
+		_rejected_elements = []  # type: List[Tuple[ExecutableElement, ExecutableQueueRejection]]
+
+		if self.__maximum_estimated_wait_seconds is not None and self.__pending_elements_total != 0 and self.get_estimated_wait_seconds() > self.__maximum_estimated_wait_seconds:
+			self.__shed_total += 1
+			_rejected_elements.append((executable_element, self.__get_rejection(
+				rejection_reason=ExecutableQueueRejectionReasonEnum.QueueDelay
+			)))
+			return False, _rejected_elements
+
+		_bytes_total = self.__estimated_bytes_function(executable_element)
+		_is_fitting = self.__is_fitting(
+			bytes_total=_bytes_total
+		)
+		if not _is_fitting:
+			if self.__overflow_policy == ExecutableQueueOverflowPolicyEnum.Block:
+				_deadline_time = None if self.__block_timeout_seconds is None else time.monotonic() + self.__block_timeout_seconds
+				while not _is_fitting and is_active_function():
+					if _deadline_time is None:
+						queue_not_full_condition.wait()
+					else:
+						_remaining_seconds = _deadline_time - time.monotonic()
+						if _remaining_seconds <= 0:
+							break
+						queue_not_full_condition.wait(_remaining_seconds)
+					_is_fitting = self.__is_fitting(
+						bytes_total=_bytes_total
+					)
+			elif self.__overflow_policy == ExecutableQueueOverflowPolicyEnum.DropOldest:
+				while not _is_fitting:
+					_dropped_executable_element = drop_oldest_function()
+					if _dropped_executable_element is None:
+						break
+					self.release(
+						executable_element=_dropped_executable_element
+					)
+					self.__dropped_total += 1
+					_rejected_elements.append((_dropped_executable_element, self.__get_rejection(
+						rejection_reason=ExecutableQueueRejectionReasonEnum.Dropped
+					)))
+					_is_fitting = self.__is_fitting(
+						bytes_total=_bytes_total
+					)
+
+		if not _is_fitting:
+			self.__rejected_total += 1
+			_rejected_elements.append((executable_element, self.__get_rejection(
+				rejection_reason=ExecutableQueueRejectionReasonEnum.Capacity
+			)))
+			return False, _rejected_elements
+
+		self.__pending_elements_total += 1
+		self.__pending_bytes_total += _bytes_total
+		self.__admitted_total += 1
+		return True, _rejected_elements
+
+	def release(self, *, executable_element: ExecutableElement):
+		"""
+		Releases a pending element once it is taken from the queue to be executed or is dropped. The queue notifies its not full condition afterwards.
+		"""
+
+		self.__pending_elements_total -= 1
+		self.__pending_bytes_total -= self.__estimated_bytes_function(executable_element)
+
+	def record_execution_seconds(self, *, execution_seconds: float):
+		if self.__smoothed_execution_seconds is None:
+			self.__smoothed_execution_seconds = execution_seconds
+		else:
+			self.__smoothed_execution_seconds += self.__execution_seconds_smoothing * (execution_seconds - self.__smoothed_execution_seconds)
+
+	def get_statistics(self) -> Dict[str, object]:
+		return {
+			"pending_elements_total": self.__pending_elements_total,
+			"pending_bytes_total": self.__pending_bytes_total,
+			"estimated_wait_seconds": self.get_estimated_wait_seconds(),
+			"admitted_total": self.__admitted_total,
+			"rejected_total": self.__rejected_total,
+			"shed_total": self.__shed_total,
+			"dropped_total": self.__dropped_total
+		}
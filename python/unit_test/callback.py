@@ -0,0 +1,351 @@
+import unittest
+from postgres_api.callback import RequestsRemoteApiInterface, HttpxRemoteApiInterface, httpx, BatchingCallback, CallbackDelivery, CallbackDeliveryStatusEnum, FunctionCallback, JsonWebTokenCallback
+from postgres_api.callback_dispatch import CallbackDispatchExecutableQueue, CallbackDispatchBackpressureEnum, DispatchingCallback
+from postgres_api.command import DefaultCommandResult
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Tuple, Dict
+import threading
+import json
+import jwt
+
+
+class RecordingHttpRequestHandler(BaseHTTPRequestHandler):
+
+	protocol_version = "HTTP/1.1"
+	# the headers and body are sent separately, which without this waits on delayed acknowledgements over kept alive connections
+	disable_nagle_algorithm = True
+
+	def do_POST(self):
+		_json_object = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+		self.server.requests.append((self.client_address, self.path, _json_object))
+		_response_bytes = json.dumps({"path": self.path}).encode("utf-8")
+		self.send_response(200)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(_response_bytes)))
+		self.end_headers()
+		self.wfile.write(_response_bytes)
+
+	def log_message(self, format, *args):
+		pass
+
+
+class TestRemoteApi(unittest.TestCase):
+
+	def setUp(self):
+
+		self.__http_server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHttpRequestHandler)
+		self.__http_server.requests = []  # type: List[Tuple[Tuple[str, int], str, object]]
+		self.__http_server_thread = threading.Thread(
+			target=self.__http_server.serve_forever
+		)
+		self.__http_server_thread.start()
+
+	def tearDown(self):
+
+		self.__http_server.shutdown()
+		self.__http_server.server_close()
+		self.__http_server_thread.join()
+
+	def test_requests_posts_to_url_over_one_kept_alive_connection(self):
+
+		_remote_api = RequestsRemoteApiInterface(
+			connect_timeout_seconds=1.0,
+			read_timeout_seconds=1.0
+		)
+		try:
+			for _index in range(5):
+				_url_response = _remote_api.post(
+					url=f"http://127.0.0.1:{self.__http_server.server_port}/callback/{_index}",
+					json_object={"index": _index}
+				)
+				self.assertEqual(200, _url_response.get_status_code())
+				self.assertEqual({"path": f"/callback/{_index}"}, _url_response.get_body_json_object())
+				self.assertEqual({"status_code": 200, "json_object": {"path": f"/callback/{_index}"}}, json.loads(_url_response.get_json_string()))
+				self.assertEqual(json.loads(_url_response.get_json_string()), _url_response.get_json_object())
+		finally:
+			_remote_api.dispose()
+
+		self.assertEqual([{"index": _index} for _index in range(5)], [_json_object for _, _, _json_object in self.__http_server.requests])
+		self.assertEqual(1, len(set(_client_address for _client_address, _, _ in self.__http_server.requests)))
+
+	@unittest.skipIf(httpx is None, "httpx is not installed")
+	def test_httpx_posts_to_url(self):
+
+		_remote_api = HttpxRemoteApiInterface(
+			is_http2=False
+		)
+		try:
+			for _index in range(2):
+				_url_response = _remote_api.post(
+					url=f"http://127.0.0.1:{self.__http_server.server_port}/callback/{_index}",
+					json_object={"index": _index}
+				)
+				self.assertEqual(200, _url_response.get_status_code())
+		finally:
+			_remote_api.dispose()
+
+		self.assertEqual(1, len(set(_client_address for _client_address, _, _ in self.__http_server.requests)))
+
+	def test_batching_json_web_token_callback_posts_one_token_per_batch(self):
+
+		_secret = "test secret of at least thirty-two bytes"
+		_remote_api = RequestsRemoteApiInterface()
+		_batching_callback = BatchingCallback(
+			callback=JsonWebTokenCallback(
+				url=f"http://127.0.0.1:{self.__http_server.server_port}/callback",
+				secret=_secret,
+				remote_api=_remote_api
+			),
+			maximum_results_total=10,
+			maximum_delay_seconds=0.05
+		)
+		try:
+			_callback_deliveries = [_batching_callback.execute_json_convertable(
+				json_convertable=DefaultCommandResult(
+					default_json_string=json.dumps({"index": _index})
+				)
+			) for _index in range(4)]
+			for _callback_delivery in _callback_deliveries:
+				self.assertTrue(_callback_delivery.wait(
+					timeout_seconds=5.0
+				))
+				self.assertEqual(CallbackDeliveryStatusEnum.Delivered, _callback_delivery.get_status())
+				self.assertEqual(200, _callback_delivery.get_response().get_status_code())
+				self.assertEqual(_callback_delivery.get_response().get_json_object(), _callback_delivery.get_json_object()["response"])
+		finally:
+			_batching_callback.dispose()
+			_remote_api.dispose()
+
+		self.assertEqual(1, len(self.__http_server.requests))
+		_encoded_jwt = json.loads(self.__http_server.requests[0][2])["token"]
+		self.assertEqual({"version": 1, "results": [{"index": _index} for _index in range(4)]}, jwt.decode(_encoded_jwt, _secret, algorithms=["HS256"]))
+
+
+class TestBatchingCallback(unittest.TestCase):
+
+	def test_flushed_by_results_total_bytes_total_and_dispose(self):
+
+		_batches = []  # type: List[object]
+
+		def _function(data: str):
+			_batches.append(json.loads(data)["results"])
+			if len(_batches) == 3:
+				raise Exception("receiver unavailable")
+
+		_batching_callback = BatchingCallback(
+			callback=FunctionCallback(
+				function=_function
+			),
+			maximum_results_total=3,
+			maximum_bytes_total=100,
+			maximum_delay_seconds=60.0
+		)
+		try:
+			_callback_deliveries = [_batching_callback.execute(
+				data={"index": _index}
+			) for _index in range(5)]
+			for _callback_delivery in _callback_deliveries[:3]:
+				self.assertTrue(_callback_delivery.wait(
+					timeout_seconds=5.0
+				))
+				self.assertEqual(0, _callback_delivery.get_batch_index())
+
+			# a result over the maximum bytes is sent alone once the results before it are sent
+			_callback_deliveries.append(_batching_callback.execute(
+				data={"padding": "x" * 100}
+			))
+			self.assertTrue(_callback_deliveries[5].wait(
+				timeout_seconds=5.0
+			))
+			self.assertEqual(2, _callback_deliveries[5].get_batch_index())
+			self.assertEqual(CallbackDeliveryStatusEnum.Failed, _callback_deliveries[5].get_status())
+			self.assertEqual("receiver unavailable", _callback_deliveries[5].get_error_message())
+
+			_callback_deliveries.append(_batching_callback.execute(
+				data="{\"index\": 6}"
+			))
+			self.assertEqual(CallbackDeliveryStatusEnum.Pending, _callback_deliveries[6].get_status())
+		finally:
+			_batching_callback.dispose()
+
+		self.assertEqual(CallbackDeliveryStatusEnum.Delivered, _callback_deliveries[6].get_status())
+		self.assertEqual(1, _callback_deliveries[4].get_batch_index())
+		self.assertEqual([
+			[{"index": 0}, {"index": 1}, {"index": 2}],
+			[{"index": 3}, {"index": 4}],
+			[{"padding": "x" * 100}],
+			[{"index": 6}]
+		], _batches)
+		self.assertEqual(4, _batching_callback.get_batches_total())
+
+	def test_buffered_results_bounded_while_receiver_is_slow(self):
+
+		for _backpressure in [CallbackDispatchBackpressureEnum.Drop, CallbackDispatchBackpressureEnum.Block]:
+
+			_started_event = threading.Event()
+			_receiver_event = threading.Event()
+
+			def _function(data: str):
+				_started_event.set()
+				_receiver_event.wait()
+
+			_batching_callback = BatchingCallback(
+				callback=FunctionCallback(
+					function=_function
+				),
+				maximum_results_total=1,
+				maximum_delay_seconds=0.0,
+				maximum_buffered_results_total=2,
+				backpressure=_backpressure
+			)
+			try:
+				# the first result is being called back, so only the maximum buffered results are kept behind it
+				_callback_deliveries = [_batching_callback.execute(
+					data={"index": 0}
+				)]
+				self.assertTrue(_started_event.wait(5.0))
+				_callback_deliveries.extend(_batching_callback.execute(
+					data={"index": _index}
+				) for _index in range(1, 3))
+				if _backpressure == CallbackDispatchBackpressureEnum.Drop:
+					_callback_deliveries.append(_batching_callback.execute(
+						data={"index": 3}
+					))
+					self.assertEqual(CallbackDeliveryStatusEnum.Failed, _callback_deliveries[3].get_status())
+					self.assertEqual(1, _batching_callback.get_dropped_total())
+				else:
+					_execute_thread = threading.Thread(
+						target=lambda: _callback_deliveries.append(_batching_callback.execute(
+							data={"index": 3}
+						))
+					)
+					_execute_thread.start()
+					_execute_thread.join(0.1)
+					self.assertTrue(_execute_thread.is_alive())
+					_receiver_event.set()
+					_execute_thread.join(5.0)
+					self.assertFalse(_execute_thread.is_alive())
+					self.assertEqual(0, _batching_callback.get_dropped_total())
+			finally:
+				_receiver_event.set()
+				_batching_callback.dispose()
+
+			self.assertEqual([CallbackDeliveryStatusEnum.Delivered] * 3, [_callback_delivery.get_status() for _callback_delivery in _callback_deliveries[:3]])
+			self.assertEqual(_backpressure == CallbackDispatchBackpressureEnum.Block, _callback_deliveries[3].get_status() == CallbackDeliveryStatusEnum.Delivered)
+
+
+class TestCallbackDispatch(unittest.TestCase):
+
+	def test_failed_callbacks_retried_with_backoff(self):
+
+		_attempts_total_per_index = {}  # type: Dict[int, int]
+
+		def _function(data: str):
+			_index = json.loads(data)["index"]
+			_attempts_total_per_index[_index] = _attempts_total_per_index.get(_index, 0) + 1
+			if _index != 0 and _attempts_total_per_index[_index] <= _index:
+				raise Exception(f"attempt {_attempts_total_per_index[_index]} failed")
+
+		_callback_dispatch_executable_queue = CallbackDispatchExecutableQueue(
+			callback=FunctionCallback(
+				function=_function
+			),
+			workers_total=2,
+			attempts_total=3,
+			initial_retry_seconds=0.01
+		)
+		try:
+			_dispatching_callback = DispatchingCallback(
+				callback_dispatch_executable_queue=_callback_dispatch_executable_queue
+			)
+			_callback_deliveries = [_dispatching_callback.execute(
+				data=json.dumps({"index": _index})
+			) for _index in range(4)]
+			_callback_dispatch_executable_queue.wait_until_delivered()
+		finally:
+			_callback_dispatch_executable_queue.dispose()
+
+		self.assertEqual([CallbackDeliveryStatusEnum.Delivered] * 3 + [CallbackDeliveryStatusEnum.Failed], [_callback_delivery.get_status() for _callback_delivery in _callback_deliveries])
+		self.assertEqual([1, 2, 3, 3], [_callback_delivery.get_attempts_total() for _callback_delivery in _callback_deliveries])
+		self.assertEqual("attempt 3 failed", _callback_deliveries[3].get_error_message())
+		self.assertEqual(5, _callback_dispatch_executable_queue.get_retries_total())
+
+	def test_dispatch_drops_when_pending_results_full(self):
+
+		_callback_event = threading.Event()
+
+		_callback_dispatch_executable_queue = CallbackDispatchExecutableQueue(
+			callback=FunctionCallback(
+				function=lambda data: _callback_event.wait()
+			),
+			workers_total=1,
+			maximum_pending_total=2,
+			backpressure=CallbackDispatchBackpressureEnum.Drop
+		)
+		try:
+			_callback_deliveries = [_callback_dispatch_executable_queue.dispatch(
+				json_convertable=DefaultCommandResult(
+					default_json_string=json.dumps({"index": _index})
+				)
+			) for _index in range(3)]
+
+			self.assertEqual(CallbackDeliveryStatusEnum.Pending, _callback_deliveries[0].get_status())
+			self.assertEqual(CallbackDeliveryStatusEnum.Failed, _callback_deliveries[2].get_status())
+			self.assertEqual(0, _callback_deliveries[2].get_attempts_total())
+			self.assertEqual(1, _callback_dispatch_executable_queue.get_dropped_total())
+
+			_callback_event.set()
+			_callback_dispatch_executable_queue.wait_until_delivered()
+			self.assertEqual(CallbackDeliveryStatusEnum.Delivered, _callback_deliveries[1].get_status())
+		finally:
+			_callback_event.set()
+			_callback_dispatch_executable_queue.dispose()
+
+	def test_dispose_fails_pending_results_and_releases_waiters(self):
+
+		_callback_dispatch_executable_queue = CallbackDispatchExecutableQueue(
+			callback=FunctionCallback(
+				function=lambda data: 1 / 0
+			),
+			workers_total=1,
+			maximum_pending_total=1,
+			backpressure=CallbackDispatchBackpressureEnum.Block,
+			attempts_total=5,
+			initial_retry_seconds=60.0
+		)
+		# the first result fails and waits on a long retry, so the second dispatch blocks on the full queue
+		_callback_delivery = _callback_dispatch_executable_queue.dispatch(
+			json_convertable=DefaultCommandResult(
+				default_json_string="{}"
+			)
+		)
+		_blocked_callback_deliveries = []  # type: List[CallbackDelivery]
+		_dispatch_thread = threading.Thread(
+			target=lambda: _blocked_callback_deliveries.append(_callback_dispatch_executable_queue.dispatch(
+				json_convertable=DefaultCommandResult(
+					default_json_string="{}"
+				)
+			))
+		)
+		_dispatch_thread.start()
+		_wait_thread = threading.Thread(
+			target=_callback_dispatch_executable_queue.wait_until_delivered
+		)
+		_wait_thread.start()
+		self.assertFalse(_callback_delivery.wait(
+			timeout_seconds=0.1
+		))
+
+		_callback_dispatch_executable_queue.dispose()
+		_dispatch_thread.join(5)
+		_wait_thread.join(5)
+
+		self.assertFalse(_dispatch_thread.is_alive())
+		self.assertFalse(_wait_thread.is_alive())
+		self.assertEqual(CallbackDeliveryStatusEnum.Failed, _callback_delivery.get_status())
+		self.assertEqual(CallbackDeliveryStatusEnum.Failed, _blocked_callback_deliveries[0].get_status())
+		self.assertEqual(0, _callback_dispatch_executable_queue.get_pending_total())
+
+
+if __name__ == "__main__":
+	unittest.main()
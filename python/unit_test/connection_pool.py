@@ -0,0 +1,355 @@
+import unittest
+from postgres_api.connection_pool import PostgresConnectionPool, AsyncPostgresConnectionPool, ConnectionPoolAcquireTimeoutException
+from postgres_api.prepared_statement_cache import PreparedStatement, PreparedStatementCache
+from psycopg2.extensions import POLL_OK
+from typing import List
+import asyncio
+import threading
+import time
+
+
+class FakeConnection():
+
+	def __init__(self):
+
+		self.closed = 0
+
+	def poll(self) -> int:
+		return POLL_OK
+
+	def close(self):
+		self.closed = 1
+
+
+class TestPostgresConnectionPool(unittest.TestCase):
+
+	def __get_connection_pool(self, *, connections: List[FakeConnection], **kwargs) -> PostgresConnectionPool:
+
+		def _connect_function(**connect_kwargs) -> FakeConnection:
+			_connection = FakeConnection()
+			connections.append(_connection)
+			return _connection
+
+		return PostgresConnectionPool(
+			user_name="user",
+			password="password",
+			host_url="localhost",
+			port=5432,
+			connect_function=_connect_function,
+			**kwargs
+		)
+
+	def test_released_connection_is_reused(self):
+
+		_connections = []  # type: List[FakeConnection]
+		_connection_pool = self.__get_connection_pool(
+			connections=_connections
+		)
+
+		for _ in range(5):
+			_postgres_connection = _connection_pool.acquire(
+				database_name="first"
+			)
+			_connection_pool.release(
+				postgres_connection=_postgres_connection,
+				is_broken=False
+			)
+
+		_postgres_connection = _connection_pool.acquire(
+			database_name="second"
+		)
+		_connection_pool.release(
+			postgres_connection=_postgres_connection,
+			is_broken=True
+		)
+
+		_connection_pool.dispose()
+
+		self.assertEqual(2, len(_connections))
+		self.assertEqual([1, 1], [_connection.closed for _connection in _connections])
+
+	def test_acquire_waits_for_release_and_times_out(self):
+
+		_connections = []  # type: List[FakeConnection]
+		_connection_pool = self.__get_connection_pool(
+			connections=_connections,
+			maximum_connections_total=1,
+			acquire_timeout_seconds=0.1
+		)
+
+		_postgres_connection = _connection_pool.acquire(
+			database_name="database"
+		)
+
+		with self.assertRaises(ConnectionPoolAcquireTimeoutException):
+			_connection_pool.acquire(
+				database_name="database"
+			)
+
+		_release_timer = threading.Timer(0.05, lambda: _connection_pool.release(
+			postgres_connection=_postgres_connection,
+			is_broken=False
+		))
+		_release_timer.start()
+
+		self.assertIs(_postgres_connection, _connection_pool.acquire(
+			database_name="database"
+		))
+		self.assertEqual(1, len(_connections))
+
+		_connection_pool.dispose()
+
+	def test_evict_closes_idle_and_expired_connections_down_to_minimum(self):
+
+		_connections = []  # type: List[FakeConnection]
+		_connection_pool = self.__get_connection_pool(
+			connections=_connections,
+			minimum_connections_total=1,
+			maximum_idle_seconds=0.01,
+			eviction_interval_seconds=60
+		)
+
+		_postgres_connections = [_connection_pool.acquire(
+			database_name="database"
+		) for _ in range(3)]
+		for _postgres_connection in _postgres_connections:
+			_connection_pool.release(
+				postgres_connection=_postgres_connection,
+				is_broken=False
+			)
+
+		time.sleep(0.02)
+
+		_database_connection_pool = _connection_pool.get_database_connection_pool(
+			database_name="database"
+		)
+		_database_connection_pool.evict()
+
+		self.assertEqual(1, _database_connection_pool.get_connections_total())
+		self.assertEqual(1, _database_connection_pool.get_idle_connections_total())
+		self.assertEqual(2, len([_connection for _connection in _connections if _connection.closed]))
+
+		_connection_pool.dispose()
+
+
+class TestAsyncPostgresConnectionPool(unittest.TestCase):
+
+	def __get_connection_pool(self, *, connections: List[FakeConnection], **kwargs) -> AsyncPostgresConnectionPool:
+
+		def _connect_function(**connect_kwargs) -> FakeConnection:
+			_connection = FakeConnection()
+			connections.append(_connection)
+			return _connection
+
+		return AsyncPostgresConnectionPool(
+			user_name="user",
+			password="password",
+			host_url="localhost",
+			port=5432,
+			connect_function=_connect_function,
+			**kwargs
+		)
+
+	def test_released_connection_is_reused_and_broken_connection_is_closed(self):
+
+		async def _test():
+
+			_connections = []  # type: List[FakeConnection]
+			_connection_pool = self.__get_connection_pool(
+				connections=_connections
+			)
+
+			for _ in range(5):
+				_postgres_connection = await _connection_pool.acquire(
+					database_name="first"
+				)
+				await _connection_pool.release(
+					postgres_connection=_postgres_connection,
+					is_broken=False
+				)
+			self.assertEqual(1, len(_connections))
+			self.assertEqual(1, _connection_pool.get_idle_connections_total(database_name="first"))
+
+			_postgres_connection = await _connection_pool.acquire(
+				database_name="first"
+			)
+			await _connection_pool.release(
+				postgres_connection=_postgres_connection,
+				is_broken=True
+			)
+			self.assertEqual(1, _connections[0].closed)
+			self.assertEqual(0, _connection_pool.get_connections_total(database_name="first"))
+
+			await _connection_pool.dispose()
+
+		asyncio.run(_test())
+
+	def test_acquire_waits_for_release_and_times_out(self):
+
+		async def _test():
+
+			_connections = []  # type: List[FakeConnection]
+			_connection_pool = self.__get_connection_pool(
+				connections=_connections,
+				maximum_connections_total=1,
+				acquire_timeout_seconds=0.1
+			)
+
+			_postgres_connection = await _connection_pool.acquire(
+				database_name="first"
+			)
+			with self.assertRaises(ConnectionPoolAcquireTimeoutException):
+				await _connection_pool.acquire(
+					database_name="first"
+				)
+
+			# a waiting task is handed the connection once it is released
+			_acquire_task = asyncio.ensure_future(_connection_pool.acquire(
+				database_name="first"
+			))
+			await asyncio.sleep(0.01)
+			self.assertFalse(_acquire_task.done())
+			await _connection_pool.release(
+				postgres_connection=_postgres_connection,
+				is_broken=False
+			)
+			self.assertIs(_postgres_connection, await _acquire_task)
+			self.assertEqual(1, len(_connections))
+
+			await _connection_pool.release(
+				postgres_connection=_postgres_connection,
+				is_broken=False
+			)
+			await _connection_pool.dispose()
+			self.assertEqual(1, _connections[0].closed)
+			with self.assertRaises(Exception):
+				await _connection_pool.acquire(
+					database_name="first"
+				)
+
+		asyncio.run(_test())
+
+	def test_idle_connection_is_closed_once_expired(self):
+
+		async def _test():
+
+			_connections = []  # type: List[FakeConnection]
+			_connection_pool = self.__get_connection_pool(
+				connections=_connections,
+				maximum_idle_seconds=0.05
+			)
+
+			_postgres_connection = await _connection_pool.acquire(
+				database_name="first"
+			)
+			await _connection_pool.release(
+				postgres_connection=_postgres_connection,
+				is_broken=False
+			)
+			await asyncio.sleep(0.1)
+			_postgres_connection = await _connection_pool.acquire(
+				database_name="first"
+			)
+
+			self.assertEqual(2, len(_connections))
+			self.assertEqual(1, _connections[0].closed)
+			self.assertIs(_connections[1], _postgres_connection.get_connection())
+			self.assertEqual(1, _connection_pool.get_connections_total(database_name="first"))
+
+			await _connection_pool.dispose()
+
+		asyncio.run(_test())
+
+
+class TestPreparedStatementCache(unittest.TestCase):
+
+	def test_normalize_query_keeps_quoted_whitespace(self):
+
+		self.assertEqual(
+			"SELECT 'a  b', \"c  d\" FROM t WHERE x = %(x)s",
+			PreparedStatementCache.normalize_query(
+				query="  SELECT 'a  b',\n\t\"c  d\"\nFROM   t WHERE x = %(x)s  "
+			)
+		)
+		self.assertEqual(
+			"SELECT 1 -- comment\nFROM t",
+			PreparedStatementCache.normalize_query(
+				query="SELECT 1 -- comment\nFROM t"
+			)
+		)
+
+	def test_try_get_positional_query(self):
+
+		_is_preparable, _positional_query, _parameter_names = PreparedStatementCache.try_get_positional_query(
+			normalized_query="SELECT '100%%' FROM t WHERE a = %(a)s AND b = %(b)s AND c > %(a)s"
+		)
+		self.assertTrue(_is_preparable)
+		self.assertEqual("SELECT '100%' FROM t WHERE a = $1 AND b = $2 AND c > $1", _positional_query)
+		self.assertEqual(["a", "b"], _parameter_names)
+
+		_is_preparable, _positional_query, _parameter_names = PreparedStatementCache.try_get_positional_query(
+			normalized_query="INSERT INTO t (a, b) VALUES (%(a)s, %(b)s::int) ON CONFLICT (a) DO UPDATE SET b = %(b)s RETURNING a"
+		)
+		self.assertTrue(_is_preparable)
+		self.assertEqual("INSERT INTO t (a, b) VALUES ($1, $2::int) ON CONFLICT (a) DO UPDATE SET b = $2 RETURNING a", _positional_query)
+
+		# a parameter of no known type would be prepared as text, changing the output
+		for _normalized_query in ["CREATE TABLE t (a int)", "SELECT %s", "SELECT $1", "SELECT %(a)s", "SELECT %(a)s + 1 FROM t", "SELECT a FROM t WHERE a IN %(a)s", "SELECT a->>%(a)s FROM t", "INSERT INTO t (a) VALUES (1) RETURNING a, %(a)s"]:
+			_is_preparable, _, _ = PreparedStatementCache.try_get_positional_query(
+				normalized_query=_normalized_query
+			)
+			self.assertFalse(_is_preparable)
+
+	def test_unpreparable_query_is_retried_after_interval(self):
+
+		_prepared_statement_cache = PreparedStatementCache(
+			maximum_prepared_statements_total=2,
+			unpreparable_retry_seconds=0.05
+		)
+		_prepared_statement_cache.add(
+			normalized_query="first",
+			prepared_statement=None
+		)
+		self.assertEqual((True, None), _prepared_statement_cache.try_get(
+			normalized_query="first"
+		))
+		time.sleep(0.1)
+		self.assertEqual((False, None), _prepared_statement_cache.try_get(
+			normalized_query="first"
+		))
+		self.assertEqual(0, _prepared_statement_cache.get_length())
+
+	def test_least_recently_used_prepared_statement_is_evicted(self):
+
+		_prepared_statement_cache = PreparedStatementCache(
+			maximum_prepared_statements_total=2
+		)
+
+		_prepared_statements = [PreparedStatement(
+			name=_prepared_statement_cache.get_next_prepared_statement_name(),
+			parameter_names=["a"]
+		) for _ in range(3)]
+
+		self.assertEqual([], _prepared_statement_cache.add(
+			normalized_query="first",
+			prepared_statement=_prepared_statements[0]
+		))
+		self.assertEqual([], _prepared_statement_cache.add(
+			normalized_query="second",
+			prepared_statement=_prepared_statements[1]
+		))
+		self.assertEqual((True, _prepared_statements[0]), _prepared_statement_cache.try_get(
+			normalized_query="first"
+		))
+		self.assertEqual([_prepared_statements[1]], _prepared_statement_cache.add(
+			normalized_query="third",
+			prepared_statement=_prepared_statements[2]
+		))
+		self.assertEqual((False, None), _prepared_statement_cache.try_get(
+			normalized_query="second"
+		))
+		self.assertEqual("EXECUTE postgres_api_statement_1 (%(a)s)", _prepared_statements[0].get_execute_query())
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from postgres_api.copy_record_stream import CopyRecordStream, CopyRecordFormatEnum, CsvCopyRecordStream, JsonLinesCopyRecordStream
+import io
+
+
+class TestCopyRecordStream(unittest.TestCase):
+
+	def test_csv_header_becomes_column_names(self):
+
+		_copy_record_stream = CopyRecordStream.get_copy_record_stream(
+			record_format=CopyRecordFormatEnum.Csv,
+			record_stream=io.BytesIO(b"id,\"display name\"\n1,first\n2,second\n")
+		)
+
+		self.assertIsInstance(_copy_record_stream, CsvCopyRecordStream)
+		self.assertEqual(["id", "display name"], _copy_record_stream.get_column_names())
+		self.assertEqual(b"1,first\n2,second\n", _copy_record_stream.read())
+
+	def test_json_lines_converted_to_text_format(self):
+
+		_copy_record_stream = CopyRecordStream.get_copy_record_stream(
+			record_format=CopyRecordFormatEnum.JsonLines,
+			record_stream=io.BytesIO(b"{\"id\": 1, \"name\": \"a\\tb\\\\c\", \"tags\": [1], \"is_active\": true}\n\n{\"id\": 2}\n")
+		)
+
+		self.assertIsInstance(_copy_record_stream, JsonLinesCopyRecordStream)
+		self.assertEqual(["id", "name", "tags", "is_active"], _copy_record_stream.get_column_names())
+		self.assertEqual(b"1\ta\\tb\\\\c\t[1]\tt\n2\t\\N\t\\N\t\\N\n", _copy_record_stream.read())
+
+	def test_json_lines_read_in_blocks(self):
+
+		_lines = [f"{{\"id\": {_index}}}\n".encode() for _index in range(1000)]
+		_copy_record_stream = JsonLinesCopyRecordStream(
+			record_stream=io.BytesIO(b"".join(_lines))
+		)
+
+		_blocks = []
+		_block = _copy_record_stream.read(100)
+		while _block != b"":
+			self.assertLessEqual(len(_block), 100)
+			_blocks.append(_block)
+			_block = _copy_record_stream.read(100)
+
+		self.assertEqual("".join([f"{_index}\n" for _index in range(1000)]).encode(), b"".join(_blocks))
+
+	def test_json_lines_unexpected_property(self):
+
+		_copy_record_stream = JsonLinesCopyRecordStream(
+			record_stream=io.BytesIO(b"{\"id\": 1}\n{\"id\": 2, \"name\": \"b\"}\n")
+		)
+
+		with self.assertRaises(Exception):
+			_copy_record_stream.read()
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -1,13 +1,56 @@
 import unittest
 from unittest import mock
 from unittest.mock import patch
-from postgres_api.database_implementation import DatabaseInterface
-from postgres_api.database_command_polling_executable_queue import DatabaseCommandSingleThreadedExecutableQueue
-from postgres_api.callback import FunctionCallback, JsonConvertable, Callback
+from postgres_api.database_implementation import DatabaseInterface, ExecuteQueryDatabaseCommand, ExecuteQueryDatabaseCommandResult, ExecuteBatchQueryDatabaseCommand, StreamQueryDatabaseCommand, GetRecordsDatabaseCommand, PostgresDatabase, PooledPostgresDatabase, AsyncPostgresDatabase, DatabaseCommandAsyncExecutableElement, PostgresApiDatabaseCommandResultFactory
+from postgres_api.database_interface import AsyncDatabaseInterface, DatabaseCommand, DatabaseCommandResult, DatabaseCommandResultFactoryInterface
+from postgres_api.connection_pool import PostgresConnectionPool, AsyncPostgresConnectionPool
+from postgres_api.database_command_polling_executable_queue import DatabaseCommandSingleThreadedExecutableQueue, DatabaseCommandAsyncExecutableQueue
+from postgres_api.callback import FunctionCallback, AsyncFunctionCallback, JsonConvertable, Callback, UrlResponse
+from postgres_api.queue import DelayedElement
 from postgres_api.command import DefaultCommandResult
 from postgres_api.executable import DefaultExecutableElement, DelegatedExecutableElement
+from unit_test.job_table_queue import _get_connection_parameters, _is_postgres_available
+from datetime import datetime
 from typing import List
+import threading
+import asyncio
+import json
 import time
+import uuid
+
+
+class FakeCursor():
+
+	def __init__(self):
+
+		self.description = None
+		self.rowcount = 1
+
+	def execute(self, query: str, parameters: dict = None):
+		if query.startswith("FAIL"):
+			raise Exception("syntax error")
+
+	def close(self):
+		pass
+
+
+class FakeConnection():
+
+	def __init__(self):
+
+		self.closed = 0
+
+	def cursor(self) -> FakeCursor:
+		return FakeCursor()
+
+	def commit(self):
+		pass
+
+	def rollback(self):
+		pass
+
+	def close(self):
+		self.closed = 1
 
 
 class TestDatabaseCommandPollingExecutableQueue(unittest.TestCase):
@@ -335,9 +378,683 @@ class TestDatabaseCommandPollingExecutableQueue(unittest.TestCase):
 		for _index in range(_inserts_total):
 			self.assertEqual(_order_of_callback[_index], _get_json_per_index(_index))
 
+	@patch.multiple(DatabaseInterface, __abstractmethods__=set())
+	def test_append_after_elapsed_seconds_dispatched_in_delay_order(self):
+
+		_delays_in_seconds = [0.3, 0.1, 0.2]
+
+		_order_of_callback = []  # type: List[str]
+		_callback_datetimes = []  # type: List[datetime]
+
+		def _function_callback(data: object) -> JsonConvertable:
+			_order_of_callback.append(data)
+			_callback_datetimes.append(datetime.utcnow())
+			return None
+
+		_database_interface = DatabaseInterface()
+
+		_execution_result_callback = FunctionCallback(
+			function=_function_callback
+		)
+
+		_database_command_polling_executable_queue = DatabaseCommandSingleThreadedExecutableQueue(
+			database_interface=_database_interface,
+			execution_result_callback=_execution_result_callback
+		)
+
+		_start_datetime = datetime.utcnow()
+		for _delay_in_seconds in _delays_in_seconds:
+			_database_command_polling_executable_queue.append_to_end_after_elapsed_seconds(
+				executable_element=DefaultExecutableElement(
+					default_output=DefaultCommandResult(
+						default_json_string=str(_delay_in_seconds)
+					)
+				),
+				seconds_total=_delay_in_seconds
+			)
+
+		time.sleep(0.5)
+
+		_database_command_polling_executable_queue.wait_until_empty()
+
+		_database_command_polling_executable_queue.dispose()
+
+		self.assertEqual(["0.1", "0.2", "0.3"], _order_of_callback)
+		for _delay_in_seconds, _callback_datetime in zip(sorted(_delays_in_seconds), _callback_datetimes):
+			_elapsed_seconds = (_callback_datetime - _start_datetime).total_seconds()
+			self.assertGreaterEqual(_elapsed_seconds, _delay_in_seconds)
+			self.assertLess(_elapsed_seconds, _delay_in_seconds + 0.1)
+
+	@patch.multiple(DatabaseInterface, __abstractmethods__=set())
+	def test_append_many_and_insert_many_order_respected(self):
+
+		def _get_json_per_index(index: int) -> str:
+			return f'{{ "index": {index} }}'
+
+		def _get_executable_elements(indexes: List[int]) -> List[DefaultExecutableElement]:
+			return [
+				DefaultExecutableElement(
+					default_output=DefaultCommandResult(
+						default_json_string=_get_json_per_index(_index)
+					)
+				) for _index in indexes
+			]
+
+		_order_of_callback = []  # type: List[str]
+
+		_blocking_started_semaphore = threading.Semaphore(0)
+		_blocking_semaphore = threading.Semaphore(0)
+
+		def _blocking_delegate_function(*args, **kwargs) -> object:
+			_blocking_started_semaphore.release()
+			_blocking_semaphore.acquire()
+			return DefaultCommandResult(
+				default_json_string=_get_json_per_index(-1)
+			)
+
+		def _function_callback(data: object) -> JsonConvertable:
+			_order_of_callback.append(data)
+			return None
+
+		_database_interface = DatabaseInterface()
+
+		_execution_result_callback = FunctionCallback(
+			function=_function_callback
+		)
+
+		_database_command_polling_executable_queue = DatabaseCommandSingleThreadedExecutableQueue(
+			database_interface=_database_interface,
+			execution_result_callback=_execution_result_callback
+		)
+
+		# holds the processing thread so that both batches are queued before anything else is executed
+		_database_command_polling_executable_queue.append_to_end_immediately(
+			executable_element=DelegatedExecutableElement(
+				delegate_function=_blocking_delegate_function
+			)
+		)
+
+		_blocking_started_semaphore.acquire()
+
+		_database_command_polling_executable_queue.append_many_to_end_immediately(
+			executable_elements=_get_executable_elements([3, 4, 5])
+		)
+
+		_database_command_polling_executable_queue.insert_many_at_front_immediately(
+			executable_elements=_get_executable_elements([0, 1, 2])
+		)
+
+		_blocking_semaphore.release()
+
+		_database_command_polling_executable_queue.wait_until_empty()
+
+		_database_command_polling_executable_queue.dispose()
+
+		self.assertEqual([_get_json_per_index(_index) for _index in range(-1, 6)], _order_of_callback)
+
+	@patch.multiple(DatabaseInterface, __abstractmethods__=set())
+	def test_execute_batch_query_reports_failed_rows(self):
+
+		_parameters_list = [{"index": _index} for _index in range(4)]
+
+		def _execute_batch_query(*, query: str, parameters_list: List[dict]) -> List[str]:
+			self.assertEqual(_parameters_list, parameters_list)
+			return [None, "first error", None, "second error"]
+
+		_database_interface = DatabaseInterface()
+		_database_interface.connect_to_database = mock.Mock()
+		_database_interface.disconnect_from_database = mock.Mock()
+		_database_interface.execute_batch_query = _execute_batch_query
+
+		_execute_batch_query_database_command = ExecuteBatchQueryDatabaseCommand(
+			database_name="test",
+			query="INSERT INTO test (index) VALUES (%(index)s)",
+			parameters_list=_parameters_list
+		)
+
+		_database_command_result = _execute_batch_query_database_command.execute(
+			database_interface=_database_interface,
+			database_command_result_factory=PostgresApiDatabaseCommandResultFactory()
+		)
+
+		_is_successful, _row_error_messages = _database_command_result.try_get_row_error_messages()
+		self.assertTrue(_is_successful)
+		self.assertEqual([None, "first error", None, "second error"], _row_error_messages)
+
+		_batch_querying_json = json.loads(_database_command_result.get_json_string())["child_results"][1]
+		self.assertEqual(4, _batch_querying_json["rows_total"])
+		self.assertFalse(_batch_querying_json["is_successful"])
+		self.assertEqual([
+			{"index": 1, "error_message": "first error"},
+			{"index": 3, "error_message": "second error"}
+		], _batch_querying_json["failed_rows"])
+
+	@patch.multiple(DatabaseInterface, __abstractmethods__=set())
+	def test_stream_query_yields_row_batches_and_disconnects(self):
+
+		def _execute_streaming_query(*, query: str, parameters: dict, fetch_rows_total: int):
+			self.assertEqual(2, fetch_rows_total)
+			yield [(1, "a"), (2, "b")]
+			yield [(3, "c")]
+			raise Exception("lost connection")
+
+		_database_interface = DatabaseInterface()
+		_database_interface.connect_to_database = mock.Mock()
+		_database_interface.disconnect_from_database = mock.Mock()
+		_database_interface.execute_streaming_query = _execute_streaming_query
+
+		_database_command_result = StreamQueryDatabaseCommand(
+			database_name="test",
+			query="SELECT * FROM test",
+			parameters={},
+			fetch_rows_total=2
+		).execute(
+			database_interface=_database_interface,
+			database_command_result_factory=PostgresApiDatabaseCommandResultFactory()
+		)
+
+		_database_interface.connect_to_database.assert_not_called()
+
+		_json_chunks = list(_database_command_result.get_json_chunks())
+
+		# the prefix, the first batch, the separator, the second batch and the suffix
+		self.assertEqual(5, len(_json_chunks))
+		_json = json.loads("".join(_json_chunks))
+		self.assertEqual([[1, "a"], [2, "b"], [3, "c"]], _json["output"])
+		self.assertFalse(_json["is_successful"])
+		self.assertEqual("lost connection", _json["error_message"])
+		_database_interface.disconnect_from_database.assert_called_once()
+
+		with self.assertRaises(Exception):
+			_database_command_result.get_json_string()
+
+	@patch.multiple(DatabaseInterface, __abstractmethods__=set())
+	def test_get_records_seeks_past_continuation_token(self):
+
+		_rows = [(_index, _index, f"name {_index}") for _index in range(1, 6)]
+		_queries = []  # type: List[str]
+
+		def _execute_query(*, query: str, parameters: dict) -> object:
+			_queries.append(query)
+			_last_sort_key = parameters.get("last_sort_key_0", 0)
+			return [_row for _row in _rows if _row[0] > _last_sort_key][:parameters["limit"]]
+
+		_database_interface = DatabaseInterface()
+		_database_interface.connect_to_database = mock.Mock()
+		_database_interface.disconnect_from_database = mock.Mock()
+		_database_interface.execute_query = _execute_query
+
+		_records_pages = []  # type: List[List[List[object]]]
+		_continuation_token = None
+		while len(_records_pages) == 0 or _continuation_token is not None:
+			_database_command_result = GetRecordsDatabaseCommand(
+				database_name="test",
+				table_name="test",
+				sort_column_names=["id"],
+				page_rows_total=2,
+				continuation_token=_continuation_token
+			).execute(
+				database_interface=_database_interface,
+				database_command_result_factory=PostgresApiDatabaseCommandResultFactory()
+			)
+			_is_successful, _records, _continuation_token = _database_command_result.try_get_records_page()
+			self.assertTrue(_is_successful)
+			_records_pages.append(_records)
+
+		self.assertEqual([
+			[[1, "name 1"], [2, "name 2"]],
+			[[3, "name 3"], [4, "name 4"]],
+			[[5, "name 5"]]
+		], _records_pages)
+		self.assertEqual("SELECT \"id\", * FROM \"test\" ORDER BY \"id\" LIMIT %(limit)s", _queries[0])
+		self.assertEqual("SELECT \"id\", * FROM \"test\" WHERE (\"id\") > (%(last_sort_key_0)s) ORDER BY \"id\" LIMIT %(limit)s", _queries[1])
+
+		_database_command_result = GetRecordsDatabaseCommand(
+			database_name="test",
+			table_name="other",
+			sort_column_names=["id"],
+			page_rows_total=2,
+			continuation_token=GetRecordsDatabaseCommand.get_continuation_token(
+				table_name="test",
+				sort_column_names=["id"],
+				last_sort_key=[2]
+			)
+		).execute(
+			database_interface=_database_interface,
+			database_command_result_factory=PostgresApiDatabaseCommandResultFactory()
+		)
+		_is_successful, _, _ = _database_command_result.try_get_records_page()
+		self.assertFalse(_is_successful)
+
+	def test_queued_commands_and_results_have_no_instance_dictionary(self):
+
+		_database_command_result_factory = PostgresApiDatabaseCommandResultFactory()
+		_execute_query_database_command_result = ExecuteQueryDatabaseCommandResult(
+			child_database_command_results=[
+				_database_command_result_factory.get_success_connecting_to_database_result(
+					database_name="test"
+				),
+				_database_command_result_factory.get_success_querying_database_result(
+					query="SELECT 1",
+					parameters={},
+					output=[(1,)]
+				),
+				_database_command_result_factory.get_success_disconnecting_from_database_result(
+					database_name="test"
+				)
+			],
+			is_successful=True
+		)
+
+		for _object in [
+			ExecuteQueryDatabaseCommand(
+				database_name="test",
+				query="SELECT 1",
+				parameters={}
+			),
+			DelayedElement(
+				element=None,
+				delay_datetime=datetime.utcnow()
+			),
+			_execute_query_database_command_result,
+			UrlResponse(
+				status_code=200,
+				json_object={}
+			)
+		]:
+			self.assertFalse(hasattr(_object, "__dict__"), type(_object).__name__)
+
+		self.assertIs(_execute_query_database_command_result.get_json_bytes(), _execute_query_database_command_result.get_json_bytes())
+		self.assertEqual([1], json.loads(_execute_query_database_command_result.get_json_string())["child_results"][1]["output"][0])
+
+	def test_failed_query_returns_pooled_connection(self):
+
+		_connection_pool = PostgresConnectionPool(
+			user_name="user",
+			password="password",
+			host_url="localhost",
+			port=5432,
+			maximum_connections_total=1,
+			acquire_timeout_seconds=0.1,
+			connect_function=lambda **kwargs: FakeConnection()
+		)
+		_database_interface = PooledPostgresDatabase(
+			connection_pool=_connection_pool,
+			maximum_prepared_statements_total=0
+		)
+
+		_database_command_results = []
+		for _query in ["FAIL", "SELECT 1"]:
+			_database_command_results.append(ExecuteQueryDatabaseCommand(
+				database_name="test",
+				query=_query,
+				parameters={}
+			).execute(
+				database_interface=_database_interface,
+				database_command_result_factory=PostgresApiDatabaseCommandResultFactory()
+			))
+		_database_connection_pool = _connection_pool.get_database_connection_pool(
+			database_name="test"
+		)
+
+		self.assertFalse(_database_command_results[0].try_get_output()[0])
+		self.assertEqual((True, 1), _database_command_results[1].try_get_output())
+		self.assertEqual(1, _database_connection_pool.get_connections_total())
+		self.assertEqual(1, _database_connection_pool.get_idle_connections_total())
+		_connection_pool.dispose()
+
+	@patch.multiple(AsyncDatabaseInterface, __abstractmethods__=set())
+	def test_database_command_runs_through_async_executable_queue(self):
+
+		async def _test():
+
+			_queries = []  # type: List[str]
+			_thread_idents = set()
+
+			async def _execute_query(*, query: str, parameters: dict) -> object:
+				_queries.append(query)
+				_thread_idents.add(threading.get_ident())
+				if query == "FAIL":
+					raise Exception("syntax error")
+				return [(1,)]
+
+			_async_database_interface = AsyncDatabaseInterface()
+			_async_database_interface.connect_to_database = mock.AsyncMock()
+			_async_database_interface.disconnect_from_database = mock.AsyncMock()
+			_async_database_interface.execute_query = _execute_query
+
+			_json_objects = []  # type: List[object]
+
+			async def _callback_function(data: object) -> JsonConvertable:
+				_json_objects.append(json.loads(data))
+				if len(_json_objects) == 1:
+					raise Exception("callback failed")
+				return None
+
+			_executable_queue = DatabaseCommandAsyncExecutableQueue(
+				async_database_interface_factory=lambda: _async_database_interface,
+				workers_total=1,
+				execution_result_callback=AsyncFunctionCallback(
+					function=_callback_function
+				)
+			)
+			# the callback raises for the first result, which must not stop the worker from executing the second command
+			with patch("traceback.print_exception") as _print_exception:
+				_executable_queue.append_many_to_end_immediately(
+					executable_elements=[DatabaseCommandAsyncExecutableElement(
+						database_command=ExecuteQueryDatabaseCommand(
+							database_name="test",
+							query=_query,
+							parameters={}
+						)
+					) for _query in ["FAIL", "SELECT 1"]]
+				)
+				await _executable_queue.wait_until_empty()
+			await _executable_queue.dispose()
+
+			self.assertEqual(["FAIL", "SELECT 1"], _queries)
+			self.assertEqual(2, len(_json_objects))
+			self.assertFalse(_json_objects[0]["is_successful"])
+			self.assertTrue(_json_objects[1]["is_successful"])
+			self.assertEqual([[1]], _json_objects[1]["child_results"][1]["output"])
+			self.assertEqual(2, _async_database_interface.disconnect_from_database.await_count)
+			_print_exception.assert_called_once()
+			# the built-in commands are executed on the event loop without holding a thread
+			self.assertEqual({threading.get_ident()}, _thread_idents)
+
+		asyncio.run(_test())
+
+	@patch.multiple(AsyncDatabaseInterface, __abstractmethods__=set())
+	def test_synchronous_only_database_command_runs_on_queue_executor(self):
+
+		class ThreadDatabaseCommand(DatabaseCommand):
+
+			def execute(self, *, database_interface: DatabaseInterface, database_command_result_factory: DatabaseCommandResultFactoryInterface) -> DatabaseCommandResult:
+				database_interface.connect_to_database(
+					database_name="test"
+				)
+				database_interface.disconnect_from_database()
+				return DefaultCommandResult(
+					default_json_string=json.dumps({"thread_ident": threading.get_ident()})
+				)
+
+		async def _test():
+
+			_async_database_interface = AsyncDatabaseInterface()
+			_async_database_interface.connect_to_database = mock.AsyncMock()
+			_async_database_interface.disconnect_from_database = mock.AsyncMock()
+
+			_json_objects = []  # type: List[object]
+
+			async def _callback_function(data: object) -> JsonConvertable:
+				_json_objects.append(json.loads(data))
+				return None
+
+			_executable_queue = DatabaseCommandAsyncExecutableQueue(
+				async_database_interface_factory=lambda: _async_database_interface,
+				workers_total=2,
+				execution_result_callback=AsyncFunctionCallback(
+					function=_callback_function
+				),
+				executor_threads_total=1
+			)
+			_executable_queue.append_many_to_end_immediately(
+				executable_elements=[DatabaseCommandAsyncExecutableElement(
+					database_command=ThreadDatabaseCommand()
+				) for _ in range(2)]
+			)
+			await _executable_queue.wait_until_empty()
+			await _executable_queue.dispose()
+
+			# both commands ran on the single executor thread, not on the event loop
+			self.assertEqual(2, len(_json_objects))
+			self.assertEqual(1, len({_json_object["thread_ident"] for _json_object in _json_objects}))
+			self.assertNotEqual(threading.get_ident(), _json_objects[0]["thread_ident"])
+			self.assertEqual(2, _async_database_interface.disconnect_from_database.await_count)
+
+			with self.assertRaises(Exception):
+				await DatabaseCommandAsyncExecutableElement(
+					database_command=ThreadDatabaseCommand()
+				).execute(
+					async_database_interface=_async_database_interface
+				)
+
+		asyncio.run(_test())
+
 	def test_set_of_commands_for_creating_inserting_and_pulling_data(self):
 		pass
 
 
+@unittest.skipUnless(_is_postgres_available(), "postgres is not available")
+class TestAsyncPostgresDatabase(unittest.TestCase):
+
+	def test_workers_share_pooled_connections(self):
+
+		async def _test():
+
+			_connection_pool = AsyncPostgresConnectionPool(
+				maximum_connections_total=2,
+				**_get_connection_parameters()
+			)
+			_json_objects = []  # type: List[object]
+
+			async def _callback_function(data: object) -> JsonConvertable:
+				_json_objects.append(json.loads(data))
+				return None
+
+			_executable_queue = DatabaseCommandAsyncExecutableQueue(
+				async_database_interface_factory=lambda: AsyncPostgresDatabase(
+					connection_pool=_connection_pool
+				),
+				workers_total=20,
+				execution_result_callback=AsyncFunctionCallback(
+					function=_callback_function
+				)
+			)
+			_executable_queue.append_many_to_end_immediately(
+				executable_elements=[DatabaseCommandAsyncExecutableElement(
+					database_command=ExecuteQueryDatabaseCommand(
+						database_name="postgres",
+						query="SELECT pg_backend_pid(), %(index)s, pg_sleep(0.01)",
+						parameters={
+							"index": _index
+						}
+					)
+				) for _index in range(100)]
+			)
+			await _executable_queue.wait_until_empty()
+			await _executable_queue.dispose()
+
+			self.assertEqual(100, len(_json_objects))
+			self.assertTrue(all(_json_object["is_successful"] for _json_object in _json_objects))
+			self.assertEqual(set(range(100)), {_json_object["child_results"][1]["output"][0][1] for _json_object in _json_objects})
+			# the twenty workers took turns on the two pooled connections instead of opening one per command
+			self.assertGreaterEqual(2, len({_json_object["child_results"][1]["output"][0][0] for _json_object in _json_objects}))
+			self.assertEqual(2, _connection_pool.get_connections_total(database_name="postgres"))
+			self.assertEqual(2, _connection_pool.get_idle_connections_total(database_name="postgres"))
+			await _connection_pool.dispose()
+			self.assertEqual(0, _connection_pool.get_connections_total(database_name="postgres"))
+
+		asyncio.run(_test())
+
+
+@unittest.skipUnless(_is_postgres_available(), "postgres is not available")
+class TestPostgresDatabasePreparedStatements(unittest.TestCase):
+
+	def __get_outputs(self, *, maximum_prepared_statements_total: int, queries: List[str], parameters: dict) -> List[object]:
+
+		_postgres_database = PostgresDatabase(
+			maximum_prepared_statements_total=maximum_prepared_statements_total,
+			**_get_connection_parameters()
+		)
+		_postgres_database.connect_to_database(
+			database_name="postgres"
+		)
+		try:
+			# each query runs twice so that the second run executes the cached prepared statement
+			return [_postgres_database.execute_query(
+				query=_query,
+				parameters=parameters
+			) for _query in queries for _ in range(2)]
+		finally:
+			_postgres_database.disconnect_from_database()
+
+	def test_prepared_output_types_match_direct_output_types(self):
+
+		_queries = [
+			"SELECT %(number)s, %(text)s, %(flag)s",
+			"SELECT a, %(number)s + 1 FROM generate_series(1, 3) a WHERE a = %(number)s",
+			"SELECT %(number)s::int * 2",
+			"SELECT a FROM generate_series(1, 10) a ORDER BY a LIMIT %(number)s"
+		]
+		_parameters = {
+			"number": 2,
+			"text": "b",
+			"flag": True
+		}
+
+		_direct_outputs = self.__get_outputs(
+			maximum_prepared_statements_total=0,
+			queries=_queries,
+			parameters=_parameters
+		)
+		_prepared_outputs = self.__get_outputs(
+			maximum_prepared_statements_total=128,
+			queries=_queries,
+			parameters=_parameters
+		)
+
+		self.assertEqual([(2, "b", True)], _direct_outputs[0])
+		self.assertEqual(_direct_outputs, _prepared_outputs)
+		self.assertEqual([[type(_value) for _row in _output for _value in _row] for _output in _direct_outputs], [[type(_value) for _row in _output for _value in _row] for _output in _prepared_outputs])
+
+	def test_query_of_missing_table_is_prepared_once_table_exists(self):
+
+		_table_name = f"prepared_{uuid.uuid4().hex}"
+		_postgres_database = PostgresDatabase(
+			maximum_prepared_statements_total=128,
+			unpreparable_retry_seconds=0.1,
+			**_get_connection_parameters()
+		)
+		_postgres_database.connect_to_database(
+			database_name="postgres"
+		)
+		try:
+			with self.assertRaises(Exception):
+				_postgres_database.execute_query(
+					query=f"SELECT a FROM {_table_name} WHERE a = %(a)s",
+					parameters={"a": 1}
+				)
+			_postgres_database.execute_query(
+				query=f"CREATE TABLE {_table_name} (a int)",
+				parameters={}
+			)
+			# the failed PREPARE is retried once the retry interval has passed
+			time.sleep(0.2)
+			for _ in range(2):
+				self.assertEqual([], _postgres_database.execute_query(
+					query=f"SELECT a FROM {_table_name} WHERE a = %(a)s",
+					parameters={"a": 1}
+				))
+			self.assertEqual(1, _postgres_database.get_prepared_statement_cache_hits_total())
+			self.assertEqual(2, _postgres_database.get_prepared_statement_cache_misses_total())
+		finally:
+			_postgres_database.execute_query(
+				query=f"DROP TABLE IF EXISTS {_table_name}",
+				parameters={}
+			)
+			_postgres_database.disconnect_from_database()
+
+
+
+@unittest.skipUnless(_is_postgres_available(), "postgres is not available")
+class TestPostgresDatabaseBatchQueries(unittest.TestCase):
+
+	def setUp(self):
+		self.__table_name = f"batch_{uuid.uuid4().hex}"
+		self.__postgres_database = PostgresDatabase(
+			maximum_prepared_statements_total=0,
+			**_get_connection_parameters()
+		)
+		self.__postgres_database.connect_to_database(
+			database_name="postgres"
+		)
+		self.__postgres_database.execute_query(
+			query=f"CREATE TABLE {self.__table_name} (a int CHECK (a %% 5 <> 2))",
+			parameters={}
+		)
+
+	def tearDown(self):
+		self.__postgres_database.execute_query(
+			query=f"DROP TABLE {self.__table_name}",
+			parameters={}
+		)
+		self.__postgres_database.disconnect_from_database()
+
+	def __assert_failed_rows_found(self, *, row_error_messages: List[str]):
+		# rows 2 and 7 fail in different pages while the rest of their pages are kept
+		self.assertEqual([2, 7], [_index for _index, _row_error_message in enumerate(row_error_messages) if _row_error_message is not None])
+		self.assertIn("check constraint", row_error_messages[2])
+		self.assertEqual([(_index,) for _index in range(10) if _index % 5 != 2], self.__postgres_database.execute_query(
+			query=f"SELECT a FROM {self.__table_name} ORDER BY a",
+			parameters={}
+		))
+
+	def test_failed_rows_of_pages_are_found(self):
+
+		for _maximum_prepared_statements_total in [0, 128]:
+			with self.subTest(maximum_prepared_statements_total=_maximum_prepared_statements_total):
+				_postgres_database = PostgresDatabase(
+					maximum_prepared_statements_total=_maximum_prepared_statements_total,
+					batch_page_rows_total=4,
+					**_get_connection_parameters()
+				)
+				_postgres_database.connect_to_database(
+					database_name="postgres"
+				)
+				try:
+					_row_error_messages = _postgres_database.execute_batch_query(
+						query=f"INSERT INTO {self.__table_name} (a) VALUES (%(a)s)",
+						parameters_list=[{"a": _index} for _index in range(10)]
+					)
+				finally:
+					_postgres_database.disconnect_from_database()
+				self.__assert_failed_rows_found(
+					row_error_messages=_row_error_messages
+				)
+				self.__postgres_database.execute_query(
+					query=f"TRUNCATE {self.__table_name}",
+					parameters={}
+				)
+
+	def test_failed_rows_of_pages_are_found_asynchronously(self):
+
+		async def _test() -> List[str]:
+
+			_connection_pool = AsyncPostgresConnectionPool(
+				**_get_connection_parameters()
+			)
+			_async_postgres_database = AsyncPostgresDatabase(
+				connection_pool=_connection_pool,
+				batch_page_rows_total=4
+			)
+			await _async_postgres_database.connect_to_database(
+				database_name="postgres"
+			)
+			try:
+				return await _async_postgres_database.execute_batch_query(
+					query=f"INSERT INTO {self.__table_name} (a) VALUES (%(a)s)",
+					parameters_list=[{"a": _index} for _index in range(10)]
+				)
+			finally:
+				await _async_postgres_database.disconnect_from_database()
+				await _connection_pool.dispose()
+
+		self.__assert_failed_rows_found(
+			row_error_messages=asyncio.run(_test())
+		)
+
+
+
 if __name__ == "__main__":
 	unittest.main()
@@ -0,0 +1,198 @@
+import unittest
+from postgres_api.durable_queue import DurableSingleThreadedExecutableQueue, DurableQueueSyncEnum
+from postgres_api.executable import ExecutableElement, DefaultExecutableElement
+from typing import List, Dict
+import os
+import tempfile
+import threading
+import time
+
+
+_gate_event = threading.Event()
+_gate_started_event = threading.Event()
+
+
+class GateExecutableElement(ExecutableElement):
+
+	__slots__ = ()
+
+	def execute(self) -> object:
+		_gate_started_event.set()
+		_gate_event.wait(5)
+		return "gate"
+
+
+class RecordingDurableSingleThreadedExecutableQueue(DurableSingleThreadedExecutableQueue):
+
+	def __init__(self, **kwargs):
+
+		self.execution_results = []  # type: List[object]
+
+		super().__init__(**kwargs)
+
+	def get_execution_parameters(self) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		self.execution_results.append(execution_result)
+
+
+class TestDurableSingleThreadedExecutableQueue(unittest.TestCase):
+
+	def setUp(self):
+		self.__temporary_directory = tempfile.TemporaryDirectory()
+		self.__directory_path = self.__temporary_directory.name
+		_gate_event.clear()
+		_gate_started_event.clear()
+
+	def tearDown(self):
+		self.__temporary_directory.cleanup()
+
+	def __get_queue(self, **kwargs) -> RecordingDurableSingleThreadedExecutableQueue:
+		return RecordingDurableSingleThreadedExecutableQueue(
+			directory_path=self.__directory_path,
+			segment_bytes_total=4096,
+			**kwargs
+		)
+
+	def __dispose_while_gated(self, *, executable_queue: DurableSingleThreadedExecutableQueue):
+		_timer = threading.Timer(0.2, _gate_event.set)
+		_timer.start()
+		executable_queue.dispose()
+		_timer.join()
+		_gate_event.clear()
+
+	def test_pending_elements_are_replayed_in_order(self):
+
+		_executable_queue = self.__get_queue(
+			window_elements_total=5
+		)
+		_executable_queue.append_to_end_immediately(
+			executable_element=GateExecutableElement()
+		)
+		# the gate is executing before the other elements are enqueued, so that none of them runs ahead of it
+		self.assertTrue(_gate_started_event.wait(5))
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(100)]
+		)
+		_executable_queue.insert_many_at_front_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=_output) for _output in ["first", "second"]]
+		)
+		# only the window of elements is held in memory
+		self.assertLessEqual(90, _executable_queue.get_spilled_elements_total())
+		self.__dispose_while_gated(
+			executable_queue=_executable_queue
+		)
+		self.assertEqual(["gate"], _executable_queue.execution_results)
+
+		_executable_queue = self.__get_queue(
+			window_elements_total=5
+		)
+		_executable_queue.wait_until_empty()
+
+		self.assertEqual(["first", "second"] + list(range(100)), _executable_queue.execution_results)
+
+		_executable_queue.dispose()
+
+	def test_executed_elements_are_not_replayed(self):
+
+		_executable_queue = self.__get_queue(
+			sync=DurableQueueSyncEnum.PerInterval
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(200)]
+		)
+		_executable_queue.wait_until_empty()
+		self.assertEqual(list(range(200)), _executable_queue.execution_results)
+		_executable_queue.dispose()
+
+		_executable_queue = self.__get_queue()
+		_executable_queue.wait_until_empty()
+		self.assertEqual([], _executable_queue.execution_results)
+		self.assertEqual(1, _executable_queue.get_segments_total())
+		_executable_queue.dispose()
+
+	def test_delayed_element_is_replayed_after_compaction(self):
+
+		_executable_queue = self.__get_queue()
+		_executable_queue.append_to_end_after_elapsed_seconds(
+			executable_element=DefaultExecutableElement(default_output="delayed"),
+			seconds_total=1
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(200)]
+		)
+		_executable_queue.wait_until_empty()
+		self.assertLess(1, _executable_queue.get_segments_total())
+
+		_executable_queue.compact()
+		self.assertEqual(1, _executable_queue.get_compacted_records_total())
+		self.assertEqual(1, _executable_queue.get_segments_total())
+		_executable_queue.dispose()
+		self.assertEqual(1, len(os.listdir(self.__directory_path)))
+
+		_executable_queue = self.__get_queue()
+		time.sleep(1.2)
+		_executable_queue.wait_until_empty()
+		self.assertEqual(["delayed"], _executable_queue.execution_results)
+		_executable_queue.dispose()
+
+	def test_sequence_indexes_are_not_reused_after_restarts(self):
+
+		_executable_queue = self.__get_queue()
+		_executable_queue.append_to_end_after_elapsed_seconds(
+			executable_element=DefaultExecutableElement(default_output="delayed first"),
+			seconds_total=2
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(3)]
+		)
+		_executable_queue.wait_until_empty()
+		_executable_queue.dispose()
+
+		# the completed records of the executed elements are kept in the segment of the delayed element
+		_executable_queue = self.__get_queue()
+		_executable_queue.append_to_end_after_elapsed_seconds(
+			executable_element=DefaultExecutableElement(default_output="delayed second"),
+			seconds_total=2
+		)
+		_executable_queue.dispose()
+
+		_executable_queue = self.__get_queue()
+		time.sleep(2.2)
+		_executable_queue.wait_until_empty()
+		self.assertEqual(["delayed first", "delayed second"], _executable_queue.execution_results)
+		_executable_queue.dispose()
+
+	def test_torn_record_is_not_replayed(self):
+
+		_executable_queue = self.__get_queue()
+		for _output in ["a", "b", "c"]:
+			_executable_queue.append_to_end_after_elapsed_seconds(
+				executable_element=DefaultExecutableElement(default_output=_output),
+				seconds_total=1
+			)
+		_executable_queue.dispose()
+
+		_segment_file_path = os.path.join(self.__directory_path, sorted(os.listdir(self.__directory_path))[-1])
+		with open(_segment_file_path, "r+b") as _segment_file:
+			_segment_bytes = bytearray(_segment_file.read())
+			# the segment is zeroed past its records, so the last nonzero byte ends the payload of the last record
+			_segment_bytes[len(_segment_bytes.rstrip(b"\x00")) - 1] ^= 0xff
+			_segment_file.seek(0)
+			_segment_file.write(_segment_bytes)
+
+		_executable_queue = self.__get_queue()
+		time.sleep(1.2)
+		_executable_queue.wait_until_empty()
+		self.assertEqual(["a", "b"], _executable_queue.execution_results)
+		_executable_queue.dispose()
+
+	def test_submit_is_refused(self):
+
+		_executable_queue = self.__get_queue()
+		with self.assertRaises(Exception):
+			_executable_queue.submit(
+				executable_element=DefaultExecutableElement(default_output=1)
+			)
+		_executable_queue.dispose()
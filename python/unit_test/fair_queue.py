@@ -0,0 +1,190 @@
+import unittest
+from postgres_api.fair_queue import FairThreadPoolExecutableQueue
+from postgres_api.executable import DelegatedExecutableElement, DefaultExecutableElement
+from typing import List, Dict
+import threading
+import time
+
+
+class RecordingFairThreadPoolExecutableQueue(FairThreadPoolExecutableQueue):
+
+	def __init__(self, **kwargs):
+
+		self.execution_results = []  # type: List[object]
+		self.__lock = threading.Lock()
+
+		super().__init__(**kwargs)
+
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		with self.__lock:
+			self.execution_results.append(execution_result)
+
+
+class TestFairThreadPoolExecutableQueue(unittest.TestCase):
+
+	def __hold_worker(self, *, executable_queue: FairThreadPoolExecutableQueue) -> threading.Event:
+		# the single worker waits on the gate so that the later elements are all pending when it is opened
+		_gate_event = threading.Event()
+		_started_event = threading.Event()
+
+		def _wait() -> str:
+			_started_event.set()
+			_gate_event.wait(5)
+			return "gate"
+
+		executable_queue.append_to_end_immediately(
+			executable_element=DelegatedExecutableElement(
+				delegate_function=_wait
+			),
+			tenant_key="gate"
+		)
+		_started_event.wait(5)
+		return _gate_event
+
+	def test_tenants_take_turns(self):
+
+		_executable_queue = RecordingFairThreadPoolExecutableQueue(
+			workers_total=1
+		)
+		_gate_event = self.__hold_worker(
+			executable_queue=_executable_queue
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=f"a{_index}") for _index in range(100)],
+			tenant_key="a"
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=f"b{_index}") for _index in range(3)],
+			tenant_key="b"
+		)
+		_gate_event.set()
+		_executable_queue.wait_until_empty()
+		_executable_queue.dispose()
+
+		self.assertEqual(["gate", "a0", "b0", "a1", "b1", "a2", "b2", "a3", "a4"], _executable_queue.execution_results[:9])
+		self.assertEqual(104, len(_executable_queue.execution_results))
+
+	def test_tenants_take_turns_by_weight_and_cost(self):
+
+		_executable_queue = RecordingFairThreadPoolExecutableQueue(
+			workers_total=1,
+			weight_per_tenant_key={
+				"a": 2.0
+			}
+		)
+		_gate_event = self.__hold_worker(
+			executable_queue=_executable_queue
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=f"a{_index}") for _index in range(4)],
+			tenant_key="a"
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=f"b{_index}") for _index in range(2)],
+			tenant_key="b"
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=f"c{_index}") for _index in range(2)],
+			tenant_key="c",
+			cost=2.0
+		)
+		_gate_event.set()
+		_executable_queue.wait_until_empty()
+		_executable_queue.dispose()
+
+		self.assertEqual(["gate", "a0", "a1", "b0", "a2", "a3", "b1", "c0", "c1"], _executable_queue.execution_results)
+
+	def test_higher_lane_is_taken_first(self):
+
+		_executable_queue = RecordingFairThreadPoolExecutableQueue(
+			workers_total=1
+		)
+		_gate_event = self.__hold_worker(
+			executable_queue=_executable_queue
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=f"bulk{_index}") for _index in range(2)],
+			lane_name="bulk"
+		)
+		_executable_queue.append_to_end_immediately(
+			executable_element=DefaultExecutableElement(default_output="default")
+		)
+		_executable_queue.append_to_end_immediately(
+			executable_element=DefaultExecutableElement(default_output="interactive"),
+			lane_name="interactive"
+		)
+		_executable_queue.insert_at_front_immediately(
+			executable_element=DefaultExecutableElement(default_output="bulk front"),
+			lane_name="bulk"
+		)
+		_gate_event.set()
+		_executable_queue.wait_until_empty()
+
+		self.assertEqual(["gate", "interactive", "default", "bulk front", "bulk0", "bulk1"], _executable_queue.execution_results)
+		_statistics = _executable_queue.get_statistics()
+		self.assertEqual(3, _statistics["bulk"]["executed_total"])
+		self.assertEqual(3, _statistics["bulk"]["queue_wait_samples_total"])
+		self.assertLessEqual(_statistics["interactive"]["queue_wait_p99_seconds"], _statistics["bulk"]["queue_wait_maximum_seconds"])
+
+		with self.assertRaises(Exception):
+			_executable_queue.append_to_end_immediately(
+				executable_element=DefaultExecutableElement(default_output="unknown"),
+				lane_name="unknown"
+			)
+
+		_executable_queue.dispose()
+
+	def test_tenant_concurrency_is_capped(self):
+
+		_executing_total_per_tenant_key = {"a": 0, "b": 0}
+		_maximum_executing_total_per_tenant_key = {"a": 0, "b": 0}
+		_lock = threading.Lock()
+
+		def _get_executable_element(*, tenant_key: str) -> DelegatedExecutableElement:
+
+			def _execute() -> str:
+				with _lock:
+					_executing_total_per_tenant_key[tenant_key] += 1
+					_maximum_executing_total_per_tenant_key[tenant_key] = max(_maximum_executing_total_per_tenant_key[tenant_key], _executing_total_per_tenant_key[tenant_key])
+				time.sleep(0.01)
+				with _lock:
+					_executing_total_per_tenant_key[tenant_key] -= 1
+				return tenant_key
+
+			return DelegatedExecutableElement(
+				delegate_function=_execute
+			)
+
+		_executable_queue = RecordingFairThreadPoolExecutableQueue(
+			workers_total=4,
+			maximum_executing_total_per_tenant_key={
+				"a": 1
+			}
+		)
+		for _tenant_key in ["a", "b"]:
+			_executable_queue.append_many_to_end_immediately(
+				executable_elements=[_get_executable_element(tenant_key=_tenant_key) for _ in range(12)],
+				tenant_key=_tenant_key
+			)
+		_executable_queue.wait_until_empty()
+		_executable_queue.dispose()
+
+		self.assertEqual(24, len(_executable_queue.execution_results))
+		self.assertEqual(1, _maximum_executing_total_per_tenant_key["a"])
+		self.assertLess(1, _maximum_executing_total_per_tenant_key["b"])
+
+	def test_submit_returns_future_of_tenant_element(self):
+
+		_executable_queue = RecordingFairThreadPoolExecutableQueue(
+			workers_total=2
+		)
+		_futures = _executable_queue.submit_many(
+			executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(3)],
+			tenant_key="a",
+			lane_name="interactive"
+		)
+		self.assertEqual([0, 1, 2], [_future.result(timeout=5) for _future in _futures])
+		_executable_queue.dispose()
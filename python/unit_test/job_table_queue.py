@@ -0,0 +1,164 @@
+import unittest
+from postgres_api.connection_pool import PostgresConnectionPool
+from postgres_api.executable import DefaultExecutableElement
+from postgres_api.job_table_queue import JobTableExecutableQueue
+from typing import List, Dict
+import os
+import psycopg2
+import threading
+import time
+import uuid
+
+
+def _get_connection_parameters() -> Dict[str, object]:
+	# the standard libpq environment variables point the tests at a local postgres
+	return {
+		"user_name": os.environ.get("PGUSER", "postgres"),
+		"password": os.environ.get("PGPASSWORD", ""),
+		"host_url": os.environ.get("PGHOST", "localhost"),
+		"port": int(os.environ.get("PGPORT", "5432"))
+	}
+
+
+def _is_postgres_available() -> bool:
+	_connection_parameters = _get_connection_parameters()
+	try:
+		psycopg2.connect(
+			user=_connection_parameters["user_name"],
+			password=_connection_parameters["password"],
+			host=_connection_parameters["host_url"],
+			port=_connection_parameters["port"],
+			database="postgres",
+			connect_timeout=2
+		).close()
+		return True
+	except psycopg2.Error:
+		return False
+
+
+class RecordingJobTableExecutableQueue(JobTableExecutableQueue):
+
+	def __init__(self, **kwargs):
+
+		self.execution_results = []  # type: List[object]
+		self.__lock = threading.Lock()
+
+		super().__init__(**kwargs)
+
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		with self.__lock:
+			self.execution_results.append(execution_result)
+
+
+@unittest.skipUnless(_is_postgres_available(), "postgres is not available")
+class TestJobTableExecutableQueue(unittest.TestCase):
+
+	def setUp(self):
+		self.__postgres_connection_pool = PostgresConnectionPool(
+			**_get_connection_parameters()
+		)
+		self.__table_name = f"test_job_{uuid.uuid4().hex}"
+
+	def tearDown(self):
+		_postgres_connection = self.__postgres_connection_pool.acquire(
+			database_name="postgres"
+		)
+		_cursor = _postgres_connection.get_connection().cursor()
+		_cursor.execute(f"DROP TABLE IF EXISTS {self.__table_name}; DROP SEQUENCE IF EXISTS {self.__table_name}_front_sequence")
+		_cursor.close()
+		_postgres_connection.get_connection().commit()
+		self.__postgres_connection_pool.release(
+			postgres_connection=_postgres_connection,
+			is_broken=False
+		)
+		self.__postgres_connection_pool.dispose()
+
+	def __get_queue(self, **kwargs) -> RecordingJobTableExecutableQueue:
+		return RecordingJobTableExecutableQueue(
+			postgres_connection_source=self.__postgres_connection_pool,
+			database_name="postgres",
+			table_name=self.__table_name,
+			poll_interval_seconds=0.05,
+			**kwargs
+		)
+
+	def test_jobs_are_executed_in_order_by_a_single_worker(self):
+
+		_producing_queue = self.__get_queue(
+			workers_total=0
+		)
+		_producing_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(20)]
+		)
+		_producing_queue.insert_many_at_front_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=_output) for _output in ["first", "second"]]
+		)
+		_producing_queue.append_to_end_after_elapsed_seconds(
+			executable_element=DefaultExecutableElement(default_output="delayed"),
+			seconds_total=0.5
+		)
+
+		_consuming_queue = self.__get_queue(
+			workers_total=1
+		)
+		_consuming_queue.wait_until_empty()
+		self.assertEqual(["first", "second"] + list(range(20)), _consuming_queue.execution_results)
+
+		time.sleep(0.6)
+		_consuming_queue.wait_until_empty()
+		self.assertEqual("delayed", _consuming_queue.execution_results[-1])
+
+		_consuming_queue.dispose()
+		_producing_queue.dispose()
+
+	def test_jobs_are_shared_between_queues(self):
+
+		_executable_queues = [self.__get_queue(
+			workers_total=2,
+			claimed_jobs_total=5
+		) for _ in range(2)]
+		_executable_queues[0].append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(200)]
+		)
+		_executable_queues[1].wait_until_empty()
+		for _executable_queue in _executable_queues:
+			_executable_queue.dispose()
+
+		_execution_results = _executable_queues[0].execution_results + _executable_queues[1].execution_results
+		self.assertEqual(list(range(200)), sorted(_execution_results))
+
+	def test_expired_lease_is_claimed_again(self):
+
+		_producing_queue = self.__get_queue(
+			workers_total=0
+		)
+		_producing_queue.append_to_end_immediately(
+			executable_element=DefaultExecutableElement(default_output="abandoned")
+		)
+		# a claim that is never executed or renewed stands in for a node that died holding the job
+		_postgres_connection = self.__postgres_connection_pool.acquire(
+			database_name="postgres"
+		)
+		_cursor = _postgres_connection.get_connection().cursor()
+		_cursor.execute(f"UPDATE {self.__table_name} SET lease_owner = 'dead', lease_expires_at = clock_timestamp() + interval '0.5 seconds', attempts_total = 1")
+		_cursor.close()
+		_postgres_connection.get_connection().commit()
+		self.__postgres_connection_pool.release(
+			postgres_connection=_postgres_connection,
+			is_broken=False
+		)
+
+		_consuming_queue = self.__get_queue(
+			workers_total=1
+		)
+		time.sleep(0.2)
+		self.assertEqual([], _consuming_queue.execution_results)
+		time.sleep(0.5)
+		_consuming_queue.wait_until_empty()
+		self.assertEqual(["abandoned"], _consuming_queue.execution_results)
+
+		_consuming_queue.dispose()
+		_producing_queue.dispose()
@@ -0,0 +1,131 @@
+import unittest
+from postgres_api.json_serializer import JsonSerializerInterface, StandardJsonSerializer, OrjsonJsonSerializer, orjson
+from postgres_api.json_convertable import CachedJsonConvertable
+from postgres_api.command import DefaultCommandResult
+from postgres_api.callback import JsonWebTokenCallback, FunctionCallback, RemoteApiInterface, UrlResponse
+from unittest import mock
+import io
+import json
+import jwt
+
+
+class CountingJsonConvertable(CachedJsonConvertable):
+
+	def __init__(self):
+
+		self.json_objects_total = 0
+
+	def get_json_object(self) -> object:
+		self.json_objects_total += 1
+		return {
+			"version": 1,
+			"rows": [(1, "a"), (2, "b")]
+		}
+
+
+class TestJsonSerializer(unittest.TestCase):
+
+	def tearDown(self):
+		JsonSerializerInterface.set_default(
+			json_serializer=None
+		)
+
+	def test_serializers_round_trip(self):
+
+		# the default does not depend on whether orjson is installed
+		self.assertIsInstance(JsonSerializerInterface.get_default(), StandardJsonSerializer)
+
+		_json_serializers = [StandardJsonSerializer()]
+		if orjson is not None:
+			_json_serializers.append(OrjsonJsonSerializer())
+
+		for _json_serializer in _json_serializers:
+			_json_bytes = _json_serializer.dumps(
+				json_object={"name": "é", "rows": [(1, None, True)]}
+			)
+			self.assertIsInstance(_json_bytes, bytes)
+			self.assertEqual({"name": "é", "rows": [[1, None, True]]}, _json_serializer.loads(
+				json_bytes=_json_bytes
+			))
+
+	def test_cached_json_convertable_serialized_once(self):
+
+		JsonSerializerInterface.set_default(
+			json_serializer=StandardJsonSerializer()
+		)
+
+		_json_convertable = CountingJsonConvertable()
+
+		self.assertEqual("{\"version\": 1, \"rows\": [[1, \"a\"], [2, \"b\"]]}", _json_convertable.get_json_string())
+		self.assertIs(_json_convertable.get_json_bytes(), _json_convertable.get_json_bytes())
+		self.assertEqual(1, _json_convertable.json_objects_total)
+
+		self.assertEqual({"test": True}, DefaultCommandResult(
+			default_json_string="{ \"test\": true }"
+		).get_json_object())
+
+	def test_json_web_token_signs_serialized_payload(self):
+
+		_secret = "test secret of at least thirty-two bytes"
+
+		for _data in [CountingJsonConvertable(), "{\"version\": 1, \"rows\": [[1, \"a\"], [2, \"b\"]]}", {"version": 1, "rows": [[1, "a"], [2, "b"]]}]:
+			_encoded_jwt = JsonWebTokenCallback.get_encoded_json_web_token(
+				data=_data,
+				secret=_secret
+			)
+			self.assertEqual({"version": 1, "rows": [[1, "a"], [2, "b"]]}, jwt.decode(_encoded_jwt, _secret, algorithms=["HS256"]))
+
+		with self.assertRaises(Exception):
+			JsonWebTokenCallback.get_encoded_json_web_token(
+				data="[1, 2]",
+				secret=_secret
+			)
+
+	def test_write_json_to_reused_buffer(self):
+
+		JsonSerializerInterface.set_default(
+			json_serializer=StandardJsonSerializer()
+		)
+
+		_buffer = io.BytesIO()
+		for _json_convertable in [CountingJsonConvertable(), DefaultCommandResult(default_json_string="{\"test\": \"é\"}")]:
+			_buffer.seek(0)
+			_buffer.truncate()
+			_bytes_total = _json_convertable.write_json_to(
+				buffer=_buffer
+			)
+			self.assertEqual(_json_convertable.get_json_bytes(), _buffer.getvalue())
+			self.assertEqual(len(_buffer.getvalue()), _bytes_total)
+
+	def test_callbacks_receive_json_convertable(self):
+
+		_json_convertable = CountingJsonConvertable()
+
+		_function_callback_data = []
+		FunctionCallback(
+			function=_function_callback_data.append
+		).execute_json_convertable(
+			json_convertable=_json_convertable
+		)
+		self.assertEqual([_json_convertable.get_json_string()], _function_callback_data)
+
+		_secret = "test secret of at least thirty-two bytes"
+		_remote_api = mock.Mock(spec=RemoteApiInterface)
+		_remote_api.post.return_value = UrlResponse(
+			status_code=200,
+			json_object={}
+		)
+		JsonWebTokenCallback(
+			url="http://localhost/callback",
+			secret=_secret,
+			remote_api=_remote_api
+		).execute_json_convertable(
+			json_convertable=_json_convertable
+		)
+		_encoded_jwt = json.loads(_remote_api.post.call_args.kwargs["json_object"])["token"]
+		self.assertEqual({"version": 1, "rows": [[1, "a"], [2, "b"]]}, jwt.decode(_encoded_jwt, _secret, algorithms=["HS256"]))
+		self.assertEqual(1, _json_convertable.json_objects_total)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from postgres_api.json_web_token_signer import JsonWebTokenSigner
+import jwt
+import jwt.algorithms
+import jwt.api_jws
+
+
+class TestJsonWebTokenSigner(unittest.TestCase):
+
+	def test_symmetric_tokens_match_pyjwt(self):
+
+		_secret = "test secret of at least sixty-four bytes for the longest hmac hash"
+		_payload = b"{\"version\": 1, \"rows\": [[1, \"a\"]]}"
+
+		for _algorithm in ["HS256", "HS384", "HS512"]:
+			_json_web_token_signer = JsonWebTokenSigner(
+				key=_secret,
+				algorithm=_algorithm
+			)
+			for _ in range(2):
+				self.assertEqual(jwt.api_jws.encode(_payload, _secret, algorithm=_algorithm), _json_web_token_signer.sign(
+					payload=_payload
+				))
+			self.assertEqual({"version": 1, "rows": [[1, "a"]]}, jwt.decode(_json_web_token_signer.sign(
+				payload=_payload
+			), _secret, algorithms=[_algorithm]))
+
+		self.assertIs(JsonWebTokenSigner.get_cached(key=_secret), JsonWebTokenSigner.get_cached(key=_secret))
+
+		with self.assertRaises(Exception):
+			JsonWebTokenSigner(
+				key=_secret,
+				algorithm="none"
+			)
+
+	@unittest.skipIf(not jwt.algorithms.has_crypto, "cryptography is not installed")
+	def test_asymmetric_tokens_verified_by_public_key(self):
+
+		from cryptography.hazmat.primitives.asymmetric import ec
+
+		_private_key = ec.generate_private_key(ec.SECP256R1())
+		_json_web_token_signer = JsonWebTokenSigner(
+			key=_private_key,
+			algorithm="ES256",
+			headers={"kid": "test"}
+		)
+		_encoded_jwt = _json_web_token_signer.sign(
+			payload=b"{\"version\": 1}"
+		)
+		self.assertEqual("test", jwt.get_unverified_header(_encoded_jwt)["kid"])
+		self.assertEqual({"version": 1}, jwt.decode(_encoded_jwt, _private_key.public_key(), algorithms=["ES256"]))
+
+
+if __name__ == "__main__":
+	unittest.main()
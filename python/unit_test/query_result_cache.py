@@ -0,0 +1,259 @@
+import unittest
+from unittest import mock
+from unittest.mock import patch
+from postgres_api.query_result_cache import QueryResultCache
+from postgres_api.query_result_cache_invalidation import QueryResultCacheInvalidationChannel
+from postgres_api.database_implementation import DatabaseInterface, CachingDatabaseInterface
+import json
+import time
+
+
+class TestQueryResultCache(unittest.TestCase):
+
+	def test_read_and_written_table_names(self):
+
+		self.assertEqual((True, {"select", "name", "from", "users", "where", "id", "s"}), QueryResultCache.try_get_read_table_names(
+			query="SELECT name FROM Users WHERE id = %(id)s"
+		))
+		self.assertEqual(False, QueryResultCache.try_get_read_table_names(
+			query="SELECT nextval('users_id_seq')"
+		)[0])
+		self.assertEqual(False, QueryResultCache.try_get_read_table_names(
+			query="INSERT INTO users (name) VALUES ('a')"
+		)[0])
+		self.assertEqual(True, QueryResultCache.try_get_read_table_names(
+			query="SELECT lower(name), count(*)::numeric(10, 2) FROM users WHERE id IN (1, 2) GROUP BY lower(name)"
+		)[0])
+		self.assertEqual(False, QueryResultCache.try_get_read_table_names(
+			query="SELECT pg_notify('channel', 'payload')"
+		)[0])
+		self.assertEqual(False, QueryResultCache.try_get_read_table_names(
+			query="SELECT audit.log_read(%(id)s)"
+		)[0])
+		self.assertEqual(True, QueryResultCache.try_get_read_table_names(
+			query="SELECT audit.log_read(%(id)s)",
+			deterministic_function_names={"log_read"}
+		)[0])
+
+		self.assertEqual((True, {"users"}), QueryResultCache.try_get_written_table_names(
+			query="INSERT INTO public.users (name) VALUES ('a')"
+		))
+		self.assertEqual((True, {"Users", "orders"}), QueryResultCache.try_get_written_table_names(
+			query="WITH deleted AS (DELETE FROM orders RETURNING *) UPDATE \"Users\" SET orders_total = 0"
+		))
+		self.assertEqual((True, set()), QueryResultCache.try_get_written_table_names(
+			query="SELECT name FROM users"
+		))
+		self.assertEqual(False, QueryResultCache.try_get_written_table_names(
+			query="ALTER TABLE users ADD COLUMN age integer"
+		)[0])
+		self.assertEqual(False, QueryResultCache.try_get_written_table_names(
+			query="SELECT audit.log_read(%(id)s)"
+		)[0])
+		self.assertEqual((True, set()), QueryResultCache.try_get_written_table_names(
+			query="SELECT nextval('users_id_seq')"
+		))
+
+	def test_least_recently_used_evicted_and_expired(self):
+
+		_query_result_cache = QueryResultCache(
+			maximum_entries_total=2,
+			time_to_live_seconds=0.2
+		)
+
+		for _index in range(3):
+			_query_result_cache.add(
+				database_name="test",
+				query="SELECT name FROM users WHERE id = %(id)s",
+				parameters={"id": _index},
+				table_names={"users"},
+				table_versions=_query_result_cache.get_table_versions(
+					database_name="test",
+					table_names={"users"}
+				),
+				output=[(f"name {_index}",)]
+			)
+			if _index == 1:
+				self.assertTrue(_query_result_cache.try_get(
+					database_name="test",
+					query="SELECT name FROM users WHERE id = %(id)s",
+					parameters={"id": 0}
+				)[0])
+
+		self.assertEqual((True, [("name 0",)]), _query_result_cache.try_get(
+			database_name="test",
+			query="SELECT  name  FROM users WHERE id = %(id)s",
+			parameters={"id": 0}
+		))
+		self.assertFalse(_query_result_cache.try_get(
+			database_name="test",
+			query="SELECT name FROM users WHERE id = %(id)s",
+			parameters={"id": 1}
+		)[0])
+
+		time.sleep(0.3)
+
+		self.assertFalse(_query_result_cache.try_get(
+			database_name="test",
+			query="SELECT name FROM users WHERE id = %(id)s",
+			parameters={"id": 2}
+		)[0])
+
+		_statistics = _query_result_cache.get_statistics()
+		self.assertEqual(1, _statistics["evictions_total"])
+		self.assertEqual(1, _statistics["expirations_total"])
+		self.assertEqual(2, _statistics["hits_total"])
+		self.assertEqual(2, _statistics["misses_total"])
+
+	def test_output_of_stale_read_not_added(self):
+
+		_query_result_cache = QueryResultCache()
+
+		_table_versions = _query_result_cache.get_table_versions(
+			database_name="test",
+			table_names={"users"}
+		)
+		_query_result_cache.invalidate_tables(
+			database_name="test",
+			table_names={"users"}
+		)
+		_query_result_cache.add(
+			database_name="test",
+			query="SELECT name FROM users",
+			parameters={},
+			table_names={"users"},
+			table_versions=_table_versions,
+			output=[("stale",)]
+		)
+
+		self.assertFalse(_query_result_cache.try_get(
+			database_name="test",
+			query="SELECT name FROM users",
+			parameters={}
+		)[0])
+
+	@patch.multiple(DatabaseInterface, __abstractmethods__=set())
+	def test_caching_database_interface_invalidated_by_write(self):
+
+		_database_interface = DatabaseInterface()
+		_database_interface.connect_to_database = mock.Mock()
+		_database_interface.execute_query = mock.Mock(return_value=[("name",)])
+
+		_caching_database_interface = CachingDatabaseInterface(
+			database_interface=_database_interface,
+			query_result_cache=QueryResultCache()
+		)
+		_caching_database_interface.connect_to_database(
+			database_name="test"
+		)
+
+		for _ in range(3):
+			self.assertEqual([("name",)], _caching_database_interface.execute_query(
+				query="SELECT name FROM users",
+				parameters={}
+			))
+		self.assertEqual(1, _database_interface.execute_query.call_count)
+
+		_caching_database_interface.execute_query(
+			query="UPDATE users SET name = 'other'",
+			parameters={}
+		)
+		_caching_database_interface.execute_query(
+			query="SELECT name FROM users",
+			parameters={}
+		)
+		self.assertEqual(3, _database_interface.execute_query.call_count)
+
+	@patch.multiple(DatabaseInterface, __abstractmethods__=set())
+	def test_caching_database_interface_does_not_cache_unknown_function(self):
+
+		_database_interface = DatabaseInterface()
+		_database_interface.connect_to_database = mock.Mock()
+		_database_interface.execute_query = mock.Mock(return_value=[("name",)])
+
+		_caching_database_interface = CachingDatabaseInterface(
+			database_interface=_database_interface,
+			query_result_cache=QueryResultCache()
+		)
+		_caching_database_interface.connect_to_database(
+			database_name="test"
+		)
+
+		_caching_database_interface.execute_query(
+			query="SELECT name FROM users",
+			parameters={}
+		)
+		for _ in range(2):
+			_caching_database_interface.execute_query(
+				query="SELECT insert_audit_row()",
+				parameters={}
+			)
+		self.assertEqual(3, _database_interface.execute_query.call_count)
+
+		# the function may have written to any table
+		_caching_database_interface.execute_query(
+			query="SELECT name FROM users",
+			parameters={}
+		)
+		self.assertEqual(4, _database_interface.execute_query.call_count)
+
+	def test_invalidation_channel_applies_notifications_of_other_origins(self):
+
+		_query_result_cache = QueryResultCache()
+		_query_result_cache_invalidation_channel = QueryResultCacheInvalidationChannel(
+			query_result_cache=_query_result_cache,
+			user_name="test",
+			password="test",
+			host_url="localhost",
+			port=5432
+		)
+
+		def _add_output():
+			_query_result_cache.add(
+				database_name="test",
+				query="SELECT name FROM users",
+				parameters={},
+				table_names={"users"},
+				table_versions=_query_result_cache.get_table_versions(
+					database_name="test",
+					table_names={"users"}
+				),
+				output=[("name",)]
+			)
+
+		try:
+			_add_output()
+			_parameters = _query_result_cache_invalidation_channel.get_notification_parameters(
+				database_name="test",
+				table_names={"users"}
+			)
+			self.assertEqual("postgres_api_query_result_cache", _parameters["channel_name"])
+
+			_query_result_cache_invalidation_channel.process_notification_payload(
+				payload=_parameters["payload"]
+			)
+			self.assertEqual(1, _query_result_cache.get_statistics()["entries_total"])
+
+			_payload = json.loads(_parameters["payload"])
+			_payload["origin"] = "other"
+			_query_result_cache_invalidation_channel.process_notification_payload(
+				payload=json.dumps(_payload)
+			)
+			self.assertEqual(0, _query_result_cache.get_statistics()["entries_total"])
+
+			_add_output()
+			_query_result_cache_invalidation_channel.process_notification_payload(
+				payload=json.dumps({
+					"origin": "other",
+					"database_name": "test",
+					"table_names": None
+				})
+			)
+			self.assertEqual(0, _query_result_cache.get_statistics()["entries_total"])
+			self.assertEqual(3, _query_result_cache_invalidation_channel.get_notifications_received_total())
+		finally:
+			_query_result_cache_invalidation_channel.dispose()
+
+
+if __name__ == "__main__":
+	unittest.main()
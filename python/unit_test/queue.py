@@ -0,0 +1,428 @@
+import unittest
+from unittest.mock import patch
+from postgres_api.queue import DelayedElement, DelayedElementQueue, SingleThreadedExecutableQueue, ThreadPoolExecutableQueue
+from postgres_api.async_queue import AsyncExecutableQueue
+from postgres_api.executable import DelegatedExecutableElement, DefaultExecutableElement, DelegatedAsyncExecutableElement
+from datetime import datetime, timedelta
+from typing import List, Dict
+import threading
+import asyncio
+import concurrent.futures
+import random
+
+
+class TestDelayedElementQueue(unittest.TestCase):
+
+	def test_try_get_returns_earliest_due_element(self):
+
+		_now = datetime.utcnow()
+
+		_delayed_element_queue = DelayedElementQueue()
+
+		_seconds = list(range(100))
+		random.shuffle(_seconds)
+		for _second in _seconds:
+			_delayed_element_queue.add(
+				delayed_element=DelayedElement(
+					element=_second,
+					delay_datetime=_now - timedelta(seconds=_second)
+				)
+			)
+
+		_elements = []  # type: List[int]
+		_is_successful = True
+		while _is_successful:
+			_is_successful, _delayed_element = _delayed_element_queue.try_get()
+			if _is_successful:
+				_elements.append(_delayed_element.get_element())
+
+		self.assertEqual(list(reversed(range(100))), _elements)
+
+	def test_try_get_does_not_return_future_element(self):
+
+		_delayed_element_queue = DelayedElementQueue()
+
+		_delayed_element_queue.add(
+			delayed_element=DelayedElement(
+				element="future",
+				delay_datetime=datetime.utcnow() + timedelta(hours=1)
+			)
+		)
+
+		_is_successful, _delayed_element = _delayed_element_queue.try_get()
+		self.assertFalse(_is_successful)
+		self.assertIsNone(_delayed_element)
+
+		_is_successful, _delayed_element = _delayed_element_queue.peek_next_due()
+		self.assertTrue(_is_successful)
+		self.assertEqual("future", _delayed_element.get_element())
+		self.assertEqual(1, _delayed_element_queue.get_length())
+
+	def test_add_many_keeps_insertion_order_for_equal_delay_datetimes(self):
+
+		_delay_datetime = datetime.utcnow() - timedelta(seconds=1)
+
+		_delayed_element_queue = DelayedElementQueue()
+
+		_delayed_element_queue.add(
+			delayed_element=DelayedElement(
+				element=0,
+				delay_datetime=_delay_datetime
+			)
+		)
+		_delayed_element_queue.add_many(
+			delayed_elements=[
+				DelayedElement(
+					element=_index,
+					delay_datetime=_delay_datetime
+				) for _index in range(1, 10)
+			]
+		)
+
+		_elements = []  # type: List[int]
+		_is_successful = True
+		while _is_successful:
+			_is_successful, _delayed_element = _delayed_element_queue.try_get()
+			if _is_successful:
+				_elements.append(_delayed_element.get_element())
+
+		self.assertEqual(list(range(10)), _elements)
+
+		_is_successful, _delayed_element = _delayed_element_queue.peek_next_due()
+		self.assertFalse(_is_successful)
+
+
+class RecordingThreadPoolExecutableQueue(ThreadPoolExecutableQueue):
+
+	def __init__(self, *, workers_total: int):
+		super().__init__(
+			workers_total=workers_total
+		)
+
+		self.__execution_results = []  # type: List[object]
+		self.__execution_results_semaphore = threading.Semaphore()
+
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		return {
+			"worker_index": worker_index
+		}
+
+	def process_execution_result(self, *, execution_result: object):
+		self.__execution_results_semaphore.acquire()
+		self.__execution_results.append(execution_result)
+		self.__execution_results_semaphore.release()
+
+	def get_execution_results(self) -> List[object]:
+		return self.__execution_results.copy()
+
+
+class TestThreadPoolExecutableQueue(unittest.TestCase):
+
+	def test_worker_carries_on_after_exception(self):
+
+		_executable_queue = RecordingThreadPoolExecutableQueue(
+			workers_total=1
+		)
+
+		def _raise(*args, **kwargs):
+			raise ValueError("failed element")
+
+		try:
+			with patch("traceback.print_exception") as _print_exception:
+				_executable_queue.append_many_to_end_immediately(
+					executable_elements=[
+						DelegatedExecutableElement(
+							delegate_function=_raise
+						),
+						DefaultExecutableElement(
+							default_output="first"
+						)
+					]
+				)
+				# the only worker must survive the exception for the later elements to be executed
+				_future = _executable_queue.submit(
+					executable_element=DefaultExecutableElement(
+						default_output="last"
+					)
+				)
+				self.assertEqual("last", _future.result(timeout=5.0))
+				_executable_queue.wait_until_empty()
+		finally:
+			_executable_queue.dispose()
+
+		self.assertEqual(["first", "last"], _executable_queue.get_execution_results())
+		_print_exception.assert_called_once()
+
+	def test_same_ordering_key_is_sequential(self):
+
+		_executable_queue = RecordingThreadPoolExecutableQueue(
+			workers_total=4
+		)
+
+		_executing_totals = {}  # type: Dict[str, int]
+		_is_overlapping = []  # type: List[bool]
+
+		def _get_executable_element(ordering_key: str, index: int) -> DelegatedExecutableElement:
+
+			def _delegate_function(*args, **kwargs) -> object:
+				_executing_totals[ordering_key] = _executing_totals.get(ordering_key, 0) + 1
+				if _executing_totals[ordering_key] != 1:
+					_is_overlapping.append(True)
+				threading.Event().wait(0.001)
+				_executing_totals[ordering_key] -= 1
+				return ordering_key, index
+
+			return DelegatedExecutableElement(
+				delegate_function=_delegate_function
+			)
+
+		for _index in range(20):
+			for _ordering_key in ["first", "second", "third"]:
+				_executable_queue.append_to_end_immediately(
+					executable_element=_get_executable_element(_ordering_key, _index),
+					ordering_key=_ordering_key
+				)
+
+		_executable_queue.wait_until_empty()
+		_executable_queue.dispose()
+
+		self.assertEqual([], _is_overlapping)
+		_execution_results = _executable_queue.get_execution_results()
+		self.assertEqual(60, len(_execution_results))
+		for _ordering_key in ["first", "second", "third"]:
+			self.assertEqual(list(range(20)), [_index for _key, _index in _execution_results if _key == _ordering_key])
+
+	def test_different_ordering_keys_run_in_parallel(self):
+
+		_executable_queue = RecordingThreadPoolExecutableQueue(
+			workers_total=2
+		)
+
+		_slow_started_event = threading.Event()
+		_slow_release_event = threading.Event()
+
+		def _slow_delegate_function(*args, **kwargs) -> object:
+			_slow_started_event.set()
+			_slow_release_event.wait()
+			return "slow"
+
+		def _fast_delegate_function(*args, **kwargs) -> object:
+			_slow_release_event.set()
+			return "fast"
+
+		_executable_queue.append_to_end_immediately(
+			executable_element=DelegatedExecutableElement(
+				delegate_function=_slow_delegate_function
+			),
+			ordering_key="slow_database"
+		)
+		_slow_started_event.wait()
+		_executable_queue.append_to_end_immediately(
+			executable_element=DelegatedExecutableElement(
+				delegate_function=_fast_delegate_function
+			),
+			ordering_key="fast_database"
+		)
+
+		_executable_queue.wait_until_empty()
+		_executable_queue.dispose()
+
+		self.assertEqual(["fast", "slow"], _executable_queue.get_execution_results())
+
+
+class RecordingSingleThreadedExecutableQueue(SingleThreadedExecutableQueue):
+
+	def __init__(self):
+		super().__init__()
+
+		self.__execution_results = []  # type: List[object]
+
+	def get_execution_parameters(self) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		self.__execution_results.append(execution_result)
+
+	def get_execution_results(self) -> List[object]:
+		return self.__execution_results.copy()
+
+
+class TestSubmit(unittest.TestCase):
+
+	def test_futures_resolve_with_output_or_exception(self):
+
+		_executable_queue = RecordingSingleThreadedExecutableQueue()
+
+		def _raise(*args, **kwargs):
+			raise ValueError("failed element")
+
+		try:
+			_futures = _executable_queue.submit_many(
+				executable_elements=[
+					DefaultExecutableElement(
+						default_output="first"
+					),
+					DelegatedExecutableElement(
+						delegate_function=_raise
+					)
+				]
+			)
+			# the processing thread carries on after the exception
+			_future = _executable_queue.submit(
+				executable_element=DefaultExecutableElement(
+					default_output="last"
+				)
+			)
+
+			self.assertEqual("first", _futures[0].result(timeout=5.0))
+			with self.assertRaises(ValueError):
+				_futures[1].result(timeout=5.0)
+			self.assertEqual("last", _future.result(timeout=5.0))
+			_executable_queue.wait_until_empty()
+		finally:
+			_executable_queue.dispose()
+
+		self.assertEqual(["first", "last"], _executable_queue.get_execution_results())
+
+	def test_cancelled_future_not_executed(self):
+
+		_executable_queue = RecordingThreadPoolExecutableQueue(
+			workers_total=1
+		)
+
+		_started_event = threading.Event()
+		_release_event = threading.Event()
+
+		def _block(*args, **kwargs) -> object:
+			_started_event.set()
+			_release_event.wait()
+			return "blocking"
+
+		try:
+			_blocking_future = _executable_queue.submit(
+				executable_element=DelegatedExecutableElement(
+					delegate_function=_block
+				),
+				ordering_key="test"
+			)
+			_started_event.wait()
+			_cancelled_future = _executable_queue.submit(
+				executable_element=DefaultExecutableElement(
+					default_output="cancelled"
+				),
+				ordering_key="test"
+			)
+			self.assertTrue(_cancelled_future.cancel())
+			_release_event.set()
+
+			self.assertEqual("blocking", _blocking_future.result(timeout=5.0))
+			_executable_queue.wait_until_empty()
+		finally:
+			_release_event.set()
+			_executable_queue.dispose()
+
+		self.assertTrue(_cancelled_future.cancelled())
+		self.assertEqual(["blocking"], _executable_queue.get_execution_results())
+
+	def test_exception_processing_result_of_submitted_element_is_printed(self):
+
+		class RaisingThreadPoolExecutableQueue(RecordingThreadPoolExecutableQueue):
+
+			def process_execution_result(self, *, execution_result: object):
+				raise ValueError("failed result")
+
+		_executable_queue = RaisingThreadPoolExecutableQueue(
+			workers_total=1
+		)
+
+		def _raise(*args, **kwargs):
+			raise ValueError("failed element")
+
+		try:
+			with patch("traceback.print_exception") as _print_exception:
+				_futures = _executable_queue.submit_many(
+					executable_elements=[
+						DefaultExecutableElement(
+							default_output="first"
+						),
+						DelegatedExecutableElement(
+							delegate_function=_raise
+						)
+					]
+				)
+				_executable_queue.wait_until_empty()
+		finally:
+			_executable_queue.dispose()
+
+		# the exception of the element is only set on its future, while the exception processing the result is also printed
+		self.assertEqual("first", _futures[0].result(timeout=5.0))
+		with self.assertRaises(ValueError):
+			_futures[1].result(timeout=5.0)
+		_print_exception.assert_called_once()
+		self.assertEqual("failed result", str(_print_exception.call_args.args[1]))
+
+
+class RecordingAsyncExecutableQueue(AsyncExecutableQueue):
+
+	def __init__(self, *, workers_total: int):
+		super().__init__(
+			workers_total=workers_total
+		)
+
+		self.__execution_results = []  # type: List[object]
+
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		return {}
+
+	async def process_execution_result(self, *, execution_result: object):
+		self.__execution_results.append(execution_result)
+
+	def get_execution_results(self) -> List[object]:
+		return self.__execution_results.copy()
+
+
+class TestAsyncExecutableQueue(unittest.TestCase):
+
+	def test_async_and_synchronous_elements_run_concurrently_in_order(self):
+
+		async def _test():
+
+			_executable_queue = RecordingAsyncExecutableQueue(
+				workers_total=11
+			)
+
+			def _get_async_executable_element(index: int) -> DelegatedAsyncExecutableElement:
+
+				async def _delegate_function(*args, **kwargs) -> object:
+					await asyncio.sleep(0.1)
+					return index
+
+				return DelegatedAsyncExecutableElement(
+					delegate_function=_delegate_function
+				)
+
+			_executable_queue.append_to_end_after_elapsed_seconds(
+				executable_element=DefaultExecutableElement(
+					default_output="delayed"
+				),
+				seconds_total=0.05
+			)
+			_executable_queue.append_many_to_end_immediately(
+				executable_elements=[_get_async_executable_element(_index) for _index in range(10)]
+			)
+
+			_start = asyncio.get_running_loop().time()
+			await asyncio.sleep(0.06)
+			await _executable_queue.wait_until_empty()
+			_elapsed_seconds = asyncio.get_running_loop().time() - _start
+
+			await _executable_queue.dispose()
+
+			self.assertLess(_elapsed_seconds, 0.5)
+			self.assertEqual(["delayed"] + list(range(10)), _executable_queue.get_execution_results())
+
+		asyncio.run(_test())
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,261 @@
+import unittest
+from postgres_api.queue import SingleThreadedExecutableQueue, ThreadPoolExecutableQueue
+from postgres_api.queue_admission import ExecutableQueueAdmissionController, ExecutableQueueOverflowPolicyEnum, ExecutableQueueRejectionReasonEnum, ExecutableQueueRejection, ExecutableQueueRejectedException
+from postgres_api.executable import ExecutableElement, DelegatedExecutableElement, DefaultExecutableElement
+from postgres_api.database_implementation import PostgresApiDatabaseCommandResultFactory
+from typing import List, Dict, Tuple
+import threading
+
+
+class RejectionRecordingThreadPoolExecutableQueue(ThreadPoolExecutableQueue):
+
+	def __init__(self, **kwargs):
+
+		self.execution_results = []  # type: List[object]
+		self.rejected_elements = []  # type: List[Tuple[ExecutableElement, ExecutableQueueRejection]]
+		self.__lock = threading.Lock()
+
+		super().__init__(**kwargs)
+
+	def get_execution_parameters(self, *, worker_index: int) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		with self.__lock:
+			self.execution_results.append(execution_result)
+
+	def process_rejected_executable_element(self, *, executable_element: ExecutableElement, executable_queue_rejection: ExecutableQueueRejection):
+		super().process_rejected_executable_element(
+			executable_element=executable_element,
+			executable_queue_rejection=executable_queue_rejection
+		)
+		with self.__lock:
+			self.rejected_elements.append((executable_element, executable_queue_rejection))
+
+
+class RejectionRecordingSingleThreadedExecutableQueue(SingleThreadedExecutableQueue):
+
+	def __init__(self, **kwargs):
+
+		self.execution_results = []  # type: List[object]
+		self.rejected_elements = []  # type: List[Tuple[ExecutableElement, ExecutableQueueRejection]]
+		self.__lock = threading.Lock()
+
+		super().__init__(**kwargs)
+
+	def get_execution_parameters(self) -> Dict[str, object]:
+		return {}
+
+	def process_execution_result(self, *, execution_result: object):
+		with self.__lock:
+			self.execution_results.append(execution_result)
+
+	def process_rejected_executable_element(self, *, executable_element: ExecutableElement, executable_queue_rejection: ExecutableQueueRejection):
+		super().process_rejected_executable_element(
+			executable_element=executable_element,
+			executable_queue_rejection=executable_queue_rejection
+		)
+		with self.__lock:
+			self.rejected_elements.append((executable_element, executable_queue_rejection))
+
+
+class TestExecutableQueueAdmission(unittest.TestCase):
+
+	def __hold_worker(self, *, executable_queue) -> threading.Event:
+		# the single worker waits on the gate so that the later elements stay pending until it is opened
+		_gate_event = threading.Event()
+		_started_event = threading.Event()
+
+		def _wait() -> str:
+			_started_event.set()
+			_gate_event.wait(5)
+			return "gate"
+
+		executable_queue.append_to_end_immediately(
+			executable_element=DelegatedExecutableElement(
+				delegate_function=_wait
+			)
+		)
+		_started_event.wait(5)
+		return _gate_event
+
+	def test_reject_when_full(self):
+
+		_executable_queue = RejectionRecordingThreadPoolExecutableQueue(
+			workers_total=1,
+			admission_controller=ExecutableQueueAdmissionController(
+				maximum_elements_total=3,
+				overflow_policy=ExecutableQueueOverflowPolicyEnum.Reject
+			)
+		)
+		_gate_event = self.__hold_worker(
+			executable_queue=_executable_queue
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(5)]
+		)
+		_gate_event.set()
+		_executable_queue.wait_until_empty()
+		_executable_queue.dispose()
+
+		self.assertEqual(["gate", 0, 1, 2], _executable_queue.execution_results)
+		self.assertEqual(2, len(_executable_queue.rejected_elements))
+		self.assertEqual(ExecutableQueueRejectionReasonEnum.Capacity, _executable_queue.rejected_elements[0][1].get_rejection_reason())
+		self.assertEqual(3, _executable_queue.rejected_elements[0][1].get_pending_elements_total())
+		_statistics = _executable_queue.get_admission_statistics()
+		self.assertEqual(0, _statistics["pending_elements_total"])
+		self.assertEqual(0, _statistics["pending_bytes_total"])
+		self.assertEqual(4, _statistics["admitted_total"])
+		self.assertEqual(2, _statistics["rejected_total"])
+
+	def test_reject_by_estimated_bytes(self):
+
+		_executable_queue = RejectionRecordingSingleThreadedExecutableQueue(
+			admission_controller=ExecutableQueueAdmissionController(
+				maximum_bytes_total=100,
+				overflow_policy=ExecutableQueueOverflowPolicyEnum.Reject,
+				estimated_bytes_function=lambda executable_element: 40
+			)
+		)
+		_gate_event = self.__hold_worker(
+			executable_queue=_executable_queue
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(4)]
+		)
+		_gate_event.set()
+		_executable_queue.wait_until_empty()
+		_executable_queue.dispose()
+
+		self.assertEqual(["gate", 0, 1], _executable_queue.execution_results)
+		self.assertEqual([2, 3], [_executable_element.execute() for _executable_element, _ in _executable_queue.rejected_elements])
+
+	def test_block_until_room(self):
+
+		_executable_queue = RejectionRecordingThreadPoolExecutableQueue(
+			workers_total=1,
+			admission_controller=ExecutableQueueAdmissionController(
+				maximum_elements_total=2,
+				overflow_policy=ExecutableQueueOverflowPolicyEnum.Block
+			)
+		)
+		_gate_event = self.__hold_worker(
+			executable_queue=_executable_queue
+		)
+		_is_appended_event = threading.Event()
+
+		def _append():
+			_executable_queue.append_many_to_end_immediately(
+				executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(4)]
+			)
+			_is_appended_event.set()
+
+		_append_thread = threading.Thread(
+			target=_append
+		)
+		_append_thread.start()
+		self.assertFalse(_is_appended_event.wait(0.2))
+		_gate_event.set()
+		self.assertTrue(_is_appended_event.wait(5))
+		_append_thread.join()
+		_executable_queue.wait_until_empty()
+		_executable_queue.dispose()
+
+		self.assertEqual(["gate", 0, 1, 2, 3], _executable_queue.execution_results)
+		self.assertEqual(0, len(_executable_queue.rejected_elements))
+
+	def test_block_times_out(self):
+
+		_executable_queue = RejectionRecordingSingleThreadedExecutableQueue(
+			admission_controller=ExecutableQueueAdmissionController(
+				maximum_elements_total=1,
+				overflow_policy=ExecutableQueueOverflowPolicyEnum.Block,
+				block_timeout_seconds=0.05
+			)
+		)
+		_gate_event = self.__hold_worker(
+			executable_queue=_executable_queue
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(2)]
+		)
+		_gate_event.set()
+		_executable_queue.wait_until_empty()
+		_executable_queue.dispose()
+
+		self.assertEqual(["gate", 0], _executable_queue.execution_results)
+		self.assertEqual(1, len(_executable_queue.rejected_elements))
+
+	def test_drop_oldest(self):
+
+		_executable_queue = RejectionRecordingThreadPoolExecutableQueue(
+			workers_total=1,
+			admission_controller=ExecutableQueueAdmissionController(
+				maximum_elements_total=2,
+				overflow_policy=ExecutableQueueOverflowPolicyEnum.DropOldest
+			)
+		)
+		_gate_event = self.__hold_worker(
+			executable_queue=_executable_queue
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(2)],
+			ordering_key="a"
+		)
+		_executable_queue.append_many_to_end_immediately(
+			executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(2, 5)]
+		)
+		_gate_event.set()
+		_executable_queue.wait_until_empty()
+		_executable_queue.dispose()
+
+		self.assertEqual(["gate", 3, 4], _executable_queue.execution_results)
+		self.assertEqual([0, 1, 2], [_executable_element.execute() for _executable_element, _ in _executable_queue.rejected_elements])
+		self.assertEqual(ExecutableQueueRejectionReasonEnum.Dropped, _executable_queue.rejected_elements[0][1].get_rejection_reason())
+		self.assertEqual(3, _executable_queue.get_admission_statistics()["dropped_total"])
+
+	def test_shed_when_estimated_wait_is_too_long(self):
+
+		_admission_controller = ExecutableQueueAdmissionController(
+			maximum_estimated_wait_seconds=0.05
+		)
+		_executable_queue = RejectionRecordingSingleThreadedExecutableQueue(
+			admission_controller=_admission_controller
+		)
+		_gate_event = self.__hold_worker(
+			executable_queue=_executable_queue
+		)
+		# the recorded execution seconds estimate 0.02 seconds of wait per pending element
+		_admission_controller.record_execution_seconds(
+			execution_seconds=0.02
+		)
+		_futures = _executable_queue.submit_many(
+			executable_elements=[DefaultExecutableElement(default_output=_index) for _index in range(5)]
+		)
+		_gate_event.set()
+
+		self.assertEqual([0, 1, 2], [_future.result(timeout=5) for _future in _futures[:3]])
+		for _future in _futures[3:]:
+			with self.assertRaises(ExecutableQueueRejectedException) as _context:
+				_future.result(timeout=5)
+			self.assertEqual(ExecutableQueueRejectionReasonEnum.QueueDelay, _context.exception.get_executable_queue_rejection().get_rejection_reason())
+		_executable_queue.wait_until_empty()
+		self.assertEqual(2, _executable_queue.get_admission_statistics()["shed_total"])
+		_executable_queue.dispose()
+
+	def test_rejected_database_command_result(self):
+
+		_database_command_result = PostgresApiDatabaseCommandResultFactory().get_rejected_result(
+			rejection_reason=ExecutableQueueRejectionReasonEnum.QueueDelay.name,
+			estimated_wait_seconds=1.5,
+			error_message="Rejected."
+		)
+
+		self.assertEqual({
+			"version": 1,
+			"is_successful": False,
+			"is_rejected": True,
+			"rejection_reason": "QueueDelay",
+			"retry_after_seconds": 1.5,
+			"error_message": "Rejected."
+		}, _database_command_result.get_json_object())